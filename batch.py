@@ -0,0 +1,254 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Project-wide batch tokenization (file explorer, search explorer)
+
+# Files under a root are tokenized on a process pool. Each task takes a chunk
+# of files and writes their tokens as columns (starts int32, lengths int32,
+# kinds uint8) into one shared memory block, so only the block name and a few
+# numbers per file are pickled back. The parent copies the columns out and
+# unlinks the block as soon as the chunk arrives.
+#
+#   for result in tokenize_project(root, exclude="pyc,so,o,git,DS_Store"):
+#       result.path, result.styles, result.kinds, result.starts, result.lengths
+#
+# Progress is reported with on_progress(done, total) (files), and setting the
+# cancel event (or closing the generator) stops the run.
+
+import importlib
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+# extension or dotfile name (".hackerman") -> lexer module (built modules must be importable in the workers)
+LEXERS = {
+    "pc": "pc",
+    "hackerman": "hackerman",
+    "odin": "_odin",
+    "py": "_py",
+    "toml": "toml",
+    "txt": "txt",
+    "todo": "todo",
+}
+
+CHUNK_FILES = 64 # files per task
+MAX_FILE_SIZE = 16 << 20 # larger files are skipped (reported with error)
+
+
+def exclude_set(exclude):
+    # file_types_to_exclude value ("pyc,so,o") or iterable of types, without dots
+    if isinstance(exclude, str):
+        exclude = exclude.split(",")
+    return { file_type.strip().lstrip(".") for file_type in exclude if file_type.strip() }
+
+
+def is_excluded(name, excluded):
+    # by extension ("x.pyc") or by name of dotfiles and dirs (".git", ".DS_Store")
+    if name.startswith(".") and name[1:] in excluded:
+        return True
+    return os.path.splitext(name)[1][1:] in excluded
+
+
+def lexer_module(name, lexers):
+    # module for extension ("x.pc") or name of dotfiles (".hackerman"), or None
+    module = lexers.get(os.path.splitext(name)[1][1:])
+    if module is None and name.startswith("."):
+        module = lexers.get(name[1:])
+    return module
+
+
+def find_files(root, exclude=(), lexers=None):
+    # [(path, module)] for files under root with a lexer for their extension or dotfile name
+    excluded = exclude_set(exclude)
+    lexers = LEXERS if lexers is None else lexers
+    files = []
+
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = sorted(name for name in dirs if not is_excluded(name, excluded))
+
+        for name in sorted(names):
+            if is_excluded(name, excluded):
+                continue
+
+            module = lexer_module(name, lexers)
+            if module is not None:
+                files.append((os.path.join(directory, name), module))
+
+    return files
+
+
+class FileTokens(object):
+    # tokens of one file as columns, kinds index into styles
+
+    __slots__ = ("path", "styles", "kinds", "starts", "lengths", "error")
+
+    def __init__(self, path, styles=(), kinds=None, starts=None, lengths=None, error=None):
+        self.path = path
+        self.styles = styles
+        self.kinds = array("B") if kinds is None else kinds
+        self.starts = array("i") if starts is None else starts
+        self.lengths = array("i") if lengths is None else lengths
+        self.error = error
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __repr__(self):
+        return "FileTokens(%r, %d tokens%s)" % (self.path, len(self), ", error=%r" % self.error if self.error else "")
+
+    def to_list(self, text):
+        # (style, start, lexeme) tuples, text is the file content
+        return [(self.styles[kind], start, text[start:start + length]) for kind, start, length in zip(self.kinds, self.starts, self.lengths)]
+
+
+# worker process
+
+_lexers = {} # module -> Lexer, per worker
+
+
+def _lexer(module):
+    lexer = _lexers.get(module)
+    if lexer is None:
+        lexer = _lexers[module] = importlib.import_module(module).Lexer()
+    return lexer
+
+
+def _columns(lexer, text):
+    # (styles, kinds, starts, lengths) with tokenize_compact if the lexer has it
+    if hasattr(lexer, "tokenize_compact"):
+        tokens = lexer.tokenize_compact(text)
+        return (tokens.styles,) + tokens.arrays()
+
+    styles = {}
+    kinds = array("B")
+    starts = array("i")
+    lengths = array("i")
+    for style, start, lexeme in lexer.tokenize(text):
+        kinds.append(styles.setdefault(style, len(styles)))
+        starts.append(start)
+        lengths.append(len(lexeme))
+    return tuple(styles), kinds, starts, lengths
+
+
+def _tokenize_chunk(files):
+    # tokenize files into one shared memory block, returns (block name, [(path, styles, count, error)])
+    #
+    # errors are per file, so a lexer module that is not built here (or raises)
+    # fails only its files
+    found = []
+    for path, module in files:
+        try:
+            if os.path.getsize(path) > MAX_FILE_SIZE:
+                raise ValueError("file larger than %d bytes" % MAX_FILE_SIZE)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            found.append((path, _columns(_lexer(module), text), None))
+        except Exception as e: # OSError, UnicodeDecodeError, ImportError, lexer errors
+            found.append((path, ((), array("B"), array("i"), array("i")), "%s: %s" % (type(e).__name__, e)))
+
+    total = sum(len(columns[1]) for _, columns, _ in found)
+    block = shared_memory.SharedMemory(create=True, size=max(1, 9 * total))
+    try:
+        offset = 0
+        for _, (_, kinds, starts, lengths), _ in found:
+            count = len(kinds)
+            block.buf[4 * offset:4 * (offset + count)] = starts.tobytes()
+            block.buf[4 * (total + offset):4 * (total + offset + count)] = lengths.tobytes()
+            block.buf[8 * total + offset:8 * total + offset + count] = kinds.tobytes()
+            offset += count
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+
+    # parent unlinks the block, don't let this worker's tracker claim it too
+    resource_tracker.unregister(block._name, "shared_memory")
+    block.close()
+    return block.name, [(path, columns[0], len(columns[1]), error) for path, columns, error in found]
+
+
+# parent process
+
+def _collect(name, files):
+    # FileTokens from a chunk's shared memory block (block is unlinked)
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        total = sum(count for _, _, count, _ in files)
+        results = []
+        offset = 0
+        for path, styles, count, error in files:
+            starts = array("i", bytes(block.buf[4 * offset:4 * (offset + count)]))
+            lengths = array("i", bytes(block.buf[4 * (total + offset):4 * (total + offset + count)]))
+            kinds = array("B", bytes(block.buf[8 * total + offset:8 * total + offset + count]))
+            results.append(FileTokens(path, styles, kinds, starts, lengths, error))
+            offset += count
+        return results
+    finally:
+        block.close()
+        block.unlink()
+
+
+def tokenize_project(root, exclude=(), lexers=None, max_workers=None, chunk_files=CHUNK_FILES, on_progress=None, cancel=None):
+    # FileTokens for every file under root with a lexer (LEXERS by extension), in completion order
+    #
+    # exclude     : file_types_to_exclude value or iterable of types
+    # on_progress : called with (done, total) files after each chunk
+    # cancel      : event (anything with is_set()), pending chunks are dropped once set
+    files = find_files(root, exclude, lexers)
+    total = len(files)
+    done = 0
+
+    if on_progress is not None:
+        on_progress(0, total)
+    if total == 0:
+        return
+
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    pending = { pool.submit(_tokenize_chunk, files[i:i + chunk_files]) for i in range(0, total, chunk_files) }
+
+    try:
+        while pending:
+            if cancel is not None and cancel.is_set():
+                return
+
+            finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            results = []
+            for future in finished:
+                pending.discard(future)
+                results.extend(_collect(*future.result()))
+
+            if results:
+                done += len(results)
+                if on_progress is not None:
+                    on_progress(done, total)
+
+            for result in results:
+                if cancel is not None and cancel.is_set():
+                    return
+                yield result
+    finally:
+        # drop queued chunks, free blocks of chunks that finish anyway
+        pool.shutdown(wait=True, cancel_futures=True)
+        for future in pending:
+            if not future.cancelled() and future.exception() is None:
+                _collect(*future.result())
@@ -0,0 +1,73 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compare two benchmark reports (see bench/run.py)
+#
+#   python -m bench.compare old.json new.json --threshold 0.1
+#
+# Exits with status 1 if any (target, size) present in both reports lost more
+# than threshold of its MB/s, so it can gate a release.
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return { (result["target"], result["size"]): result for result in report["results"] }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.compare", description="Compare tokenizer benchmark reports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative MB/s loss (default 0.1)")
+    args = parser.parse_args(argv)
+
+    old = load(args.old)
+    new = load(args.new)
+    regressions = 0
+
+    for key in sorted(old.keys() & new.keys()):
+        before = old[key]["mb_per_sec"]
+        after = new[key]["mb_per_sec"]
+        if not before or not after:
+            continue
+
+        ratio = after / before
+        status = ""
+        if ratio < 1.0 - args.threshold:
+            status = "REGRESSION"
+            regressions += 1
+
+        print("%-24s %-6s %9.2f -> %9.2f MB/s  x%.2f  %s" % (key[0], key[1], before, after, ratio, status))
+
+    for key in sorted(old.keys() - new.keys()):
+        print("%-24s %-6s missing in new report" % key)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
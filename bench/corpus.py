@@ -0,0 +1,299 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Synthetic corpora for tokenizer benchmarks
+
+# Each generator returns one block of source (one or more complete lines) drawn
+# from rng, so the same (language, size, seed) always gives the same text. A
+# small share of blocks carries non-ASCII text to keep the utf-8 paths honest.
+
+import random
+
+SIZES = ("1KB", "10KB", "100KB", "1MB", "10MB", "100MB")
+
+WORDS = (
+    "alpha", "beta", "gamma", "delta", "buffer", "cursor", "window", "editor",
+    "token", "lexer", "value", "count", "index", "result", "config", "theme",
+    "line", "column", "offset", "style", "render", "update", "cache", "state",
+)
+UNICODE_WORDS = ("café", "naïve", "Größe", "привет", "日本語", "emoji 🚀", "λ")
+
+
+def word(rng):
+    return rng.choice(WORDS)
+
+def phrase(rng, low=2, high=7):
+    words = [word(rng) for _ in range(rng.randint(low, high))]
+    if rng.random() < 0.05:
+        words.append(rng.choice(UNICODE_WORDS))
+    return " ".join(words)
+
+def ident(rng):
+    return "_".join(word(rng) for _ in range(rng.randint(1, 3)))
+
+
+# DSCL (hackerman.pyx)
+
+DSCL_SECTIONS = ("license", "editor", "ui", "terminal", "models")
+DSCL_KEYS = (
+    ("font", lambda rng: rng.choice(("Menlo", "Fira_Code", "JetBrains_Mono"))),
+    ("font_weight", lambda rng: rng.choice(("light", "normal", "medium", "bold"))),
+    ("font_size", lambda rng: str(rng.randint(8, 32))),
+    ("tab_width", lambda rng: str(rng.choice((2, 4, 8)))),
+    ("theme", lambda rng: rng.choice(("dark", "light", "solarized"))),
+    ("auto_indent", lambda rng: rng.choice(("true", "false"))),
+    ("show_minimap", lambda rng: rng.choice(("true", "false"))),
+    ("window_opacity", lambda rng: "%.2f" % rng.random()),
+    ("eol_mode", lambda rng: rng.choice(("lf", "crlf", "cr"))),
+    ("file_types_to_exclude", lambda rng: ",".join(rng.sample(("pyc", "so", "o", "git", "DS_Store"), 3))),
+    ("file_explorer_root", lambda rng: "~/" + "/".join(word(rng) for _ in range(2))),
+    ("vertical_rulers", lambda rng: ",".join(str(rng.choice((80, 100, 120))) for _ in range(2))),
+    ("unsaved_symbol", lambda rng: rng.choice(("*", "•"))),
+    ("ollama", lambda rng: rng.choice(("llama3", "mistral"))),
+    ("not_a_setting", lambda rng: word(rng)),
+)
+
+def dscl(rng):
+    lines = ["", "[%s]" % rng.choice(DSCL_SECTIONS)]
+    for _ in range(rng.randint(3, 10)):
+        r = rng.random()
+        if r < 0.15:
+            lines.append("-- " + phrase(rng))
+        else:
+            key, value = rng.choice(DSCL_KEYS)
+            line = "%s %s" % (key, value(rng))
+            if r > 0.85:
+                line += " -- " + phrase(rng, 1, 4)
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+# PlayCode (pc.pyx)
+
+def playcode(rng):
+    name = ident(rng)
+    lines = ["@" + name.replace("_", "")]
+    for _ in range(rng.randint(2, 8)):
+        r = rng.random()
+        if r < 0.15:
+            lines.append("-- " + phrase(rng))
+        elif r < 0.35:
+            lines.append("if %s > %d -> print \"%s\"" % (word(rng), rng.randint(0, 99), phrase(rng)))
+        elif r < 0.5:
+            lines.append("while %s < %d -> %s = %s + 1" % (word(rng), rng.randint(1, 999), word(rng), word(rng)))
+        elif r < 0.6:
+            lines.append("swap %s %s" % (word(rng), word(rng)))
+        elif r < 0.75:
+            lines.append("%s = %s" % (word(rng), rng.choice(("True", "False"))))
+        else:
+            lines.append("    %s = %s * %.1f - %d / 2" % (word(rng), word(rng), rng.random() * 100, rng.randint(1, 50)))
+    return "\n".join(lines) + "\n\n"
+
+
+# Odin (_odin.pyx, odin_tokenizer)
+
+ODIN_TYPES = ("i32", "i64", "f32", "f64", "int", "bool", "string", "u8", "rune")
+
+def odin(rng):
+    r = rng.random()
+    if r < 0.1:
+        return "package %s\n\nimport \"core:fmt\"\nimport \"core:strings\"\n\n" % word(rng)
+    if r < 0.25:
+        fields = "".join("    %s: %s,\n" % (ident(rng), rng.choice(ODIN_TYPES)) for _ in range(rng.randint(2, 6)))
+        return "%s :: struct {\n%s}\n\n" % (ident(rng).title(), fields)
+    if r < 0.35:
+        return "/*\n    %s\n    %s\n*/\n" % (phrase(rng), phrase(rng))
+
+    body = []
+    for _ in range(rng.randint(2, 8)):
+        s = rng.random()
+        if s < 0.2:
+            body.append("    // " + phrase(rng))
+        elif s < 0.4:
+            body.append("    %s : %s = %d" % (ident(rng), rng.choice(ODIN_TYPES), rng.randint(0, 1 << 16)))
+        elif s < 0.55:
+            body.append("    for i in 0..<%d { fmt.println(\"%s\", i) }" % (rng.randint(1, 100), phrase(rng)))
+        elif s < 0.7:
+            body.append("    if %s == %s { return %.3f }" % (word(rng), rng.choice(("true", "false", "nil")), rng.random()))
+        elif s < 0.8:
+            body.append("    %s := '%s'" % (word(rng), rng.choice("abcxyz")))
+        else:
+            body.append("    %s += %s(%s) * %d" % (word(rng), ident(rng), word(rng), rng.randint(1, 9)))
+
+    attribute = "@(test)\n" if rng.random() < 0.1 else ""
+    params = ", ".join("%s: %s" % (word(rng), rng.choice(ODIN_TYPES)) for _ in range(rng.randint(0, 3)))
+    return "%s%s :: proc(%s) -> %s {\n%s\n}\n\n" % (attribute, ident(rng), params, rng.choice(ODIN_TYPES), "\n".join(body))
+
+
+# Python (_py.py)
+
+def python(rng):
+    r = rng.random()
+    if r < 0.1:
+        return "import %s\nfrom %s import %s, %s\n\n" % (word(rng), word(rng), word(rng), ident(rng))
+    if r < 0.25:
+        methods = "".join(
+            "    def %s(self, %s=%d):\n        return self.%s + %s\n\n" % (ident(rng), word(rng), rng.randint(0, 9), word(rng), word(rng))
+            for _ in range(rng.randint(1, 3))
+        )
+        return "class %s(%s):\n    \"\"\"%s\"\"\"\n\n%s\n" % (ident(rng).title().replace("_", ""), rng.choice(("object", "dict", "Exception")), phrase(rng), methods)
+
+    body = []
+    for _ in range(rng.randint(2, 8)):
+        s = rng.random()
+        if s < 0.15:
+            body.append("    # " + phrase(rng))
+        elif s < 0.3:
+            body.append("    %s = %s" % (word(rng), rng.choice(("0x1F", "3.14", "1e-3", "42", "0b101", "2j", "1_000"))))
+        elif s < 0.45:
+            body.append("    %s = f\"%s {%s!r} %s\"" % (word(rng), word(rng), word(rng), phrase(rng, 1, 3)))
+        elif s < 0.6:
+            body.append("    for %s in range(%d):\n        %s(%s, '%s')" % (word(rng), rng.randint(1, 99), ident(rng), word(rng), word(rng)))
+        elif s < 0.75:
+            body.append("    if %s is not None and %s:\n        return %s" % (word(rng), word(rng), rng.choice(("True", "False", "None"))))
+        else:
+            body.append("    %s = [%s for %s in %s if %s]" % (word(rng), word(rng), word(rng), word(rng), word(rng)))
+
+    decorator = "@%s\n" % word(rng) if rng.random() < 0.2 else ""
+    params = ", ".join(word(rng) for _ in range(rng.randint(0, 4)))
+    return "%sdef %s(%s):\n%s\n\n" % (decorator, ident(rng), params, "\n".join(body))
+
+
+# TOML (toml.py)
+
+def toml(rng):
+    r = rng.random()
+    if r < 0.15:
+        header = "[[%s]]" % word(rng)
+    else:
+        header = "[%s.%s]" % (word(rng), word(rng))
+
+    lines = ["", header]
+    for _ in range(rng.randint(2, 8)):
+        s = rng.random()
+        key = ident(rng)
+        if s < 0.1:
+            lines.append("# " + phrase(rng))
+        elif s < 0.3:
+            lines.append("%s = \"%s\"" % (key, phrase(rng)))
+        elif s < 0.45:
+            lines.append("%s = %s" % (key, rng.choice(("42", "-17", "3.1415", "6.626e-34", "0xDEADBEEF", "inf", "1_000_000"))))
+        elif s < 0.55:
+            lines.append("%s = %s" % (key, rng.choice(("true", "false"))))
+        elif s < 0.65:
+            lines.append("%s = [ %s ]" % (key, ", ".join(str(rng.randint(0, 999)) for _ in range(rng.randint(1, 6)))))
+        elif s < 0.75:
+            lines.append("%s = { %s = \"%s\", %s = %d }" % (key, word(rng), word(rng), word(rng), rng.randint(0, 99)))
+        elif s < 0.85:
+            lines.append("%s.%s = %s" % (word(rng), word(rng), rng.choice(("1979-05-27T07:32:00Z", "1979-05-27", "07:32:00"))))
+        else:
+            lines.append("%s = \"\"\"\n%s\n%s\"\"\"" % (key, phrase(rng), phrase(rng)))
+    return "\n".join(lines) + "\n"
+
+
+# Todo (todo.pyx, py_todo.py) and Scratch Pad (scrpd.pyx)
+
+def todo_line(rng):
+    r = rng.random()
+    if r < 0.1:
+        return "\n# " + phrase(rng).title()
+    if r < 0.3:
+        return "+ " + phrase(rng)
+    if r < 0.55:
+        return "- " + phrase(rng)
+    if r < 0.65:
+        return "- [x] " + phrase(rng)
+    if r < 0.75:
+        return "* " + phrase(rng)
+    if r < 0.85:
+        return "    - " + phrase(rng)
+    return phrase(rng, 4, 12)
+
+def todo(rng):
+    return "\n".join(todo_line(rng) for _ in range(rng.randint(3, 8))) + "\n"
+
+def scratchpad(rng):
+    lines = []
+    for _ in range(rng.randint(3, 8)):
+        r = rng.random()
+        if r < 0.1:
+            lines.append(">> %s -%s %s" % (rng.choice(("ls", "git", "grep", "python")), rng.choice("lav"), word(rng)))
+        elif r < 0.2:
+            lines.append("%% " + phrase(rng, 4, 10))
+        else:
+            lines.append(todo_line(rng))
+    return "\n".join(lines) + "\n"
+
+
+# Super Text (stxt.pyx, txt.pyx, _txt.py)
+
+def super_text(rng):
+    lines = []
+    for _ in range(rng.randint(2, 6)):
+        r = rng.random()
+        if r < 0.1:
+            lines.append("sh: %s %s" % (rng.choice(("ls -la", "git status", "make", "echo")), word(rng)))
+        elif r < 0.2:
+            lines.append("> " + phrase(rng, 6, 16))
+        else:
+            lines.append(phrase(rng, 6, 16) + ".")
+    return "\n".join(lines) + "\n\n"
+
+
+LANGUAGES = {
+    "dscl": dscl,
+    "playcode": playcode,
+    "odin": odin,
+    "python": python,
+    "toml": toml,
+    "todo": todo,
+    "scratchpad": scratchpad,
+    "super_text": super_text,
+}
+
+
+def parse_size(size):
+    # "1KB", "10MB", "512" (bytes) -> int
+    size = str(size).strip().upper()
+    for suffix, scale in (("KB", 1 << 10), ("MB", 1 << 20), ("GB", 1 << 30), ("B", 1)):
+        if size.endswith(suffix):
+            return int(float(size[:-len(suffix)]) * scale)
+    return int(size)
+
+
+def generate(language, size, seed=0):
+    # text of at most size utf-8 bytes (whole blocks only, so lines are never cut)
+    block = LANGUAGES[language]
+    rng = random.Random("%s:%d" % (language, seed))
+    limit = parse_size(size)
+    parts = []
+    total = 0
+
+    while True:
+        part = block(rng)
+        part_size = len(part.encode("utf-8"))
+        if total + part_size > limit:
+            break
+        parts.append(part)
+        total += part_size
+
+    return "".join(parts)
@@ -0,0 +1,90 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Per-line cost of DSCL value validation
+#
+#   python -m bench.dscl_validation [--build-dir DIR] [--lines N] [--out FILE]
+#
+# Tokenizes blocks of `name value` lines where every line exercises one value
+# type of ACCEPTED_NAMES in hackerman.pyx, and reports nanoseconds per line
+# (best of --repeat). Path values are left out, see PathCache.
+
+import argparse
+import json
+import sys
+import time
+
+from bench.run import ROOT, load_target
+
+CASES = {
+    "int":          ("font_size", ("12", "x12", "1_000", "-4")),
+    "float":        ("window_opacity", ("0.85", "1e-3", ".5", "0.8x")),
+    "bool":         ("auto_indent", ("true", "False", "yes")),
+    "choice":       ("font_weight", ("bold", "light", "heavy")),
+    "name":         ("font", ("Fira Code", "JetBrains Mono", "Menlo?")),
+    "list":         ("file_types_to_exclude", ("pyc,so,o", "pyc")),
+    "max_len":      ("unsaved_symbol", ("*", "**")),
+    "unknown_name": ("not_a_setting", ("value",)),
+    "comment":      ("font_size", ("14 -- default size",)),
+}
+
+
+def block(name, values, lines):
+    return "".join("%s %s\n" % (name, values[i % len(values)]) for i in range(lines))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.dscl_validation", description="Per-line cost of DSCL value validation")
+    parser.add_argument("--build-dir", action="append", help="dir with built hackerman module (default: repo root)")
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    tokenize = load_target("hackerman.pyx", args.build_dir or [ROOT])
+    results = {}
+
+    for case, (name, values) in CASES.items():
+        text = block(name, values, args.lines)
+        best = None
+
+        for _ in range(args.repeat):
+            start = time.perf_counter_ns()
+            tokenize(text)
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        results[case] = best / args.lines
+        print("%-14s %8.1f ns/line" % (case, results[case]), file=sys.stderr)
+
+    report = { "lines": args.lines, "repeat": args.repeat, "ns_per_line": results }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
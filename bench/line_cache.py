@@ -0,0 +1,170 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+
+# Per-line token cache (LineCache in lexer_core.pyx) against full scans
+#
+#   python -m bench.line_cache [--build-dir DIR] [--lines N] [--edits N] [--fuzz N] [--out FILE]
+#
+# For each lexer with tokenize_cached, a buffer of about --lines lines (see
+# bench/corpus.py) is tokenized once to fill the cache, then one random line is
+# edited at a time and the buffer tokenized again with tokenize_cached and
+# tokenize_compact. Both must give the same tokens and outline symbols, also on
+# random texts (and edits of them) with a cache small enough to evict all the
+# time. Reports the median time of both per edit. Exits with status 1 if
+# anything differs.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from bench.corpus import generate
+from bench.run import ROOT, load_target
+
+# target : (corpus, chars for random texts)
+TARGETS = {
+    "hackerman.pyx": ("dscl", "[]-=\"' abc_.0123/~\n\t"),
+    "pc.pyx": ("playcode", "-->=!+*/<@\"0123456789._aZ if True\n\t"),
+    "playcode_lexer.pyx": ("playcode", "-->=!+*/<@\"0123456789._aZ if True\n\t"),
+    "scrpd.pyx": ("scratchpad", ">>%%#+-*[] ab\n\t"),
+    "scratchpad_lexer.pyx": ("scratchpad", ">>%%#+-*[] ab\n\t"),
+    "todo.pyx": ("todo", "#+-*[] ab\n\t"),
+}
+
+FUZZ_CACHE_BYTES = 4096
+
+
+def random_text(rng, chars):
+    return "".join(rng.choice(chars) for _ in range(rng.randint(0, 80)))
+
+
+def splice(rng, text, chars):
+    # text with a random run replaced by random chars
+    start = rng.randint(0, len(text))
+    end = rng.randint(start, min(len(text), start + 8))
+    return text[:start] + "".join(rng.choice(chars) for _ in range(rng.randint(0, 8))) + text[end:]
+
+
+def same(a, b):
+    return a.arrays() == b.arrays() and a.symbols() == b.symbols()
+
+
+def corpus(language, lines, seed):
+    # generated text of at least lines lines (or what the generator gives for 64MB)
+    size = 64
+    while True:
+        text = generate(language, "%dKB" % size, seed)
+        if text.count("\n") >= lines or size >= 64 << 10:
+            return text
+        size *= 2
+
+
+def edit(rng, text):
+    # text with one random line replaced by a shuffled copy of itself
+    starts = [0] + [i + 1 for i, ch in enumerate(text) if ch == "\n" and i + 1 < len(text)]
+    index = rng.randrange(len(starts))
+    start = starts[index]
+    end = text.find("\n", start)
+    end = len(text) if end < 0 else end
+    line = list(text[start:end])
+    rng.shuffle(line)
+    return text[:start] + "".join(line) + text[end:]
+
+
+def timed(tokenize, text):
+    start = time.perf_counter_ns()
+    tokens = tokenize(text)
+    return tokens, (time.perf_counter_ns() - start) / 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.line_cache", description="Per-line token cache against full scans")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--lines", type=int, default=100000, help="lines in the edited buffer (default 100000)")
+    parser.add_argument("--edits", type=int, default=20, help="one-line edits per target (default 20)")
+    parser.add_argument("--fuzz", type=int, default=5000, help="random texts per target (default 5000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    rng = random.Random(args.seed)
+    report = { "lines": args.lines, "edits": args.edits, "fuzz": args.fuzz, "targets": {} }
+    failed = False
+
+    for name, (language, chars) in TARGETS.items():
+        lexer = load_target(name, build_dirs).__self__
+        cache_type = type(lexer.line_cache)
+        text = corpus(language, args.lines, args.seed)
+        mismatches = []
+
+        lexer.line_cache = cache_type()
+        lexer.tokenize_cached(text)
+        cached_times = []
+        compact_times = []
+
+        for _ in range(args.edits):
+            text = edit(rng, text)
+            cached, seconds = timed(lexer.tokenize_cached, text)
+            cached_times.append(seconds)
+            compact, seconds = timed(lexer.tokenize_compact, text)
+            compact_times.append(seconds)
+            if not same(cached, compact):
+                mismatches.append({ "text": "edited corpus" })
+
+        lexer.line_cache = cache_type(FUZZ_CACHE_BYTES)
+        for _ in range(args.fuzz):
+            sample = random_text(rng, chars)
+            for sample in (sample, splice(rng, sample, chars)):
+                if not same(lexer.tokenize_cached(sample), lexer.tokenize_compact(sample)):
+                    mismatches.append({ "text": sample })
+
+        for mismatch in mismatches:
+            print("%s : tokenize_cached differs (%r)" % (name, mismatch["text"][:200]), file=sys.stderr)
+
+        results = {
+            "lines": text.count("\n"),
+            "cached_seconds": statistics.median(cached_times),
+            "compact_seconds": statistics.median(compact_times),
+        }
+        print("%-24s %7d lines   cached %8.4f s   compact %8.4f s   %5.1fx, %d differ" % (
+            name, results["lines"], results["cached_seconds"], results["compact_seconds"],
+            results["compact_seconds"] / results["cached_seconds"], len(mismatches)), file=sys.stderr)
+
+        report["targets"][name] = { "mismatches": mismatches[:20], "results": results }
+        failed = failed or bool(mismatches)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+
+# Line-sharded tokenize_parallel against tokenize
+#
+#   python -m bench.parallel [--build-dir DIR] [--size 4MB] [--workers N] [--fuzz N] [--repeat N] [--out FILE]
+#
+# tokenize_parallel splits a text at line starts and scans the shards on a
+# thread pool (see scan_parallel in lexer_core.pyx). It must give the same
+# tokens and outline symbols as tokenize. This is checked on a generated corpus
+# (see bench/corpus.py) with 2 to 8 workers, and on random texts split with no
+# size threshold, so shards also start inside strings and comments. Then
+# tokenize_compact and tokenize_parallel(compact=True) are timed. Exits with
+# status 1 if anything differs.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from bench.corpus import generate
+from bench.run import ROOT, load_target
+
+# target : (corpus, chars for random texts)
+TARGETS = {
+    "hackerman.pyx": ("dscl", "[]-=\"' abc_.0123/~\n\t"),
+    "pc.pyx": ("playcode", "-->=!+*/<@\"0123456789._aZ if True\n\t"),
+}
+
+WORKERS = (2, 3, 4, 8)
+
+
+def random_text(rng, chars):
+    return "".join(rng.choice(chars) for _ in range(rng.randint(0, 200)))
+
+
+def same(lexer, text, workers, threshold):
+    parallel = lexer.tokenize_parallel(text, workers, threshold, compact=True)
+    return parallel.to_list() == lexer.tokenize(text) and parallel.symbols() == lexer.tokenize_compact(text).symbols()
+
+
+def best_time(tokenize, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.parallel", description="Line-sharded tokenize_parallel against tokenize")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--size", default="4MB", help="corpus size (default 4MB)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="workers for timing (default os.cpu_count())")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fuzz", type=int, default=5000, help="random texts per target (default 5000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    rng = random.Random(args.seed)
+    report = { "size": args.size, "workers": args.workers, "fuzz": args.fuzz, "targets": {} }
+    failed = False
+
+    for name, (language, chars) in TARGETS.items():
+        lexer = load_target(name, build_dirs).__self__
+        text = generate(language, args.size, args.seed)
+        mismatches = []
+
+        for workers in WORKERS:
+            if not same(lexer, text, workers, 0):
+                mismatches.append({ "text": "corpus", "workers": workers })
+
+        for _ in range(args.fuzz):
+            sample = random_text(rng, chars)
+            workers = rng.choice(WORKERS)
+            if not same(lexer, sample, workers, 0):
+                mismatches.append({ "text": sample, "workers": workers })
+
+        for mismatch in mismatches:
+            print("%s : tokenize_parallel differs with %d workers (%r)" % (name, mismatch["workers"], mismatch["text"][:200]), file=sys.stderr)
+
+        results = {}
+        for method, tokenize in (("compact", lexer.tokenize_compact), ("parallel", lambda text: lexer.tokenize_parallel(text, args.workers, compact=True))):
+            seconds = best_time(tokenize, text, args.repeat)
+            results[method] = { "seconds": seconds, "mb_per_sec": len(text.encode("utf-8")) / 1e6 / seconds }
+
+        print("%-12s compact %8.2f MB/s   parallel (%d workers) %8.2f MB/s, %d differ" % (
+            name, results["compact"]["mb_per_sec"], args.workers, results["parallel"]["mb_per_sec"], len(mismatches)), file=sys.stderr)
+
+        report["targets"][name] = { "mismatches": mismatches[:20], "results": results }
+        failed = failed or bool(mismatches)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python tokenizers on the CPython standard library
+#
+#   python -m bench.py_stdlib [--build-dir DIR] [--stdlib DIR] [--repeat N] [--out FILE]
+#
+# Tokenizes every .py file of the stdlib (of the running interpreter unless
+# --stdlib is given) with experiments/_py.py and the compiled _py.pyx, checks
+# that both give the same tokens and reports MB/s (best of --repeat per file,
+# summed) and the speedup. Files that are not utf-8 are left out.
+
+import argparse
+import json
+import os
+import sys
+import sysconfig
+import time
+
+from bench.run import ROOT, load_target
+
+TARGETS = ("_py.py", "_py.pyx", "_py.pyx:compact")
+
+
+def find_sources(root):
+    sources = []
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = sorted(name for name in dirs if name not in ("site-packages", "__pycache__"))
+        for name in sorted(names):
+            if name.endswith(".py"):
+                try:
+                    with open(os.path.join(directory, name), encoding="utf-8") as f:
+                        sources.append((os.path.join(directory, name), f.read()))
+                except (OSError, ValueError):
+                    pass
+    return sources
+
+
+def best_time(tokenize, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.py_stdlib", description="Python tokenizers on the CPython standard library")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--stdlib", default=sysconfig.get_path("stdlib"), help="dir with .py files (default: stdlib of this interpreter)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    sources = find_sources(args.stdlib)
+    n_bytes = sum(len(text.encode("utf-8")) for _, text in sources)
+    print("%d files, %.1f MB" % (len(sources), n_bytes / 1e6), file=sys.stderr)
+
+    tokenizers = { name: load_target(name, build_dirs) for name in TARGETS }
+    reference = tokenizers["_py.py"]
+    compiled = tokenizers["_py.pyx"]
+
+    mismatches = [path for path, text in sources if reference(text) != compiled(text)]
+    for path in mismatches:
+        print("tokens differ : %s" % path, file=sys.stderr)
+
+    results = {}
+    for name, tokenize in tokenizers.items():
+        seconds = sum(best_time(tokenize, text, args.repeat) for _, text in sources) / 1e9
+        results[name] = { "seconds": seconds, "mb_per_sec": n_bytes / 1e6 / seconds }
+        print("%-16s %8.2f s %9.2f MB/s  x%.1f" % (name, seconds, results[name]["mb_per_sec"], results["_py.py"]["seconds"] / seconds), file=sys.stderr)
+
+    report = {
+        "stdlib": args.stdlib,
+        "files": len(sources),
+        "bytes": n_bytes,
+        "repeat": args.repeat,
+        "mismatches": mismatches,
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
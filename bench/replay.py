@@ -0,0 +1,114 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Replay a flight recorder dump (see flight.py)
+#
+#   python -m bench.replay flight.json [--build-dir DIR] [--min-time 1.0] [--out FILE]
+#
+# Every recorded call with its text is timed again with the same lexer module
+# and method (as the matching bench.run target), e.g. to check a fix against
+# the inputs that stalled in the field. Entries recorded without text, or for
+# modules that have no target, are listed under "skipped".
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from bench.run import ROOT, TARGETS, measure
+
+
+def target_for(module, method):
+    # bench.run target of a compiled module and entry point, or None
+    for name, (_, _, module_name, file_name, entry) in TARGETS.items():
+        if file_name is None and module_name == module and entry == method:
+            return name
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.replay", description="Replay a flight recorder dump")
+    parser.add_argument("dump", help="json written by FlightRecorder.dump")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--corpus-dir", help="where replayed texts are written (default: temp dir)")
+    parser.add_argument("--min-calls", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds of timed calls per entry")
+    parser.add_argument("--max-calls", type=int, default=1000)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    cache_dir = args.corpus_dir or os.path.join(tempfile.gettempdir(), "tokenizers-replay")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    with open(args.dump, encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+
+    report = { "dump": args.dump, "results": [], "skipped": [] }
+
+    for index, entry in enumerate(entries):
+        target = target_for(entry["module"], entry["method"])
+        if entry.get("text") is None or target is None:
+            reason = "text not recorded" if entry.get("text") is None else "no target for %s.%s" % (entry["module"], entry["method"])
+            report["skipped"].append({ "entry": index, "fingerprint": entry["fingerprint"], "reason": reason })
+            continue
+
+        path = os.path.join(cache_dir, "%s.txt" % entry["fingerprint"])
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(entry["text"])
+
+        try:
+            result = measure(target, path, build_dirs, args.min_calls, args.min_time, args.max_calls)
+        except (ImportError, OSError, AttributeError) as e:
+            report["skipped"].append({ "entry": index, "fingerprint": entry["fingerprint"], "reason": "%s: %s" % (type(e).__name__, e) })
+            continue
+
+        result = {
+            "entry": index,
+            "target": target,
+            "fingerprint": entry["fingerprint"],
+            "recorded_ms": entry["seconds"] * 1e3,
+            "recorded_tokens": entry["tokens"],
+            **result,
+        }
+        report["results"].append(result)
+
+        print("%-4d %-24s %s %10d chars  recorded %9.3f ms  p50 %9.3f ms  p99 %9.3f ms%s" % (
+            index, target, entry["fingerprint"], result["chars"], result["recorded_ms"], result["p50_ms"], result["p99_ms"],
+            "" if result["tokens"] == entry["tokens"] else "  tokens %d -> %d" % (entry["tokens"], result["tokens"]),
+        ), file=sys.stderr)
+
+    for skipped in report["skipped"]:
+        print("%-4d skipped : %s" % (skipped["entry"], skipped["reason"]), file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
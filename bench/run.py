@@ -0,0 +1,321 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Tokenizer throughput benchmarks
+#
+#   python -m bench.run                           # all targets, 1KB .. 1MB, json to stdout
+#   python -m bench.run --sizes 1KB,100MB --out bench.json
+#   python -m bench.run --targets hackerman.pyx,_odin.pyx --build-dir build/
+#
+# Every (target, size) runs in a fresh interpreter so peak RSS belongs to that
+# run only. Targets that cannot be loaded here (not built, no Odin library, ...)
+# are reported under "skipped" instead of failing the run.
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.corpus import LANGUAGES, SIZES, generate, parse_size
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = SIZES[:4] # 1KB .. 1MB, larger sizes on request
+
+# name : (corpus, implementation, module, file, entry point)
+#
+# compiled modules are looked up by name in the build dirs, python files are
+# loaded from file (experiments/pc.py and pc.so share a module name)
+TARGETS = {
+    "hackerman.pyx":            ("dscl",        "cython", "hackerman",      None,                           "tokenize"),
+    "hackerman.pyx:compact":    ("dscl",        "cython", "hackerman",      None,                           "tokenize_compact"),
+    "_hackerman.py":            ("dscl",        "ctypes", None,             "experiments/_hackerman.py",    "tokenize"),
+    "pc.pyx":                   ("playcode",    "cython", "pc",             None,                           "tokenize"),
+    "pc.pyx:compact":           ("playcode",    "cython", "pc",             None,                           "tokenize_compact"),
+    "pc.py":                    ("playcode",    "ctypes", None,             "experiments/pc.py",            "tokenize"),
+    "_odin.pyx":                ("odin",        "cython", "_odin",          None,                           "tokenize"),
+    "_odin.pyx:compact":        ("odin",        "cython", "_odin",          None,                           "tokenize_compact"),
+    "_odin.py":                 ("odin",        "ctypes", None,             "experiments/_odin.py",         "tokenize"),
+    "_odin_tokenizer.c":        ("odin",        "c",      "odin_tokenizer", None,                           "tokenize"),
+    "_odin_tokenizer.c:file":   ("odin",        "c",      "odin_tokenizer", None,                           "tokenize_file"),
+    "_py.pyx":                  ("python",      "cython", "_py",            None,                           "tokenize"),
+    "_py.pyx:compact":          ("python",      "cython", "_py",            None,                           "tokenize_compact"),
+    "_py.py":                   ("python",      "python", None,             "experiments/_py.py",           "tokenize"),
+    "toml.pyx":                 ("toml",        "cython", "toml",           None,                           "tokenize"),
+    "toml.pyx:compact":         ("toml",        "cython", "toml",           None,                           "tokenize_compact"),
+    "toml.py":                  ("toml",        "python", None,             "experiments/toml.py",          "tokenize"),
+    "todo.pyx":                 ("todo",        "cython", "todo",           None,                           "tokenize"),
+    "py_todo.py":               ("todo",        "python", None,             "experiments/py_todo.py",       "tokenize"),
+    "playcode_lexer.pyx":       ("playcode",    "cython", "playcode_lexer", None,                           "tokenize"),
+    "playcode_lexer.pyx:compact": ("playcode",  "cython", "playcode_lexer", None,                           "tokenize_compact"),
+    "odin_lexer.pyx":           ("odin",        "cython", "odin_lexer",     None,                           "tokenize"),
+    "scrpd.pyx":                ("scratchpad",  "cython", "scrpd",          None,                           "tokenize"),
+    "scratchpad_lexer.pyx":     ("scratchpad",  "cython", "scratchpad_lexer", None,                         "tokenize"),
+    "stxt.pyx":                 ("super_text",  "cython", "stxt",           None,                           "tokenize"),
+    "txt.pyx":                  ("super_text",  "cython", "txt",            None,                           "tokenize"),
+    "_txt.py":                  ("super_text",  "python", None,             "experiments/_txt.py",          "tokenize"),
+}
+
+
+def peak_rss():
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def percentile(samples, p):
+    # nearest-rank percentile of sorted samples
+    index = max(0, min(len(samples) - 1, int(-(-p * len(samples) // 100)) - 1))
+    return samples[index]
+
+
+def load_target(name, build_dirs):
+    # returns callable text -> tokens
+    _, _, module_name, file_name, entry = TARGETS[name]
+
+    for path in reversed(build_dirs):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    if file_name is not None:
+        path = os.path.join(ROOT, file_name)
+        spec = importlib.util.spec_from_file_location("bench_" + os.path.basename(path)[:-3], path)
+    else:
+        spec = None
+        for directory in build_dirs:
+            for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+                path = os.path.join(directory, module_name + suffix)
+                if os.path.exists(path):
+                    spec = importlib.util.spec_from_file_location(module_name, path)
+                    break
+            if spec is not None:
+                break
+        if spec is None:
+            raise ImportError("%s is not built (searched %s)" % (module_name, ", ".join(build_dirs)))
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    if hasattr(module, "Lexer"):
+        return getattr(module.Lexer(), entry)
+    return getattr(module, entry)
+
+
+def count_chars(path):
+    # code points in utf-8 file without reading it at once
+    with open(path, encoding="utf-8") as f:
+        return sum(len(chunk) for chunk in iter(lambda: f.read(1 << 20), ""))
+
+
+def measure(name, corpus_path, build_dirs, min_calls, min_time, max_calls):
+    # runs in worker process
+    if TARGETS[name][4] == "tokenize_file":
+        # entry point reads the file itself
+        text = corpus_path
+        n_chars = count_chars(corpus_path)
+        n_bytes = os.path.getsize(corpus_path)
+    else:
+        with open(corpus_path, encoding="utf-8") as f:
+            text = f.read()
+        n_chars = len(text)
+        n_bytes = len(text.encode("utf-8"))
+
+    tokenize = load_target(name, build_dirs)
+    load_rss = peak_rss()
+
+    # warmup (also gives token count)
+    start = time.perf_counter_ns()
+    tokens = len(tokenize(text))
+    first = time.perf_counter_ns() - start
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_calls and (len(samples) < min_calls or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        samples.append(time.perf_counter_ns() - start)
+
+        # one slow call is enough for huge inputs
+        if first > min_time * 1e9:
+            break
+
+    samples.sort()
+    p50 = percentile(samples, 50) / 1e9
+
+    return {
+        "chars": n_chars,
+        "bytes": n_bytes,
+        "tokens": tokens,
+        "calls": len(samples),
+        "first_ms": first / 1e6,
+        "p50_ms": p50 * 1e3,
+        "p99_ms": percentile(samples, 99) / 1e6,
+        "mean_ms": sum(samples) / len(samples) / 1e6,
+        "tokens_per_sec": tokens / p50 if p50 else None,
+        "mb_per_sec": n_bytes / 1e6 / p50 if p50 else None,
+        "load_rss_bytes": load_rss,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def run_worker(args):
+    try:
+        result = measure(args.worker, args.corpus, args.build_dir, args.min_calls, args.min_time, args.max_calls)
+    except (ImportError, OSError, AttributeError) as e:
+        result = { "skipped": "%s: %s" % (type(e).__name__, e) }
+    json.dump(result, sys.stdout)
+
+
+def corpus_file(cache_dir, language, size, seed):
+    path = os.path.join(cache_dir, "%s-%s-%d.txt" % (language, size, seed))
+    if not os.path.exists(path):
+        with open(path + ".tmp", "w", encoding="utf-8", newline="") as f:
+            f.write(generate(language, size, seed))
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    targets = args.targets.split(",") if args.targets else list(TARGETS)
+    sizes = list(SIZES) if args.sizes == "all" else args.sizes.split(",")
+
+    for size in sizes:
+        parse_size(size)
+
+    for name in targets:
+        if name not in TARGETS:
+            raise SystemExit("unknown target %r (choose from %s)" % (name, ", ".join(TARGETS)))
+
+    cache_dir = args.corpus_dir or os.path.join(tempfile.gettempdir(), "tokenizers-bench")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "sizes": sizes,
+            "build_dirs": args.build_dir,
+        },
+        "results": [],
+        "skipped": [],
+    }
+
+    for name in targets:
+        language, implementation = TARGETS[name][:2]
+
+        for size in sizes:
+            path = corpus_file(cache_dir, language, size, args.seed)
+            command = [
+                sys.executable, "-m", "bench.run", "--worker", name, "--corpus", path,
+                "--min-calls", str(args.min_calls), "--min-time", str(args.min_time), "--max-calls", str(args.max_calls),
+            ]
+            for directory in args.build_dir:
+                command += ["--build-dir", directory]
+
+            worker = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+            if worker.returncode != 0:
+                report["skipped"].append({ "target": name, "size": size, "reason": (worker.stderr.strip().splitlines() or ["worker exited with %d" % worker.returncode])[-1] })
+                break
+
+            result = json.loads(worker.stdout)
+            if "skipped" in result:
+                report["skipped"].append({ "target": name, "reason": result["skipped"] })
+                break
+
+            result = { "target": name, "language": language, "implementation": implementation, "size": size, **result }
+            report["results"].append(result)
+
+            print("%-24s %-6s %10d tokens %9.2f MB/s %12.0f tok/s  p50 %9.3f ms  p99 %9.3f ms  rss %7.1f MB" % (
+                name, size, result["tokens"], result["mb_per_sec"] or 0, result["tokens_per_sec"] or 0,
+                result["p50_ms"], result["p99_ms"], result["peak_rss_bytes"] / 1e6,
+            ), file=sys.stderr)
+
+            # do not escalate sizes once a single call is too slow
+            if result["first_ms"] > args.max_seconds * 1e3 and size != sizes[-1]:
+                report["skipped"].append({ "target": name, "reason": "sizes after %s skipped (call took %.1f s)" % (size, result["first_ms"] / 1e3) })
+                break
+
+    for skipped in report["skipped"]:
+        print("%-24s skipped : %s" % (skipped["target"], skipped["reason"]), file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="Tokenizer throughput benchmarks")
+    parser.add_argument("--targets", help="comma separated target names (default: all)")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="comma separated sizes (%s) or 'all'" % ", ".join(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--corpus-dir", help="where generated corpora are cached (default: temp dir)")
+    parser.add_argument("--min-calls", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds of timed calls per size")
+    parser.add_argument("--max-calls", type=int, default=1000)
+    parser.add_argument("--max-seconds", type=float, default=30.0, help="skip larger sizes once one call takes longer")
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    parser.add_argument("--list", action="store_true", help="list targets and corpora")
+
+    # worker mode (internal)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    args.build_dir = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+
+    if args.list:
+        for name, (language, implementation, *_) in TARGETS.items():
+            print("%-24s %-12s %s" % (name, language, implementation))
+        print("corpora : %s" % ", ".join(LANGUAGES))
+        return
+
+    if args.worker:
+        run_worker(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Spec tokenizers against the hand-written ones
+#
+#   python -m bench.spec_parity [--build-dir DIR] [--size 1MB] [--fuzz N] [--repeat N] [--out FILE]
+#
+# The tokenizers generated from specs/playcode.py and specs/scratchpad.py (see
+# gen_lexers.py) must give the same tokens, outline symbols and visible-line
+# tokens as pc.pyx and experiments/scrpd.pyx. Checked on a generated corpus
+# (see bench/corpus.py) and on random texts of the chars the rules start with,
+# then both are timed. Exits with status 1 if anything differs.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from bench.corpus import generate
+from bench.run import ROOT, load_target
+
+# spec target : (hand-written target, corpus, chars for random texts)
+PAIRS = {
+    "playcode_lexer.pyx": ("pc.pyx", "playcode", "-->=!+*/<@\"0123456789._aZ if True\n\t"),
+    "scratchpad_lexer.pyx": ("scrpd.pyx", "scratchpad", ">>%%#+-*[] ab\n\t"),
+}
+
+
+def random_text(rng, chars):
+    return "".join(rng.choice(chars) for _ in range(rng.randint(0, 80)))
+
+
+def differences(spec_lexer, lexer, text, rng):
+    # what differs between the two lexers on text
+    found = []
+    if spec_lexer.tokenize(text) != lexer.tokenize(text):
+        found.append("tokens")
+    if spec_lexer.tokenize_compact(text).symbols() != lexer.tokenize_compact(text).symbols():
+        found.append("symbols")
+
+    lines = text.count("\n") + 1
+    first = rng.randrange(lines)
+    last = rng.randrange(first, lines)
+    if spec_lexer.tokenize_visible(text, first, last) != lexer.tokenize_visible(text, first, last):
+        found.append("visible %d..%d" % (first, last))
+
+    return found
+
+
+def best_time(tokenize, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.spec_parity", description="Spec tokenizers against the hand-written ones")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--size", default="1MB", help="corpus size (default 1MB)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fuzz", type=int, default=20000, help="random texts per pair (default 20000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    rng = random.Random(args.seed)
+    report = { "size": args.size, "fuzz": args.fuzz, "repeat": args.repeat, "pairs": {} }
+    failed = False
+
+    for spec_name, (name, language, chars) in PAIRS.items():
+        spec_lexer = load_target(spec_name, build_dirs).__self__
+        lexer = load_target(name, build_dirs).__self__
+        text = generate(language, args.size, args.seed)
+
+        mismatches = []
+        for sample in [text] + [random_text(rng, chars) for _ in range(args.fuzz)]:
+            found = differences(spec_lexer, lexer, sample, rng)
+            if found:
+                mismatches.append({ "text": sample[:200], "differ": found })
+                print("%s differs from %s (%s) : %r" % (spec_name, name, ", ".join(found), sample[:200]), file=sys.stderr)
+
+        results = {}
+        for target, tokenize in ((name, lexer.tokenize_compact), (spec_name, spec_lexer.tokenize_compact)):
+            seconds = best_time(tokenize, text, args.repeat)
+            results[target] = { "seconds": seconds, "mb_per_sec": len(text.encode("utf-8")) / 1e6 / seconds }
+            print("%-32s %8.3f s %9.2f MB/s" % (target + ":compact", seconds, results[target]["mb_per_sec"]), file=sys.stderr)
+
+        print("%s : %d texts checked, %d differ" % (spec_name, args.fuzz + 1, len(mismatches)), file=sys.stderr)
+        report["pairs"][spec_name] = { "reference": name, "mismatches": mismatches[:20], "results": results }
+        failed = failed or bool(mismatches)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compiled TOML tokenizer against toml.py
+#
+#   python -m bench.toml_native [--build-dir DIR] [--size 4MB] [--repeat N] [--out FILE]
+#
+# Times experiments/toml.py and the compiled toml.pyx on a generated TOML
+# corpus (see bench/corpus.py), and checks that both give the same tokens for
+# every line of it that toml.py already handles, plus the cases in HANDLED.
+# Lines with what toml.py gets wrong (multi-line strings, escapes, datetimes,
+# keys with digits or dashes, tabs in strings) are left out of the check.
+# Exits with status 1 if any checked line differs.
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from bench.corpus import generate
+from bench.run import ROOT, load_target
+
+TARGETS = ("toml.py", "toml.pyx", "toml.pyx:compact")
+
+# cases toml.py already gets right
+HANDLED = (
+    "[package]",
+    "[tool.poetry.dependencies]",
+    "[[bin]]",
+    "name = \"tokenizers\"",
+    "path = 'C:\\Users\\literal'",
+    "version = \"0.1.0\" # comment",
+    "# comment only",
+    "answer = 42",
+    "neg = -17",
+    "pi = 3.1415",
+    "planck = 6.626e-34",
+    "hex = 0xDEADBEEF",
+    "big = 1_000_000",
+    "flags = [true, false]",
+    "special = [inf, -inf, nan, +nan]",
+    "date = 1979-05-27",
+    "nested = [[1, 2], [\"a\", 'b']]",
+    "point = { x = 1, y = 2 }",
+    "site.\"google.com\" = true",
+    "physical.color = \"orange\"",
+    "\"quoted key\" = \"value\"",
+    "empty = \"\"",
+    "unicode = \"caf\u00e9 \u65e5\u672c\"",
+    "unclosed = \"runs to end of line",
+)
+
+# what toml.py gets wrong, lines with any of it are not compared
+UNHANDLED = re.compile(r"\"\"\"|'''|\\|\t|\d:\d")
+KEY = re.compile(r"(?:^|[{,])\s*([^=\s{},\"']+)\s*=")
+
+
+def handled(line):
+    if UNHANDLED.search(line):
+        return False
+    return all(re.fullmatch(r"[A-Za-z_.]+", key) for key in KEY.findall(line))
+
+
+def best_time(tokenize, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.toml_native", description="Compiled TOML tokenizer against toml.py")
+    parser.add_argument("--build-dir", action="append", help="dirs with built modules (default: repo root and experiments)")
+    parser.add_argument("--size", default="4MB", help="corpus size (default 4MB)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write json report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    build_dirs = [os.path.abspath(d) for d in (args.build_dir or [ROOT, os.path.join(ROOT, "experiments")])]
+    tokenizers = { name: load_target(name, build_dirs) for name in TARGETS }
+    reference = tokenizers["toml.py"]
+    compiled = tokenizers["toml.pyx"]
+
+    text = generate("toml", args.size, args.seed)
+    n_bytes = len(text.encode("utf-8"))
+
+    lines = [line for line in sorted(set(text.split("\n"))) if handled(line)] + list(HANDLED)
+    mismatches = [line for line in lines if reference(line) != compiled(line)]
+    for line in mismatches:
+        print("tokens differ : %r" % line, file=sys.stderr)
+    print("%d lines checked, %d differ" % (len(lines), len(mismatches)), file=sys.stderr)
+
+    results = {}
+    for name, tokenize in tokenizers.items():
+        seconds = best_time(tokenize, text, args.repeat)
+        results[name] = { "seconds": seconds, "mb_per_sec": n_bytes / 1e6 / seconds }
+        print("%-16s %8.3f s %9.2f MB/s  x%.1f" % (name, seconds, results[name]["mb_per_sec"], results["toml.py"]["seconds"] / seconds), file=sys.stderr)
+
+    report = {
+        "size": args.size,
+        "bytes": n_bytes,
+        "repeat": args.repeat,
+        "lines_checked": len(lines),
+        "mismatches": mismatches,
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,39 @@
 
 # Build file for Cython tokenizers
 
+import os
+
 from setuptools import setup, Extension
 from Cython.Build import cythonize
 
+import gen_lexers
+import gen_words
+
+# keyword tables (pc_words.h, ...) as perfect hash, see gen_words.py
+gen_words.main()
+
+# tokenizers declared as specs (specs/*.py -> specs/*_lexer.pyx), see gen_lexers.py
+SPEC_LEXERS = gen_lexers.main()
+
+# LEXER_STATS=1 builds count calls, chars and time per scan handler (Lexer.stats(),
+# see lexer_core.h), rebuild with --force when switching
+MACROS = [("LC_STATS", "1")] if os.environ.get("LEXER_STATS") == "1" else []
+
 setup(
     ext_modules=cythonize(
         [
             # Extension("stxt", ["stxt.pyx"], extra_compile_args=["-O3", "-std=c11"]),
             # Extension("scrpd", ["scrpd.pyx"], extra_compile_args=["-O3", "-std=c11"]),
-            Extension("hackerman", ["hackerman.pyx"], extra_compile_args=["-O3", "-std=c11"]),
-            Extension("pc", ["pc.pyx"], extra_compile_args=["-O3", "-std=c11"]),
-        ], 
+            Extension("lexer_core", ["lexer_core.pyx"], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"]),
+            Extension("incremental", ["incremental.pyx"], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"]),
+            Extension("hackerman", ["hackerman.pyx"], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"]),
+            Extension("pc", ["pc.pyx"], depends=["pc_words.h"], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"]),
+            Extension("lexer_spec", ["lexer_spec.pyx"], depends=["lexer_spec.h"], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"]),
+        ] + [
+            Extension(name, [source], depends=[header, "lexer_spec.h"], include_dirs=["."], define_macros=MACROS, extra_compile_args=["-O3", "-std=c11"])
+            for name, source, header in SPEC_LEXERS
+        ],
         compiler_directives={ "language_level": "3" },
+        include_path=["."],
     )
 )
@@ -39,10 +39,22 @@
 # 15 WARNING
 # 16 SUCCESS
 
+# Pygments lexers for languages without a tokenizer here
+#
+# Lexers are looked up once per extension (LRU cache shared by all instances)
+# and each Pygments token type is mapped to a style once, through its parents
+# (Token.Literal.Number.Hex is styled as Token.Literal.Number), so tokenize is a
+# single pass over get_tokens_unprocessed with one dict lookup per token.
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from fnmatch import translate
+
 from main import TOKEN_MAP # token map is same for all lexers
 
-from pygments import lex
-from pygments.lexers import get_lexer_for_filename
+from pygments.lexers import LEXERS, get_lexer_for_filename
 from pygments.token import Token
 
 # https://pygments.org/docs/tokens/#module-pygments.token
@@ -53,6 +65,7 @@ TOKEN_MAP_PYGMENTS = {
     Token.Punctuation: 1,
     Token.Generic: 1,
     Token.Other: 1,
+    Token.Keyword: 2,
     Token.Keyword.Constant: 2,
     Token.Keyword.Declaration: 2,
     Token.Keyword.Namespace: 2,
@@ -61,12 +74,15 @@ TOKEN_MAP_PYGMENTS = {
     Token.Name.Function: 4,
     Token.Name.Property: 5,
     Token.Literal: 7,
+    Token.Literal.String: 7,
     Token.Literal.String.Single: 7,
     Token.Literal.String.Double: 7,
+    Token.Literal.Number: 8,
     Token.Literal.Number.Integer: 8,
     Token.Literal.Number.Float: 8,
     Token.Operator: 9,
     Token.Literal.Date: 9,
+    Token.Comment: 10,
     Token.Comment.Single: 10,
     Token.Comment.Multiline: 10,
     Token.Keyword.Type: 11,
@@ -75,21 +91,74 @@ TOKEN_MAP_PYGMENTS = {
     Token.Error: 14,
 }
 
+class StyleMap(dict):
+    # { token type: style } filled on first use from the nearest mapped parent (default if none)
+
+    def __missing__(self, token_type):
+        parent = token_type
+        while parent is not None and parent not in TOKEN_MAP_PYGMENTS: parent = parent.parent
+        style = TOKEN_MAP[TOKEN_MAP_PYGMENTS[parent]] if parent is not None else TOKEN_MAP[1]
+        self[token_type] = style
+        return style
+
+STYLES = StyleMap()
+
+LEXER_CACHE_SIZE = 32 # lexers kept (one per extension or special file name)
+
+# file names Pygments matches by more than the extension (Makefile, CMakeLists.txt, *.[1-9], ...)
+NAME_PATTERNS = re.compile("|".join(
+    translate(pattern) for lexer in LEXERS.values() for pattern in lexer[3]
+    if not (pattern.startswith("*.") and not any(c in pattern[2:] for c in "*?["))
+))
+
+# extensions of more than one suffix (.js.j2, .rs.in, ...), the last suffix alone may be another lexer or none
+LONG_EXTENSIONS = frozenset(
+    pattern[1:] for lexer in LEXERS.values() for pattern in lexer[3]
+    if pattern.startswith("*.") and "." in pattern[2:] and not any(c in pattern[2:] for c in "*?[")
+)
+
+_lexers = OrderedDict() # cache key -> Pygments lexer, least recently used first
+_lexers_lock = threading.Lock()
+
+def lexer_key(filename):
+    # extension (longest Pygments knows), or file name if Pygments could pick a lexer by name
+    name = os.path.basename(filename)
+    if NAME_PATTERNS.match(name): return name
+    dot = name.find(".")
+    while dot >= 0:
+        if name[dot:] in LONG_EXTENSIONS: return name[dot:]
+        dot = name.find(".", dot + 1)
+    return os.path.splitext(name)[1] or name # as written, Pygments matches case-sensitively (.C is C++, .c is C)
+
+def get_lexer(filename):
+    # Pygments lexer for filename from cache (raises pygments.util.ClassNotFound if none)
+    key = lexer_key(filename)
+    with _lexers_lock:
+        lexer = _lexers.get(key)
+        if lexer is not None:
+            _lexers.move_to_end(key)
+            return lexer
+
+    lexer = get_lexer_for_filename(filename)
+    with _lexers_lock:
+        _lexers[key] = lexer
+        _lexers.move_to_end(key)
+        while len(_lexers) > LEXER_CACHE_SIZE: _lexers.popitem(last=False)
+    return lexer
+
 class Lexer(object):
-    def __init__(self, filename): self.lexer = get_lexer_for_filename(filename)
+    def __init__(self, filename): self.lexer = get_lexer(filename)
 
     def comment_char(self): return "" # todo : create map for comment injection in common un-supported programming languages
 
     def lexer_name(self): return f"<{ self.lexer.name }>"
     
     def tokenize(self, text):
-        tokens = []
-        result = list(self.lexer.get_tokens_unprocessed(text))
-        for token in result:
-            token_type = str(TOKEN_MAP[TOKEN_MAP_PYGMENTS[token[1]]] if token[1] in TOKEN_MAP_PYGMENTS else TOKEN_MAP[1])
-            start_pos = int(token[0])
-            value = str(token[2])
-
-            tokens.append((token_type, start_pos, value))
+        styles = STYLES
+        return [(styles[token_type], start_pos, value) for start_pos, token_type, value in self.lexer.get_tokens_unprocessed(text)]
 
-        return tokens
+    def iter_tokens(self, text):
+        # tokens one at a time, as Pygments produces them
+        styles = STYLES
+        for start_pos, token_type, value in self.lexer.get_tokens_unprocessed(text):
+            yield (styles[token_type], start_pos, value)
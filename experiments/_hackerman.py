@@ -24,7 +24,8 @@
 # Tokenizer wrapper for Hackerman DSCL (TOML-like custom DSL)
 
 import os
-import ctypes
+
+from native_bridge import NativeLexer, library_path
 
 TOKEN_MAP = { # to map int value from Odin to style string
     0: "whitespace",
@@ -50,35 +51,7 @@ COMMENT = "comment"
 SPECIAL = "special"
 WARNING = "warning"
 
-lib = ctypes.CDLL(os.path.join(os.path.dirname(__file__), "hackerman.dylib"))
-
-# Odin internal struct for string (rawptr and len)
-class String(ctypes.Structure):
-    _fields_ = [
-        ("text", ctypes.POINTER(ctypes.c_uint8)),
-        ("len", ctypes.c_ssize_t),
-    ]
-
-    def to_python(self):
-        if self.text: return ctypes.string_at(self.text, self.len).decode("utf-8")
-        return ""
-
-# Odin custom struct for Token
-class Token(ctypes.Structure):
-    _fields_ = [
-        # ("type", String),
-        ("type", ctypes.c_ssize_t), # todo : this fixed segmentation fault (maybe need to replace start_pos?)
-        ("start_pos", ctypes.c_int),
-        ("value", String),
-    ]
-
-# Odin internal struct for [dynamic]Token
-class DynamicToken(ctypes.Structure):
-    _fields_ = [
-        ("data", ctypes.POINTER(Token)),
-        ("len", ctypes.c_ssize_t),
-        ("cap", ctypes.c_ssize_t), # this is important c_ssize_t and not c_int
-    ]
+lib = NativeLexer(library_path(os.path.dirname(__file__), "hackerman"), offsets="chars") # loaded and bound once
 
 class Lexer(object):
     def __init__(self): pass
@@ -90,26 +63,5 @@ class Lexer(object):
     def delimiters(self): return { "[", "\"" }
 
     def tokenize(self, text):
-        tokens = []
-        
-        # define arg and res types
-        lib.process_input.argtypes = [String]
-        lib.process_input.restype = DynamicToken
-
-        # convert text input to Odin String structure
-        text_as_bytes = text.encode("utf-8")
-        text_byte_array = (ctypes.c_uint8 * len(text_as_bytes))(*text_as_bytes)
-        
-        text_string_arg = String()
-        text_string_arg.text = ctypes.cast(text_byte_array, ctypes.POINTER(ctypes.c_uint8))
-        text_string_arg.len = len(text_as_bytes)
-
-        # call process_input (Odin procedure)
-        result = lib.process_input(text_string_arg)
-        
-        # process result
-        for n in range(result.len):
-            value_as_string = result.data[n].value.to_python()
-            tokens.append((TOKEN_MAP[result.data[n].type], result.data[n].start_pos, value_as_string))
-
-        return tokens
+        types, starts, values = lib.tokenize_raw(text)
+        return [(TOKEN_MAP[token_type], start_pos, value) for token_type, start_pos, value in zip(types, starts, values)]
@@ -24,7 +24,8 @@
 # Tokenizer wrapper for Odin
 
 import os
-import ctypes
+
+from native_bridge import NativeLexer, library_path
 
 TOKEN_MAP = { # to map int value from Odin to style string
     0: "whitespace",
@@ -48,35 +49,7 @@ TOKEN_MAP = { # to map int value from Odin to style string
     22: "success",
 }
 
-lib = ctypes.CDLL(os.path.join(os.path.dirname(__file__), "odin.dylib"))
-
-# Odin internal struct for string (rawptr and len)
-class String(ctypes.Structure):
-    _fields_ = [
-        ("text", ctypes.POINTER(ctypes.c_uint8)),
-        ("len", ctypes.c_ssize_t),
-    ]
-
-    def to_python(self):
-        if self.text: return ctypes.string_at(self.text, self.len).decode("utf-8")
-        return ""
-
-# Odin custom struct for Token
-class Token(ctypes.Structure):
-    _fields_ = [
-        # ("type", String),
-        ("type", ctypes.c_ssize_t), # todo : this fixed segmentation fault (maybe need to replace start_pos?)
-        ("start_pos", ctypes.c_int),
-        ("value", String),
-    ]
-
-# Odin internal struct for [dynamic]Token
-class DynamicToken(ctypes.Structure):
-    _fields_ = [
-        ("data", ctypes.POINTER(Token)),
-        ("len", ctypes.c_ssize_t),
-        ("cap", ctypes.c_ssize_t), # this is important c_ssize_t and not c_int
-    ]
+lib = NativeLexer(library_path(os.path.dirname(__file__), "odin"), offsets="chars") # loaded and bound once
 
 class Lexer(object):
     @property
@@ -100,33 +73,15 @@ class Lexer(object):
 
     def tokenize(self, text):
         tokens = []
-        
-        # define arg and res types
-        lib.process_input.argtypes = [String]
-        lib.process_input.restype = DynamicToken
-
-        # lib.free_tokens.argtypes = [c_void_p]
-        # lib.free_tokens.restype = None
-
-        # convert text input to Odin String structure
-        text_as_bytes = text.encode("utf-8")
-        text_byte_array = (ctypes.c_uint8 * len(text_as_bytes))(*text_as_bytes)
-
-        text_string_arg = String()
-        text_string_arg.text = ctypes.cast(text_byte_array, ctypes.POINTER(ctypes.c_uint8))
-        text_string_arg.len = len(text_as_bytes)
-
-        # call process_input (Odin procedure)
-        result = lib.process_input(text_string_arg)
+        types, starts, values = lib.tokenize_raw(text)
 
         # process result
-        for n in range(result.len):
-            value_as_string = result.data[n].value.to_python()
+        for n, token_type in enumerate(types):
 
             # change some names to default
-            if result.data[n].type == 4 and not (result.data[n + 2].type == 2 and result.data[n + 2].value.to_python() == "proc"):
-                tokens.append(("default", result.data[n].start_pos, value_as_string))
+            if token_type == 4 and not (n + 2 < len(types) and types[n + 2] == 2 and values[n + 2] == "proc"):
+                tokens.append(("default", starts[n], values[n]))
             else:
-                tokens.append((TOKEN_MAP[result.data[n].type], result.data[n].start_pos, value_as_string))
+                tokens.append((TOKEN_MAP[token_type], starts[n], values[n]))
 
         return tokens
@@ -25,6 +25,20 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport (
+    char_is, is_alpha, is_digit, skip_whitespace, scan_to_eol, scan_to_str,
+    scan_word, scan_numeric, LC_BLANK, LC_NEWLINE,
+    WordTable, lc_word_table, wrap_words, word_kind,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_STRING, TK_NUMBER, TK_OPERATOR,
+    TK_COMMENT, TK_TYPE, TK_CONDITIONAL, TK_BUILT_IN, TK_ERROR,
+    SymbolIndex, SYM_FUNCTION, SYM_TYPE,
+)
+
+from incremental import retokenize_lines, tokenize_lines
+from lexer_core import line_range, make_styles, word_kinds
+
+cdef extern from "_odin_words.h":
+    const lc_word_table odin_words
 
 # --- Token Types ---
 
@@ -48,131 +62,94 @@ cdef str ERROR = "error"
 cdef str WARNING = "warning"
 cdef str SUCCESS = "success"
 
-
-KEYWORDS = frozenset({ 
-    "asm",
-    "auto_cast",
-    "bit_set",
-    "break",
-    "case",
-    "cast",
-    "context",
-    "continue",
-    "defer",
-    "distinct",
-    "do",
-    "dynamic",
-    "else",
-    "enum",
-    "fallthrough",
-    "for",
-    "foreign",
-    "if",
-    "import",
-    "in",
-    "map",
-    "not_in",
-    "or_else",
-    "or_return",
-    "package",
-    "proc",
-    "return",
-    "struct",
-    "switch",
-    "transmute",
-    "typeid",
-    "union",
-    "using",
-    "when",
-    "where",
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_STRING: STRING,
+    TK_NUMBER: NUMBER,
+    TK_OPERATOR: OPERATOR,
+    TK_COMMENT: COMMENT,
+    TK_TYPE: TYPE,
+    TK_CONDITIONAL: CONDITIONAL,
+    TK_BUILT_IN: BUILT_IN,
+    TK_ERROR: ERROR,
 })
 
-BUILT_INS = frozenset({
-    "fmt",
-    "len",
-    "println",
-})
 
-TYPES = frozenset({
-    "i8",
-    "i16",
-    "i32",
-    "i64",
-    "i128",
-    "int",
-    "u8",
-    "u16",
-    "u32",
-    "u64",
-    "u128",
-    "uint",
-    "f32",
-    "f64",
-    "complex64",
-    "complex128",
-    "quaternion128",
-    "quaternion256",
-    "string",
-    "rune",
-    "bool",
-})
+# generated from gen_words.py
+cdef WordTable WORDS = wrap_words(&odin_words)
+
+cdef frozenset DECLARED_TYPES = frozenset({ "struct", "enum", "union", "distinct", "bit_set" })
+
+KEYWORDS = WORDS.words(TK_KEYWORD)
+BUILT_INS = WORDS.words(TK_BUILT_IN)
+TYPES = WORDS.words(TK_TYPE)
 
+# styles that can be extended with Lexer(extra_words={ style: [...] })
+WORD_KINDS = { KEYWORD: TK_KEYWORD, BUILT_IN: TK_BUILT_IN, TYPE: TK_TYPE, CONDITIONAL: TK_CONDITIONAL }
 
-cdef int handle_attribute(int current_char_index, str text, int length, list tokens):
+# state at line start (see LineStates in incremental.pyx) : "" or the start of the block
+# comment ("/*") or string (quote) spanning it, the only tokens that span lines
+INITIAL_STATE = ""
+
+def resumable(state):
+    return not state
+
+
+cdef int handle_attribute(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
     current_char_index += 1 # Consume '@'
 
-    while current_char_index < length and (text[current_char_index].isalnum() or text[current_char_index] in { '_', '(', ')' }):
-        current_char_index += 1
+    # words and parentheses, e.g. @(test)
+    while current_char_index < length:
+        current_char_index = scan_word(text, current_char_index, length)
+        
+        if current_char_index < length and (text[current_char_index] == '(' or text[current_char_index] == ')'):
+            current_char_index += 1
+        else:
+            break
 
-    tokens.append((OPERATOR, start_pos, text[start_pos:current_char_index]))
+    tokens.push(TK_OPERATOR, start_pos, current_char_index - start_pos)
     return current_char_index
 
-cdef int handle_directive(int current_char_index, str text, int length, list tokens):
+cdef int handle_directive(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
-    current_char_index += 1 # Consume '#'
+    current_char_index = scan_word(text, current_char_index + 1, length) # Consume '#'
 
-    while current_char_index < length and (text[current_char_index].isalnum() or text[current_char_index] == '_'):
-        current_char_index += 1
-
-    tokens.append((KEYWORD, start_pos, text[start_pos:current_char_index]))
+    tokens.push(TK_KEYWORD, start_pos, current_char_index - start_pos)
     return current_char_index
 
-cdef int handle_operator(int current_char_index, str text, list tokens):
+cdef int handle_operator(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
 
-    tokens.append((OPERATOR, start_pos, text[current_char_index]))
+    tokens.push(TK_OPERATOR, start_pos, 1)
     return current_char_index + 1
 
-cdef int handle_comment(int current_char_index, str text, int length, list tokens):
+cdef int handle_comment(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, length)
 
-    while current_char_index < length and text[current_char_index] != '\n':
-        current_char_index += 1
-
-    tokens.append((COMMENT, start_pos, text[start_pos:current_char_index]))
+    tokens.push(TK_COMMENT, start_pos, current_char_index - start_pos)
     return current_char_index
 
-cdef int handle_multiline_comment(int current_char_index, str text, int length, list tokens):
+cdef int handle_multiline_comment(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
-    current_char_index += 1
+    cdef int end = scan_to_str(text, current_char_index + 1, length, "*/")
 
-    while current_char_index + 1 < length:
-        if text[current_char_index] == '*' and text[current_char_index + 1] == '/':
-            current_char_index += 2
-            
-            tokens.append((COMMENT, start_pos, text[start_pos:current_char_index]))
-            return current_char_index
+    if end < length:
+        current_char_index = end + 2
         
-        current_char_index += 1
+        tokens.push(TK_COMMENT, start_pos, current_char_index - start_pos)
+        return current_char_index
 
-    tokens.append((ERROR, start_pos, text[start_pos:current_char_index]))
+    # unterminated (last char is left to main loop)
+    current_char_index = length - 1
+    tokens.push(TK_ERROR, start_pos, current_char_index - start_pos)
     return current_char_index
 
-cdef int handle_string(int current_char_index, str text, int length, list tokens):
+cdef int handle_string(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str quote = text[current_char_index]
+    cdef Py_UCS4 quote = text[current_char_index]
     current_char_index += 1
 
     while current_char_index < length and text[current_char_index] != quote:
@@ -184,45 +161,167 @@ cdef int handle_string(int current_char_index, str text, int length, list tokens
 
     if current_char_index < length and text[current_char_index] == quote:
         current_char_index += 1
-        tokens.append((STRING, start_pos, text[start_pos:current_char_index]))
+        tokens.push(TK_STRING, start_pos, current_char_index - start_pos)
     else:
         # unterminated string
-        tokens.append((ERROR, start_pos, text[start_pos:current_char_index]))
+        tokens.push(TK_ERROR, start_pos, current_char_index - start_pos)
     
     return current_char_index
 
-cdef int handle_number(int current_char_index, str text, int length, list tokens):
+cdef int handle_number(int current_char_index, str text, int length, TokenArray tokens):
     cdef int start_pos = current_char_index
+    current_char_index = scan_numeric(text, current_char_index + 1, length, True)
 
-    while current_char_index < length and (text[current_char_index].isdigit() or text[current_char_index] == '.'):
-        current_char_index += 1
-
-    tokens.append((NUMBER, start_pos, text[start_pos:current_char_index]))
+    tokens.push(TK_NUMBER, start_pos, current_char_index - start_pos)
     return current_char_index
 
-cdef int handle_identifier(int current_char_index, str text, int length, list tokens):
+cdef int handle_identifier(int current_char_index, str text, int length, WordTable words, TokenArray tokens):
     cdef int start_pos = current_char_index
+    current_char_index = scan_word(text, current_char_index, length)
+
+    cdef int kind = word_kind(words, text, start_pos, current_char_index)
+    if kind < 0:
+        kind = TK_DEFAULT
+
+    tokens.push(kind, start_pos, current_char_index - start_pos)
 
-    while current_char_index < length and (text[current_char_index].isalnum() or text[current_char_index] == '_'):
+    # name :: proc / struct / enum / union / distinct is a function or type in outline
+    if kind == TK_KEYWORD and tokens.count >= 3:
+        mark_declaration(text, tokens)
+
+    return current_char_index
+
+cdef int mark_declaration(str text, TokenArray tokens) except -1:
+    cdef Py_ssize_t last = tokens.count - 1
+    cdef Py_ssize_t start = tokens.starts[last]
+    cdef Py_ssize_t name_start = tokens.starts[last - 2]
+    cdef Py_UCS4 first = text[name_start]
+    cdef str word
+
+    if not (tokens.kinds[last - 1] == TK_KEYWORD and tokens.lengths[last - 1] == 2 and text[tokens.starts[last - 1]] == ':'):
+        return 0
+    if not (tokens.kinds[last - 2] == TK_DEFAULT and (is_alpha(first) or first == '_')):
+        return 0
+
+    word = text[start:start + tokens.lengths[last]]
+    if word == "proc":
+        tokens.mark_symbol(last - 2, SYM_FUNCTION)
+    elif word in DECLARED_TYPES:
+        tokens.mark_symbol(last - 2, SYM_TYPE)
+
+    return 0
+
+cdef int string_end(int current_char_index, str text, int length):
+    # end of string token at current_char_index (same rules as handle_string)
+    cdef Py_UCS4 quote = text[current_char_index]
+    current_char_index += 1
+
+    while current_char_index < length and text[current_char_index] != quote:
+        if text[current_char_index] == '\\' and current_char_index + 1 < length:
+            current_char_index += 2
+        else:
+            current_char_index += 1
+
+    if current_char_index < length:
         current_char_index += 1
 
-    cdef str identifier = text[start_pos:current_char_index]
+    return current_char_index
 
-    if identifier in KEYWORDS:
-        tokens.append((KEYWORD, start_pos, identifier))
-    elif identifier in BUILT_INS:
-        tokens.append((BUILT_IN, start_pos, identifier))
-    elif identifier in TYPES:
-        tokens.append((TYPE, start_pos, identifier))
-    elif identifier in { "true", "false" }:
-        tokens.append((CONDITIONAL, start_pos, identifier))
-    else:
-        tokens.append((DEFAULT, start_pos, identifier))
+cdef int restart_point(str text, int offset):
+    # offset, or start of string or block comment spanning it
+    #
+    # only strings and block comments span lines, and quotes and '/' are not
+    # part of any other token, so skimming for them finds every token boundary
+    # tokenize would see before offset
+    cdef int current_char_index = 0
+    cdef int length = len(text)
+    cdef int end
+    cdef Py_UCS4 current_char
+
+    while current_char_index < offset:
+        current_char = text[current_char_index]
+
+        if current_char == '/' and current_char_index + 1 < length and text[current_char_index + 1] == '/':
+            end = scan_to_eol(text, current_char_index + 2, length)
+        elif current_char == '/' and current_char_index + 1 < length and text[current_char_index + 1] == '*':
+            end = scan_to_str(text, current_char_index + 1, length, "*/")
+            end = end + 2 if end < length else length - 1
+        elif current_char in u"\"'`":
+            end = string_end(current_char_index, text, length)
+        else:
+            current_char_index += 1
+            continue
+
+        if end > offset:
+            return current_char_index
+        current_char_index = end
+
+    return offset
+
+cdef int scan_into(str text, int current_char_index, int stop, WordTable words, TokenArray tokens) except -1:
+    # tokenize from token boundary, return at first token boundary at or after stop
+    cdef int length = len(text)
+    cdef Py_UCS4 current_char
+    cdef Py_UCS4 next_char
+
+    while current_char_index < length and current_char_index < stop:
+        current_char = text[current_char_index]
+
+        # whitespace
+        if char_is(current_char, LC_BLANK | LC_NEWLINE):
+            current_char_index = skip_whitespace(text, current_char_index + 1, length, True)
+            continue
+
+        next_char = 0
+        if current_char_index + 1 < length:
+            next_char = text[current_char_index + 1]
+
+        # attribute
+        if current_char == '@':
+            current_char_index = handle_attribute(current_char_index, text, length, tokens)
+        # directive
+        elif current_char == '#':
+            current_char_index = handle_directive(current_char_index, text, length, tokens)
+        # comment
+        elif current_char == '/' and next_char == '/':
+            current_char_index = handle_comment(current_char_index, text, length, tokens)
+        # multiline comment
+        elif current_char == '/' and next_char == '*':
+            current_char_index = handle_multiline_comment(current_char_index, text, length, tokens)
+        # scope
+        elif current_char == ':' and next_char == ':':
+            tokens.push(TK_KEYWORD, current_char_index, 2)
+            current_char_index += 2
+        # range
+        elif current_char == '.' and next_char == '.':
+            tokens.push(TK_OPERATOR, current_char_index, 2)
+            current_char_index += 2
+        # operator
+        elif current_char in u"=!^?+-*%&|~<>/:":
+            current_char_index = handle_operator(current_char_index, text, tokens)            
+        # string
+        elif current_char in u"\"'`":
+            current_char_index = handle_string(current_char_index, text, length, tokens)
+        # number
+        elif is_digit(current_char):
+            current_char_index = handle_number(current_char_index, text, length, tokens)
+        # identifier
+        elif is_alpha(current_char) or current_char == '_':
+            current_char_index = handle_identifier(current_char_index, text, length, words, tokens)
+        # default
+        else:
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
 
     return current_char_index
 
 @cython.cclass
 class Lexer:
+    words = cython.declare(WordTable, visibility="readonly")
+
+    def __init__(self, extra_words=None):
+        # extra_words : { style: words } added to word table, e.g. { "built_in": ["append"] }
+        self.words = WORDS.extended(word_kinds(extra_words, WORD_KINDS)) if extra_words else WORDS
 
     @property
     def lexer_name(self):
@@ -233,67 +332,90 @@ class Lexer:
         return "//"
 
     def tokenize(self, str text):
-        cdef int current_char_index = 0
-        cdef int length = len(text)
-        cdef list tokens = []
-        cdef str current_char
-        cdef str next_char
-
-        while current_char_index < length:
-            current_char = text[current_char_index]
-
-            # whitespace
-            if current_char in { ' ', '\t', '\r', '\n' }:
-                current_char_index += 1
-                continue
-
-            next_char = text[current_char_index + 1] if current_char_index + 1 < length else ""
-
-            # attribute
-            if current_char == '@':
-                current_char_index = handle_attribute(current_char_index, text, length, tokens)
-            # directive
-            elif current_char == '#':
-                current_char_index = handle_directive(current_char_index, text, length, tokens)
-            # comment
-            elif current_char == '/' and next_char == '/':
-                current_char_index = handle_comment(current_char_index, text, length, tokens)
-            # multiline comment
-            elif current_char == '/' and next_char == '*':
-                current_char_index = handle_multiline_comment(current_char_index, text, length, tokens)
-            # scope
-            elif current_char == ':' and next_char == ':':
-                tokens.append((KEYWORD, current_char_index, current_char + next_char))
-                current_char_index += 2
-            # range
-            elif current_char == '.' and next_char == '.':
-                tokens.append((OPERATOR, current_char_index, current_char + next_char))
-                current_char_index += 2
-            # operator
-            elif current_char in { '=', '!', '^', '?', '+', '-', '*', '%', '&', '|', '~', '<', '>', '/', ':' }:
-                current_char_index = handle_operator(current_char_index, text, tokens)            
-            # string
-            elif current_char in { '\"', '\'', '`' }:
-                current_char_index = handle_string(current_char_index, text, length, tokens)
-            # number
-            elif current_char.isdigit():
-                current_char_index = handle_number(current_char_index, text, length, tokens)
-            # identifier
-            elif current_char.isalpha() or current_char == '_':
-                current_char_index = handle_identifier(current_char_index, text, length, tokens)
-            # default
-            else:
-                tokens.append((DEFAULT, current_char_index, current_char))
-                current_char_index += 1
+        return self.tokenize_compact(text).to_list()
 
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        scan_into(text, 0, len(text), self.words, tokens)
         return tokens
 
+    def tokenize_lines(self, str text):
+        # (tokens, LineStates) with state at every line start
+        return tokenize_lines(self.scan_lines, text, INITIAL_STATE)
 
+    def tokenize_from(self, str text, Py_ssize_t start_offset, state, stop=None):
+        # (tokens, LineStates) from line start start_offset in state (resumable, from LineStates)
+        return tokenize_lines(self.scan_lines, text, state, start_offset, stop)
 
+    def retokenize(self, str text, list old_tokens, old_lines, edits):
+        # (tokens, lines, (changed_start, changed_end)) for buffer after edits, re-lexing from the
+        # last line before each edit outside comments and strings (see tokenize_lines)
+        return retokenize_lines(self.scan_lines, resumable, text, old_tokens, old_lines, edits)
+
+    def scan_lines(self, str text, Py_ssize_t start, Py_ssize_t stop, state, list tokens, lines):
+        # tokenize from line start outside tokens, appending to tokens and lines, and return
+        # first line start at or after stop outside tokens (or end of text)
+        cdef TokenArray found = TokenArray(text, STYLES)
+        cdef int length = len(text)
+        cdef int pos = start
+        cdef int end
+        cdef int line_start
+        cdef int newline
+        cdef int token_start
+        cdef Py_ssize_t k = 0
+
+        while True:
+            pos = scan_into(text, pos, stop, self.words, found)
+            if pos >= length:
+                pos = length
+                break
+
+            # scan may have skipped whitespace past line starts, first one after last token is a boundary
+            end = found.starts[found.count - 1] + found.lengths[found.count - 1] if found.count > 0 else start
+            end = max(end, stop)
+            line_start = end if text[end - 1] == '\n' else text.find('\n', end) + 1
+            if line_start == 0:
+                line_start = length
+            if line_start <= pos:
+                pos = line_start
+                break
+            stop = line_start
+
+        tokens.extend(found)
+
+        newline = text.find('\n', start, pos)
+        while newline >= 0:
+            line_start = newline + 1
+            while k < found.count and found.starts[k] + found.lengths[k] <= line_start:
+                k += 1
+
+            if k < found.count and found.starts[k] < line_start:
+                token_start = found.starts[k]
+                lines.append(line_start, text[token_start:token_start + 2] if text[token_start] == '/' else text[token_start])
+            else:
+                lines.append(line_start, INITIAL_STATE)
 
+            newline = text.find('\n', line_start, pos)
 
+        return pos
 
+    def symbol_index(self, str text, TokenArray tokens=None):
+        # outline (name :: proc, name :: struct, ...) from tokens of text (tokenized if not given), see SymbolIndex
+        return SymbolIndex(tokens if tokens is not None else self.tokenize_compact(text))
 
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing from the
+        # line start (or the string or block comment spanning it)
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef int line_start = text.rfind('\n', 0, start_offset) + 1
+        cdef int line_end = text.find('\n', max(end_offset - 1, line_start))
 
+        if line_end < 0:
+            line_end = len(text)
 
+        scan_into(text, restart_point(text, line_start), line_end, self.words, tokens)
+        return tokens.to_list()
 
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        return self.tokenize_range(text, *line_range(text, first_line, last_line))
@@ -3,13 +3,20 @@
 // MIT © 2025 @asyncze (Michael Sjöberg)
 // Build:
 // export SDKROOT=$(xcrun --sdk macosx --show-sdk-path)
-// clang -O3 -fPIC -shared -std=c11 -undefined dynamic_lookup $(python3-config --includes) odin_tokenizer.c -o odin_tokenizer$(python3-config --extension-suffix)
+// clang -O3 -fPIC -shared -std=c11 -undefined dynamic_lookup -I.. $(python3-config --includes) _odin_tokenizer.c -o odin_tokenizer$(python3-config --extension-suffix)
+// (-I.. for lexer_core.h, _odin_words.h is generated by gen_words.py)
 
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <stdint.h>
 #include <string.h>
 #include <stdlib.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#include "_odin_words.h"
 
 // --- Token Types ---
 
@@ -64,46 +71,15 @@ static inline int is_digit(uint8_t c) { return (c>='0' && c<='9'); }
 static inline int is_alnum(uint8_t c) { return is_alpha(c) || is_digit(c); }
 static inline int is_space(uint8_t c) { return c==' '||c=='\t'||c=='\r'||c=='\f'||c=='\v'; }
 
-typedef struct { const char* s; uint8_t ln; } Word;
-
-// KEYWORDS
-static const Word KEYWORDS[] = {
-    {"asm",3},{"auto_cast",9},{"bit_set",7},{"break",5},{"case",4},{"cast",4},
-    {"context",7},{"continue",8},{"defer",5},{"distinct",8},{"do",2},{"dynamic",7},
-    {"else",4},{"enum",4},{"fallthrough",11},{"for",3},{"foreign",7},{"if",2},
-    {"import",6},{"in",2},{"map",3},{"not_in",6},{"or_else",7},{"or_return",9},
-    {"package",7},{"proc",4},{"return",6},{"struct",6},{"switch",6},{"transmute",9},
-    {"typeid",6},{"union",5},{"using",5},{"when",4},{"where",5},
-};
-static const int N_KEYWORDS = (int)(sizeof(KEYWORDS)/sizeof(KEYWORDS[0]));
-
-// BUILT_INS
-static const Word BUILT_INS[] = {
-    {"fmt",3},{"len",3},{"println",7},
-};
-static const int N_BUILT_INS = (int)(sizeof(BUILT_INS)/sizeof(BUILT_INS[0]));
-
-// TYPES (from your set)
-static const Word TYPES[] = {
-    {"i8",2},{"i16",3},{"i32",3},{"i64",3},{"i128",4},{"int",3},
-    {"u8",2},{"u16",3},{"u32",3},{"u64",3},{"u128",4},{"uint",4},
-    {"f32",3},{"f64",3},{"complex64",9},{"complex128",10},
-    {"quaternion128",13},{"quaternion256",13},{"string",6},{"rune",4},{"bool",4},
-};
-static const int N_TYPES = (int)(sizeof(TYPES)/sizeof(TYPES[0]));
-
-// CONDITIONAL literals
-static const Word CONDITIONALS[] = { {"true",4}, {"false",5} };
-static const int N_CONDITIONALS = 2;
-
-static int word_in_table(const Word* tab, int n, const uint8_t* p, Py_ssize_t ln) {
-    if (ln < 1 || ln > 64) return 0;
-    uint8_t c0 = p[0] | 32;
-    for (int i=0;i<n;i++) {
-        if (((tab[i].s[0]|32)==c0) && tab[i].ln==ln && memcmp(tab[i].s, (const char*)p, (size_t)ln)==0)
-            return 1;
+// KEYWORDS, BUILT_INS, TYPES and CONDITIONALS (perfect hash from _odin_words.h)
+static inline int word_kind(const uint8_t* p, Py_ssize_t ln) {
+    switch (lc_word_kind(&odin_words, p, 1, 0, ln)) {
+        case ODIN_WORDS_TK_KEYWORD: return TK_KEYWORD;
+        case ODIN_WORDS_TK_BUILT_IN: return TK_BUILT_IN;
+        case ODIN_WORDS_TK_TYPE: return TK_TYPE;
+        case ODIN_WORDS_TK_CONDITIONAL: return TK_CONDITIONAL;
+        default: return TK_DEFAULT;
     }
-    return 0;
 }
 
 // --- Scanner ---
@@ -135,12 +111,10 @@ static void scan_line_comment(Scanner* sc) {
 static void scan_block_comment(Scanner* sc) {
     const uint8_t* t = sc->t; const uint8_t* max=sc->max_t;
     // assumes we are at first '/' of '/*'
+    // unterminated comments run to the end (not to the byte before it, which can split a utf-8 char)
     t += 2;
-    while (t+1<max) {
-        if (t[0]=='*' && t[1]=='/') { t+=2; break; }
-        t++;
-    }
-    sc->t = t;
+    while (t+1<max && !(t[0]=='*' && t[1]=='/')) t++;
+    sc->t = t+1<max ? t+2 : max;
 }
 
 static void scan_string(Scanner* sc, uint8_t delim) {
@@ -277,78 +251,198 @@ static int next_token(Scanner* sc, TokenBuf* out) {
     if (is_alpha(c) || c=='_') {
         scan_identifier(sc);
         Py_ssize_t len = (Py_ssize_t)(sc->t - start);
-        int kind = TK_DEFAULT;
-        if (word_in_table(KEYWORDS, N_KEYWORDS, start, len)) kind = TK_KEYWORD;
-        else if (word_in_table(BUILT_INS, N_BUILT_INS, start, len)) kind = TK_BUILT_IN;
-        else if (word_in_table(TYPES, N_TYPES, start, len)) kind = TK_TYPE;
-        else if (word_in_table(CONDITIONALS, N_CONDITIONALS, start, len)) kind = TK_CONDITIONAL;
+        int kind = word_kind(start, len);
 
         if (!tokbuf_push(out, kind, (Py_ssize_t)(start - sc->buf), len)) return -1;
         return 1;
     }
 
-    // default single char
+    // default single char (whole utf-8 sequence)
     sc->t++;
-    if (!tokbuf_push(out, TK_DEFAULT, (Py_ssize_t)(start - sc->buf), 1)) return -1;
+    while (sc->t<sc->max_t && (*sc->t & 0xC0)==0x80) sc->t++;
+    if (!tokbuf_push(out, TK_DEFAULT, (Py_ssize_t)(start - sc->buf), (Py_ssize_t)(sc->t - start))) return -1;
     return 1;
 }
 
-// --- Python binding ---
-static PyObject* py_tokenize(PyObject* self, PyObject* args, PyObject* kwargs) {
-    // Accept: bytes/bytearray/memoryview (preferred), or str (will encode to UTF-8 once)
-    static char* kwlist[] = { "data", NULL };
-    PyObject* obj;
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O", kwlist, &obj)) return NULL;
+// --- UTF-8 offsets ---
 
-    Py_buffer view;
-    uint8_t* buf = NULL;
-    Py_ssize_t n = 0;
-    PyObject* temp_bytes = NULL;
+// The scanner works on UTF-8 bytes, str offsets are code points. Byte offsets
+// are converted with a sparse index holding the code point count at every
+// UTF8_STEP bytes: a lookup is one index read plus counting lead bytes in at
+// most UTF8_STEP bytes, and sorted lookups (token starts and ends) continue
+// from the previous one within a block.
 
-    if (PyUnicode_Check(obj)) {
-        temp_bytes = PyUnicode_AsEncodedString(obj, "utf-8", "surrogatepass");
-        if (!temp_bytes) return NULL;
-        if (PyObject_GetBuffer(temp_bytes, &view, PyBUF_SIMPLE) != 0) {
-            Py_DECREF(temp_bytes); return NULL;
-        }
-        buf = (uint8_t*)view.buf; n = view.len;
-    } else {
-        if (PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) != 0) return NULL;
-        buf = (uint8_t*)view.buf; n = view.len;
+#define UTF8_STEP 4096
+
+typedef struct {
+    const uint8_t* buf;
+    Py_ssize_t n;
+    Py_ssize_t* counts;  // code points before byte k * UTF8_STEP
+    Py_ssize_t at_byte;  // previous lookup
+    Py_ssize_t at_char;
+} Utf8Index;
+
+static inline Py_ssize_t utf8_count(const uint8_t* p, Py_ssize_t len) {
+    Py_ssize_t count = 0;
+    for (Py_ssize_t i=0;i<len;i++) count += (p[i] & 0xC0) != 0x80;
+    return count;
+}
+
+static int utf8_index_init(Utf8Index* idx, const uint8_t* buf, Py_ssize_t n) {
+    Py_ssize_t blocks = n / UTF8_STEP + 1;
+    idx->counts = (Py_ssize_t*)malloc((size_t)blocks * sizeof(Py_ssize_t));
+    if (!idx->counts) return 0;
+
+    idx->buf = buf; idx->n = n;
+    idx->at_byte = 0; idx->at_char = 0;
+    idx->counts[0] = 0;
+    for (Py_ssize_t k=1;k<blocks;k++)
+        idx->counts[k] = idx->counts[k-1] + utf8_count(buf + (k-1)*UTF8_STEP, UTF8_STEP);
+    return 1;
+}
+
+static inline Py_ssize_t utf8_char_offset(Utf8Index* idx, Py_ssize_t off) {
+    Py_ssize_t block = off - off % UTF8_STEP;
+    if (idx->at_byte > off || idx->at_byte < block) {
+        idx->at_byte = block;
+        idx->at_char = idx->counts[block / UTF8_STEP];
     }
+    idx->at_char += utf8_count(idx->buf + idx->at_byte, off - idx->at_byte);
+    idx->at_byte = off;
+    return idx->at_char;
+}
 
-    TokenBuf out = {0};
+// --- Python binding ---
+
+// scan buf into out, offsets in code points if char_offsets (no Python objects, runs without the gil)
+static int scan_buffer(const uint8_t* buf, Py_ssize_t n, int char_offsets, TokenBuf* out) {
+    Utf8Index idx = {0};
     Scanner sc = { buf, buf, buf + n };
     int rc;
-    while ((rc = next_token(&sc, &out)) > 0) { /* loop */ }
-    if (rc < 0) {
-        if (temp_bytes) { PyBuffer_Release(&view); Py_DECREF(temp_bytes); }
-        else PyBuffer_Release(&view);
-        free(out.data);
-        return PyErr_NoMemory();
-    }
 
-    PyObject* pylist = PyList_New(out.count);
-    if (!pylist) {
-        if (temp_bytes) { PyBuffer_Release(&view); Py_DECREF(temp_bytes); }
-        else PyBuffer_Release(&view);
-        free(out.data);
-        return NULL;
+    while ((rc = next_token(&sc, out)) > 0) { /* loop */ }
+    if (rc < 0) return 0;
+
+    if (char_offsets) {
+        if (!utf8_index_init(&idx, buf, n)) return 0;
+        for (Py_ssize_t i=0;i<out->count;i++) {
+            Token* t = &out->data[i];
+            Py_ssize_t start = utf8_char_offset(&idx, t->start);
+            t->len = utf8_char_offset(&idx, t->start + t->len) - start;
+            t->start = start;
+        }
+        free(idx.counts);
     }
+    return 1;
+}
+
+// tokenize buf as list of (kind, start, len), in code points if char_offsets else in bytes
+// (buf must stay valid and unchanged while the gil is released)
+static PyObject* tokenize_buffer(const uint8_t* buf, Py_ssize_t n, int char_offsets) {
+    TokenBuf out = {0};
+    PyObject* pylist = NULL;
+    int ok;
+
+    Py_BEGIN_ALLOW_THREADS
+    ok = scan_buffer(buf, n, char_offsets, &out);
+    Py_END_ALLOW_THREADS
+
+    if (!ok) { PyErr_NoMemory(); goto done; }
+
+    pylist = PyList_New(out.count);
+    if (!pylist) goto done;
+
     for (Py_ssize_t i=0;i<out.count;i++) {
         Token* t = &out.data[i];
         // (kind:int, start:int, len:int)
-        PyObject* tup = Py_BuildValue("(iii)", t->kind, (int)t->start, (int)t->len);
-        if (!tup) { Py_DECREF(pylist); if (temp_bytes){PyBuffer_Release(&view); Py_DECREF(temp_bytes);} else PyBuffer_Release(&view); free(out.data); return NULL; }
+        PyObject* tup = PyTuple_New(3);
+        if (!tup) { Py_CLEAR(pylist); goto done; }
         PyList_SET_ITEM(pylist, i, tup);
+
+        PyObject* kind_obj = PyLong_FromLong(t->kind);
+        PyObject* start_obj = PyLong_FromSsize_t(t->start);
+        PyObject* len_obj = PyLong_FromSsize_t(t->len);
+        PyTuple_SET_ITEM(tup, 0, kind_obj);
+        PyTuple_SET_ITEM(tup, 1, start_obj);
+        PyTuple_SET_ITEM(tup, 2, len_obj);
+        if (!kind_obj || !start_obj || !len_obj) { Py_CLEAR(pylist); goto done; }
     }
 
-    if (temp_bytes) { PyBuffer_Release(&view); Py_DECREF(temp_bytes); }
-    else PyBuffer_Release(&view);
+done:
     free(out.data);
     return pylist;
 }
 
+static PyObject* py_tokenize(PyObject* self, PyObject* args, PyObject* kwargs) {
+    // Accept: bytes/bytearray/memoryview (byte offsets), or str (code point offsets)
+    static char* kwlist[] = { "data", NULL };
+    PyObject* obj;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O", kwlist, &obj)) return NULL;
+
+    if (PyUnicode_Check(obj)) {
+        // ascii str is already utf-8 with byte == code point offsets, no copy
+        if (PyUnicode_IS_ASCII(obj))
+            return tokenize_buffer((const uint8_t*)PyUnicode_DATA(obj), PyUnicode_GET_LENGTH(obj), 0);
+
+        PyObject* temp_bytes = PyUnicode_AsEncodedString(obj, "utf-8", "surrogatepass");
+        if (!temp_bytes) return NULL;
+        PyObject* result = tokenize_buffer((const uint8_t*)PyBytes_AS_STRING(temp_bytes), PyBytes_GET_SIZE(temp_bytes), 1);
+        Py_DECREF(temp_bytes);
+        return result;
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) != 0) return NULL;
+    PyObject* result = tokenize_buffer((const uint8_t*)view.buf, view.len, 0);
+    PyBuffer_Release(&view);
+    return result;
+}
+
+static PyObject* py_tokenize_file(PyObject* self, PyObject* args, PyObject* kwargs) {
+    // mmap utf-8 file and tokenize in place, offsets in code points (as if decoded) unless byte_offsets
+    static char* kwlist[] = { "path", "byte_offsets", NULL };
+    PyObject* path_obj;
+    PyObject* path = NULL;
+    int byte_offsets = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p", kwlist, &path_obj, &byte_offsets)) return NULL;
+    if (!PyUnicode_FSConverter(path_obj, &path)) return NULL;
+
+    int fd = open(PyBytes_AS_STRING(path), O_RDONLY);
+    if (fd < 0) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path_obj);
+        Py_DECREF(path);
+        return NULL;
+    }
+
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path_obj);
+        close(fd); Py_DECREF(path);
+        return NULL;
+    }
+
+    Py_ssize_t n = (Py_ssize_t)st.st_size;
+    const uint8_t* buf = (const uint8_t*)"";
+    void* map = NULL;
+
+    if (n > 0) {
+        map = mmap(NULL, (size_t)n, PROT_READ, MAP_PRIVATE, fd, 0);
+        if (map == MAP_FAILED) {
+            PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path_obj);
+            close(fd); Py_DECREF(path);
+            return NULL;
+        }
+        madvise(map, (size_t)n, MADV_SEQUENTIAL);
+        buf = (const uint8_t*)map;
+    }
+    close(fd);
+    Py_DECREF(path);
+
+    PyObject* result = tokenize_buffer(buf, n, !byte_offsets);
+    if (map) munmap(map, (size_t)n);
+    return result;
+}
+
 static PyObject* py_kind_name(PyObject* self, PyObject* args) {
     int k;
     if (!PyArg_ParseTuple(args, "i", &k)) return NULL;
@@ -374,7 +468,8 @@ static PyObject* py_kind_name(PyObject* self, PyObject* args) {
 }
 
 static PyMethodDef Methods[] = {
-    {"tokenize", (PyCFunction)py_tokenize, METH_VARARGS|METH_KEYWORDS, "Tokenize Odin source. Returns list of (kind, start, len)."},
+    {"tokenize", (PyCFunction)py_tokenize, METH_VARARGS|METH_KEYWORDS, "Tokenize Odin source. Returns list of (kind, start, len), in code points for str and bytes for buffers."},
+    {"tokenize_file", (PyCFunction)py_tokenize_file, METH_VARARGS|METH_KEYWORDS, "Tokenize utf-8 file (mmap, no decode). Returns list of (kind, start, len) in code points, or bytes if byte_offsets."},
     {"kind_name", py_kind_name, METH_VARARGS, "Map kind int -> name string."},
     {NULL, NULL, 0, NULL}
 };
@@ -0,0 +1,38 @@
+// Generated by gen_words.py, do not edit
+
+#include "lexer_core.h"
+
+#define ODIN_WORDS_TK_KEYWORD 2
+#define ODIN_WORDS_TK_CONDITIONAL 12
+#define ODIN_WORDS_TK_BUILT_IN 13
+#define ODIN_WORDS_TK_TYPE 17
+
+static const int32_t odin_words_displace[] = {
+    0, -61, 0, -59, 0, -55, 3, -54, 0, -53, 2, 0, 4, -52, 0, 1,
+    0, 0, -41, 0, -36, 0, 1, 0, 0, 0, 0, 0, 1, 0, 2, -32,
+    6, 6, 1, 5, -27, 11, -21, -20, -19, 1, 1, 0, 1, -15, 1, -12,
+    -10, 0, 0, -7, -3, 0, 0, 0, 4, 12, 3, 0, 0
+};
+static const uint32_t odin_words_offsets[] = {
+    0, 7, 16, 19, 24, 27, 34, 41, 50, 53, 57, 70, 72, 75, 82, 86,
+    89, 91, 94, 98, 101, 105, 108, 112, 121, 124, 131, 134, 138, 143, 148, 151,
+    159, 165, 173, 179, 190, 196, 199, 203, 207, 212, 214, 216, 221, 223, 229, 233,
+    242, 248, 254, 258, 271, 281, 285, 292, 296, 303, 308, 311, 314
+};
+static const uint8_t odin_words_lengths[] = {
+    7, 9, 3, 5, 3, 7, 7, 9, 3, 4, 13, 2, 3, 7, 4, 3,
+    2, 3, 4, 3, 4, 3, 4, 9, 3, 7, 3, 4, 5, 5, 3, 8,
+    6, 8, 6, 11, 6, 3, 4, 4, 5, 2, 2, 5, 2, 6, 4, 9,
+    6, 6, 4, 13, 10, 4, 7, 4, 7, 5, 3, 3, 6
+};
+static const uint8_t odin_words_kinds[] = {
+    2, 2, 17, 12, 2, 2, 2, 17, 17, 17, 17, 2, 17, 13, 17, 17,
+    17, 13, 12, 17, 17, 13, 2, 2, 17, 2, 17, 17, 2, 2, 17, 2,
+    2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 17, 2, 17, 2,
+    17, 2, 2, 17, 17, 2, 2, 2, 2, 2, 17, 2, 2
+};
+static const unsigned char odin_words_chars[] = "bit_setor_returni16falseasmforeignpackagecomplex64inti128quaternion128dof64printlnuintf32i8lentrueu16u128fmtcasetransmutei32dynamici64boolusingbreaku64continuestructdistinctimportfallthroughnot_inforelseenumwhereifindeferu8switchruneauto_caststringtypeidcastquaternion256complex128procor_elsewhencontextunionu32mapreturn";
+
+static const lc_word_table odin_words = {
+    61, 13, odin_words_displace, odin_words_offsets, odin_words_lengths, odin_words_kinds, odin_words_chars
+};
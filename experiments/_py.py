@@ -25,6 +25,8 @@
 
 import re
 
+from incremental import LineStates, retokenize_lines, tokenize_lines
+
 WHITESPACE      = "whitespace"
 DEFAULT         = "default"
 KEYWORD         = "keyword"
@@ -45,6 +47,34 @@ ERROR           = "error"
 WARNING         = "warning"
 SUCCESS         = "success"
 
+# what tokenize_range skims for before the viewport : comments, strings, parentheses and declarations
+SKIM_REGEX = re.compile(r"#[^\n]*|'''|\"\"\"|['\"()]|\b(def|class)\s+([^\W\d]\w*)")
+# class name followed by bases, styled as a name and not declared by tokenize
+BASES_REGEX = re.compile(r"\s*\(")
+
+# state at line start (see LineStates in incremental.pyx) :
+#
+#   (string, function_declaration, function_parameters, function_arguments, skip_next_parameter,
+#    inside_import, inside_import_block, after_name, after_class, class_names, function_names)
+#
+# string is the open quote if the line starts inside a string, after_name and after_class
+# are about the last token (checked by "(" and class names) and names are frozensets
+INITIAL_STATE = ("", False, 0, 0, False, False, False, False, False, frozenset(), frozenset())
+
+def line_state(string, tokens, function_declaration, function_parameters, function_arguments, skip_next_parameter, inside_import, inside_import_block, class_names, function_names):
+    last = tokens[-1] if tokens else None
+    return (
+        string, function_declaration, function_parameters, function_arguments, skip_next_parameter,
+        inside_import, inside_import_block,
+        last is not None and last[0] == NAME,
+        last is not None and last[0] == KEYWORD and last[2] == "class",
+        class_names, function_names,
+    )
+
+def resumable(state):
+    # not inside a string, and "=" on the line can't restyle the last token of the line before (keyword arguments)
+    return not state[0] and state[3] != 1
+
 class Lexer(object):
     def __init__(self):
         self.KEYWORDS = [
@@ -116,10 +146,110 @@ class Lexer(object):
 
     def block_starters(self): return { ":", "(", "[", "{", "\"", "\'" }
 
-    def tokenize(self, text):        
-        tokens = []
-        current_char = ''
+    def tokenize(self, text):
+        return self._tokenize(text, 0, len(text), [], [])
+
+    def tokenize_lines(self, text):
+        # (tokens, LineStates) with lexer state at every line start
+        return tokenize_lines(self.scan_lines, text, INITIAL_STATE)
+
+    def tokenize_from(self, text, start_offset, state, stop=None):
+        # (tokens, LineStates) from line start start_offset in state (resumable, from LineStates),
+        # with a stand-in for the last token before it if state says it matters
+        seed = (NAME, start_offset, "") if state[7] else (KEYWORD, start_offset, "class") if state[8] else None
+        tokens = [] if seed is None else [seed]
+        lines = LineStates()
+        lines.append(start_offset, state)
+        self.scan_lines(text, start_offset, len(text) if stop is None else stop, state, tokens, lines)
+        return tokens if seed is None else tokens[1:], lines
+
+    def retokenize(self, text, old_tokens, old_lines, edits):
+        # (tokens, lines, (changed_start, changed_end)) for buffer after edits, re-lexing from the
+        # last resumable line before each edit until line states line up again (see tokenize_lines)
+        return retokenize_lines(self.scan_lines, resumable, text, old_tokens, old_lines, edits)
+
+    def scan_lines(self, text, start, stop, state, tokens, lines):
+        # tokenize from line start in state, appending to tokens and lines, and return first line
+        # start at or after stop outside tokens (the last one appended) or end of text
+        self._tokenize(text, start, stop, None, None, state, tokens, lines)
+        end = lines.starts[-1]
+        return end if end >= stop and not lines.states[-1][0] else len(text)
+
+    def tokenize_range(self, text, start_offset, end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing from the last line
+        # start before them that is outside strings and parentheses
+        line_start = text.rfind("\n", 0, start_offset) + 1
+        line_end = text.find("\n", max(end_offset - 1, line_start))
+        if line_end < 0: line_end = len(text)
+
+        restart, class_dir, function_dir = self._restart_point(text, line_start)
+        tokens = self._tokenize(text, restart, line_end, class_dir, function_dir)
+        return [token for token in tokens if token[1] + len(token[2]) > line_start]
+
+    def tokenize_visible(self, text, first_line, last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        start_offset = 0
+        for _ in range(first_line):
+            newline = text.find("\n", start_offset)
+            if newline < 0: return []
+            start_offset = newline + 1
+
+        end_offset = start_offset
+        for _ in range(first_line, last_line + 1):
+            newline = text.find("\n", end_offset)
+            end_offset = len(text) if newline < 0 else newline + 1
+
+        return self.tokenize_range(text, start_offset, end_offset)
+
+    def _restart_point(self, text, offset):
+        # (restart, class_dir, function_dir) : last line start at or before offset that is outside
+        # strings and parentheses, and class and function names declared before it
+        #
+        # strings (also single-quoted) and parentheses (function declarations, arguments and import
+        # blocks) are the only state tokenize carries across lines
+        restart = 0
+        depth = 0
         current_char_index = 0
+        class_dir = []
+        function_dir = []
+
+        while True:
+            match = SKIM_REGEX.search(text, current_char_index)
+            start_pos = match.start() if match else len(text)
+
+            if depth == 0:
+                newline = text.rfind("\n", current_char_index, min(start_pos, offset))
+                if newline >= 0: restart = newline + 1
+
+            if match is None or start_pos >= offset: return restart, class_dir, function_dir
+
+            current_char_index = match.end()
+            lexeme = match.group()
+
+            if lexeme == "(":
+                depth += 1
+            elif lexeme == ")":
+                depth -= 1 if depth > 0 else 0
+            elif match.group(1) == "def":
+                if match.group(2) not in function_dir: function_dir.append(match.group(2))
+            elif match.group(1) == "class":
+                if match.group(2) not in class_dir and not BASES_REGEX.match(text, current_char_index): class_dir.append(match.group(2))
+            elif lexeme in { "'", '"' } or start_pos + 3 >= len(text):
+                # single-line string (also ends at next quote on a later line)
+                end = text.find(lexeme[0], start_pos + 1)
+                current_char_index = len(text) if end < 0 else end + 1
+            elif lexeme[0] != "#":
+                end = text.find(lexeme, current_char_index)
+                current_char_index = len(text) if end < 0 else end + 3
+
+            # string or comment spanning offset
+            if current_char_index > offset and lexeme[0] != "#" and match.group(1) is None:
+                return restart, class_dir, function_dir
+
+    def _tokenize(self, text, current_char_index, stop, class_dir, function_dir, state=None, tokens=None, lines=None):
+        # state, tokens and lines are for scan_lines (lexes to line start at or after stop)
+        tokens = [] if tokens is None else tokens
+        current_char = ''
 
         function_declaration = False
         # use numerical to only match non-nested groups
@@ -131,10 +261,17 @@ class Lexer(object):
         inside_import = False
         inside_import_block = False
 
-        self.CLASS_DIR = []
-        self.FUNCTION_DIR = []
+        # class and function names are per call (not on self), so one Lexer can tokenize from several threads
 
-        while current_char_index < len(text):
+        if state is not None:
+            _, function_declaration, function_parameters, function_arguments, skip_next_parameter, inside_import, inside_import_block, _, _, class_names, function_names = state
+            class_dir = list(class_names)
+            function_dir = list(function_names)
+        elif lines is not None:
+            class_names = frozenset(class_dir)
+            function_names = frozenset(function_dir)
+
+        while current_char_index < len(text) and (current_char_index < stop or (lines is not None and text[current_char_index - 1] != '\n')):
             current_char = text[current_char_index]
             match current_char:
                 case ' ' | '\t' | '\r':
@@ -142,6 +279,11 @@ class Lexer(object):
                 case '\n':
                     current_char_index += 1
                     if inside_import == True and not inside_import_block == True: inside_import = False
+
+                    if lines is not None:
+                        if len(class_names) != len(class_dir): class_names = frozenset(class_dir)
+                        if len(function_names) != len(function_dir): function_names = frozenset(function_dir)
+                        lines.append(current_char_index, line_state("", tokens, function_declaration, function_parameters, function_arguments, skip_next_parameter, inside_import, inside_import_block, class_names, function_names))
                 case '#':
                     start_pos = current_char_index
                     current_char_index += 1
@@ -381,6 +523,16 @@ class Lexer(object):
                     
                     tokens.append((STRING, start_pos, string))
 
+                    # lines starting inside string (unclosed single-line strings run to end of text)
+                    newline = text.find('\n', start_pos, current_char_index) if lines is not None else -1
+                    if newline >= 0:
+                        if len(class_names) != len(class_dir): class_names = frozenset(class_dir)
+                        if len(function_names) != len(function_dir): function_names = frozenset(function_dir)
+                        inside = line_state(string[:3] if string.startswith(current_char * 3) else current_char, tokens, function_declaration, function_parameters, function_arguments, skip_next_parameter, inside_import, inside_import_block, class_names, function_names)
+                        while newline >= 0:
+                            lines.append(newline + 1, inside)
+                            newline = text.find('\n', newline + 1, current_char_index)
+
                 case _:
                     # number
                     if current_char.isdigit():                        
@@ -452,8 +604,8 @@ class Lexer(object):
                             # custom style for function and class name
                             if function_declaration and function_parameters == 0:
                                 tokens.append((NAME, start_pos, identifier))
-                                # append name to FUNCTION_DIR
-                                if identifier not in self.FUNCTION_DIR: self.FUNCTION_DIR.append(identifier)
+                                # append name to function_dir
+                                if identifier not in function_dir: function_dir.append(identifier)
                             
                             # custom style for function parameters
                             elif function_declaration and function_parameters == 1 and not skip_next_parameter:
@@ -472,12 +624,12 @@ class Lexer(object):
                             else:
                                 if len(tokens) > 0 and tokens[-1][0] == KEYWORD and tokens[-1][2] == "class":
                                     tokens.append((CLASS, start_pos, identifier))
-                                    # append to CLASS_DIR
-                                    if identifier not in self.CLASS_DIR: self.CLASS_DIR.append(identifier)
+                                    # append to class_dir
+                                    if identifier not in class_dir: class_dir.append(identifier)
                                 else:
-                                    if identifier in self.CLASS_DIR:
+                                    if identifier in class_dir:
                                         tokens.append((CLASS, start_pos, identifier))
-                                    elif identifier in self.FUNCTION_DIR:
+                                    elif identifier in function_dir:
                                         tokens.append((NAME, start_pos, identifier))
                                     else:
                                         # using identifier as type to easier find and style identifiers post lexing
@@ -0,0 +1,725 @@
+
+# MIT License
+
+# Copyright 2024, 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Tokenizer for Python 3
+
+# Compiled version of _py.py with the same tokens (and line states) in one pass :
+# characters are dispatched on Py_UCS4, words are looked up in a generated table,
+# numbers are checked by a small state machine instead of regexes and declared
+# class and function names are kept in sets.
+#
+# Lexer(forward_references=True) runs the scan twice for tokenize and
+# tokenize_compact, so names declared further down are styled too (_py.py and
+# the default only know names declared before use).
+
+# cython: language_level=3
+cimport cython
+from cpython.unicode cimport PyUnicode_DATA, PyUnicode_KIND
+from libc.stdint cimport uint32_t, uint64_t
+from lexer_core cimport (
+    char_is, is_alpha, is_digit, scan_to_char, scan_to_eol, scan_to_str, LC_BLANK,
+    WordTable, lc_word_table, lc_hash, wrap_words, word_kind,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_CLASS, TK_NAME, TK_PARAMETER, TK_STRING,
+    TK_NUMBER, TK_OPERATOR, TK_COMMENT, TK_SPECIAL, TK_TYPE, TK_CONDITIONAL,
+    TK_BUILT_IN, TK_ERROR,
+    SymbolIndex, SYM_CLASS, SYM_FUNCTION,
+)
+
+import re
+
+from incremental import retokenize_lines, tokenize_lines
+from lexer_core import make_styles
+
+cdef extern from "Python.h":
+    # same as str.isspace() and str.isdecimal() (re \d) per char
+    bint Py_UNICODE_ISSPACE(Py_UCS4 ch) nogil
+    bint Py_UNICODE_ISDECIMAL(Py_UCS4 ch) nogil
+
+cdef extern from "_py_words.h":
+    const lc_word_table py_words
+
+# --- Token Types ---
+
+cdef str WHITESPACE = "whitespace"
+cdef str DEFAULT = "default"
+cdef str KEYWORD = "keyword"
+cdef str CLASS = "class"
+cdef str NAME = "name"
+cdef str PARAMETER = "parameter"
+cdef str LAMBDA = "lambda"
+cdef str STRING = "string"
+cdef str NUMBER = "number"
+cdef str OPERATOR = "operator"
+cdef str COMMENT = "comment"
+cdef str SPECIAL = "special"
+cdef str TYPE = "type"
+cdef str CONDITIONAL = "conditional"
+cdef str BUILT_IN = "built_in"
+# system colors
+cdef str ERROR = "error"
+cdef str WARNING = "warning"
+cdef str SUCCESS = "success"
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_CLASS: CLASS,
+    TK_NAME: NAME,
+    TK_PARAMETER: PARAMETER,
+    TK_STRING: STRING,
+    TK_NUMBER: NUMBER,
+    TK_OPERATOR: OPERATOR,
+    TK_COMMENT: COMMENT,
+    TK_SPECIAL: SPECIAL,
+    TK_TYPE: TYPE,
+    TK_CONDITIONAL: CONDITIONAL,
+    TK_BUILT_IN: BUILT_IN,
+    TK_ERROR: ERROR,
+})
+
+
+# generated from gen_words.py
+cdef WordTable WORDS = wrap_words(&py_words)
+
+KEYWORDS = WORDS.words(TK_KEYWORD)
+BUILT_INS = WORDS.words(TK_BUILT_IN)
+TYPES = WORDS.words(TK_TYPE)
+
+cdef enum:
+    NAME_FILTER_WORDS = 64 # filter of declared names (most identifiers are not, and skip the set lookup)
+    NAME_FILTER_BITS = NAME_FILTER_WORDS * 64
+
+# what tokenize_range skims for before the viewport : comments, strings, parentheses and declarations
+SKIM_REGEX = re.compile(r"#[^\n]*|'''|\"\"\"|['\"()]|\b(def|class)\s+([^\W\d]\w*)")
+# class name followed by bases, styled as a name and not declared by tokenize
+BASES_REGEX = re.compile(r"\s*\(")
+
+# state at line start (see LineStates in incremental.pyx), same as in _py.py :
+#
+#   (string, function_declaration, function_parameters, function_arguments, skip_next_parameter,
+#    inside_import, inside_import_block, after_name, after_class, class_names, function_names)
+#
+# string is the open quote if the line starts inside a string, after_name and after_class
+# are about the last token (checked by "(" and class names) and names are frozensets
+INITIAL_STATE = ("", False, 0, 0, False, False, False, False, False, frozenset(), frozenset())
+
+def resumable(state):
+    # not inside a string, and "=" on the line can't restyle the last token of the line before (keyword arguments)
+    return not state[0] and state[3] != 1
+
+
+@cython.final
+cdef class LexState:
+    # lexer state carried across tokens (and lines)
+    cdef bint function_declaration
+    cdef int function_parameters # only match non-nested groups
+    cdef int function_arguments
+    cdef bint skip_next_parameter
+    cdef bint inside_import
+    cdef bint inside_import_block
+
+    # last token before the scan started (stands in for tokens[-1] while the scan has none)
+    cdef bint after_name
+    cdef bint after_class
+    cdef bint parameter_before # "=" made it a keyword argument
+
+    cdef set class_dir
+    cdef set function_dir
+    cdef frozenset class_names # last copies handed out in line states
+    cdef frozenset function_names
+    cdef uint64_t name_filter[NAME_FILTER_WORDS] # hashes of names in class_dir and function_dir
+
+    cdef int declare(self, set names, str name) except -1:
+        cdef uint32_t h = lc_hash(PyUnicode_DATA(name), PyUnicode_KIND(name), 0, len(name), 0) % NAME_FILTER_BITS
+        self.name_filter[h // 64] |= (<uint64_t>1) << (h % 64)
+        names.add(name)
+        return 0
+
+    cdef bint maybe_declared(self, str text, Py_ssize_t start, Py_ssize_t end):
+        # False if text[start:end] is in neither class_dir nor function_dir
+        cdef uint32_t h = lc_hash(PyUnicode_DATA(text), PyUnicode_KIND(text), start, end - start, 0) % NAME_FILTER_BITS
+        return (self.name_filter[h // 64] >> (h % 64)) & 1
+
+    cdef tuple line_state(self, str string, str text, TokenArray tokens):
+        if len(self.class_names) != len(self.class_dir):
+            self.class_names = frozenset(self.class_dir)
+        if len(self.function_names) != len(self.function_dir):
+            self.function_names = frozenset(self.function_dir)
+
+        return (
+            string, self.function_declaration, self.function_parameters, self.function_arguments,
+            self.skip_next_parameter, self.inside_import, self.inside_import_block,
+            is_name(tokens, self, tokens.count - 1), is_class_keyword(text, tokens, self, tokens.count - 1),
+            self.class_names, self.function_names,
+        )
+
+cdef LexState lex_state(tuple state):
+    # LexState at line start in state (see INITIAL_STATE)
+    cdef LexState lex = LexState.__new__(LexState)
+
+    lex.function_declaration = state[1]
+    lex.function_parameters = state[2]
+    lex.function_arguments = state[3]
+    lex.skip_next_parameter = state[4]
+    lex.inside_import = state[5]
+    lex.inside_import_block = state[6]
+    lex.after_name = state[7]
+    lex.after_class = state[8]
+    lex.class_names = state[9]
+    lex.function_names = state[10]
+    lex.class_dir = set()
+    lex.function_dir = set()
+    for name in lex.class_names:
+        lex.declare(lex.class_dir, name)
+    for name in lex.function_names:
+        lex.declare(lex.function_dir, name)
+    return lex
+
+cdef LexState declared_state(class_dir, function_dir):
+    # LexState at start of text with names already declared
+    cdef LexState lex = lex_state(INITIAL_STATE)
+    for name in class_dir:
+        lex.declare(lex.class_dir, name)
+    for name in function_dir:
+        lex.declare(lex.function_dir, name)
+    return lex
+
+cdef inline bint is_name(TokenArray tokens, LexState state, Py_ssize_t index):
+    # token at index is a name (index -1 is the token before the scan)
+    if index >= 0:
+        return tokens.kinds[index] == TK_NAME
+    return index == -1 and state.after_name
+
+cdef bint is_class_keyword(str text, TokenArray tokens, LexState state, Py_ssize_t index):
+    # token at index is the class keyword (index -1 is the token before the scan)
+    cdef Py_ssize_t start
+    if index >= 0:
+        start = tokens.starts[index]
+        return tokens.kinds[index] == TK_KEYWORD and tokens.lengths[index] == 5 and text[start:start + 5] == "class"
+    return index == -1 and state.after_class
+
+cdef bint is_name_start(Py_UCS4 ch):
+    # same as str.isidentifier() for one char
+    cdef str char
+    if ch < 0x100:
+        return is_alpha(ch) or ch == '_'
+    char = ch
+    return char.isidentifier()
+
+cdef bint is_number(str text, Py_ssize_t start, Py_ssize_t end):
+    # state machine for the numbers _py.py matches with regexes :
+    #
+    #   0[bB][01]+  0[xX][0-9a-fA-F]+  0[oO][0-7]+
+    #   d+(.d+)?  d+(.d+)?[eE]d+  d+(.d+)?[jJ]  d+.dd+.d+[jJ]
+    #
+    # where d is a unicode decimal (re \d), the run never has signs
+    cdef Py_ssize_t i = start + 2
+    cdef Py_ssize_t fraction = 0
+    cdef Py_UCS4 ch
+    cdef Py_UCS4 prefix
+
+    if end - start > 2 and text[start] == '0':
+        prefix = text[start + 1]
+        if prefix in u"bBxXoO":
+            while i < end:
+                ch = text[i]
+                if prefix == 'b' or prefix == 'B':
+                    if not (ch == '0' or ch == '1'): break
+                elif prefix == 'o' or prefix == 'O':
+                    if not (ch >= '0' and ch <= '7'): break
+                elif not (ch < 0x80 and ch in u"0123456789abcdefABCDEF"):
+                    break
+                i += 1
+            if i == end:
+                return True
+
+    # integer part
+    i = start
+    while i < end and Py_UNICODE_ISDECIMAL(text[i]):
+        i += 1
+    if i == start:
+        return False
+
+    # fraction
+    if i + 1 < end and text[i] == '.' and Py_UNICODE_ISDECIMAL(text[i + 1]):
+        i += 1
+        while i < end and Py_UNICODE_ISDECIMAL(text[i]):
+            i += 1
+            fraction += 1
+
+    if i == end:
+        return True
+
+    ch = text[i]
+    i += 1
+
+    # exponent
+    if ch == 'e' or ch == 'E':
+        if i == end:
+            return False
+        while i < end and Py_UNICODE_ISDECIMAL(text[i]):
+            i += 1
+        return i == end
+
+    # imaginary
+    if ch == 'j' or ch == 'J':
+        return i == end
+
+    # imaginary with two fractions (second decimal starts inside first fraction)
+    if ch == '.' and fraction >= 2 and i < end and Py_UNICODE_ISDECIMAL(text[i]):
+        while i < end and Py_UNICODE_ISDECIMAL(text[i]):
+            i += 1
+        return i + 1 == end and (text[i] == 'j' or text[i] == 'J')
+
+    return False
+
+
+cdef Py_ssize_t handle_comment(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    current_char_index = scan_to_eol(text, current_char_index + 1, length)
+
+    tokens.push(TK_COMMENT, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_dot(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # triple dot is special, single dot is keyword
+    if current_char_index + 2 < length and text[current_char_index + 1] == '.' and text[current_char_index + 2] == '.':
+        tokens.push(TK_SPECIAL, current_char_index, 3)
+        return current_char_index + 3
+
+    tokens.push(TK_KEYWORD, current_char_index, 1)
+    return current_char_index + 1
+
+cdef Py_ssize_t handle_operator(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # + - * / % and their assignments, ** and //, -> is default
+    cdef Py_UCS4 current_char = text[current_char_index]
+    cdef Py_UCS4 next_char = 0
+    if current_char_index + 1 < length:
+        next_char = text[current_char_index + 1]
+    cdef Py_ssize_t size = 1
+
+    if current_char == '-' and next_char == '>':
+        tokens.push(TK_DEFAULT, current_char_index, 2)
+        return current_char_index + 2
+
+    if (current_char == '*' or current_char == '/') and next_char == current_char:
+        size = 2
+        next_char = 0
+        if current_char_index + 2 < length:
+            next_char = text[current_char_index + 2]
+    if next_char == '=':
+        size += 1
+
+    tokens.push(TK_OPERATOR, current_char_index, size)
+    return current_char_index + size
+
+cdef Py_ssize_t handle_comparison(Py_ssize_t current_char_index, str text, Py_ssize_t length, LexState state, TokenArray tokens) except -1:
+    # == != < <= << > >= >> are conditional, = and ! are operators
+    cdef Py_UCS4 current_char = text[current_char_index]
+    cdef Py_UCS4 next_char = 0
+    if current_char_index + 1 < length:
+        next_char = text[current_char_index + 1]
+
+    if next_char == '=' or ((current_char == '<' or current_char == '>') and next_char == current_char):
+        tokens.push(TK_CONDITIONAL, current_char_index, 2)
+        return current_char_index + 2
+
+    if current_char == '<' or current_char == '>':
+        tokens.push(TK_CONDITIONAL, current_char_index, 1)
+    else:
+        tokens.push(TK_OPERATOR, current_char_index, 1)
+
+        # identifier before = in call is keyword argument
+        if current_char == '=' and state.function_arguments == 1:
+            if tokens.count >= 2:
+                tokens.kinds[tokens.count - 2] = TK_PARAMETER
+            else:
+                state.parameter_before = True
+
+    return current_char_index + 1
+
+cdef Py_ssize_t handle_bracket(Py_ssize_t current_char_index, str text, LexState state, TokenArray tokens) except -1:
+    # parentheses track declarations, call arguments and import blocks
+    cdef Py_UCS4 current_char = text[current_char_index]
+    tokens.push(TK_DEFAULT, current_char_index, 1)
+
+    if current_char == '(':
+        if state.function_declaration:
+            state.function_parameters += 1
+        if is_name(tokens, state, tokens.count - 2):
+            state.function_arguments += 1
+        if state.inside_import:
+            state.inside_import_block = True
+    elif current_char == ')':
+        if state.function_declaration and state.function_parameters > 0:
+            state.function_parameters -= 1
+        if state.function_arguments > 0:
+            state.function_arguments -= 1
+        state.inside_import_block = False
+
+    return current_char_index + 1
+
+cdef Py_ssize_t handle_separator(Py_ssize_t current_char_index, str text, LexState state, TokenArray tokens) except -1:
+    cdef Py_UCS4 current_char = text[current_char_index]
+    tokens.push(TK_DEFAULT, current_char_index, 1)
+
+    # end of declaration
+    if state.function_declaration and state.function_parameters == 0:
+        state.function_declaration = False
+        state.skip_next_parameter = False
+    # only highlight keys at lowest level as parameters
+    if state.function_declaration and state.function_parameters == 1 and state.skip_next_parameter and current_char == ',':
+        state.skip_next_parameter = False
+
+    return current_char_index + 1
+
+cdef Py_ssize_t handle_string(Py_ssize_t current_char_index, str text, Py_ssize_t length, LexState state, TokenArray tokens, lines) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_UCS4 quote = text[current_char_index]
+    cdef bint triple = False
+    cdef Py_ssize_t end
+    cdef Py_ssize_t newline
+    cdef tuple inside
+    current_char_index += 1
+
+    # multi-line (triple quotes), unclosed runs to end of text
+    if current_char_index + 2 < length and text[current_char_index] == quote and text[current_char_index + 1] == quote:
+        triple = True
+        end = scan_to_str(text, current_char_index + 2, length, u"'''" if quote == '\'' else u'"""')
+        current_char_index = end + 3 if end < length else length
+        tokens.push(TK_STRING, start_pos, current_char_index - start_pos)
+    # single-line string (ends at next quote, on any line), unclosed is the quote only
+    else:
+        end = scan_to_char(text, current_char_index, length, quote)
+        if end < length:
+            current_char_index = end + 1
+            tokens.push(TK_STRING, start_pos, current_char_index - start_pos)
+        else:
+            current_char_index = length
+            tokens.push(TK_STRING, start_pos, 1)
+
+    # lines starting inside string
+    if lines is not None:
+        newline = scan_to_eol(text, start_pos, current_char_index)
+        if newline < current_char_index:
+            inside = state.line_state(text[start_pos:start_pos + 3] if triple else text[start_pos], text, tokens)
+            while newline < current_char_index:
+                lines.append(newline + 1, inside)
+                newline = scan_to_eol(text, newline + 1, current_char_index)
+
+    return current_char_index
+
+cdef Py_ssize_t handle_number(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_UCS4 ch
+    current_char_index += 1
+
+    while current_char_index < length:
+        ch = text[current_char_index]
+        if not (is_digit(ch) or is_alpha(ch) or ch == '.'):
+            break
+        current_char_index += 1
+
+    tokens.push(TK_NUMBER if is_number(text, start_pos, current_char_index) else TK_DEFAULT, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_identifier(Py_ssize_t current_char_index, str text, Py_ssize_t length, LexState state, TokenArray tokens) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_ssize_t n
+    cdef Py_UCS4 ch
+    cdef Py_UCS4 next_non_empty_char = 0
+    cdef int kind
+    cdef str identifier
+    current_char_index += 1
+
+    while current_char_index < length:
+        ch = text[current_char_index]
+        if not (is_name_start(ch) or is_digit(ch)):
+            break
+        current_char_index += 1
+
+    # use default inside imports
+    if state.inside_import:
+        tokens.push(TK_DEFAULT, start_pos, current_char_index - start_pos)
+        return current_char_index
+
+    # conditional, type, special, built_in, parameter (lambda) or keyword, self is a name in declarations
+    kind = word_kind(WORDS, text, start_pos, current_char_index)
+    if kind == TK_SPECIAL and state.function_declaration:
+        kind = -1
+
+    if kind >= 0:
+        tokens.push(kind, start_pos, current_char_index - start_pos)
+
+        # update state for custom function declaration styling
+        if kind == TK_KEYWORD and current_char_index - start_pos in (3, 6):
+            identifier = text[start_pos:current_char_index]
+            if identifier == "def": state.function_declaration = True
+            elif identifier == "import": state.inside_import = True
+        return current_char_index
+
+    # single underscore is special
+    if current_char_index - start_pos == 1 and text[start_pos] == '_':
+        tokens.push(TK_SPECIAL, start_pos, 1)
+        return current_char_index
+
+    n = current_char_index
+    while n < length and Py_UNICODE_ISSPACE(text[n]):
+        n += 1
+    if n < length:
+        next_non_empty_char = text[n]
+
+    # custom style for function name
+    if state.function_declaration and state.function_parameters == 0:
+        tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
+        state.declare(state.function_dir, text[start_pos:current_char_index])
+        if tokens.count >= 2 and tokens.kinds[tokens.count - 2] == TK_KEYWORD:
+            tokens.mark_symbol(tokens.count - 1, SYM_FUNCTION)
+    # custom style for function parameters
+    elif state.function_declaration and state.function_parameters == 1 and not state.skip_next_parameter:
+        if next_non_empty_char == ':':
+            state.skip_next_parameter = True
+        tokens.push(TK_PARAMETER, start_pos, current_char_index - start_pos)
+    # custom style for function names
+    elif next_non_empty_char == '(':
+        tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
+    # class name
+    elif is_class_keyword(text, tokens, state, tokens.count - 1):
+        tokens.push(TK_CLASS, start_pos, current_char_index - start_pos)
+        tokens.mark_symbol(tokens.count - 1, SYM_CLASS)
+        state.declare(state.class_dir, text[start_pos:current_char_index])
+    else:
+        kind = TK_DEFAULT
+        if state.maybe_declared(text, start_pos, current_char_index):
+            identifier = text[start_pos:current_char_index]
+            if identifier in state.class_dir:
+                kind = TK_CLASS
+            elif identifier in state.function_dir:
+                kind = TK_NAME
+        tokens.push(kind, start_pos, current_char_index - start_pos)
+
+    return current_char_index
+
+cdef Py_ssize_t scan_into(str text, Py_ssize_t current_char_index, Py_ssize_t stop, LexState state, TokenArray tokens, lines) except -1:
+    # tokenize from line start in state, return at first token boundary at or after stop, or if lines
+    # is given at first line start at or after stop (recording state at every line start on the way)
+    cdef Py_ssize_t length = len(text)
+    cdef bint record = lines is not None
+    cdef Py_UCS4 current_char
+
+    while current_char_index < length and (current_char_index < stop or (record and current_char_index > 0 and text[current_char_index - 1] != '\n')):
+        current_char = text[current_char_index]
+
+        # whitespace
+        if char_is(current_char, LC_BLANK):
+            current_char_index += 1
+        # newline
+        elif current_char == '\n':
+            current_char_index += 1
+            if state.inside_import and not state.inside_import_block:
+                state.inside_import = False
+            if record:
+                lines.append(current_char_index, state.line_state("", text, tokens))
+        # comment
+        elif current_char == '#':
+            current_char_index = handle_comment(current_char_index, text, length, tokens)
+        # attribute access or ellipsis
+        elif current_char == '.':
+            current_char_index = handle_dot(current_char_index, text, length, tokens)
+        # bitwise
+        elif current_char in u"^&|~":
+            tokens.push(TK_OPERATOR, current_char_index, 1)
+            current_char_index += 1
+        # arithmetic
+        elif current_char in u"+-*/%":
+            current_char_index = handle_operator(current_char_index, text, length, tokens)
+        # parentheses and brackets
+        elif current_char in u"()[]{}":
+            current_char_index = handle_bracket(current_char_index, text, state, tokens)
+        # anons
+        elif current_char in u",;:@\\´`":
+            current_char_index = handle_separator(current_char_index, text, state, tokens)
+        # assignment and comparison
+        elif current_char in u"=!<>":
+            current_char_index = handle_comparison(current_char_index, text, length, state, tokens)
+        # string
+        elif current_char == '"' or current_char == '\'':
+            current_char_index = handle_string(current_char_index, text, length, state, tokens, lines)
+        # number
+        elif is_digit(current_char):
+            current_char_index = handle_number(current_char_index, text, length, tokens)
+        # identifier
+        elif is_name_start(current_char):
+            current_char_index = handle_identifier(current_char_index, text, length, state, tokens)
+        else:
+            tokens.push(TK_ERROR, current_char_index, 1)
+            current_char_index += 1
+
+    return current_char_index
+
+cdef tuple restart_point(str text, Py_ssize_t offset):
+    # (restart, class_dir, function_dir) : last line start at or before offset that is outside
+    # strings and parentheses, and class and function names declared before it
+    #
+    # strings (also single-quoted) and parentheses (function declarations, arguments and import
+    # blocks) are the only state tokenize carries across lines
+    cdef Py_ssize_t restart = 0
+    cdef Py_ssize_t depth = 0
+    cdef Py_ssize_t current_char_index = 0
+    cdef Py_ssize_t length = len(text)
+    cdef Py_ssize_t start_pos
+    cdef Py_ssize_t newline
+    cdef Py_ssize_t end
+    cdef set class_dir = set()
+    cdef set function_dir = set()
+    cdef str lexeme
+
+    while True:
+        match = SKIM_REGEX.search(text, current_char_index)
+        start_pos = match.start() if match else length
+
+        if depth == 0:
+            newline = text.rfind("\n", current_char_index, min(start_pos, offset))
+            if newline >= 0: restart = newline + 1
+
+        if match is None or start_pos >= offset:
+            return restart, class_dir, function_dir
+
+        current_char_index = match.end()
+        lexeme = match.group()
+
+        if lexeme == "(":
+            depth += 1
+        elif lexeme == ")":
+            depth -= 1 if depth > 0 else 0
+        elif match.group(1) == "def":
+            function_dir.add(match.group(2))
+        elif match.group(1) == "class":
+            if not BASES_REGEX.match(text, current_char_index): class_dir.add(match.group(2))
+        elif lexeme == "'" or lexeme == '"' or start_pos + 3 >= length:
+            # single-line string (also ends at next quote on a later line)
+            end = text.find(lexeme[0], start_pos + 1)
+            current_char_index = length if end < 0 else end + 1
+        elif lexeme[0] != "#":
+            end = text.find(lexeme, current_char_index)
+            current_char_index = length if end < 0 else end + 3
+
+        # string or comment spanning offset
+        if current_char_index > offset and lexeme[0] != "#" and match.group(1) is None:
+            return restart, class_dir, function_dir
+
+@cython.cclass
+class Lexer:
+    forward_references = cython.declare(cython.bint, visibility="readonly")
+
+    def __init__(self, forward_references=False):
+        # forward_references : style names declared anywhere in text (tokenize and tokenize_compact)
+        self.forward_references = forward_references
+
+    def comment_char(self): return "#"
+
+    def declarations_pattern(self): return r"^(class|def)\b"
+
+    def lexer_name(self): return "Python 3"
+
+    def block_starters(self): return { ":", "(", "[", "{", "\"", "\'" }
+
+    def tokenize(self, str text):
+        return self.tokenize_compact(text).to_list()
+
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef LexState state = lex_state(INITIAL_STATE)
+
+        if self.forward_references:
+            # first pass only collects declared names
+            scan_into(text, 0, len(text), state, TokenArray(text, STYLES), None)
+            state = declared_state(state.class_dir, state.function_dir)
+
+        scan_into(text, 0, len(text), state, tokens, None)
+        return tokens
+
+    def tokenize_lines(self, str text):
+        # (tokens, LineStates) with lexer state at every line start
+        return tokenize_lines(self.scan_lines, text, INITIAL_STATE)
+
+    def tokenize_from(self, str text, Py_ssize_t start_offset, tuple state, stop=None):
+        # (tokens, LineStates) from line start start_offset in state (resumable, from LineStates)
+        return tokenize_lines(self.scan_lines, text, state, start_offset, stop)
+
+    def retokenize(self, str text, list old_tokens, old_lines, edits):
+        # (tokens, lines, (changed_start, changed_end)) for buffer after edits, re-lexing from the
+        # last resumable line before each edit until line states line up again (see tokenize_lines)
+        return retokenize_lines(self.scan_lines, resumable, text, old_tokens, old_lines, edits)
+
+    def scan_lines(self, str text, Py_ssize_t start, Py_ssize_t stop, tuple state, list tokens, lines):
+        # tokenize from line start in state, appending to tokens and lines, and return first line
+        # start at or after stop outside tokens (the last one appended) or end of text
+        cdef TokenArray found = TokenArray(text, STYLES)
+        cdef LexState lex = lex_state(state)
+        cdef Py_ssize_t end
+
+        scan_into(text, start, stop, lex, found, lines)
+        if lex.parameter_before and tokens:
+            tokens[-1] = (PARAMETER, tokens[-1][1], tokens[-1][2])
+        tokens.extend(found)
+
+        end = lines.starts[-1]
+        return end if end >= stop and not lines.states[-1][0] else len(text)
+
+    def symbol_index(self, str text, TokenArray tokens=None):
+        # outline (classes and functions) from tokens of text (tokenized if not given), see SymbolIndex
+        return SymbolIndex(tokens if tokens is not None else self.tokenize_compact(text))
+
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing from the last line
+        # start before them that is outside strings and parentheses
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef Py_ssize_t line_start = text.rfind('\n', 0, start_offset) + 1
+        cdef Py_ssize_t line_end = text.find('\n', max(end_offset - 1, line_start))
+        cdef Py_ssize_t restart
+
+        if line_end < 0:
+            line_end = len(text)
+
+        restart, class_dir, function_dir = restart_point(text, line_start)
+        scan_into(text, restart, line_end, declared_state(class_dir, function_dir), tokens, None)
+        return [token for token in tokens if token[1] + len(token[2]) > line_start]
+
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        cdef Py_ssize_t start_offset = 0
+        cdef Py_ssize_t end_offset
+        cdef Py_ssize_t newline
+
+        for _ in range(first_line):
+            newline = text.find('\n', start_offset)
+            if newline < 0: return []
+            start_offset = newline + 1
+
+        end_offset = start_offset
+        for _ in range(first_line, last_line + 1):
+            newline = text.find('\n', end_offset)
+            end_offset = len(text) if newline < 0 else newline + 1
+
+        return self.tokenize_range(text, start_offset, end_offset)
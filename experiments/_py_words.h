@@ -0,0 +1,52 @@
+// Generated by gen_words.py, do not edit
+
+#include "lexer_core.h"
+
+#define PY_WORDS_TK_KEYWORD 2
+#define PY_WORDS_TK_PARAMETER 5
+#define PY_WORDS_TK_SPECIAL 11
+#define PY_WORDS_TK_CONDITIONAL 12
+#define PY_WORDS_TK_BUILT_IN 13
+#define PY_WORDS_TK_TYPE 17
+
+static const int32_t py_words_displace[] = {
+    -101, 0, -100, 1, 2, 1, 0, 0, 2, 2, 1, 0, -99, -91, -88, 0,
+    0, 0, 1, -86, 0, 0, 1, -81, 0, 0, -76, -74, 0, 1, -72, -70,
+    -62, 1, -57, -56, 1, -51, 0, -47, 0, -44, 1, 2, 0, 0, -40, 2,
+    0, -39, -38, 1, 3, 1, 0, 0, 11, 0, 0, 1, -32, 0, 0, 0,
+    7, 0, 0, 2, -31, -30, 0, 0, 2, -24, -23, 0, 11, 0, 0, 9,
+    2, 7, 0, -22, -20, -19, -18, 0, 0, 8, -15, -11, 5, 0, 1, 0,
+    1, 0, 0, 0, -8, 5, 0, -5, 0, -4, -1
+};
+static const uint32_t py_words_offsets[] = {
+    0, 5, 12, 16, 21, 26, 29, 34, 37, 43, 46, 53, 61, 64, 66, 72,
+    77, 80, 82, 84, 87, 95, 101, 104, 109, 115, 121, 124, 129, 133, 137, 140,
+    152, 156, 162, 165, 170, 180, 184, 187, 197, 201, 204, 209, 218, 223, 233, 240,
+    246, 253, 257, 259, 264, 272, 281, 285, 293, 300, 303, 307, 311, 315, 319, 324,
+    327, 331, 337, 340, 345, 350, 353, 356, 360, 364, 372, 379, 384, 388, 392, 401,
+    404, 411, 417, 420, 424, 430, 441, 444, 452, 456, 461, 465, 470, 475, 478, 484,
+    489, 496, 502, 506, 509, 519, 521, 526, 531, 534, 538
+};
+static const uint8_t py_words_lengths[] = {
+    5, 7, 4, 5, 5, 3, 5, 3, 6, 3, 7, 8, 3, 2, 6, 5,
+    3, 2, 2, 3, 8, 6, 3, 5, 6, 6, 3, 5, 4, 4, 3, 12,
+    4, 6, 3, 5, 10, 4, 3, 10, 4, 3, 5, 9, 5, 10, 7, 6,
+    7, 4, 2, 5, 8, 9, 4, 8, 7, 3, 4, 4, 4, 4, 5, 3,
+    4, 6, 3, 5, 5, 3, 3, 4, 4, 8, 7, 5, 4, 4, 9, 3,
+    7, 6, 3, 4, 6, 11, 3, 8, 4, 5, 4, 5, 5, 3, 6, 5,
+    7, 6, 4, 3, 10, 2, 5, 5, 3, 4, 3
+};
+static const uint8_t py_words_kinds[] = {
+    13, 13, 2, 13, 13, 17, 2, 13, 13, 13, 13, 13, 13, 2, 2, 2,
+    2, 2, 13, 2, 2, 13, 2, 17, 5, 2, 13, 17, 13, 12, 13, 13,
+    17, 2, 13, 13, 13, 17, 2, 13, 2, 2, 2, 13, 12, 17, 2, 13,
+    13, 13, 2, 2, 13, 17, 2, 13, 17, 13, 13, 13, 2, 2, 13, 13,
+    17, 13, 13, 13, 2, 13, 13, 13, 13, 2, 13, 17, 17, 2, 17, 17,
+    13, 13, 13, 13, 13, 13, 13, 13, 11, 2, 13, 13, 2, 13, 13, 13,
+    13, 2, 12, 13, 13, 2, 2, 13, 13, 13, 13
+};
+static const unsigned char py_words_chars[] = "rangeglobalsfromsuperanextintraiseabsasserthexsetattrcallableallinreturnclassnotoridfornonlocalfilterandfloatlambdaimportdirtuplereprTruechrstaticmethodtypeexceptoctaiterisinstancebooltryissubclasspassdefwhileenumerateFalsememoryviewfinallyformatcompilevarsisasyncpropertyfrozensetelif__init__complexsumevalopenelsewithinputbindictdivmodpowprintbreakminanyhashitercontinuedelattrbyteslistcasebytearraystrgetattrobjectmapexecsortedclassmethoddelreversedselfyieldnextroundawaitordlocalsasciihasattrglobalNonelenbreakpointifmatchslicemaxhelpzip";
+
+static const lc_word_table py_words = {
+    107, 12, py_words_displace, py_words_offsets, py_words_lengths, py_words_kinds, py_words_chars
+};
@@ -0,0 +1,161 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Native bridge for tokenizers built as shared libraries (Odin, C, ...)
+
+# A native tokenizer exports (C ABI, Odin layout):
+#
+#   process_input(text: String) -> DynamicToken
+#   free_tokens(tokens: DynamicToken)            (optional)
+#
+# where String is (pointer, byte length), Token is (type, start_pos, value) with
+# 64-bit ints and DynamicToken is Odin's [dynamic]Token (data, len, cap, allocator).
+# Token values must be the source span at start_pos (as in all lexers here), so
+# values are sliced from the input instead of being read one by one.
+#
+# NativeLexer loads the library once, binds signatures once, passes the encoded
+# input without copying, reads the token array in one go and frees it before
+# returning (if free_tokens is exported).
+
+import os
+import sys
+import ctypes
+
+if sys.platform == "darwin": LIBRARY_SUFFIX = ".dylib"
+elif sys.platform == "win32": LIBRARY_SUFFIX = ".dll"
+else: LIBRARY_SUFFIX = ".so"
+
+# Odin internal struct for string (rawptr and len)
+class String(ctypes.Structure):
+    _fields_ = [
+        ("text", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+    ]
+
+    def to_python(self):
+        if self.text: return ctypes.string_at(self.text, self.len).decode("utf-8")
+        return ""
+
+# Odin custom struct for Token (int is 64-bit in Odin)
+class Token(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_ssize_t),
+        ("start_pos", ctypes.c_ssize_t),
+        ("value", String),
+    ]
+
+# Odin internal struct for [dynamic]Token (with allocator, so it can be passed back to free_tokens)
+class DynamicToken(ctypes.Structure):
+    _fields_ = [
+        ("data", ctypes.POINTER(Token)),
+        ("len", ctypes.c_ssize_t),
+        ("cap", ctypes.c_ssize_t),
+        ("allocator_procedure", ctypes.c_void_p),
+        ("allocator_data", ctypes.c_void_p),
+    ]
+
+TOKEN_FIELDS = ctypes.sizeof(Token) // 8 # type, start_pos, value.text, value.len
+
+def library_path(directory, name):
+    # platform library for name (without suffix) in directory
+    return os.path.join(directory, name + LIBRARY_SUFFIX)
+
+class NativeLexer(object):
+    # offsets : "bytes" if start_pos is a utf-8 byte index (pc.odin), "chars" if a code point index
+
+    def __init__(self, path, offsets="chars"):
+        if offsets not in ("bytes", "chars"): raise ValueError(f"NativeLexer : unknown offsets '{offsets}' (expected bytes or chars)")
+
+        self.path = path
+        self.offsets = offsets
+        self.lib = ctypes.CDLL(path)
+
+        self.process_input = self.lib.process_input
+        self.process_input.argtypes = [String]
+        self.process_input.restype = DynamicToken
+
+        self.free_tokens = getattr(self.lib, "free_tokens", None)
+        if self.free_tokens is not None:
+            self.free_tokens.argtypes = [DynamicToken]
+            self.free_tokens.restype = None
+
+    def tokenize_raw(self, text):
+        # (types, starts, values) lists with starts in code points
+        data = text.encode("utf-8")
+
+        # c_char_p points into the bytes object (no copy), data stays alive during the call
+        arg = String(ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p), len(data))
+        result = self.process_input(arg)
+
+        try:
+            count = result.len
+            if count == 0 or not result.data: return [], [], []
+
+            # read whole token array at once as 64-bit fields
+            fields = memoryview(ctypes.string_at(result.data, count * ctypes.sizeof(Token))).cast("q")
+            types = fields[0::TOKEN_FIELDS].tolist()
+            starts = fields[1::TOKEN_FIELDS].tolist()
+            lengths = fields[3::TOKEN_FIELDS].tolist()
+
+            if len(data) == len(text): # ascii, bytes and code points line up
+                values = [text[start:start + length] for start, length in zip(starts, lengths)]
+                return types, starts, values
+
+            # value lengths are in bytes : values are decoded from the input at byte starts and
+            # starts are converted once (no per-token reads through ctypes)
+            if self.offsets == "bytes":
+                values = [data[start:start + length].decode("utf-8", "replace") for start, length in zip(starts, lengths)]
+                starts = byte_to_char_offsets(data, starts)
+            else:
+                values = [data[start:start + length].decode("utf-8", "replace") for start, length in zip(char_to_byte_offsets(text, starts), lengths)]
+
+            return types, starts, values
+        finally:
+            if self.free_tokens is not None: self.free_tokens(result)
+
+def char_to_byte_offsets(text, offsets):
+    # code point offsets (in order) to utf-8 byte offsets
+    result = []
+    byte_pos = 0
+    char_pos = 0
+    for offset in offsets:
+        if offset < char_pos: # out of order, count from start
+            byte_pos = 0
+            char_pos = 0
+        byte_pos += len(text[char_pos:offset].encode("utf-8"))
+        char_pos = offset
+        result.append(byte_pos)
+    return result
+
+def byte_to_char_offsets(data, offsets):
+    # utf-8 byte offsets (in order) to code point offsets
+    chars = []
+    byte_pos = 0
+    char_pos = 0
+    for offset in offsets:
+        if offset < byte_pos: # out of order, count from start
+            byte_pos = 0
+            char_pos = 0
+        char_pos += len(data[byte_pos:offset].decode("utf-8", "replace"))
+        byte_pos = offset
+        chars.append(char_pos)
+    return chars
@@ -188,9 +188,8 @@ tokenize :: proc(text: string, alloc: runtime.Allocator) -> [dynamic]Token {
     // alloc := runtime.default_allocator() // need to do this to not get assertion error when calling from FFI
     tokens: [dynamic]Token = runtime.make([dynamic]Token, 0, alloc);
 
-    // todo : return pointer to token array to use in call back to free memory
-
     runes := convert_to_runes(text)
+    defer delete(runes)
     
     index: int = 0
     for index < len(runes) {
@@ -464,6 +463,15 @@ tokenize :: proc(text: string, alloc: runtime.Allocator) -> [dynamic]Token {
     return result
 }
 
+// tokens are allocated with default allocator, free them (and their values) after reading
+@export free_tokens :: proc "c" (tokens: [dynamic]Token) {
+    context = runtime.default_context()
+    for token in tokens {
+        delete(token.value, tokens.allocator)
+    }
+    delete(tokens)
+}
+
 // for testing only
 // main :: proc() {
 //     TEXT :: `
@@ -243,3 +243,12 @@ tokenize :: proc(text: string) -> [dynamic]Token {
     result := tokenize(arg)
     return result
 }
+
+// tokens are allocated with default allocator, free them (and their values) after reading
+@export free_tokens :: proc "c" (tokens: [dynamic]Token) {
+    context = runtime.default_context()
+    for token in tokens {
+        delete(token.value, tokens.allocator)
+    }
+    delete(tokens)
+}
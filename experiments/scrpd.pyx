@@ -25,6 +25,14 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport (
+    char_is, skip_whitespace, scan_to_char, scan_to_eol, LC_BLANK,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_COMMENT, TK_NAME, TK_SPECIAL,
+    TK_ERROR, TK_SUCCESS, LineCache,
+)
+
+from incremental import tokenize_range as _tokenize_range
+from lexer_core import CHUNK_SIZE, iter_tokens as _iter_tokens, line_range, make_styles
 
 cdef str DEFAULT    = "default"
 cdef str KEYWORD    = "keyword"
@@ -34,118 +42,155 @@ cdef str SPECIAL    = "special"
 cdef str ERROR      = "error"
 cdef str SUCCESS    = "success"
 
-
-cdef int handle_whitespace(int current_char_index):
-    current_char_index += 1
-    return current_char_index
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_COMMENT: COMMENT,
+    TK_NAME: NAME,
+    TK_SPECIAL: SPECIAL,
+    TK_ERROR: ERROR,
+    TK_SUCCESS: SUCCESS,
+})
 
 
-cdef int handle_command(int current_char_index, str text, list tokens):
+cdef int handle_command(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
-
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    tokens.append((NAME, start_pos, line))
+    tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_chat(int current_char_index, str text, list tokens):
+cdef int handle_chat(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
-
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    tokens.append((SPECIAL, start_pos, line))
+    tokens.push(TK_SPECIAL, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_header(int current_char_index, str text, list tokens):
+cdef int handle_header(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
-
-    tokens.append((KEYWORD, start_pos, line))
+    tokens.push(TK_KEYWORD, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_done_task(int current_char_index, str text, list tokens):
+cdef int handle_done_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
-
-    tokens.append((SUCCESS, start_pos, line))
+    tokens.push(TK_SUCCESS, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_not_done_task(int current_char_index, str text, list tokens):
+cdef int handle_not_done_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
+    cdef int line_end = scan_to_eol(text, current_char_index + 1, len(text))
     current_char_index += 1
 
-    cdef str special = ""
-
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        if text[current_char_index] == '[':
-            tokens.append((NAME, start_pos, line))
+    while current_char_index < line_end:
+        current_char_index = scan_to_char(text, current_char_index, line_end, '[')
+        
+        if current_char_index < line_end:
+            tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
             
             # update state
             start_pos = current_char_index
-            special = text[current_char_index]
-            current_char_index += 1
-
-            while current_char_index < len(text) and text[current_char_index] != '\n':
-                special += text[current_char_index]
-                if text[current_char_index] == ']':
-                    current_char_index += 1
-                    break
+            current_char_index = scan_to_char(text, current_char_index + 1, line_end, ']')
+            
+            if current_char_index < line_end:
                 current_char_index += 1
 
-            tokens.append((SPECIAL, start_pos, special))
+            tokens.push(TK_SPECIAL, start_pos, current_char_index - start_pos)
 
-            if current_char_index < len(text) and text[current_char_index] == ' ':
+            if current_char_index < line_end and text[current_char_index] == ' ':
                 current_char_index += 1
 
             start_pos = current_char_index
-            line = ""
-        else:
-            line += text[current_char_index]
-            current_char_index += 1
 
-    tokens.append((NAME, start_pos, line))
+    tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_priority_task(int current_char_index, str text, list tokens):
+cdef int handle_priority_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
+
+    tokens.push(TK_ERROR, start_pos, current_char_index - start_pos)
+    return current_char_index
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
 
-    tokens.append((ERROR, start_pos, line))
+cdef Py_ssize_t scan_into(str text, Py_ssize_t current_char_index, Py_ssize_t stop, TokenArray tokens) except -1:
+    # tokenize from line start, return at first line start at or after stop
+    cdef Py_ssize_t n = len(text)
+    cdef Py_UCS4 current_char
+    cdef Py_UCS4 next_char
+    cdef int new_line = True
+
+    while current_char_index < n:
+        if current_char_index >= stop and text[current_char_index - 1] == '\n':
+            break
+
+        current_char = text[current_char_index]
+        next_char = 0
+        if current_char_index + 1 < n: next_char = text[current_char_index + 1]
+
+        # whitespace
+        if char_is(current_char, LC_BLANK): current_char_index = skip_whitespace(text, current_char_index + 1, n, False)
+        # newline
+        elif current_char == '\n':
+            current_char_index += 1
+            new_line = True
+            continue
+        # command
+        elif new_line and current_char == '>' and next_char == '>': current_char_index = handle_command(current_char_index, text, tokens)
+        # chat
+        elif new_line and current_char == '%' and next_char == '%': current_char_index = handle_chat(current_char_index, text, tokens)
+        # header
+        elif new_line and current_char == '#': current_char_index = handle_header(current_char_index, text, tokens)
+        # done task
+        elif new_line and current_char == '+': current_char_index = handle_done_task(current_char_index, text, tokens)
+        # not done task
+        elif new_line and current_char == '-': current_char_index = handle_not_done_task(current_char_index, text, tokens)
+        # priority task
+        elif new_line and current_char == '*': current_char_index = handle_priority_task(current_char_index, text, tokens)
+        # handle identifiers
+        # elif new_line and current_char.isalpha(): current_char_index = handle_identifiers(current_char_index, text, tokens)
+        # style everything else as comment
+        else:
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+
+        new_line = False
+
     return current_char_index
 
 
+cpdef Py_ssize_t scan(str text, Py_ssize_t start, Py_ssize_t stop, list tokens):
+    # list version of scan_into (used by tokenize_range)
+    cdef TokenArray found = TokenArray(text, STYLES)
+    cdef Py_ssize_t end = scan_into(text, start, stop, found)
+    tokens.extend(found)
+    return end
+
+
+# lines seen by tokenize_cached, shared by all Scratch Pad lexers
+cdef LineCache LINE_CACHE = LineCache()
+
+
+cdef Py_ssize_t scan_line(object context, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    return scan_into(text, start, stop, tokens)
+
+
 @cython.cclass
 class Lexer:
-    
+    line_cache = cython.declare(LineCache, visibility="public")
+
+    def __init__(self):
+        self.line_cache = LINE_CACHE
+
     @property
     def lexer_name(self):
         return "Scratch Pad"
@@ -159,42 +204,26 @@ class Lexer:
         return ""
 
     def tokenize(self, str text):
-        cdef int current_char_index = 0
-        cdef str current_char
-        cdef list tokens = []
-        cdef int new_line = True
-
-        while current_char_index < len(text):
-            current_char = text[current_char_index]
-            next_char = text[current_char_index + 1] if current_char_index + 1 < len(text) else ""
-
-            # whitespace
-            if current_char in (' ', '\t', '\r'): current_char_index = handle_whitespace(current_char_index)
-            # newline
-            elif current_char in ('\n'):
-                current_char_index = handle_whitespace(current_char_index)
-                new_line = True
-                continue
-            # command
-            elif new_line and current_char == '>' and next_char == '>': current_char_index = handle_command(current_char_index, text, tokens)
-            # chat
-            elif new_line and current_char == '%' and next_char == '%': current_char_index = handle_chat(current_char_index, text, tokens)
-            # header
-            elif new_line and current_char == '#': current_char_index = handle_header(current_char_index, text, tokens)
-            # done task
-            elif new_line and current_char == '+': current_char_index = handle_done_task(current_char_index, text, tokens)
-            # not done task
-            elif new_line and current_char == '-': current_char_index = handle_not_done_task(current_char_index, text, tokens)
-            # priority task
-            elif new_line and current_char == '*': current_char_index = handle_priority_task(current_char_index, text, tokens)
-            # handle identifiers
-            # elif new_line and current_char.isalpha(): current_char_index = handle_identifiers(current_char_index, text, tokens)
-            # style everything else as comment
-            else:
-                tokens.append((DEFAULT, current_char_index, current_char))
-                current_char_index += 1
-
-            new_line = False
+        return self.tokenize_compact(text).to_list()
 
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        scan_into(text, 0, len(text), tokens)
         return tokens
 
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in line_cache are copied instead of lexed
+        return self.line_cache.tokenize(text, STYLES, scan_line, None)
+
+    def iter_tokens(self, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+        # tokens of str, file object or iterable of chunks, one chunk of lines at a time
+        # (compact yields (offset, TokenArray) batches)
+        return _iter_tokens(self.tokenize_compact, source, chunk_size, compact)
+
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing only those lines
+        return _tokenize_range(scan, text, start_offset, end_offset)
+
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        return self.tokenize_range(text, *line_range(text, first_line, last_line))
@@ -25,11 +25,69 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport scan_to_eol, TokenArray, TK_DEFAULT, TK_INLINE_SHELL, TK_INLINE_CHAT, LineCache
+
+from lexer_core import CHUNK_SIZE, iter_tokens as _iter_tokens, make_styles
 
 cdef str DEFAULT = "default"
 cdef str INLINE_SHELL = "_inline_shell"
 cdef str INLINE_CHAT = "_inline_chat"
 
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_INLINE_SHELL: INLINE_SHELL,
+    TK_INLINE_CHAT: INLINE_CHAT,
+})
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t scan_lines(object settings, str text, Py_ssize_t i, Py_ssize_t stop, TokenArray tokens) except -1:
+    # one token per line (and per newline) from line start i, returns at the first line start
+    # at or after stop (settings is (shell_start, chat_response))
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t j
+    cdef Py_ssize_t line_len
+
+    cdef str shell = <str>settings[0]
+    cdef Py_ssize_t shell_len = len(shell)
+
+    cdef str chat = <str>settings[1]
+    cdef Py_ssize_t chat_len = len(chat)
+
+    while i < n and i < stop:
+        
+        # find end of current line (excluding newline)
+        j = scan_to_eol(text, i, n)
+
+        line_len = j - i # does not include newline
+
+        # decide style based on line prefix
+        if shell_len and line_len >= shell_len and text.startswith(shell, i):
+            tokens.push(TK_INLINE_SHELL, i, line_len)
+        
+        # chat marker must start at column 0, supports multi-char markers too
+        elif chat_len and line_len >= chat_len and text.startswith(chat, i):
+            tokens.push(TK_INLINE_CHAT, i, line_len)
+        
+        else:
+            tokens.push(TK_DEFAULT, i, line_len)
+
+        # include newline as DEFAULT (keeps coverage exact and positions sane)
+        if j < n:
+            tokens.push(TK_DEFAULT, j, 1)
+            i = j + 1
+        else:
+            i = j
+
+    return i
+
+
+# lines seen by tokenize_cached, one cache per (shell_start, chat_response) since
+# they decide the styles (dropped when there are more than a few)
+cdef dict LINE_CACHES = {}
+cdef Py_ssize_t MAX_LINE_CACHES = 4
+
+
 cdef class Lexer:
     
     cdef public object shell_start
@@ -63,52 +121,29 @@ cdef class Lexer:
         
         return (DEFAULT, INLINE_SHELL, INLINE_CHAT)
     
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def tokenize(self, str text):
         
-        cdef Py_ssize_t n = len(text)
-        cdef Py_ssize_t i = 0
-        cdef Py_ssize_t j
-        cdef Py_ssize_t line_len
-        
-        cdef list tokens = []
-
-        cdef str shell = <str>self.shell_start
-        cdef Py_ssize_t shell_len = len(shell)
-
-        cdef str chat = <str>self.chat_response
-        cdef Py_ssize_t chat_len = len(chat)
-
-        cdef str line
-
-        while i < n:
-            
-            # find end of current line (excluding newline)
-            j = text.find('\n', i)
-            if j == -1:
-                j = n
-
-            line_len = j - i
-            line = text[i:j] # does not include newline
-
-            # decide style based on line prefix
-            if shell_len and line_len >= shell_len and text.startswith(shell, i):
-                tokens.append((INLINE_SHELL, i, line))
-            
-            # chat marker must start at column 0, supports multi-char markers too
-            elif chat_len and line_len >= chat_len and text.startswith(chat, i):
-                tokens.append((INLINE_CHAT, i, line))
-            
-            else:
-                tokens.append((DEFAULT, i, line))
-
-            # include newline as DEFAULT (keeps coverage exact and positions sane)
-            if j < n:
-                tokens.append((DEFAULT, j, "\n"))
-                i = j + 1
-            else:
-                i = j
+        return self.tokenize_compact(text).to_list()
 
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        scan_lines((self.shell_start, self.chat_response), text, 0, len(text), tokens)
         return tokens
 
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in the cache for these
+        # settings are copied instead of lexed
+        cdef tuple settings = (self.shell_start, self.chat_response)
+        cdef LineCache cache = LINE_CACHES.get(settings)
+
+        if cache is None:
+            if len(LINE_CACHES) >= MAX_LINE_CACHES:
+                LINE_CACHES.clear()
+            cache = LINE_CACHES[settings] = LineCache()
+
+        return cache.tokenize(text, STYLES, scan_lines, settings)
+
+    def iter_tokens(self, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+        # tokens of str, file object or iterable of chunks, one chunk of lines at a time
+        # (compact yields (offset, TokenArray) batches)
+        return _iter_tokens(self.tokenize_compact, source, chunk_size, compact)
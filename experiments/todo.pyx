@@ -25,6 +25,13 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport (
+    char_is, skip_whitespace, scan_to_char, scan_to_eol, LC_BLANK,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_COMMENT, TK_NAME, TK_SPECIAL,
+    TK_ERROR, TK_SUCCESS, LineCache,
+)
+
+from lexer_core import make_styles
 
 cdef str DEFAULT    = "default"
 cdef str KEYWORD    = "keyword"
@@ -34,92 +41,116 @@ cdef str SPECIAL    = "special"
 cdef str ERROR      = "error"
 cdef str SUCCESS    = "success"
 
-
-cdef int handle_whitespace(int current_char_index):
-    current_char_index += 1
-    return current_char_index
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_COMMENT: COMMENT,
+    TK_NAME: NAME,
+    TK_SPECIAL: SPECIAL,
+    TK_ERROR: ERROR,
+    TK_SUCCESS: SUCCESS,
+})
 
 
-cdef int handle_header(int current_char_index, str text, list tokens):
+cdef int handle_header(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
-
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    tokens.append((KEYWORD, start_pos, line))
+    tokens.push(TK_KEYWORD, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_done_task(int current_char_index, str text, list tokens):
+cdef int handle_done_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
-
-    tokens.append((SUCCESS, start_pos, line))
+    tokens.push(TK_SUCCESS, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_not_done_task(int current_char_index, str text, list tokens):
+cdef int handle_not_done_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
+    cdef int line_end = scan_to_eol(text, current_char_index + 1, len(text))
     current_char_index += 1
 
-    cdef str special = ""
-
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        if text[current_char_index] == '[':
-            tokens.append((NAME, start_pos, line))
+    while current_char_index < line_end:
+        current_char_index = scan_to_char(text, current_char_index, line_end, '[')
+        
+        if current_char_index < line_end:
+            tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
             
             # update state
             start_pos = current_char_index
-            special = text[current_char_index]
-            current_char_index += 1
-
-            while current_char_index < len(text) and text[current_char_index] != '\n':
-                special += text[current_char_index]
-                if text[current_char_index] == ']':
-                    current_char_index += 1
-                    break
+            current_char_index = scan_to_char(text, current_char_index + 1, line_end, ']')
+            
+            if current_char_index < line_end:
                 current_char_index += 1
 
-            tokens.append((SPECIAL, start_pos, special))
+            tokens.push(TK_SPECIAL, start_pos, current_char_index - start_pos)
 
-            if current_char_index < len(text) and text[current_char_index] == ' ':
+            if current_char_index < line_end and text[current_char_index] == ' ':
                 current_char_index += 1
 
             start_pos = current_char_index
-            line = ""
-        else:
-            line += text[current_char_index]
-            current_char_index += 1
 
-    tokens.append((NAME, start_pos, line))
+    tokens.push(TK_NAME, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_priority_task(int current_char_index, str text, list tokens):
+cdef int handle_priority_task(int current_char_index, str text, TokenArray tokens):
     cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+    current_char_index = scan_to_eol(text, current_char_index + 1, len(text))
+
+    tokens.push(TK_ERROR, start_pos, current_char_index - start_pos)
+    return current_char_index
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
 
-    tokens.append((ERROR, start_pos, line))
+cdef Py_ssize_t scan_into(str text, Py_ssize_t current_char_index, Py_ssize_t stop, TokenArray tokens) except -1:
+    # tokenize from line start, return at first line start at or after stop
+    cdef Py_ssize_t n = len(text)
+    cdef Py_UCS4 current_char
+
+    while current_char_index < n:
+        if current_char_index >= stop and text[current_char_index - 1] == '\n':
+            break
+
+        current_char = text[current_char_index]
+
+        # whitespace
+        if char_is(current_char, LC_BLANK): current_char_index = skip_whitespace(text, current_char_index + 1, n, False)
+        # newline (one at a time so scans stop at line starts)
+        elif current_char == '\n': current_char_index += 1
+        # header
+        elif current_char == '#': current_char_index = handle_header(current_char_index, text, tokens)
+        # done task
+        elif current_char == '+': current_char_index = handle_done_task(current_char_index, text, tokens)
+        # not done task
+        elif current_char == '-': current_char_index = handle_not_done_task(current_char_index, text, tokens)
+        # priority task
+        elif current_char == '*': current_char_index = handle_priority_task(current_char_index, text, tokens)
+        # style everything else as comment
+        else:
+            tokens.push(TK_COMMENT, current_char_index, 1)
+            current_char_index += 1
+
     return current_char_index
 
 
+# lines seen by tokenize_cached, shared by all Todo lexers
+cdef LineCache LINE_CACHE = LineCache()
+
+
+cdef Py_ssize_t scan_line(object context, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    return scan_into(text, start, stop, tokens)
+
+
 @cython.cclass
 class Lexer:
-    
+    line_cache = cython.declare(LineCache, visibility="public")
+
+    def __init__(self):
+        self.line_cache = LINE_CACHE
+
     @property
     def lexer_name(self):
         return "Todo (pyx)"
@@ -133,27 +164,13 @@ class Lexer:
         return ""
 
     def tokenize(self, str text):
-        cdef int current_char_index = 0
-        cdef str current_char
-        cdef list tokens = []
-
-        while current_char_index < len(text):
-            current_char = text[current_char_index]
-
-            # whitespace
-            if current_char in (' ', '\t', '\r', '\n'): current_char_index = handle_whitespace(current_char_index)
-            # header
-            elif current_char == '#': current_char_index = handle_header(current_char_index, text, tokens)
-            # done task
-            elif current_char == '+': current_char_index = handle_done_task(current_char_index, text, tokens)
-            # not done task
-            elif current_char == '-': current_char_index = handle_not_done_task(current_char_index, text, tokens)
-            # priority task
-            elif current_char == '*': current_char_index = handle_priority_task(current_char_index, text, tokens)
-            # style everything else as comment
-            else:
-                tokens.append((COMMENT, current_char_index, current_char))
-                current_char_index += 1
+        return self.tokenize_compact(text).to_list()
 
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        scan_into(text, 0, len(text), tokens)
         return tokens
 
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in line_cache are copied instead of lexed
+        return self.line_cache.tokenize(text, STYLES, scan_line, None)
@@ -0,0 +1,347 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Tokenizer for TOML (.pyx-version)
+
+# Same styles as toml.py, with the parts of TOML 1.0 it misses : multi-line
+# basic and literal strings, escapes in basic strings, datetimes as one token,
+# bare keys with digits and dashes (build-backend), arrays spanning lines and
+# keys inside inline tables.
+#
+# Brackets are kept on a small stack so keys (line start, after "{" and "," in
+# inline tables) and values (after "=", in arrays) are told apart across lines.
+
+# cython: language_level=3
+cimport cython
+from lexer_core cimport (
+    char_is, is_alpha, is_alnum, is_digit, scan_class, scan_to_char, scan_to_eol,
+    LC_BLANK, LC_ASCII_DIGIT,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_STRING, TK_NUMBER, TK_COMMENT,
+    TK_CONDITIONAL, TK_BUILT_IN,
+)
+
+from lexer_core import make_styles
+
+cdef str DEFAULT     = "default"
+cdef str KEYWORD     = "keyword"
+cdef str STRING      = "string"
+cdef str NUMBER      = "number"
+cdef str COMMENT     = "comment"
+cdef str CONDITIONAL = "conditional"
+cdef str BUILT_IN    = "built_in"
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_STRING: STRING,
+    TK_NUMBER: NUMBER,
+    TK_COMMENT: COMMENT,
+    TK_CONDITIONAL: CONDITIONAL,
+    TK_BUILT_IN: BUILT_IN,
+})
+
+cdef enum:
+    MAX_DEPTH = 64 # deeper brackets are counted but not told apart
+
+ctypedef struct Context:
+    bint key # at a key (or table header), not a value
+    int depth
+    Py_UCS4 brackets[MAX_DEPTH] # "[" (array) or "{" (inline table)
+
+
+cdef inline Py_UCS4 innermost(Context* ctx) noexcept:
+    if ctx.depth == 0:
+        return 0
+    return ctx.brackets[min(ctx.depth, MAX_DEPTH) - 1]
+
+cdef inline void open_bracket(Context* ctx, Py_UCS4 bracket) noexcept:
+    if ctx.depth < MAX_DEPTH:
+        ctx.brackets[ctx.depth] = bracket
+    ctx.depth += 1
+
+cdef inline void close_bracket(Context* ctx, Py_UCS4 bracket) noexcept:
+    if innermost(ctx) == bracket:
+        ctx.depth -= 1
+
+cdef inline bint digits_at(str text, Py_ssize_t i, Py_ssize_t length, Py_ssize_t count):
+    # count ascii digits at i
+    return i + count <= length and scan_class(text, i, i + count, LC_ASCII_DIGIT) == i + count
+
+cdef Py_ssize_t time_end(str text, Py_ssize_t i, Py_ssize_t length):
+    # end of HH:MM[:SS[.frac]][Z|+HH:MM] at i, or -1
+    if not (digits_at(text, i, length, 2) and i + 2 < length and text[i + 2] == ':' and digits_at(text, i + 3, length, 2)):
+        return -1
+    i += 5
+
+    if i + 2 < length and text[i] == ':' and digits_at(text, i + 1, length, 2):
+        i += 3
+        if i + 1 < length and text[i] == '.' and char_is(text[i + 1], LC_ASCII_DIGIT):
+            i = scan_class(text, i + 1, length, LC_ASCII_DIGIT)
+
+    # offset
+    if i < length and (text[i] == 'Z' or text[i] == 'z'):
+        i += 1
+    elif i < length and (text[i] == '+' or text[i] == '-') and digits_at(text, i + 1, length, 2) and i + 3 < length and text[i + 3] == ':' and digits_at(text, i + 4, length, 2):
+        i += 6
+
+    return i
+
+cdef Py_ssize_t datetime_end(str text, Py_ssize_t i, Py_ssize_t length):
+    # end of YYYY-MM-DD[(T|t| )time] or time at i, or -1
+    cdef Py_ssize_t end
+
+    if digits_at(text, i, length, 4) and i + 4 < length and text[i + 4] == '-' and digits_at(text, i + 5, length, 2) and i + 7 < length and text[i + 7] == '-' and digits_at(text, i + 8, length, 2):
+        i += 10
+        if i < length and (text[i] == 'T' or text[i] == 't' or text[i] == ' '):
+            end = time_end(text, i + 1, length)
+            if end >= 0:
+                return end
+        return i
+
+    return time_end(text, i, length)
+
+
+cdef Py_ssize_t handle_comment(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    current_char_index = scan_to_eol(text, current_char_index + 1, length)
+
+    tokens.push(TK_COMMENT, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t string_end(Py_ssize_t current_char_index, str text, Py_ssize_t length):
+    # end of string at current_char_index, basic strings (") have escapes, literal strings (') don't
+    cdef Py_UCS4 quote = text[current_char_index]
+    cdef Py_ssize_t line_end
+    cdef Py_ssize_t run
+    cdef Py_UCS4 current_char
+
+    # multi-line, closing quotes can be followed by up to two quotes of the content
+    if current_char_index + 2 < length and text[current_char_index + 1] == quote and text[current_char_index + 2] == quote:
+        current_char_index += 3
+        while current_char_index < length:
+            current_char = text[current_char_index]
+            if current_char == '\\' and quote == '"':
+                current_char_index += 2
+            elif current_char == quote:
+                run = current_char_index
+                while run < length and run - current_char_index < 5 and text[run] == quote:
+                    run += 1
+                if run - current_char_index >= 3:
+                    return run
+                current_char_index = run
+            else:
+                current_char_index = scan_to_char(text, current_char_index + 1, length, quote) if quote == '\'' else current_char_index + 1
+        return length
+
+    # single line, unclosed ends at end of line
+    line_end = scan_to_eol(text, current_char_index + 1, length)
+    if quote == '\'':
+        current_char_index = scan_to_char(text, current_char_index + 1, line_end, quote)
+        return current_char_index + 1 if current_char_index < line_end else line_end
+
+    current_char_index += 1
+    while current_char_index < line_end:
+        current_char = text[current_char_index]
+        if current_char == '"':
+            return current_char_index + 1
+        current_char_index += 2 if current_char == '\\' else 1
+    return line_end
+
+cdef Py_ssize_t handle_string(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    cdef Py_ssize_t start_pos = current_char_index
+    current_char_index = min(string_end(current_char_index, text, length), length)
+
+    tokens.push(TK_STRING, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_header(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # [table] or [[array.of.tables]], with quoted keys, to the closing bracket or end of line
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef bint array = current_char_index + 1 < length and text[current_char_index + 1] == '['
+    cdef Py_UCS4 current_char
+    current_char_index += 2 if array else 1
+
+    while current_char_index < length:
+        current_char = text[current_char_index]
+        if current_char == '\n':
+            break
+        elif current_char == '"' or current_char == '\'':
+            current_char_index = min(string_end(current_char_index, text, length), scan_to_eol(text, current_char_index + 1, length))
+        elif current_char == ']':
+            current_char_index += 2 if array and current_char_index + 1 < length and text[current_char_index + 1] == ']' else 1
+            break
+        else:
+            current_char_index += 1
+
+    tokens.push(TK_KEYWORD, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_key(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # bare key (letters, digits, "_" and "-"), dotted keys are split at "."
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_UCS4 current_char
+    current_char_index += 1
+
+    while current_char_index < length:
+        current_char = text[current_char_index]
+        if not (is_alnum(current_char) or current_char == '_' or current_char == '-'):
+            break
+        current_char_index += 1
+
+    tokens.push(TK_DEFAULT, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_number(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # datetime, or number as in toml.py (digits, letters and ".+-_", e.g. 0xDEAD_BEEF, -inf, 6.626e-34)
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_UCS4 current_char
+
+    current_char_index = datetime_end(text, start_pos, length)
+    if current_char_index < 0:
+        current_char_index = start_pos + 1
+        while current_char_index < length:
+            current_char = text[current_char_index]
+            if not (is_digit(current_char) or is_alpha(current_char) or current_char in u".+-_"):
+                break
+            current_char_index += 1
+
+    tokens.push(TK_NUMBER, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t handle_word(Py_ssize_t current_char_index, str text, Py_ssize_t length, TokenArray tokens) except -1:
+    # true and false, nan and inf, anything else is default
+    cdef Py_ssize_t start_pos = current_char_index
+    cdef Py_UCS4 current_char
+    cdef str word
+    cdef int kind = TK_DEFAULT
+    current_char_index += 1
+
+    while current_char_index < length:
+        current_char = text[current_char_index]
+        if not (is_alpha(current_char) or current_char == '_'):
+            break
+        current_char_index += 1
+
+    if current_char_index - start_pos <= 5:
+        word = text[start_pos:current_char_index]
+        if word == "true" or word == "false":
+            kind = TK_CONDITIONAL
+        elif word == "nan" or word == "inf":
+            kind = TK_NUMBER
+
+    tokens.push(kind, start_pos, current_char_index - start_pos)
+    return current_char_index
+
+cdef Py_ssize_t scan_into(str text, Py_ssize_t current_char_index, Py_ssize_t stop, Context* ctx, TokenArray tokens) except -1:
+    cdef Py_ssize_t length = len(text)
+    cdef Py_UCS4 current_char
+
+    while current_char_index < length and current_char_index < stop:
+        current_char = text[current_char_index]
+
+        # whitespace
+        if char_is(current_char, LC_BLANK):
+            current_char_index = scan_class(text, current_char_index + 1, length, LC_BLANK)
+        # newline, inline tables end with the line
+        elif current_char == '\n':
+            current_char_index += 1
+            while innermost(ctx) == '{':
+                ctx.depth -= 1
+            ctx.key = ctx.depth == 0
+        # comment
+        elif current_char == '#':
+            current_char_index = handle_comment(current_char_index, text, length, tokens)
+        # assignment
+        elif current_char == '=':
+            tokens.push(TK_BUILT_IN, current_char_index, 1)
+            current_char_index += 1
+            ctx.key = False
+        # header or array
+        elif current_char == '[':
+            if ctx.key and ctx.depth == 0:
+                current_char_index = handle_header(current_char_index, text, length, tokens)
+            else:
+                tokens.push(TK_DEFAULT, current_char_index, 1)
+                current_char_index += 1
+                open_bracket(ctx, '[')
+                ctx.key = False
+        elif current_char == ']':
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+            close_bracket(ctx, '[')
+        # inline table
+        elif current_char == '{':
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+            open_bracket(ctx, '{')
+            ctx.key = True
+        elif current_char == '}':
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+            close_bracket(ctx, '{')
+            ctx.key = False
+        elif current_char == ',':
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+            ctx.key = innermost(ctx) == '{'
+        # dotted keys
+        elif current_char == '.':
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+        # string (or quoted key)
+        elif current_char == '"' or current_char == '\'':
+            current_char_index = handle_string(current_char_index, text, length, tokens)
+        # bare key
+        elif ctx.key and (is_alnum(current_char) or current_char == '_' or current_char == '-'):
+            current_char_index = handle_key(current_char_index, text, length, tokens)
+        # number or datetime
+        elif is_digit(current_char) or current_char == '+' or current_char == '-':
+            current_char_index = handle_number(current_char_index, text, length, tokens)
+        # true, false, nan, inf
+        elif is_alpha(current_char) or current_char == '_':
+            current_char_index = handle_word(current_char_index, text, length, tokens)
+        else:
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+
+    return current_char_index
+
+@cython.cclass
+class Lexer:
+    def __init__(self): pass
+
+    def comment_char(self): return "#"
+
+    def lexer_name(self): return "TOML"
+
+    def tokenize(self, str text):
+        return self.tokenize_compact(text).to_list()
+
+    def tokenize_compact(self, str text):
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef Context ctx
+        ctx.key = True
+        ctx.depth = 0
+
+        scan_into(text, 0, len(text), &ctx, tokens)
+        return tokens
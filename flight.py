@@ -0,0 +1,171 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Flight recorder for slow tokenize calls
+
+# Wraps a lexer so that tokenize (and tokenize_compact) calls slower than a
+# threshold are kept in a fixed-size ring buffer, oldest dropped first:
+#
+#   recorder = FlightRecorder(threshold=0.05, size=64)
+#   lexer = recorder.wrap(pc.Lexer())
+#   tokens = lexer.tokenize(text)       # same result, recorded if slow
+#   recorder.dump("flight.json")        # or recorder.dump_at_exit("flight.json")
+#
+# An entry holds the lexer name and module, the method, input size (chars and
+# utf-8 bytes), line count, a fingerprint of the text, token count, wall time
+# and the Python stack of the caller. Texts up to max_text chars are kept as
+# well, so a dump can be replayed with python -m bench.replay flight.json.
+# Fast calls only cost two clock reads, everything else is done for slow ones.
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from functools import partial
+
+THRESHOLD = 0.05 # seconds
+SIZE = 64 # entries kept
+MAX_TEXT = 1 << 20 # chars of text kept per entry for replay (0 keeps none)
+STACK_DEPTH = 16 # frames per stack
+
+RECORDED = ("tokenize", "tokenize_compact")
+
+
+def fingerprint(text):
+    # blake2b of the utf-8 text, 16 hex digits
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
+
+class RecordedLexer(object):
+    # lexer proxy, tokenize and tokenize_compact go through the recorder
+
+    __slots__ = ("lexer", "recorder")
+
+    def __init__(self, lexer, recorder):
+        self.lexer = lexer
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        attr = getattr(self.lexer, name)
+        if name in RECORDED:
+            return partial(self.recorder.call, self.lexer, name, attr)
+        return attr
+
+    def __repr__(self):
+        return "RecordedLexer(%r)" % (self.lexer,)
+
+
+class FlightRecorder(object):
+    # ring buffer of slow tokenize calls
+
+    def __init__(self, threshold=THRESHOLD, size=SIZE, max_text=MAX_TEXT, stack_depth=STACK_DEPTH):
+        # threshold : seconds a call must take to be kept
+        self.threshold = threshold
+        self.max_text = max_text
+        self.stack_depth = stack_depth
+        self.entries = deque(maxlen=size)
+        self.lock = threading.Lock()
+        self.exit_path = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def wrap(self, lexer):
+        # RecordedLexer for lexer (other attributes are the lexer's own)
+        return RecordedLexer(lexer, self)
+
+    def call(self, lexer, name, method, text, *args, **kwargs):
+        started = time.perf_counter_ns()
+        result = method(text, *args, **kwargs)
+        elapsed = time.perf_counter_ns() - started
+
+        if elapsed >= self.threshold * 1e9:
+            self.record(lexer, name, text, result, elapsed / 1e9, sys._getframe(1))
+
+        return result
+
+    def record(self, lexer, name, text, result, seconds, frame=None):
+        # add an entry (also for calls timed elsewhere), frame is the caller's
+        stack = traceback.extract_stack(frame if frame is not None else sys._getframe(1), limit=self.stack_depth)
+
+        # lexer_name is an attribute in cdef classes and a method elsewhere
+        lexer_name = getattr(lexer, "lexer_name", type(lexer).__name__)
+        if callable(lexer_name):
+            lexer_name = lexer_name()
+
+        entry = {
+            "time": time.time(),
+            "lexer": lexer_name,
+            "module": type(lexer).__module__,
+            "method": name,
+            "chars": len(text),
+            "bytes": len(text.encode("utf-8", "surrogatepass")),
+            "lines": text.count("\n") + 1,
+            "fingerprint": fingerprint(text),
+            "tokens": len(result),
+            "seconds": seconds,
+            "stack": ["%s:%d in %s" % (step.filename, step.lineno, step.name) for step in stack],
+            "text": text if len(text) <= self.max_text else None,
+        }
+
+        with self.lock:
+            self.entries.append(entry)
+
+    def snapshot(self):
+        # entries, oldest first
+        with self.lock:
+            return list(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def dump(self, path):
+        # write entries as json (replaced atomically), returns number of entries
+        entries = self.snapshot()
+        report = { "threshold": self.threshold, "size": self.entries.maxlen, "entries": entries }
+
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except BaseException:
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+            raise
+        os.replace(path + ".tmp", path)
+        return len(entries)
+
+    def dump_at_exit(self, path):
+        # dump to path when the interpreter exits, if anything was recorded
+        if self.exit_path is None:
+            atexit.register(self._dump_at_exit)
+        self.exit_path = path
+
+    def _dump_at_exit(self):
+        if self.entries:
+            self.dump(self.exit_path)
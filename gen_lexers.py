@@ -0,0 +1,282 @@
+# Spec tokenizers (run from build.py)
+
+# A spec is a Python file in specs/ that declares a lexer instead of coding it:
+#
+#   NAME = "PlayCode"                      lexer_name
+#   COMMENT_CHAR = ["--", None]            comment_char
+#   LINE_COMMENT = "--"                    line_comment
+#   STYLES = { "TK_KEYWORD": "keyword" }   style of each kind (others are default)
+#   WORDS = { "TK_KEYWORD": ("if",) }      word table, optional (see gen_words.py)
+#   RULES = [ { ... }, ... ]               tried in order at each char, first match wins
+#
+# Blanks and newlines are skipped, chars no rule matches are 1-char TK_DEFAULT
+# tokens. A rule starts with one of
+#
+#   "start": "--"                          literal (at most LS_MAX_START chars)
+#   "chars": "=!+*/<>"                     any one of these chars
+#   "class": "LC_ASCII_DIGIT"              one char in class (LC_* from lexer_core.h, joined with |)
+#
+# and makes one token of "kind", extended by at most one of
+#
+#   "until": "eol"                         to end of line
+#   "until": '"'                           through the next '"' (or end of text)
+#   "until": "*/"                          through the next "*/" (at most LS_MAX_START chars)
+#   "until": '"', "escape": "\\"            the char after a backslash never ends the token
+#   "run": "LC_ASCII_DIGIT", "also": "."   run of chars in class (and the also char)
+#   "words": True                          with run, kind from WORDS if the token is listed
+#   "until": "eol", "spans": ("[", "]", "TK_SPECIAL", " ")
+#                                          [..] spans inside in their own kind, one " " after dropped
+#
+# Options: "line_start": True matches only as first char of a line, "symbol":
+# "SYM_FUNCTION" marks the token for the outline when it starts its line.
+#
+# Each spec is written to specs/<name>_lexer.h (rules, dispatch and word
+# tables) and specs/<name>_lexer.pyx (Lexer on lexer_spec.SpecLexer). Files are
+# only rewritten when their content changes, like gen_words.py headers.
+
+import glob
+import os
+import re
+import runpy
+
+import gen_words
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SPECS = "specs"
+
+LS_MAX_START = 8 # same as lexer_spec.h
+LS_WIDE = 0x100
+
+FIELDS = ("start", "length", "start_class", "line_start", "kind", "body", "run", "also", "open", "close", "end", "end_length", "escape", "skip", "span_kind", "symbol") # ls_rule order
+RULE_KEYS = { "start", "chars", "class", "kind", "line_start", "until", "escape", "run", "also", "words", "spans", "symbol" }
+
+
+def char_classes():
+    # ({ "LC_BLANK": 1, ... }, lc_char_class) from lexer_core.h
+    with open(os.path.join(ROOT, "lexer_core.h")) as f:
+        source = f.read()
+
+    names = { name: int(value, 16) for name, value in re.findall(r"^#define (LC_\w+) +(0x[0-9a-f]+)", source, re.M) }
+    table = re.search(r"lc_char_class\[256\] = \{(.*?)\};", source, re.S).group(1)
+    table = [int(value, 16) for value in re.findall(r"0x[0-9a-f]+", re.sub(r"/\*.*?\*/", "", table))]
+    return names, table
+
+
+def symbol_kinds():
+    # { "SYM_CLASS": 0, ... } from lexer_core.pxd
+    with open(os.path.join(ROOT, "lexer_core.pxd")) as f:
+        return { name: int(value) for name, value in re.findall(r"^\s+(SYM_\w+) = (\d+)", f.read(), re.M) if name != "SYM_COUNT" }
+
+
+def one_char(where, value):
+    if not isinstance(value, str) or len(value) != 1:
+        raise ValueError("%s : %r must be one char" % (where, value))
+    return ord(value)
+
+
+def lookup(where, table, name):
+    if name not in table:
+        raise ValueError("%s : unknown %r" % (where, name))
+    return table[name]
+
+
+def class_mask(where, value, classes):
+    return sum(set(lookup(where, classes, name.strip()) for name in value.split("|")))
+
+
+def compile_rule(where, rule, kinds, symbols, classes, table):
+    # (ls_rule fields, first latin-1 chars, matches above 0xff)
+    unknown = set(rule) - RULE_KEYS
+    if unknown:
+        raise ValueError("%s : unknown keys %s" % (where, ", ".join(sorted(unknown))))
+    if sum(key in rule for key in ("start", "chars", "class")) != 1:
+        raise ValueError("%s : needs one of start, chars or class" % where)
+
+    fields = { "kind": lookup(where, kinds, rule.get("kind")), "length": 1, "symbol": "LS_NO_SYMBOL" }
+    wide = False
+
+    if "start" in rule:
+        start = rule["start"]
+        if not 0 < len(start) <= LS_MAX_START or max(map(ord, start)) > 0xff:
+            raise ValueError("%s : start %r must be latin-1 and at most %d chars" % (where, start, LS_MAX_START))
+        fields["start"] = [ord(ch) for ch in start]
+        fields["length"] = len(start)
+        first = { ord(start[0]) }
+
+    elif "chars" in rule:
+        if not rule["chars"] or max(map(ord, rule["chars"])) > 0xff:
+            raise ValueError("%s : chars %r must be latin-1" % (where, rule["chars"]))
+        first = set(map(ord, rule["chars"]))
+
+    else:
+        mask = class_mask(where, rule["class"], classes)
+        fields["start_class"] = mask
+        first = { ch for ch in range(0x100) if table[ch] & mask }
+        wide = (mask & (classes["LC_ALPHA"] | classes["LC_ALNUM"] | classes["LC_DIGIT"])) != 0
+
+    if rule.get("line_start"):
+        fields["line_start"] = 1
+    if "symbol" in rule:
+        fields["symbol"] = lookup(where, symbols, rule["symbol"])
+
+    until = rule.get("until")
+    if "spans" in rule:
+        if until != "eol" or "run" in rule:
+            raise ValueError("%s : spans needs until eol (and no run)" % where)
+        open_char, close_char, span_kind, skip = rule["spans"]
+        fields.update(body="spans", open=one_char(where, open_char), close=one_char(where, close_char), span_kind=lookup(where, kinds, span_kind))
+        if skip:
+            fields["skip"] = one_char(where, skip)
+
+    elif until is not None:
+        if "run" in rule:
+            raise ValueError("%s : until and run can't be combined" % where)
+        if until == "eol":
+            fields["body"] = "eol"
+        elif not isinstance(until, str) or not 0 < len(until) <= LS_MAX_START:
+            raise ValueError("%s : until %r must be eol or at most %d chars" % (where, until, LS_MAX_START))
+        else:
+            fields.update(body="until", end=[ord(ch) for ch in until], end_length=len(until))
+            if "escape" in rule:
+                fields["escape"] = one_char(where, rule["escape"])
+
+    elif "run" in rule:
+        fields.update(body="word" if rule.get("words") else "run", run=class_mask(where, rule["run"], classes))
+        if "also" in rule:
+            fields["also"] = one_char(where, rule["also"])
+
+    elif rule.get("words") or "also" in rule:
+        raise ValueError("%s : words and also need run" % where)
+
+    if "escape" in rule and fields.get("body") != "until":
+        raise ValueError("%s : escape needs until (not eol)" % where)
+
+    return fields, first, wide
+
+
+def c_rule(fields, comment):
+    values = []
+    for name in FIELDS:
+        if name not in fields:
+            continue
+        value = fields[name]
+        if name in ("start", "end"):
+            values.append(".%s = { %s }" % (name, ", ".join(map(str, value))))
+        elif name == "body":
+            values.append(".body = LS_BODY_%s" % value.upper())
+        else:
+            values.append(".%s = %s" % (name, value))
+    return "    { %s }, /* %s */\n" % (", ".join(values), comment)
+
+
+def render_header(name, source, spec, kinds, symbols, classes, table):
+    rules = []
+    buckets = [[] for _ in range(LS_WIDE + 1)]
+
+    for index, rule in enumerate(spec["RULES"]):
+        fields, first, wide = compile_rule("%s rule %d" % (source, index), rule, kinds, symbols, classes, table)
+        rules.append(c_rule(fields, rule["kind"]))
+        for ch in first:
+            buckets[ch].append(index)
+        if wide:
+            buckets[LS_WIDE].append(index)
+
+    first = [0]
+    order = []
+    for bucket in buckets:
+        order.extend(bucket)
+        first.append(len(order))
+
+    if len(order) > 0xffff:
+        raise ValueError("%s : too many rules" % source)
+
+    words = spec.get("WORDS")
+    return "".join([
+        "// Generated by gen_lexers.py from %s, do not edit\n\n" % source,
+        "#include \"lexer_spec.h\"\n\n",
+        gen_words.render_table(name + "_words", words, kinds) + "\n" if words else "",
+        "static const ls_rule %s_rules[] = {\n%s};\n\n" % (name, "".join(rules)),
+        gen_words.c_array("uint16_t", name + "_first", first),
+        gen_words.c_array("uint16_t", name + "_order", order),
+        "\nstatic const ls_spec %s_spec = { %s_rules, %d, %s_first, %s_order };\n" % (name, name, len(rules), name, name),
+    ])
+
+
+def render_module(name, source, spec, kinds):
+    styles = spec["STYLES"]
+    words = spec.get("WORDS") or {}
+    for kind_name in list(styles) + list(words):
+        lookup(source, kinds, kind_name)
+
+    used = sorted(set(styles) | set(words) | { "TK_DEFAULT" }, key=kinds.get)
+    word_kinds = ", ".join("%r: %s" % (styles.get(kind_name, "default"), kind_name) for kind_name in sorted(words, key=kinds.get))
+
+    return "".join([
+        "# Generated by gen_lexers.py from %s, do not edit\n\n" % source,
+        "# Tokenizer for %s (.pyx, scanned by lexer_spec.pyx)\n\n" % spec["NAME"],
+        "# cython: language_level=3\n",
+        "cimport cython\n",
+        "from lexer_core cimport WordTable, LineCache, lc_word_table, wrap_words, %s\n" % ", ".join(used),
+        "from lexer_spec cimport ls_spec, SpecLexer\n\n",
+        "from lexer_core import make_styles\n\n",
+        "cdef extern from \"%s_lexer.h\":\n" % name,
+        "    const ls_spec %s_spec\n" % name,
+        "    const lc_word_table %s_words\n" % name if words else "",
+        "\n\n",
+        "cdef WordTable WORDS = %s\n\n" % ("wrap_words(&%s_words)" % name if words else "WordTable()"),
+        "# styles that can be extended with Lexer(extra_words={ style: [...] })\n",
+        "WORD_KINDS = { %s }\n\n" % word_kinds if word_kinds else "WORD_KINDS = {}\n\n",
+        "cdef tuple STYLES = make_styles({\n",
+        "".join("    %s: %r,\n" % (kind_name, styles[kind_name]) for kind_name in sorted(styles, key=kinds.get)),
+        "})\n\n",
+        "# lines seen by tokenize_cached, shared by lexers without extra_words\n",
+        "cdef LineCache LINE_CACHE = LineCache()\n\n\n",
+        "@cython.cclass\n",
+        "class Lexer(SpecLexer):\n\n",
+        "    def __init__(self, extra_words=None):\n",
+        "        self.setup(&%s_spec, WORDS, STYLES, WORD_KINDS, extra_words, LINE_CACHE)\n\n" % name,
+        "    @property\n",
+        "    def lexer_name(self):\n",
+        "        return %r\n\n" % spec["NAME"],
+        "    @property\n",
+        "    def comment_char(self):\n",
+        "        return %r\n\n" % (spec.get("COMMENT_CHAR", ""),),
+        "    @property\n",
+        "    def line_comment(self):\n",
+        "        return %r\n" % spec.get("LINE_COMMENT", ""),
+    ])
+
+
+def write(path, content):
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == content:
+                return
+
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def main():
+    # [(module, pyx path, header path)] of the spec tokenizers, for build.py
+    kinds = gen_words.token_kinds()
+    symbols = symbol_kinds()
+    classes, table = char_classes()
+    modules = []
+
+    for path in sorted(glob.glob(os.path.join(ROOT, SPECS, "*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        source = "%s/%s.py" % (SPECS, name)
+        spec = runpy.run_path(path)
+        header = "%s/%s_lexer.h" % (SPECS, name)
+        module = "%s/%s_lexer.pyx" % (SPECS, name)
+
+        write(os.path.join(ROOT, header), render_header(name, source, spec, kinds, symbols, classes, table))
+        write(os.path.join(ROOT, module), render_module(name, source, spec, kinds))
+        modules.append((name + "_lexer", module, header))
+
+    return modules
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# Word tables for Cython tokenizers (run from build.py)
+
+# Each table below is turned into a minimal perfect hash in C (see lexer_core.h)
+# and written to its header, which the tokenizer includes with
+#
+#   cdef extern from "pc_words.h":
+#       const lc_word_table pc_words
+#
+# Kinds are TokenKind names from lexer_core.pxd. Headers are only rewritten
+# when their content changes, so unchanged tokenizers are not rebuilt.
+
+import os
+import re
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+TABLES = {
+    "pc_words": ("pc_words.h", {
+        "TK_KEYWORD": ("if", "else", "while", "swap", "print"),
+        "TK_CONDITIONAL": ("True", "False"),
+    }),
+    "odin_words": ("experiments/_odin_words.h", {
+        "TK_KEYWORD": (
+            "asm", "auto_cast", "bit_set", "break", "case", "cast", "context", "continue", "defer",
+            "distinct", "do", "dynamic", "else", "enum", "fallthrough", "for", "foreign", "if",
+            "import", "in", "map", "not_in", "or_else", "or_return", "package", "proc", "return",
+            "struct", "switch", "transmute", "typeid", "union", "using", "when", "where",
+        ),
+        "TK_BUILT_IN": ("fmt", "len", "println"),
+        "TK_TYPE": (
+            "i8", "i16", "i32", "i64", "i128", "int", "u8", "u16", "u32", "u64", "u128", "uint",
+            "f32", "f64", "complex64", "complex128", "quaternion128", "quaternion256", "string",
+            "rune", "bool",
+        ),
+        "TK_CONDITIONAL": ("true", "false"),
+    }),
+    "py_words": ("experiments/_py_words.h", { # same lists as experiments/_py.py
+        "TK_KEYWORD": (
+            "in", "is", "async", "await", "break", "match", "case", "continue", "elif", "else",
+            "except", "finally", "for", "from", "global", "if", "import", "nonlocal", "pass",
+            "raise", "return", "try", "while", "with", "yield", "def", "class", "and", "or", "not",
+        ),
+        "TK_BUILT_IN": (
+            "assert", "del", "print", "__init__", "super", "len", "abs", "aiter", "all", "anext",
+            "any", "ascii", "bin", "breakpoint", "callable", "chr", "classmethod", "compile",
+            "delattr", "dir", "divmod", "enumerate", "eval", "exec", "filter", "format", "getattr",
+            "globals", "hasattr", "hash", "help", "hex", "id", "input", "isinstance", "issubclass",
+            "iter", "locals", "map", "max", "min", "next", "object", "oct", "open", "ord", "pow",
+            "property", "range", "repr", "reversed", "round", "setattr", "slice", "sorted",
+            "staticmethod", "sum", "vars", "zip",
+        ),
+        "TK_TYPE": (
+            "type", "int", "float", "complex", "str", "bool", "dict", "tuple", "list", "frozenset",
+            "bytes", "bytearray", "memoryview",
+        ),
+        "TK_SPECIAL": ("self",),
+        "TK_PARAMETER": ("lambda",),
+        "TK_CONDITIONAL": ("True", "False", "None"),
+    }),
+}
+
+
+def token_kinds():
+    # { "TK_KEYWORD": 2, ... } from lexer_core.pxd
+    with open(os.path.join(ROOT, "lexer_core.pxd")) as f:
+        return { name: int(value) for name, value in re.findall(r"^\s+(TK_\w+) = (\d+)", f.read(), re.M) }
+
+
+def word_hash(word, seed):
+    # same as lc_hash in lexer_core.h
+    h = 0x811c9dc5 ^ seed
+    for ch in word:
+        h ^= ord(ch)
+        h = (h * 0x01000193) & 0xffffffff
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    return h
+
+
+MAX_SEED = 1 << 20
+
+
+def perfect_hash(words):
+    # returns (displace, slots) for lc_word_table, slots[i] is word in slot i
+    size = len(words)
+    buckets = [[] for _ in range(size)]
+    for word in words:
+        buckets[word_hash(word, 0) % size].append(word)
+
+    displace = [0] * size
+    slots = [None] * size
+
+    for index in sorted(range(size), key=lambda i: -len(buckets[i])):
+        bucket = buckets[index]
+        if len(bucket) < 2:
+            break
+
+        seed = 1
+        while True:
+            placed = [word_hash(word, seed) % size for word in bucket]
+            if len(set(placed)) == len(placed) and all(slots[slot] is None for slot in placed):
+                break
+            seed += 1
+            if seed == MAX_SEED:
+                raise ValueError("perfect_hash : no seed for %r" % bucket)
+
+        displace[index] = seed
+        for word, slot in zip(bucket, placed):
+            slots[slot] = word
+
+    free = [slot for slot in range(size) if slots[slot] is None]
+    for index in range(size):
+        if len(buckets[index]) == 1:
+            slot = free.pop()
+            displace[index] = -(slot + 1)
+            slots[slot] = buckets[index][0]
+
+    return displace, slots
+
+
+def c_array(ctype, name, values):
+    rows = [", ".join(str(value) for value in values[i:i + 16]) for i in range(0, len(values), 16)]
+    return "static const %s %s[] = {\n    %s\n};\n" % (ctype, name, ",\n    ".join(rows or ["0"]))
+
+
+def render_table(name, table, kinds):
+    # #defines and arrays of one lc_word_table (also used by gen_lexers.py)
+    words = {}
+    for kind_name, kind_words in table.items():
+        for word in kind_words:
+            if word in words:
+                raise ValueError("%s : %r listed twice" % (name, word))
+            if len(word) > 255 or not word.isascii():
+                raise ValueError("%s : %r must be ascii and at most 255 chars" % (name, word))
+            words[word] = kinds[kind_name]
+
+    displace, slots = perfect_hash(sorted(words))
+
+    offsets = []
+    chars = ""
+    for word in slots:
+        offsets.append(len(chars))
+        chars += word
+
+    used = sorted(table, key=lambda kind_name: kinds[kind_name])
+    return "".join([
+        "".join("#define %s_%s %d\n" % (name.upper(), kind_name, kinds[kind_name]) for kind_name in used),
+        "\n",
+        c_array("int32_t", name + "_displace", displace),
+        c_array("uint32_t", name + "_offsets", offsets),
+        c_array("uint8_t", name + "_lengths", [len(word) for word in slots]),
+        c_array("uint8_t", name + "_kinds", [words[word] for word in slots]),
+        "static const unsigned char %s_chars[] = \"%s\";\n\n" % (name, chars),
+        "static const lc_word_table %s = {\n    %d, %d, %s_displace, %s_offsets, %s_lengths, %s_kinds, %s_chars\n};\n" % (
+            name, len(slots), max(map(len, slots)), name, name, name, name, name,
+        ),
+    ])
+
+
+def render(name, table, kinds):
+    return "// Generated by gen_words.py, do not edit\n\n#include \"lexer_core.h\"\n\n" + render_table(name, table, kinds)
+
+
+def main():
+    kinds = token_kinds()
+
+    for name, (path, table) in TABLES.items():
+        path = os.path.join(ROOT, path)
+        header = render(name, table, kinds)
+
+        if os.path.exists(path):
+            with open(path) as f:
+                if f.read() == header:
+                    continue
+
+        with open(path, "w") as f:
+            f.write(header)
+
+
+if __name__ == "__main__":
+    main()
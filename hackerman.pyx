@@ -25,7 +25,24 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport (
+    Text, text_view, char_at, char_is, at_line_start, is_alpha, is_alnum, raw_to_char,
+    raw_to_eol, raw_to_pair, raw_class, raw_word, LC_BLANK,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_CLASS, TK_NAME, TK_STRING,
+    TK_NUMBER, TK_COMMENT, TK_ERROR, TK_WARNING, TK_COUNT,
+    SymbolIndex, SYM_CLASS, LC_STATS, lc_stat, lc_clock_ns, count_stat, stats_dict,
+    clear_stats, LineCache, scan_parallel,
+)
+from cpython.unicode cimport PyUnicode_FindChar
+from libc.stdint cimport uint64_t
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from incremental import retokenize as _retokenize, tokenize_range as _tokenize_range
+from lexer_core import CHUNK_SIZE, PARALLEL_THRESHOLD, iter_tokens as _iter_tokens, line_range, make_styles, tokenize_many as _tokenize_many
 
 cdef str WHITESPACE = "whitespace"
 cdef str DEFAULT = "default"
@@ -38,6 +55,19 @@ cdef str COMMENT = "comment"
 
 # system colors
 cdef str ERROR = "_error"
+cdef str PENDING = "_warning" # path value waiting for background check
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_CLASS: CLASS,
+    TK_NAME: NAME,
+    TK_STRING: STRING,
+    TK_NUMBER: NUMBER,
+    TK_COMMENT: COMMENT,
+    TK_ERROR: ERROR,
+    TK_WARNING: PENDING,
+})
 
 ACCEPTED_FUNCTIONS = frozenset({
     
@@ -354,23 +384,115 @@ ACCEPTED_NAMES = {
     "ollama": "name",
 }
 
-cdef int is_int(str text):
-    try:
-        int(text)
-        return True
-    except ValueError:
+# value checks (single pass, same results as int(), float() and str methods)
+
+cdef inline bint is_number_space(Py_UCS4 ch):
+    # whitespace int() and float() strip (ascii \x1c-\x1f are not stripped)
+    if ch < 128:
+        return ch == ' ' or (ch >= '\t' and ch <= '\r')
+    return ch.isspace()
+
+cdef inline Py_ssize_t skip_space(str text, Py_ssize_t i, Py_ssize_t n):
+    while i < n and is_number_space(text[i]):
+        i += 1
+    return i
+
+cdef inline Py_ssize_t strip_end(str text, Py_ssize_t i, Py_ssize_t n):
+    while n > i and is_number_space(text[n - 1]):
+        n -= 1
+    return n
+
+cdef Py_ssize_t scan_decimal(str text, Py_ssize_t i, Py_ssize_t n):
+    # decimal digits, single underscores only between digits (PEP 515)
+    cdef Py_ssize_t start = i
+    cdef Py_UCS4 ch
+    cdef Py_UCS4 next_ch
+
+    while i < n:
+        ch = text[i]
+        if ch.isdecimal():
+            i += 1
+        elif ch == '_' and i > start and i + 1 < n:
+            next_ch = text[i + 1]
+            if not next_ch.isdecimal():
+                break
+            i += 1
+        else:
+            break
+
+    return i
+
+cdef bint ascii_equal_nocase(str text, Py_ssize_t i, Py_ssize_t n, str word):
+    # text[i:n] == word ignoring ascii case (word is lowercase ascii)
+    cdef Py_ssize_t k
+    cdef Py_UCS4 ch
+    cdef Py_UCS4 expected
+
+    if n - i != len(word):
         return False
 
-cdef int is_float(str text):
-    try:
-        float(text)
+    for k in range(n - i):
+        ch = text[i + k]
+        expected = word[k]
+        if (<unsigned int>ch | 0x20) != <unsigned int>expected:
+            return False
+
+    return True
+
+cdef bint is_int(str text):
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = skip_space(text, 0, n)
+    cdef Py_ssize_t end
+
+    n = strip_end(text, i, n)
+
+    if i < n and (text[i] == '+' or text[i] == '-'):
+        i += 1
+
+    end = scan_decimal(text, i, n)
+    return end > i and end == n
+
+cdef bint is_float(str text):
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = skip_space(text, 0, n)
+    cdef Py_ssize_t end
+    cdef bint digits
+
+    n = strip_end(text, i, n)
+
+    if i < n and (text[i] == '+' or text[i] == '-'):
+        i += 1
+
+    if ascii_equal_nocase(text, i, n, "inf") or ascii_equal_nocase(text, i, n, "infinity") or ascii_equal_nocase(text, i, n, "nan"):
         return True
-    except ValueError:
+
+    # mantissa
+    end = scan_decimal(text, i, n)
+    digits = end > i
+
+    if end < n and text[end] == '.':
+        i = end + 1
+        end = scan_decimal(text, i, n)
+        digits = digits or end > i
+
+    if not digits:
         return False
 
-cdef int is_bool(str text):
-    text = text.lower()
-    return text == "true" or text == "false"
+    # exponent
+    if end < n and (text[end] == 'e' or text[end] == 'E'):
+        i = end + 1
+        if i < n and (text[i] == '+' or text[i] == '-'):
+            i += 1
+
+        end = scan_decimal(text, i, n)
+        if end == i:
+            return False
+
+    return end == n
+
+cdef bint is_bool(str text):
+    cdef Py_ssize_t n = len(text)
+    return ascii_equal_nocase(text, 0, n, "true") or ascii_equal_nocase(text, 0, n, "false")
 
 cdef int is_path(str text):
     cdef str s
@@ -394,217 +516,575 @@ cdef int is_path(str text):
     except Exception:
         return False
 
-cdef int is_name(str text):
-    cdef str s
-    
-    s = (text or "").strip()
-    if not s:
+# path validation cache
+#
+# stat calls are slow on network home dirs, so path values are checked at most
+# once per ttl (lru, max_size entries). path values are pushed as pending
+# (TK_WARNING) and looked up after each scan (so lines from LINE_CACHE are
+# looked up again too), values missing from the cache are checked as one batch: inline by
+# default, or on a background thread if deferred is set (tokenize then never
+# touches the filesystem, and on_resolved(paths) is called from that thread
+# once the batch changed something, so the editor can tokenize again)
+
+cdef class PathCache:
+    cdef public double ttl
+    cdef public Py_ssize_t max_size
+    cdef public bint deferred
+    cdef public object on_resolved
+
+    cdef object entries # path -> (valid, checked_at)
+    cdef set stale
+    cdef set in_flight
+    cdef object lock
+    cdef object executor
+
+    def __cinit__(self, double ttl=5.0, Py_ssize_t max_size=512, bint deferred=False, on_resolved=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.deferred = deferred
+        self.on_resolved = on_resolved
+
+        self.entries = OrderedDict()
+        self.stale = set()
+        self.in_flight = set()
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    cdef int lookup(self, str path):
+        # 1 valid, 0 invalid, -1 unknown (caller marks value pending)
+        cdef tuple entry
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                return -1
+
+            self.entries.move_to_end(path)
+
+            if time.monotonic() - <double>entry[1] > self.ttl:
+                if not self.deferred:
+                    return -1
+
+                # serve old result while it is checked again
+                self.stale.add(path)
+
+            return 1 if entry[0] else 0
+
+    cdef list store(self, dict results):
+        # returns paths whose result is new or changed
+        cdef double now = time.monotonic()
+        cdef list changed = []
+        cdef tuple entry
+
+        with self.lock:
+            for path, valid in results.items():
+                entry = self.entries.pop(path, None)
+                if entry is None or entry[0] != valid:
+                    changed.append(path)
+
+                self.entries[path] = (valid, now)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        return changed
+
+    def validate(self, paths):
+        # check paths now (one stat per distinct path), returns { path: valid }
+        cdef dict results = { path: bool(is_path(path)) for path in set(paths) }
+        self.store(results)
+        return results
+
+    cdef void submit(self, set paths):
+        with self.lock:
+            paths |= self.stale
+            self.stale.clear()
+            paths -= self.in_flight
+            if not paths:
+                return
+
+            self.in_flight |= paths
+
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hackerman-paths")
+
+        self.executor.submit(self.check_batch, paths)
+
+    def check_batch(self, set paths):
+        cdef dict results = { path: bool(is_path(path)) for path in paths }
+        cdef list changed = self.store(results)
+
+        with self.lock:
+            self.in_flight -= paths
+
+        if changed and self.on_resolved is not None:
+            self.on_resolved(changed)
+
+    def wait(self):
+        # block until queued background checks are done
+        if self.executor is not None:
+            self.executor.submit(lambda: None).result()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.stale.clear()
+
+
+cdef PathCache PATHS = PathCache()
+
+
+cdef int resolve_paths(TokenArray tokens, Py_ssize_t first) except -1:
+    # style pending path values pushed at or after first from PATHS, batch check the unknown ones
+    cdef Py_ssize_t i
+    cdef Py_ssize_t start
+    cdef int state
+    cdef str path
+    cdef list pending = []
+    cdef set paths = set()
+    cdef dict results
+    cdef str text = tokens.text
+
+    for i in range(first, tokens.count):
+        if tokens.kinds[i] == TK_WARNING:
+            start = tokens.starts[i]
+            path = text[start:start + tokens.lengths[i]]
+            state = PATHS.lookup(path)
+
+            if state == 1:
+                tokens.kinds[i] = TK_STRING
+            elif state == 0:
+                tokens.kinds[i] = TK_ERROR
+            else:
+                pending.append(i)
+                paths.add(path)
+
+    if PATHS.deferred:
+        if paths or PATHS.stale:
+            PATHS.submit(paths)
+        return 0
+
+    if not pending:
+        return 0
+
+    results = PATHS.validate(paths)
+
+    for i in pending:
+        start = tokens.starts[i]
+        tokens.kinds[i] = TK_STRING if results[text[start:start + tokens.lengths[i]]] else TK_ERROR
+
+    return 0
+
+# extra (ascii) chars allowed in names, as bitmap
+cdef uint64_t NAME_EXTRA[2]
+
+cdef void set_bitmap(uint64_t* bitmap, str chars):
+    cdef Py_UCS4 ch
+    cdef unsigned int code
+    bitmap[0] = 0
+    bitmap[1] = 0
+    for ch in chars:
+        code = ch
+        bitmap[code >> 6] |= (<uint64_t>1) << (code & 63)
+
+cdef inline bint in_bitmap(const uint64_t* bitmap, Py_UCS4 ch):
+    cdef unsigned int code = ch
+    return code < 128 and (bitmap[code >> 6] >> (code & 63)) & 1
+
+set_bitmap(NAME_EXTRA, " -_+.'&():/")
+
+cdef bint is_name(str text):
+    # at least one alnum, otherwise alnum, whitespace or NAME_EXTRA
+    cdef bint any_alnum = False
+    cdef Py_UCS4 ch
+
+    for ch in text:
+        if is_alnum(ch):
+            any_alnum = True
+        elif not (ch.isspace() or in_bitmap(NAME_EXTRA, ch)):
+            return False
+
+    return any_alnum
+
+cdef bint is_alpha_text(str text):
+    cdef Py_UCS4 ch
+
+    if not text:
         return False
 
-    allowed_extra = set(" -_+.'&():/")
+    for ch in text:
+        if not is_alpha(ch):
+            return False
+
+    return True
+
+
+# value validators
+#
+# ACCEPTED_NAMES is compiled once into a Validator per name, each value is then
+# checked with one dict lookup and a call through VALIDATE[validator.kind]
+# (call compile_accepted_names() again after changing ACCEPTED_NAMES)
+
+cdef enum: # value kinds
+    V_ANY = 0 # known name, any value
+    V_CHOICE
+    V_INT
+    V_LIST
+    V_FLOAT
+    V_BOOL
+    V_ALPHA
+    V_NAME
+    V_PATH
+    V_MAX_LEN
+    V_COUNT
+
+@cython.final
+cdef class Validator:
+    cdef int kind
+    cdef frozenset choices
+    cdef Py_ssize_t max_len
+
+ctypedef int (*validate_fn)(Validator, str) except -1
+
+cdef int validate_any(Validator validator, str value) except -1:
+    return TK_STRING
+
+cdef int validate_choice(Validator validator, str value) except -1:
+    return TK_STRING if value in validator.choices else TK_ERROR
+
+cdef int validate_int(Validator validator, str value) except -1:
+    return TK_NUMBER if is_int(value) else TK_ERROR
+
+cdef int validate_list(Validator validator, str value) except -1:
+    return TK_STRING if PyUnicode_FindChar(value, ',', 0, len(value), 1) != -1 else TK_ERROR
+
+cdef int validate_float(Validator validator, str value) except -1:
+    return TK_NUMBER if is_float(value) else TK_ERROR
+
+cdef int validate_bool(Validator validator, str value) except -1:
+    return TK_NUMBER if is_bool(value) else TK_ERROR
+
+cdef int validate_alpha(Validator validator, str value) except -1:
+    return TK_STRING if is_alpha_text(value) else TK_ERROR
+
+cdef int validate_name(Validator validator, str value) except -1:
+    return TK_STRING if is_name(value) else TK_ERROR
+
+cdef int validate_path(Validator validator, str value) except -1:
+    # pending, looked up (or checked in batch) by resolve_paths
+    return TK_WARNING
+
+cdef int validate_max_len(Validator validator, str value) except -1:
+    return TK_STRING if len(value) <= validator.max_len else TK_ERROR
+
+cdef validate_fn VALIDATE[V_COUNT]
+VALIDATE[V_ANY] = validate_any
+VALIDATE[V_CHOICE] = validate_choice
+VALIDATE[V_INT] = validate_int
+VALIDATE[V_LIST] = validate_list
+VALIDATE[V_FLOAT] = validate_float
+VALIDATE[V_BOOL] = validate_bool
+VALIDATE[V_ALPHA] = validate_alpha
+VALIDATE[V_NAME] = validate_name
+VALIDATE[V_PATH] = validate_path
+VALIDATE[V_MAX_LEN] = validate_max_len
+
+cdef dict VALUE_KINDS = {
+    "int": V_INT,
+    "list": V_LIST,
+    "float": V_FLOAT,
+    "bool": V_BOOL,
+    "isalpha": V_ALPHA,
+    "name": V_NAME,
+    "path": V_PATH,
+}
 
-    return (
-        any(ch.isalnum() for ch in s) and
-        all(ch.isalnum() or ch.isspace() or ch in allowed_extra for ch in s)
-    )
+cdef Validator compile_validator(object spec):
+    cdef Validator validator = Validator()
+    validator.kind = V_ANY
 
+    if isinstance(spec, list):
+        validator.kind = V_CHOICE
+        validator.choices = frozenset(spec)
+    elif isinstance(spec, str):
+        validator.kind = VALUE_KINDS.get(spec, V_ANY)
+    elif isinstance(spec, int):
+        validator.kind = V_MAX_LEN
+        validator.max_len = spec
 
-cdef int handle_whitespace(int current_char_index):
-    current_char_index += 1
-    return current_char_index
+    return validator
 
+cdef dict VALIDATORS = {}
 
-cdef int handle_comment(int current_char_index, str text, list tokens):
-    cdef int start_pos = current_char_index
-    cdef str line = text[current_char_index]
-    current_char_index += 1
+# lines seen by tokenize_cached (validated values, see scan_line), shared by all DSCL lexers
+cdef LineCache LINE_CACHE = LineCache()
 
-    while current_char_index < len(text) and text[current_char_index] != '\n':
-        line += text[current_char_index]
-        current_char_index += 1
+def compile_accepted_names():
+    VALIDATORS.clear()
+    for name, spec in ACCEPTED_NAMES.items():
+        VALIDATORS[name] = compile_validator(spec)
+    LINE_CACHE.clear()
+
+compile_accepted_names()
+
+
+cdef enum:
+    TK_VALUE = TK_COUNT # value pushed by scan_into, replaced by validate_values (not a style)
 
-    tokens.append((COMMENT, start_pos, line))
+
+# scan handlers and passes for Lexer.stats() (counted only in LC_STATS builds, see lexer_core.h)
+cdef enum:
+    H_WHITESPACE
+    H_NEWLINE
+    H_COMMENT
+    H_HEADER
+    H_IDENTIFIER
+    H_ERROR
+    H_VALIDATE_VALUES
+    H_RESOLVE_PATHS
+    H_COUNT
+
+cdef tuple HANDLERS = (
+    "whitespace", "newline", "handle_comment", "handle_header", "handle_identifier", "error",
+    "validate_values", "resolve_paths",
+)
+
+cdef lc_stat STATS[H_COUNT]
+
+
+cdef Py_ssize_t handle_comment(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t start_pos = current_char_index
+    current_char_index = raw_to_eol(text, current_char_index + 1, text.length)
+
+    tokens.push(TK_COMMENT, start_pos, current_char_index - start_pos)
     return current_char_index
 
 
-cdef int handle_header(int current_char_index, str text, list tokens):
-    cdef int start_pos = current_char_index
-    cdef str lexeme = text[current_char_index] # should be '['
-    current_char_index += 1
+cdef Py_ssize_t handle_header(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t start_pos = current_char_index # should be '['
+    current_char_index = raw_to_char(text, current_char_index + 1, text.length, ']')
 
-    while current_char_index < len(text) and text[current_char_index] != ']':
-        lexeme += text[current_char_index]
+    if current_char_index < text.length:
         current_char_index += 1
 
-    if current_char_index < len(text) and text[current_char_index] == ']':
-        lexeme += text[current_char_index]
-        current_char_index += 1
+    tokens.push(TK_KEYWORD, start_pos, current_char_index - start_pos)
+
+    # header at line start is a class in outline
+    if at_line_start(text, start_pos):
+        tokens.mark_symbol(tokens.count - 1, SYM_CLASS)
 
-    tokens.append((KEYWORD, start_pos, lexeme))
     return current_char_index
 
 
-cdef int handle_identifier(int current_char_index, str text, list tokens):
-    cdef int text_length = len(text)
-    cdef int char_index = current_char_index
-    cdef int start_pos = current_char_index
-    cdef str lexeme
+cdef Py_ssize_t handle_identifier(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t text_length = text.length
+    cdef Py_ssize_t char_index = current_char_index
+    cdef Py_ssize_t start_pos = current_char_index
 
     # LHS
 
-    while char_index < text_length and (text[char_index].isalnum() or text[char_index] == '_'):
+    char_index = raw_word(text, char_index, text_length)
+    tokens.push(TK_DEFAULT, start_pos, char_index - start_pos)
+
+    # skip whitespace between LHS and RHS
+    while char_index < text_length and (char_at(text, char_index) == ' ' or char_at(text, char_index) == '\t'):
         char_index += 1
 
-    lexeme = text[start_pos:char_index]
+    cdef Py_ssize_t rhs_start = char_index
 
-    if lexeme in ACCEPTED_NAMES.keys():
-        tokens.append((DEFAULT, start_pos, lexeme))
-    else:
-        tokens.append((DEFAULT, start_pos, lexeme))
+    # RHS ends at comment or end of line
+    cdef Py_ssize_t line_end = raw_to_char(text, char_index, raw_to_eol(text, char_index, text_length), '\r')
+    cdef Py_ssize_t rhs_end = raw_to_pair(text, char_index, line_end, '-', '-')
 
-    # skip whitespace between LHS and RHS
-    while char_index < text_length and (text[char_index] == ' ' or text[char_index] == '\t'):
-        char_index += 1
+    # trim trailing whitespace
+    cdef Py_ssize_t item_end = rhs_end
+    while item_end > rhs_start and (char_at(text, item_end - 1) == ' ' or char_at(text, item_end - 1) == '\t'):
+        item_end -= 1
 
-    cdef int rhs_start = char_index
-    cdef int comment_pos = -1
+    # value (validated against LHS name by validate_values, with the gil)
+    if item_end > rhs_start:
+        if char_at(text, rhs_start) == '"':
+            tokens.push(TK_STRING, rhs_start, item_end - rhs_start)
+        else:
+            tokens.push(TK_VALUE, rhs_start, item_end - rhs_start)
 
-    # find comment pos
-    while char_index < text_length and text[char_index] not in ('\r', '\n'):
-        if text[char_index] == '-' and char_index + 1 < text_length and text[char_index + 1] == '-':
-            comment_pos = char_index
-            break
-        
-        char_index += 1
+    return rhs_end
 
-    cdef int rhs_end = comment_pos if comment_pos != -1 else char_index
-    cdef str rhs_raw = text[rhs_start:rhs_end]
 
-    # RHS
+cdef Py_ssize_t scan_into(Text text, Py_ssize_t current_char_index, Py_ssize_t stop, TokenArray tokens) except -1 nogil:
+    # tokenize from line start, return at first line start at or after stop
+    cdef Py_ssize_t n = text.length
+    cdef Py_UCS4 current_char
+    cdef Py_UCS4 next_char
+    cdef uint64_t started = 0
+    cdef Py_ssize_t first = 0
+    cdef int handler = H_ERROR
 
-    cdef str rhs = text[rhs_start:char_index].rstrip()
-    if rhs.endswith(','):
-        rhs = rhs[:-1].rstrip()
+    while current_char_index < n:
+        if current_char_index >= stop and (current_char_index == 0 or char_at(text, current_char_index - 1) == '\n'):
+            break
 
-    cdef int rhs_offset_rel = 0
-    cdef int rhs_len = len(rhs_raw)
+        if LC_STATS:
+            started = lc_clock_ns()
+            first = current_char_index
 
-    cdef int item_s
-    cdef int item_e
-    cdef int trimmed_end_rel
-    cdef str item_text
-    cdef int abs_item_start
+        current_char = char_at(text, current_char_index)
+        next_char = 0
+        if current_char_index + 1 < n:
+            next_char = char_at(text, current_char_index + 1)
 
-    # handle RHS values
+        # whitespace (newline one at a time so scan can stop at line start)
+        if char_is(current_char, LC_BLANK):
+            handler = H_WHITESPACE
+            current_char_index = raw_class(text, current_char_index + 1, n, LC_BLANK)
 
-    while rhs_offset_rel < rhs_len:
+        elif current_char == '\n':
+            handler = H_NEWLINE
+            current_char_index += 1
         
-        # skip leading whitespace
-        while rhs_offset_rel < rhs_len and (rhs_raw[rhs_offset_rel] == ' ' or rhs_raw[rhs_offset_rel] == '\t'):
-            rhs_offset_rel += 1
+        # comment
+        elif current_char == '-' and next_char == '-':
+            handler = H_COMMENT
+            current_char_index = handle_comment(current_char_index, text, tokens)
         
-        item_s = rhs_offset_rel
-
-        # scan to comma or EOL
-        while rhs_offset_rel < rhs_len:
-            rhs_offset_rel += 1
+        # header
+        elif current_char == '[':
+            handler = H_HEADER
+            current_char_index = handle_header(current_char_index, text, tokens)
+
+        # identifier
+        elif is_alpha(current_char) or current_char == '_':
+            handler = H_IDENTIFIER
+            current_char_index = handle_identifier(current_char_index, text, tokens)
         
-        item_e = rhs_offset_rel
+        # unknown
+        else:
+            handler = H_ERROR
+            tokens.push(TK_ERROR, current_char_index, 1)
+            current_char_index += 1
 
-        # trim trailing whitespace
-        trimmed_end_rel = item_e - 1
-        while trimmed_end_rel >= item_s and (rhs_raw[trimmed_end_rel] == ' ' or rhs_raw[trimmed_end_rel] == '\t'):
-            trimmed_end_rel -= 1
-        
-        trimmed_end_rel += 1
+        if LC_STATS:
+            count_stat(&STATS[handler], started, current_char_index - first)
 
-        if trimmed_end_rel > item_s:
-            item_text = rhs_raw[item_s:trimmed_end_rel]
-            abs_item_start = rhs_start + item_s
+    return current_char_index
 
-            if item_text.startswith('"'):
-                tokens.append((STRING, abs_item_start, item_text))
-            else:
-                if lexeme in ACCEPTED_NAMES.keys():
-                    valid_values = ACCEPTED_NAMES[lexeme]
-
-                    # list of strings
-                    if isinstance(valid_values, list):
-                        if item_text in valid_values:
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # int
-                    elif valid_values == "int":
-                        if is_int(item_text):
-                            tokens.append((NUMBER, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # list
-                    elif valid_values == "list":
-                        if "," in item_text:
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # float
-                    elif valid_values == "float":
-                        if is_float(item_text):
-                            tokens.append((NUMBER, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # bool
-                    elif valid_values == "bool":
-                        if is_bool(item_text):
-                            tokens.append((NUMBER, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # isalpha
-                    elif valid_values == "isalpha":
-                        if item_text.isalpha():
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-                            
-                    # name
-                    elif valid_values == "name":
-                        if is_name(item_text):
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-                            
-                    # path
-                    elif valid_values == "path":
-                        if is_path(item_text):
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-
-                    # length var
-                    elif isinstance(valid_values, int):
-                        if len(item_text) <= valid_values:
-                            tokens.append((STRING, abs_item_start, item_text))
-                        else:
-                            tokens.append((ERROR, abs_item_start, item_text))
-                    
-                    # wildcard (valid name but unknown input)
-                    else:
-                        tokens.append((STRING, abs_item_start, item_text))
-                
-                # if not in valid names
-                else:
-                    tokens.append((COMMENT, abs_item_start, item_text))
-
-        # if there is a comma, emit it with exact absolute position
-        if rhs_offset_rel < rhs_len and rhs_raw[rhs_offset_rel] == ',':
-            tokens.append((DEFAULT, rhs_start + rhs_offset_rel, ","))
-            rhs_offset_rel += 1
-
-    return char_index
+
+cdef int validate_values(TokenArray tokens, Py_ssize_t first) except -1:
+    # style values pushed at or after first by their LHS name (always the token before)
+    cdef Py_ssize_t i
+    cdef Py_ssize_t start
+    cdef str text = tokens.text
+    cdef Validator validator
+
+    for i in range(first, tokens.count):
+        if tokens.kinds[i] != TK_VALUE:
+            continue
+
+        start = tokens.starts[i - 1]
+        validator = VALIDATORS.get(text[start:start + tokens.lengths[i - 1]])
+
+        # if not in valid names
+        if validator is None:
+            tokens.kinds[i] = TK_COMMENT
+            continue
+
+        start = tokens.starts[i]
+        tokens.kinds[i] = VALIDATE[validator.kind](validator, text[start:start + tokens.lengths[i]])
+
+    return 0
+
+
+cdef int check_values(TokenArray tokens, Py_ssize_t first, bint values=True, bint paths=True) except -1:
+    # validate_values and resolve_paths for tokens pushed at or after first
+    cdef uint64_t started = 0
+    cdef Py_ssize_t chars = 0
+
+    if LC_STATS:
+        if tokens.count > first:
+            chars = tokens.starts[tokens.count - 1] + tokens.lengths[tokens.count - 1] - tokens.starts[first]
+        started = lc_clock_ns()
+
+    if values:
+        validate_values(tokens, first)
+
+        if LC_STATS:
+            count_stat(&STATS[H_VALIDATE_VALUES], started, chars)
+            started = lc_clock_ns()
+
+    if paths:
+        resolve_paths(tokens, first)
+
+        if LC_STATS:
+            count_stat(&STATS[H_RESOLVE_PATHS], started, chars)
+
+    return 0
+
+
+cdef Py_ssize_t scan_line(object context, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    # scan_into and validate_values for LINE_CACHE, path values depend on the
+    # file system so they are cached pending and resolved after (in tokenize_cached)
+    cdef Py_ssize_t first = tokens.count
+    cdef Py_ssize_t end = scan_into(text_view(text), start, stop, tokens)
+    check_values(tokens, first, True, False)
+    return end
+
+
+cdef Py_ssize_t scan_shard(object context, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    # scan_into without the gil, for tokenize_parallel (values are checked after)
+    cdef Text view = text_view(text)
+    cdef Py_ssize_t end
+
+    with nogil:
+        end = scan_into(view, start, stop, tokens)
+
+    return end
+
+
+cpdef Py_ssize_t scan(str text, Py_ssize_t start, Py_ssize_t stop, list tokens):
+    # list version of scan_into (used by incremental retokenize)
+    cdef TokenArray found = TokenArray(text, STYLES)
+    cdef Py_ssize_t end = scan_into(text_view(text), start, stop, found)
+    check_values(found, 0)
+    tokens.extend(found)
+    return end
+
+
+cpdef Py_ssize_t restart_point(str text, Py_ssize_t offset):
+    # offset, or start of header spanning it (used by tokenize_range)
+    #
+    # only headers span lines, and comments and name = value lines end at end of
+    # line, so skimming for them finds every token boundary tokenize would see
+    # before offset (a '[' in a comment or value is not a header)
+    cdef Text view = text_view(text)
+    cdef Py_ssize_t n = view.length
+    cdef Py_ssize_t current_char_index = 0
+    cdef Py_ssize_t end
+    cdef Py_UCS4 ch
+
+    while current_char_index < offset:
+        ch = char_at(view, current_char_index)
+
+        if ch == '-' and current_char_index + 1 < n and char_at(view, current_char_index + 1) == '-':
+            end = raw_to_eol(view, current_char_index + 1, n)
+        elif ch == '[':
+            end = raw_to_char(view, current_char_index + 1, n, ']')
+            if end < n:
+                end += 1
+        elif is_alpha(ch) or ch == '_':
+            # as handle_identifier, name and value run to a comment, '\r' or end of line
+            end = raw_to_pair(view, current_char_index, raw_to_char(view, current_char_index, raw_to_eol(view, current_char_index, n), '\r'), '-', '-')
+        else:
+            current_char_index += 1
+            continue
+
+        if end > offset:
+            return current_char_index
+        current_char_index = end
+
+    return offset
 
 
 cdef class Lexer:
@@ -615,9 +1095,14 @@ cdef class Lexer:
     cdef readonly str comment_char
     cdef readonly str line_comment
 
+    cdef readonly PathCache path_cache # shared by all DSCL lexers
+    cdef public LineCache line_cache # shared by all DSCL lexers
+
     def __cinit__(self, cmd_start=None, cmd_end=None):
         self.cmd_start = cmd_start
         self.cmd_end = cmd_end
+        self.path_cache = PATHS
+        self.line_cache = LINE_CACHE
         
         self.lexer_name = u"Hackerman Config"
         self.comment_char = u"--"
@@ -642,38 +1127,79 @@ cdef class Lexer:
     cpdef bint _is_type_def(self, str line_text):
         return False
 
+    # handler statistics
+
+    def stats(self):
+        # { handler: { "calls", "chars", "seconds" } } of all DSCL scans since the last
+        # reset_stats, empty unless built with LEXER_STATS=1 (see lexer_core.STATS)
+        return stats_dict(HANDLERS, STATS)
+
+    def reset_stats(self):
+        clear_stats(STATS, H_COUNT)
+
     # tokenizer
 
     def tokenize(self, str text):
-        cdef int current_char_index = 0
-        cdef str current_char
-        cdef str next_char
-        cdef list tokens = []
-
-        while current_char_index < len(text):
-            current_char = text[current_char_index]
-            next_char = text[current_char_index + 1] if current_char_index + 1 < len(text) else ""
-
-            # whitespace
-            if current_char in { ' ', '\t', '\r', '\n' }:
-                current_char_index = handle_whitespace(current_char_index)
-            
-            # comment
-            elif current_char == '-' and next_char == '-':
-                current_char_index = handle_comment(current_char_index, text, tokens)
-            
-            # header
-            elif current_char == '[':
-                current_char_index = handle_header(current_char_index, text, tokens)
-
-            # identifier
-            elif current_char.isalpha() or current_char == '_':
-                current_char_index = handle_identifier(current_char_index, text, tokens)
-            
-            # unknown
-            else:
-                tokens.append((ERROR, current_char_index, current_char))
-                current_char_index += 1
+        return self.tokenize_compact(text).to_list()
+
+    def tokenize_compact(self, str text):
+        # same tokens as tokenize, stored as kind/start/length arrays
+        # (scans without the gil, see tokenize_many)
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef Text view = text_view(text)
+
+        with nogil:
+            scan_into(view, 0, view.length, tokens)
+
+        check_values(tokens, 0)
+        return tokens
 
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in line_cache are copied instead of lexed
+        cdef TokenArray tokens = self.line_cache.tokenize(text, STYLES, scan_line, None)
+        check_values(tokens, 0, False, True)
         return tokens
 
+    def tokenize_many(self, texts, max_workers=None, bint compact=False):
+        # tokenize (or tokenize_compact) of each text, scanned in parallel on a thread pool
+        return _tokenize_many(self.tokenize_compact if compact else self.tokenize, texts, max_workers)
+
+    def tokenize_parallel(self, str text, workers=None, Py_ssize_t threshold=PARALLEL_THRESHOLD, bint compact=False):
+        # tokenize (or tokenize_compact) with text split at line starts into a shard per worker
+        # (default os.cpu_count()) scanned on a thread pool, serially if text is under threshold chars
+        cdef TokenArray tokens = scan_parallel(text, STYLES, scan_shard, None, workers, threshold)
+        check_values(tokens, 0)
+        return tokens if compact else tokens.to_list()
+
+    def iter_tokens(self, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+        # tokens of str, file object or iterable of chunks, one chunk of lines at a time
+        # (compact yields (offset, TokenArray) batches)
+        return _iter_tokens(self.tokenize_compact, source, chunk_size, compact)
+
+    def retokenize(self, str text, list old_tokens, edits, SymbolIndex symbols=None):
+        # text is buffer after edits, edits is list of (start, removed_len, inserted_text) in old positions
+        # (symbols from symbol_index is updated in place from the re-lexed lines)
+        cdef TokenArray found
+        result = _retokenize(scan, text, old_tokens, edits)
+
+        if symbols is not None:
+            changed_start, changed_end = result[1]
+            found = TokenArray(text, STYLES)
+            if changed_end > changed_start:
+                scan_into(text_view(text), changed_start, changed_end, found)
+            symbols.update(found, changed_start, changed_end)
+
+        return result
+
+    def symbol_index(self, str text, TokenArray tokens=None):
+        # outline ([headers] at line start) from tokens of text (tokenized if not given), see SymbolIndex
+        return SymbolIndex(tokens if tokens is not None else self.tokenize_compact(text))
+
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing only those lines
+        # (and a header spanning into them)
+        return _tokenize_range(scan, text, start_offset, end_offset, restart_point)
+
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        return self.tokenize_range(text, *line_range(text, first_line, last_line))
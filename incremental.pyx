@@ -0,0 +1,400 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Incremental re-tokenization for line-local lexers
+
+# Lexers whose state resets at newlines expose a scan function:
+#
+#   scan(text, start, stop, tokens) -> int
+#
+# which tokenizes text from start (a line start), appends tokens, and returns
+# the first line start at or after stop (or len(text)). Given the old token
+# list and a batch of edits, retokenize re-lexes from the nearest safe line
+# start before each edit and stops as soon as the new token stream lines up
+# with the old one again. Everything else is reused (shifted if needed).
+#
+# The same scan function gives viewport-first tokenization: tokenize_range
+# lexes only the lines overlapping a range, so visible lines can be styled
+# before the rest of the buffer is done.
+#
+# Lexers with state across lines (multi-line strings and comments, open
+# parentheses, ...) record a small hashable state at every line start in a
+# LineStates and expose
+#
+#   scan_lines(text, start, stop, state, tokens, lines) -> int
+#
+# which tokenizes from line start start in state, appends tokens and the state
+# of every line start it passes, and returns the first line start at or after
+# stop that is not inside a token (or len(text)). resumable(state) tells if
+# tokenizing can restart at a line in that state (not inside a token, ...).
+# retokenize_lines restarts at the last resumable line before each edit and
+# stops at the first line after it whose state is the same as before.
+
+# cython: language_level=3
+cimport cython
+
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+
+cdef inline Py_ssize_t token_end(tuple token):
+    return <Py_ssize_t>token[1] + len(<str>token[2])
+
+
+cdef void extend_shifted(list tokens, list old_tokens, Py_ssize_t start, Py_ssize_t stop, Py_ssize_t shift):
+    cdef Py_ssize_t i
+    cdef tuple token
+
+    if shift == 0:
+        tokens.extend(old_tokens[start:stop])
+        return
+
+    for i in range(start, stop):
+        token = <tuple>old_tokens[i]
+        tokens.append((token[0], <Py_ssize_t>token[1] + shift, token[2]))
+
+
+def retokenize(scan, str text, list old_tokens, edits):
+    # text       : buffer after edits
+    # old_tokens : tokens for buffer before edits
+    # edits      : iterable of (start, removed_len, inserted_text) in old buffer positions
+    #
+    # returns (tokens, (changed_start, changed_end)) where changed range is in new buffer positions
+
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t n_old = len(old_tokens)
+    cdef list tokens = []
+    cdef list batch = sorted(edits, key=lambda edit: edit[0])
+    cdef Py_ssize_t m = len(batch)
+
+    cdef list new_starts = []
+    cdef list new_ends = []
+    cdef list shifts = []
+
+    cdef Py_ssize_t delta = 0
+    cdef Py_ssize_t prev_end = 0
+    cdef Py_ssize_t edit_start
+    cdef Py_ssize_t removed
+    cdef Py_ssize_t inserted
+
+    # map each edit to new buffer positions
+    for edit in batch:
+        edit_start = edit[0]
+        removed = edit[1]
+        inserted = len(edit[2]) if isinstance(edit[2], str) else edit[2]
+
+        if edit_start < prev_end:
+            raise ValueError("retokenize : overlapping edits")
+
+        new_starts.append(edit_start + delta)
+        delta += inserted - removed
+        new_ends.append(edit_start + removed + delta)
+        shifts.append(delta)
+
+        prev_end = edit_start + removed
+
+    if m == 0:
+        return list(old_tokens), (0, 0)
+
+    cdef Py_ssize_t i = 0 # next old token
+    cdef Py_ssize_t k
+    cdef Py_ssize_t j = 0 # current edit
+    cdef Py_ssize_t pos = 0 # new buffer position tokens are final up to
+    cdef Py_ssize_t shift = 0 # offset of old tokens between pos and next edit
+    cdef Py_ssize_t restart
+    cdef Py_ssize_t p
+    cdef Py_ssize_t p_old
+    cdef Py_ssize_t changed_start = -1
+    cdef Py_ssize_t changed_end = 0
+
+    while j < m:
+
+        # restart at line start before edit
+        restart = text.rfind('\n', pos, <Py_ssize_t>new_starts[j]) + 1
+        if restart < pos:
+            restart = pos
+
+        # keep old tokens before restart, moving restart back if a token spans it
+        # (a token ending at restart has consumed the newline and may grow)
+        k = i
+        while k < n_old and <Py_ssize_t>old_tokens[k][1] + shift < restart:
+            k += 1
+
+        while k > i and token_end(<tuple>old_tokens[k - 1]) + shift >= restart:
+            k -= 1
+            restart = text.rfind('\n', pos, <Py_ssize_t>old_tokens[k][1] + shift) + 1
+            if restart < pos:
+                restart = pos
+
+            while k > i and <Py_ssize_t>old_tokens[k - 1][1] + shift >= restart:
+                k -= 1
+
+        extend_shifted(tokens, old_tokens, i, k, shift)
+        i = k
+
+        if changed_start < 0:
+            changed_start = restart
+
+        # re-lex line by line until old and new streams line up
+        p = restart
+        while True:
+            p = scan(text, p, p + 1, tokens)
+
+            # absorb edits the scan has run into
+            while j + 1 < m and p > <Py_ssize_t>new_starts[j + 1]:
+                j += 1
+
+            if p >= n:
+                i = n_old
+                j = m - 1
+                break
+
+            # line start must be past edit so previous char is unchanged newline
+            if p <= <Py_ssize_t>new_ends[j]:
+                continue
+
+            p_old = p - <Py_ssize_t>shifts[j]
+            while i < n_old and <Py_ssize_t>old_tokens[i][1] < p_old:
+                i += 1
+
+            # old stream must also be at token boundary
+            if i > 0 and token_end(<tuple>old_tokens[i - 1]) > p_old:
+                continue
+
+            break
+
+        changed_end = p
+        pos = p
+        shift = shifts[j]
+        j += 1
+
+    extend_shifted(tokens, old_tokens, i, n_old, shift)
+
+    return tokens, (changed_start, changed_end)
+
+
+def tokenize_range(scan, str text, Py_ssize_t start_offset, Py_ssize_t end_offset, restart_point=None):
+    # tokens for lines overlapping text[start_offset:end_offset] (at least the line at start_offset),
+    # restart_point(text, line_start) gives start of token spanning line start (line start if none)
+    cdef list tokens = []
+    cdef Py_ssize_t restart = text.rfind('\n', 0, start_offset) + 1
+
+    if restart_point is not None:
+        restart = restart_point(text, restart)
+
+    scan(text, restart, max(end_offset, restart + 1), tokens)
+    return tokens
+
+
+# lexers with line states
+
+cdef object TOKEN_START = itemgetter(1)
+
+
+class LineStates(object):
+    # lexer state at every line start, as line start offsets and states (index is line)
+
+    __slots__ = ("starts", "states")
+
+    def __init__(self, starts=None, states=None):
+        self.starts = [] if starts is None else starts
+        self.states = [] if states is None else states
+
+    def append(self, start, state):
+        self.starts.append(start)
+        self.states.append(state)
+
+    def __len__(self):
+        return len(self.states)
+
+    def __getitem__(self, line):
+        return self.states[line]
+
+    def __iter__(self):
+        return iter(self.states)
+
+    def __eq__(self, other):
+        return isinstance(other, LineStates) and self.starts == other.starts and self.states == other.states
+
+    def __repr__(self):
+        return "LineStates(%d lines)" % len(self.states)
+
+    def line_at(self, Py_ssize_t offset):
+        # line of offset
+        return bisect_right(self.starts, offset) - 1
+
+    def state_at(self, Py_ssize_t offset):
+        # state at start of line of offset
+        return self.states[bisect_right(self.starts, offset) - 1]
+
+
+def tokenize_lines(scan_lines, str text, state, Py_ssize_t start=0, stop=None):
+    # (tokens, LineStates) from line start start in state (e.g. a checkpoint from LineStates)
+    # to the first line start at or after stop outside tokens (default end of text)
+    cdef list tokens = []
+    lines = LineStates()
+
+    lines.append(start, state)
+    scan_lines(text, start, len(text) if stop is None else stop, state, tokens, lines)
+    return tokens, lines
+
+
+cdef Py_ssize_t restart_line(resumable, list old_tokens, list starts, list states, Py_ssize_t offset):
+    # last resumable line before offset (old positions), at or before the line of the token before it
+    # (the token before an edited line can change with it, e.g. identifiers looking ahead)
+    cdef Py_ssize_t line = bisect_right(starts, offset) - 1
+    cdef Py_ssize_t k = bisect_left(old_tokens, <Py_ssize_t>starts[line], key=TOKEN_START)
+
+    if k > 0:
+        line = bisect_right(starts, <Py_ssize_t>old_tokens[k - 1][1]) - 1
+    while line > 0 and not resumable(states[line]):
+        line -= 1
+    return line
+
+
+def retokenize_lines(scan_lines, resumable, str text, list old_tokens, old_lines, edits):
+    # text       : buffer after edits
+    # old_tokens : tokens for buffer before edits
+    # old_lines  : LineStates for buffer before edits
+    # edits      : iterable of (start, removed_len, inserted_text) in old buffer positions
+    #
+    # returns (tokens, lines, (changed_start, changed_end)) where changed range is in new buffer positions
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t n_old = len(old_tokens)
+    cdef list old_starts = old_lines.starts
+    cdef list old_states = old_lines.states
+    cdef Py_ssize_t n_lines = len(old_states)
+    cdef list tokens = []
+    cdef list batch = sorted(edits, key=lambda edit: edit[0])
+    cdef Py_ssize_t m = len(batch)
+
+    cdef list new_starts = []
+    cdef list new_ends = []
+    cdef list shifts = []
+    cdef list restarts = [] # restart line per edit
+
+    cdef Py_ssize_t delta = 0
+    cdef Py_ssize_t prev_end = 0
+    cdef Py_ssize_t edit_start
+    cdef Py_ssize_t removed
+    cdef Py_ssize_t inserted
+
+    for edit in batch:
+        edit_start = edit[0]
+        removed = edit[1]
+        inserted = len(edit[2]) if isinstance(edit[2], str) else edit[2]
+
+        if edit_start < prev_end:
+            raise ValueError("retokenize_lines : overlapping edits")
+
+        new_starts.append(edit_start + delta)
+        delta += inserted - removed
+        new_ends.append(edit_start + removed + delta)
+        shifts.append(delta)
+        restarts.append(restart_line(resumable, old_tokens, old_starts, old_states, edit_start))
+
+        prev_end = edit_start + removed
+
+    if m == 0:
+        return list(old_tokens), LineStates(list(old_starts), list(old_states)), (0, 0)
+
+    lines = LineStates()
+    cdef list starts = lines.starts
+    cdef list states = lines.states
+
+    cdef Py_ssize_t i = 0 # next old token
+    cdef Py_ssize_t k
+    cdef Py_ssize_t line = 0 # next old line
+    cdef Py_ssize_t restart
+    cdef Py_ssize_t j = 0 # current edit
+    cdef Py_ssize_t shift = 0 # offset of old tokens and lines between line and next edit
+    cdef Py_ssize_t p
+    cdef Py_ssize_t p_old
+    cdef Py_ssize_t old_line
+    cdef Py_ssize_t changed_start = -1
+    cdef Py_ssize_t changed_end = 0
+
+    while j < m:
+
+        # keep old lines and tokens before restart line
+        restart = max(<Py_ssize_t>restarts[j], line)
+        k = bisect_left(old_tokens, <Py_ssize_t>old_starts[restart], i, key=TOKEN_START)
+        extend_shifted(tokens, old_tokens, i, k, shift)
+        i = k
+
+        if shift == 0:
+            starts.extend(old_starts[line:restart])
+        else:
+            starts.extend([start + shift for start in old_starts[line:restart]])
+        states.extend(old_states[line:restart])
+
+        p = <Py_ssize_t>old_starts[restart] + shift
+        lines.append(p, old_states[restart])
+
+        if changed_start < 0:
+            changed_start = p
+
+        # re-lex line by line until state and tokens line up with old ones again
+        while True:
+            p = scan_lines(text, p, p + 1, states[-1], tokens, lines)
+
+            # absorb edits whose restart line the scan has run into
+            while j + 1 < m and p > <Py_ssize_t>old_starts[<Py_ssize_t>restarts[j + 1]] + <Py_ssize_t>shifts[j]:
+                j += 1
+
+            if p >= n:
+                i = n_old
+                line = n_lines
+                j = m - 1
+                break
+
+            # line start must be past edit so previous char is unchanged newline
+            if p <= <Py_ssize_t>new_ends[j]:
+                continue
+
+            # and a line start before the edit with the same (resumable) state
+            p_old = p - <Py_ssize_t>shifts[j]
+            old_line = bisect_left(old_starts, p_old, restart)
+            if old_line >= n_lines or <Py_ssize_t>old_starts[old_line] != p_old:
+                continue
+            if states[-1] != old_states[old_line] or not resumable(states[-1]):
+                continue
+
+            # old line is kept from here on (with the state it already has)
+            starts.pop()
+            states.pop()
+            i = bisect_left(old_tokens, p_old, i, key=TOKEN_START)
+            line = old_line
+            break
+
+        changed_end = p
+        shift = shifts[j]
+        j += 1
+
+    extend_shifted(tokens, old_tokens, i, n_old, shift)
+    if shift == 0:
+        starts.extend(old_starts[line:])
+    else:
+        starts.extend([start + shift for start in old_starts[line:]])
+    states.extend(old_states[line:])
+
+    return tokens, lines, (changed_start, changed_end)
@@ -0,0 +1,150 @@
+// MIT License
+
+// Copyright 2025 @asyncze (Michael Sjöberg)
+
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Character classes and word tables for Cython tokenizers (see lexer_core.pxd)
+
+// One entry per Latin-1 code point. Unicode classes (LC_ALPHA, LC_ALNUM,
+// LC_DIGIT) match the str methods, code points above 0xff fall back to them.
+
+#ifndef LEXER_CORE_H
+#define LEXER_CORE_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+
+#define LC_BLANK         0x01 /* ' ', '\t', '\r' */
+#define LC_NEWLINE       0x02 /* '\n' */
+#define LC_ASCII_LETTER  0x04 /* a-z A-Z */
+#define LC_ASCII_DIGIT   0x08 /* 0-9 */
+#define LC_UNDERSCORE    0x10 /* '_' */
+#define LC_ALPHA         0x20 /* str.isalpha() */
+#define LC_ALNUM         0x40 /* str.isalnum() */
+#define LC_DIGIT         0x80 /* str.isdigit() */
+
+static const unsigned char lc_char_class[256] = {
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x00, 0x00, 0x01, 0x00, 0x00, /* 0x00 */
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x10 */
+    0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x20 */
+    0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0xc8, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x30 */
+    0x00, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, /* 0x40 */
+    0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x00, 0x00, 0x00, 0x00, 0x10, /* 0x50 */
+    0x00, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, /* 0x60 */
+    0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x64, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x70 */
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x80 */
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0x90 */
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x60, 0x00, 0x00, 0x00, 0x00, 0x00, /* 0xa0 */
+    0x00, 0x00, 0xc0, 0xc0, 0x00, 0x60, 0x00, 0x00, 0x00, 0xc0, 0x60, 0x00, 0x40, 0x40, 0x40, 0x00, /* 0xb0 */
+    0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, /* 0xc0 */
+    0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x00, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, /* 0xd0 */
+    0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, /* 0xe0 */
+    0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x00, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, 0x60, /* 0xf0 */
+};
+
+// Word tables (keywords, built-ins, types, ...) as minimal perfect hash
+//
+// Words are hashed (FNV-1a over code points) into size buckets. A bucket holds
+// 0 if no word hashes there, -(slot + 1) for a single word, or a seed that
+// spreads its words over free slots with a second hash. A lookup is one or two
+// hashes, then a length check and memcmp against the word in that slot.
+// Tables are generated by gen_words.py or built at runtime by WordTable.
+
+typedef struct {
+    uint32_t size;
+    uint32_t max_len;
+    const int32_t* displace;    // per bucket
+    const uint32_t* offsets;    // per slot, start of word in chars
+    const uint8_t* lengths;     // per slot
+    const uint8_t* kinds;       // per slot, TokenKind
+    const unsigned char* chars; // latin-1
+} lc_word_table;
+
+// read code point i of str data (kind 1, 2 or 4 bytes per char)
+static inline uint32_t lc_read(const void* data, int kind, ptrdiff_t i) {
+    if (kind == 1) return ((const uint8_t*)data)[i];
+    if (kind == 2) return ((const uint16_t*)data)[i];
+    return ((const uint32_t*)data)[i];
+}
+
+static inline uint32_t lc_hash(const void* data, int kind, ptrdiff_t start, ptrdiff_t len, uint32_t seed) {
+    uint32_t h = 0x811c9dc5u ^ seed;
+    for (ptrdiff_t i = 0; i < len; i++) {
+        h ^= lc_read(data, kind, start + i);
+        h *= 0x01000193u;
+    }
+    // mix high bits down, low bits of FNV only depend on low bits of input
+    h ^= h >> 16;
+    h *= 0x85ebca6bu;
+    h ^= h >> 13;
+    return h;
+}
+
+// kind of word data[start:start + len], or -1 if not in table
+static inline int lc_word_kind(const lc_word_table* table, const void* data, int kind, ptrdiff_t start, ptrdiff_t len) {
+    if (len <= 0 || (uint32_t)len > table->max_len) return -1;
+
+    int32_t d = table->displace[lc_hash(data, kind, start, len, 0) % table->size];
+    if (d == 0) return -1;
+
+    uint32_t slot = d < 0 ? (uint32_t)(-d - 1) : lc_hash(data, kind, start, len, (uint32_t)d) % table->size;
+    if (table->lengths[slot] != len) return -1;
+
+    const unsigned char* word = table->chars + table->offsets[slot];
+    if (kind == 1) {
+        if (memcmp((const uint8_t*)data + start, word, (size_t)len) != 0) return -1;
+    } else {
+        for (ptrdiff_t i = 0; i < len; i++) {
+            if (lc_read(data, kind, start + i) != word[i]) return -1;
+        }
+    }
+
+    return table->kinds[slot];
+}
+
+// Handler statistics (calls, chars consumed and time per scan handler)
+//
+// Off unless built with LC_STATS=1 (LEXER_STATS=1 python build.py ...). The
+// counting code sits behind `if LC_STATS`, so the C compiler drops it from
+// normal builds.
+
+#ifndef LC_STATS
+#define LC_STATS 0
+#endif
+
+typedef struct {
+    uint64_t calls;
+    uint64_t chars;
+    uint64_t ns;
+} lc_stat;
+
+static inline uint64_t lc_clock_ns(void) {
+    struct timespec ts;
+#ifdef CLOCK_MONOTONIC
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+#else
+    timespec_get(&ts, TIME_UTC);
+#endif
+    return (uint64_t)ts.tv_sec * 1000000000u + (uint64_t)ts.tv_nsec;
+}
+
+#endif
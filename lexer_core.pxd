@@ -0,0 +1,376 @@
+# Shared declarations for Cython tokenizers (see lexer_core.pyx)
+
+# cython: language_level=3
+cimport cython
+from cpython.unicode cimport PyUnicode_Find, PyUnicode_FindChar, PyUnicode_DATA, PyUnicode_KIND
+from libc.stdint cimport uint8_t, int32_t, uint32_t, uint64_t
+from libc.string cimport memchr, memset
+
+cdef extern from "Python.h":
+    # same as str.isalpha() etc., without the gil
+    bint Py_UNICODE_ISALPHA(Py_UCS4 ch) nogil
+    bint Py_UNICODE_ISALNUM(Py_UCS4 ch) nogil
+    bint Py_UNICODE_ISDIGIT(Py_UCS4 ch) nogil
+
+
+# token kinds (same numbering as TOKEN_MAP in the Odin wrappers)
+
+cdef enum TokenKind:
+    TK_WHITESPACE = 0
+    TK_DEFAULT = 1
+    TK_KEYWORD = 2
+    TK_CLASS = 3
+    TK_NAME = 4
+    TK_PARAMETER = 5
+    TK_LAMBDA = 6
+    TK_STRING = 7
+    TK_NUMBER = 8
+    TK_OPERATOR = 9
+    TK_COMMENT = 10
+    TK_SPECIAL = 11
+    TK_CONDITIONAL = 12
+    TK_BUILT_IN = 13
+    TK_ERROR = 14
+    TK_WARNING = 15
+    TK_SUCCESS = 16
+    TK_TYPE = 17
+    TK_INLINE_SHELL = 18
+    TK_INLINE_CHAT = 19
+    TK_COUNT = 20
+
+
+# symbol kinds (outline panel : _is_class, _is_function_name, _is_type_def)
+
+cdef enum SymbolKind:
+    SYM_CLASS = 0
+    SYM_FUNCTION = 1
+    SYM_TYPE = 2
+    SYM_COUNT = 3
+
+
+# compact token storage (struct of arrays)
+
+@cython.final
+cdef class TokenArray:
+    cdef uint8_t* kinds
+    cdef int32_t* starts
+    cdef int32_t* lengths
+    cdef Py_ssize_t count
+    cdef Py_ssize_t capacity
+
+    # symbols marked during the scan (token index and SymbolKind)
+    cdef int32_t* symbol_tokens
+    cdef uint8_t* symbol_kinds
+    cdef Py_ssize_t symbol_count
+    cdef Py_ssize_t symbol_capacity
+
+    cdef readonly str text
+    cdef readonly tuple styles
+
+    cdef int reserve(self, Py_ssize_t capacity) except -1 nogil
+    cdef int push(self, int kind, Py_ssize_t start, Py_ssize_t length) except -1 nogil
+    cdef int mark_symbol(self, Py_ssize_t index, int kind) except -1 nogil
+    cdef tuple token_at(self, Py_ssize_t index)
+    cdef list symbol_entries(self, Py_ssize_t first, Py_ssize_t offset, Py_ssize_t line)
+
+
+# per-line token cache (see LineCache in lexer_core.pyx)
+#
+# line_scan tokenizes text from start (a line start) and returns the first line
+# start at or after stop, like scan_into in pc.pyx. context is passed through
+# (word table, lexer, ...)
+
+ctypedef Py_ssize_t (*line_scan)(object context, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1
+
+@cython.final
+cdef class LineCache:
+    cdef dict lines
+    cdef dict older
+    cdef list recent
+    cdef Py_ssize_t lines_bytes
+    cdef readonly Py_ssize_t max_bytes
+    cdef readonly Py_ssize_t nbytes
+    cdef readonly Py_ssize_t hits
+    cdef readonly Py_ssize_t misses
+
+    cdef int store(self, str line, bytes entry, Py_ssize_t cost) except -1
+    cdef TokenArray tokenize(self, str text, tuple styles, line_scan scan, object context)
+
+
+# line-sharded tokenization on a thread pool (see scan_parallel in lexer_core.pyx)
+
+cdef TokenArray scan_parallel(str text, tuple styles, line_scan scan, object context, object workers, Py_ssize_t threshold)
+
+
+# symbol table kept in sync with incremental edits
+
+@cython.final
+cdef class SymbolIndex:
+    cdef readonly str text
+    cdef list entries
+
+
+# character classes and word tables (lexer_core.h)
+#
+# classes use table lookup below 0x100, str methods above
+
+cdef extern from "lexer_core.h":
+    const uint8_t lc_char_class[256]
+
+    ctypedef struct lc_word_table:
+        uint32_t size
+        uint32_t max_len
+        const int32_t* displace
+        const uint32_t* offsets
+        const uint8_t* lengths
+        const uint8_t* kinds
+        const unsigned char* chars
+
+    uint32_t lc_read(const void* data, int kind, Py_ssize_t i) nogil
+    uint32_t lc_hash(const void* data, int kind, Py_ssize_t start, Py_ssize_t length, uint32_t seed) nogil
+    int lc_word_kind(const lc_word_table* table, const void* data, int kind, Py_ssize_t start, Py_ssize_t length) nogil
+
+    enum:
+        LC_BLANK
+        LC_NEWLINE
+        LC_ASCII_LETTER
+        LC_ASCII_DIGIT
+        LC_UNDERSCORE
+        LC_ALPHA
+        LC_ALNUM
+        LC_DIGIT
+
+cdef inline bint char_is(Py_UCS4 ch, uint8_t mask) noexcept nogil:
+    # for ascii/latin-1 classes (LC_BLANK, LC_ASCII_LETTER, ...)
+    return ch < 0x100 and (lc_char_class[ch] & mask) != 0
+
+cdef inline bint is_alpha(Py_UCS4 ch) noexcept nogil:
+    if ch < 0x100:
+        return (lc_char_class[ch] & LC_ALPHA) != 0
+    return Py_UNICODE_ISALPHA(ch)
+
+cdef inline bint is_alnum(Py_UCS4 ch) noexcept nogil:
+    if ch < 0x100:
+        return (lc_char_class[ch] & LC_ALNUM) != 0
+    return Py_UNICODE_ISALNUM(ch)
+
+cdef inline bint is_digit(Py_UCS4 ch) noexcept nogil:
+    if ch < 0x100:
+        return (lc_char_class[ch] & LC_DIGIT) != 0
+    return Py_UNICODE_ISDIGIT(ch)
+
+
+# word tables (keywords, built-ins, ... as perfect hash, see lexer_core.h)
+
+@cython.final
+cdef class WordTable:
+    cdef lc_word_table table
+    cdef bint owned
+
+    cdef int build(self, dict words) except -1
+
+cdef inline WordTable wrap_words(const lc_word_table* table):
+    # WordTable for a static (generated) table
+    cdef WordTable words = WordTable.__new__(WordTable)
+    words.table = table[0]
+    return words
+
+cdef inline int word_kind(WordTable words, str text, Py_ssize_t start, Py_ssize_t end) noexcept:
+    # TokenKind of text[start:end], or -1 if not in table
+    return lc_word_kind(&words.table, PyUnicode_DATA(text), PyUnicode_KIND(text), start, end - start)
+
+
+# whitespace
+
+cdef inline Py_ssize_t skip_whitespace(str text, Py_ssize_t i, Py_ssize_t n, bint newlines):
+    # run of ' ', '\t', '\r' (and '\n' if newlines)
+    cdef uint8_t mask = LC_BLANK | LC_NEWLINE if newlines else LC_BLANK
+    while i < n and char_is(text[i], mask):
+        i += 1
+    return i
+
+
+# scanning kernels (each returns index where the run ends, at most n)
+
+cdef inline Py_ssize_t scan_to_char(str text, Py_ssize_t i, Py_ssize_t n, Py_UCS4 ch) except -2:
+    # first ch at or after i
+    cdef Py_ssize_t j = PyUnicode_FindChar(text, ch, i, n, 1)
+    return n if j == -1 else j
+
+cdef inline Py_ssize_t scan_to_eol(str text, Py_ssize_t i, Py_ssize_t n) except -2:
+    # first newline at or after i
+    return scan_to_char(text, i, n, '\n')
+
+cdef inline Py_ssize_t scan_to_str(str text, Py_ssize_t i, Py_ssize_t n, str delimiter) except -2:
+    # first delimiter (e.g. "*/") at or after i
+    cdef Py_ssize_t j = PyUnicode_Find(text, delimiter, i, n, 1)
+    return n if j == -1 else j
+
+cdef inline Py_ssize_t scan_class(str text, Py_ssize_t i, Py_ssize_t n, uint8_t mask):
+    # run of chars in any of the (latin-1) classes in mask
+    while i < n and char_is(text[i], mask):
+        i += 1
+    return i
+
+cdef inline Py_ssize_t scan_letters(str text, Py_ssize_t i, Py_ssize_t n):
+    # ascii letters and underscore
+    return scan_class(text, i, n, LC_ASCII_LETTER | LC_UNDERSCORE)
+
+cdef inline Py_ssize_t scan_identifier(str text, Py_ssize_t i, Py_ssize_t n):
+    # ascii letters, digits and underscore
+    return scan_class(text, i, n, LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE)
+
+cdef inline Py_ssize_t scan_word(str text, Py_ssize_t i, Py_ssize_t n):
+    # unicode letters and digits (str.isalnum) and underscore
+    cdef Py_UCS4 ch
+    while i < n:
+        ch = text[i]
+        if not (is_alnum(ch) or ch == '_'):
+            break
+        i += 1
+    return i
+
+cdef inline Py_ssize_t scan_digits(str text, Py_ssize_t i, Py_ssize_t n, bint dots):
+    # ascii digits (and '.' if dots)
+    cdef Py_UCS4 ch
+    while i < n:
+        ch = text[i]
+        if not (char_is(ch, LC_ASCII_DIGIT) or (dots and ch == '.')):
+            break
+        i += 1
+    return i
+
+cdef inline Py_ssize_t scan_numeric(str text, Py_ssize_t i, Py_ssize_t n, bint dots):
+    # unicode digits (str.isdigit) (and '.' if dots)
+    cdef Py_UCS4 ch
+    while i < n:
+        ch = text[i]
+        if not (is_digit(ch) or (dots and ch == '.')):
+            break
+        i += 1
+    return i
+
+
+# raw text (scanning without the gil)
+#
+# a Text is the data pointer of a str, so scanning loops written against it can
+# run in a nogil block. The str must be kept alive while the Text is used and
+# only TokenArray.push is called in the loop (Python objects are created after)
+
+ctypedef struct Text:
+    const void* data
+    int kind
+    Py_ssize_t length
+
+cdef inline Text text_view(str text):
+    cdef Text view
+    view.data = PyUnicode_DATA(text)
+    view.kind = PyUnicode_KIND(text)
+    view.length = len(text)
+    return view
+
+cdef inline Py_UCS4 char_at(Text text, Py_ssize_t i) noexcept nogil:
+    return lc_read(text.data, text.kind, i)
+
+cdef inline bint at_line_start(Text text, Py_ssize_t i) noexcept nogil:
+    # only blanks between line start and i
+    while i > 0 and char_is(char_at(text, i - 1), LC_BLANK):
+        i -= 1
+    return i == 0 or char_at(text, i - 1) == '\n'
+
+cdef inline int raw_word_kind(WordTable words, Text text, Py_ssize_t start, Py_ssize_t end) noexcept nogil:
+    # TokenKind of text[start:end], or -1 if not in table
+    return lc_word_kind(&words.table, text.data, text.kind, start, end - start)
+
+cdef inline Py_ssize_t raw_to_char(Text text, Py_ssize_t i, Py_ssize_t n, Py_UCS4 ch) noexcept nogil:
+    # first ch at or after i, or n
+    cdef const void* found
+    if i >= n:
+        return n
+    if text.kind == 1:
+        if ch > 0xff:
+            return n
+        found = memchr(<const char*>text.data + i, <int>ch, <size_t>(n - i))
+        return n if found == NULL else <Py_ssize_t>(<const char*>found - <const char*>text.data)
+    while i < n and char_at(text, i) != ch:
+        i += 1
+    return i
+
+cdef inline Py_ssize_t raw_to_eol(Text text, Py_ssize_t i, Py_ssize_t n) noexcept nogil:
+    # first newline at or after i, or n
+    return raw_to_char(text, i, n, '\n')
+
+cdef inline Py_ssize_t raw_to_pair(Text text, Py_ssize_t i, Py_ssize_t n, Py_UCS4 first, Py_UCS4 second) noexcept nogil:
+    # first two-char delimiter (e.g. "--") at or after i, or n
+    while True:
+        i = raw_to_char(text, i, n, first)
+        if i + 1 >= n:
+            return n
+        if char_at(text, i + 1) == second:
+            return i
+        i += 1
+
+cdef inline Py_ssize_t raw_class(Text text, Py_ssize_t i, Py_ssize_t n, uint8_t mask) noexcept nogil:
+    # run of chars in any of the (latin-1) classes in mask
+    while i < n and char_is(char_at(text, i), mask):
+        i += 1
+    return i
+
+cdef inline Py_ssize_t raw_word(Text text, Py_ssize_t i, Py_ssize_t n) noexcept nogil:
+    # unicode letters and digits (str.isalnum) and underscore
+    cdef Py_UCS4 ch
+    while i < n:
+        ch = char_at(text, i)
+        if not (is_alnum(ch) or ch == '_'):
+            break
+        i += 1
+    return i
+
+cdef inline Py_ssize_t raw_digits(Text text, Py_ssize_t i, Py_ssize_t n, bint dots) noexcept nogil:
+    # ascii digits (and '.' if dots)
+    cdef Py_UCS4 ch
+    while i < n:
+        ch = char_at(text, i)
+        if not (char_is(ch, LC_ASCII_DIGIT) or (dots and ch == '.')):
+            break
+        i += 1
+    return i
+
+
+# handler statistics (lexer_core.h), compiled out unless built with LC_STATS=1
+#
+# A lexer keeps one lc_stat per handler and times each pass of its scan loop:
+#
+#   if LC_STATS:
+#       started = lc_clock_ns()
+#       first = current_char_index
+#   ... (each branch sets handler)
+#   if LC_STATS:
+#       count_stat(&STATS[handler], started, current_char_index - first)
+
+cdef extern from "lexer_core.h":
+    enum:
+        LC_STATS
+
+    ctypedef struct lc_stat:
+        uint64_t calls
+        uint64_t chars
+        uint64_t ns
+
+    uint64_t lc_clock_ns() nogil
+
+cdef inline void count_stat(lc_stat* stat, uint64_t started, Py_ssize_t chars) noexcept nogil:
+    # counters are not atomic, scans on several threads may lose a few counts
+    stat.calls += 1
+    stat.chars += chars
+    stat.ns += lc_clock_ns() - started
+
+cdef inline dict stats_dict(tuple names, const lc_stat* stats):
+    # { handler: { "calls", "chars", "seconds" } } for Lexer.stats(), empty unless LC_STATS
+    cdef Py_ssize_t i
+    if not LC_STATS:
+        return {}
+    return { names[i]: { "calls": stats[i].calls, "chars": stats[i].chars, "seconds": stats[i].ns / 1e9 } for i in range(len(names)) }
+
+cdef inline void clear_stats(lc_stat* stats, Py_ssize_t count) noexcept nogil:
+    memset(stats, 0, count * sizeof(lc_stat))
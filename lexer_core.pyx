@@ -0,0 +1,1140 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Shared core for Cython tokenizers
+
+# Tokenizers push (kind, start, length) into a TokenArray instead of building
+# (style, start, lexeme) tuples. Kinds are TokenKind values (see lexer_core.pxd)
+# and each lexer maps them to its own style strings with a styles tuple. The
+# familiar tuples are only built when the array is indexed or iterated, so
+# tokenize() stays compatible while tokenize_compact() keeps about 9 bytes per
+# token.
+
+# cython: language_level=3
+cimport cython
+from cpython.mem cimport PyMem_Malloc, PyMem_Free, PyMem_RawRealloc, PyMem_RawFree
+from libc.stdint cimport uint8_t, int32_t, uint32_t, INT32_MAX
+from libc.string cimport memcmp, memcpy, memset
+from cpython.pyport cimport PY_SSIZE_T_MAX
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize
+
+import os
+from array import array
+from bisect import bisect_left
+from codecs import getincrementaldecoder
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+# built with LC_STATS=1, so Lexer.stats() has counters (see lexer_core.h)
+STATS = LC_STATS != 0
+
+
+def line_range(str text, Py_ssize_t first_line, Py_ssize_t last_line):
+    # (start, end) offsets of lines first_line..last_line (0-based, inclusive), end is past newline of last_line
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t end
+    cdef Py_ssize_t line
+
+    for line in range(first_line):
+        if start >= n:
+            break
+        start = scan_to_eol(text, start, n) + 1
+
+    end = start = min(start, n)
+    for line in range(first_line, last_line + 1):
+        if end >= n:
+            break
+        end = scan_to_eol(text, end, n) + 1
+
+    return start, min(end, n)
+
+
+def make_styles(dict mapping):
+    # build styles tuple (indexed by kind) from { kind: style }, unmapped kinds use default style
+    cdef str default = mapping.get(TK_DEFAULT, "default")
+    return tuple(mapping.get(kind, default) for kind in range(TK_COUNT))
+
+
+cdef class TokenArray:
+
+    def __cinit__(self, str text, tuple styles, Py_ssize_t capacity=0):
+        self.text = text
+        self.styles = styles
+        self.count = 0
+        self.capacity = 0
+
+        if capacity > 0:
+            self.reserve(capacity)
+
+    def __dealloc__(self):
+        PyMem_RawFree(self.kinds)
+        PyMem_RawFree(self.starts)
+        PyMem_RawFree(self.lengths)
+        PyMem_RawFree(self.symbol_tokens)
+        PyMem_RawFree(self.symbol_kinds)
+
+    cdef int reserve(self, Py_ssize_t capacity) except -1 nogil:
+        # raw allocator, so tokens can be pushed without the gil
+        cdef void* kinds
+        cdef void* starts
+        cdef void* lengths
+
+        if capacity <= self.capacity:
+            return 0
+
+        kinds = PyMem_RawRealloc(self.kinds, capacity * sizeof(uint8_t))
+        if kinds == NULL:
+            with gil:
+                raise MemoryError()
+        self.kinds = <uint8_t*>kinds
+
+        starts = PyMem_RawRealloc(self.starts, capacity * sizeof(int32_t))
+        if starts == NULL:
+            with gil:
+                raise MemoryError()
+        self.starts = <int32_t*>starts
+
+        lengths = PyMem_RawRealloc(self.lengths, capacity * sizeof(int32_t))
+        if lengths == NULL:
+            with gil:
+                raise MemoryError()
+        self.lengths = <int32_t*>lengths
+
+        self.capacity = capacity
+        return 0
+
+    cdef int push(self, int kind, Py_ssize_t start, Py_ssize_t length) except -1 nogil:
+        if self.count == self.capacity:
+            self.reserve(self.capacity * 2 if self.capacity else 1024)
+
+        if start + length > INT32_MAX:
+            with gil:
+                raise OverflowError("TokenArray : offset does not fit in int32")
+
+        self.kinds[self.count] = <uint8_t>kind
+        self.starts[self.count] = <int32_t>start
+        self.lengths[self.count] = <int32_t>length
+        self.count += 1
+        return 0
+
+    cdef int mark_symbol(self, Py_ssize_t index, int kind) except -1 nogil:
+        # token at index is a symbol of kind (SymbolKind), marked in token order
+        cdef void* symbol_tokens
+        cdef void* symbol_kinds
+        cdef Py_ssize_t capacity
+
+        if self.symbol_count == self.symbol_capacity:
+            capacity = self.symbol_capacity * 2 if self.symbol_capacity else 64
+
+            symbol_tokens = PyMem_RawRealloc(self.symbol_tokens, capacity * sizeof(int32_t))
+            if symbol_tokens == NULL:
+                with gil:
+                    raise MemoryError()
+            self.symbol_tokens = <int32_t*>symbol_tokens
+
+            symbol_kinds = PyMem_RawRealloc(self.symbol_kinds, capacity * sizeof(uint8_t))
+            if symbol_kinds == NULL:
+                with gil:
+                    raise MemoryError()
+            self.symbol_kinds = <uint8_t*>symbol_kinds
+
+            self.symbol_capacity = capacity
+
+        self.symbol_tokens[self.symbol_count] = <int32_t>index
+        self.symbol_kinds[self.symbol_count] = <uint8_t>kind
+        self.symbol_count += 1
+        return 0
+
+    cdef list symbol_entries(self, Py_ssize_t first, Py_ssize_t offset, Py_ssize_t line):
+        # (name, kind, offset, line) for symbols from first, counting lines from offset (on line)
+        cdef list entries = []
+        cdef Py_ssize_t i
+        cdef Py_ssize_t start
+        cdef int32_t index
+
+        for i in range(first, self.symbol_count):
+            index = self.symbol_tokens[i]
+            start = self.starts[index]
+            line += self.text.count('\n', offset, start)
+            offset = start
+            entries.append((self.text[start:start + self.lengths[index]], SYMBOL_KINDS[self.symbol_kinds[i]], start, line))
+
+        return entries
+
+    def symbols(self):
+        # [(name, kind, offset, line)] marked by the lexer (kind is "class", "function" or "type", line 0-based)
+        return self.symbol_entries(0, 0, 0)
+
+    cdef tuple token_at(self, Py_ssize_t index):
+        cdef Py_ssize_t start = self.starts[index]
+        return (self.styles[self.kinds[index]], start, self.text[start:start + self.lengths[index]])
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        cdef Py_ssize_t i
+
+        if isinstance(index, slice):
+            return [self.token_at(i) for i in range(*index.indices(self.count))]
+
+        i = index
+        if i < 0:
+            i += self.count
+        if i < 0 or i >= self.count:
+            raise IndexError("TokenArray index out of range")
+
+        return self.token_at(i)
+
+    def __iter__(self):
+        cdef Py_ssize_t i
+        for i in range(self.count):
+            yield self.token_at(i)
+
+    def to_list(self):
+        cdef Py_ssize_t i
+        cdef list tokens = [None] * self.count
+
+        for i in range(self.count):
+            tokens[i] = self.token_at(i)
+
+        return tokens
+
+    def arrays(self):
+        # copies of raw columns as (kinds 'B', starts 'i', lengths 'i')
+        cdef object kinds = array('B')
+        cdef object starts = array('i')
+        cdef object lengths = array('i')
+
+        kinds.frombytes((<char*>self.kinds)[:self.count * sizeof(uint8_t)])
+        starts.frombytes((<char*>self.starts)[:self.count * sizeof(int32_t)])
+        lengths.frombytes((<char*>self.lengths)[:self.count * sizeof(int32_t)])
+
+        return kinds, starts, lengths
+
+    def nbytes(self):
+        return self.count * (sizeof(uint8_t) + 2 * sizeof(int32_t))
+
+
+SYMBOL_KINDS = ("class", "function", "type") # by SymbolKind
+
+cdef object ENTRY_OFFSET = itemgetter(2)
+
+
+cdef class SymbolIndex:
+    # outline of a buffer as (name, kind, offset, line) sorted by offset, built
+    # from the symbols a lexer marks while tokenizing and updated from the lines
+    # re-lexed by retokenize, so reading it never rescans the buffer
+
+    def __cinit__(self, TokenArray tokens):
+        self.text = tokens.text
+        self.entries = tokens.symbols()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def outline(self, str kind=None):
+        # [(name, kind, offset, line)], only symbols of kind if given
+        if kind is None:
+            return list(self.entries)
+        return [entry for entry in self.entries if entry[1] == kind]
+
+    def update(self, TokenArray found, Py_ssize_t start, Py_ssize_t end):
+        # found : tokens of new buffer lexed from start to end (changed range of retokenize),
+        # everything before start is unchanged and everything after end is shifted
+        cdef str text = found.text
+        cdef Py_ssize_t delta = len(text) - len(self.text)
+        cdef Py_ssize_t old_end = end - delta
+        cdef Py_ssize_t delta_lines
+        cdef Py_ssize_t first = bisect_left(self.entries, start, key=ENTRY_OFFSET)
+        cdef Py_ssize_t last = bisect_left(self.entries, old_end, key=ENTRY_OFFSET)
+        cdef Py_ssize_t offset = 0
+        cdef Py_ssize_t line = 0
+        cdef tuple entry
+        cdef list shifted
+
+        if first > 0:
+            entry = self.entries[first - 1]
+            offset = entry[2]
+            line = entry[3]
+
+        shifted = self.entries[last:]
+        if shifted:
+            delta_lines = text.count('\n', start, end) - self.text.count('\n', start, old_end)
+            if delta or delta_lines:
+                shifted = [(entry[0], entry[1], entry[2] + delta, entry[3] + delta_lines) for entry in shifted]
+
+        self.entries[first:] = found.symbol_entries(0, offset, line) + shifted
+        self.text = text
+
+
+# damage regions (restyle only what changed)
+
+cdef object TOKEN_START = itemgetter(1)
+cdef object EDIT_START = itemgetter(0)
+
+
+cdef Py_ssize_t token_after(TokenArray tokens, Py_ssize_t pos) noexcept:
+    # index of first token ending after pos (tokens are sorted and don't overlap)
+    cdef Py_ssize_t low = 0
+    cdef Py_ssize_t high = tokens.count
+    cdef Py_ssize_t mid
+
+    while low < high:
+        mid = (low + high) >> 1
+        if tokens.starts[mid] + tokens.lengths[mid] <= pos:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+cdef Py_ssize_t token_from(TokenArray tokens, Py_ssize_t pos) noexcept:
+    # index of first token ending after pos or starting at it (zero-length tokens at pos too)
+    cdef Py_ssize_t j = token_after(tokens, pos)
+    while j > 0 and tokens.starts[j - 1] >= pos:
+        j -= 1
+    return j
+
+
+cdef int add_range(list ranges, Py_ssize_t start, Py_ssize_t end) except -1:
+    # append start..end, merged with last range if they touch (ranges come in order)
+    cdef tuple last
+
+    if end <= start:
+        return 0
+    if ranges:
+        last = ranges[-1]
+        if <Py_ssize_t>last[1] >= start:
+            ranges[-1] = (last[0], max(<Py_ssize_t>last[1], end))
+            return 0
+    ranges.append((start, end))
+    return 0
+
+
+cdef int compare_styles(TokenArray old, TokenArray new, Py_ssize_t start, Py_ssize_t end, Py_ssize_t shift, list ranges) except -1:
+    # add ranges of start..end (new positions) where kinds differ, old token at p - shift lines up with new at p
+    # (one pass over both arrays, runs end at token boundaries, gaps between tokens count as kind -1)
+    cdef Py_ssize_t i = token_after(old, start - shift)
+    cdef Py_ssize_t j = token_after(new, start)
+    cdef Py_ssize_t pos = start
+    cdef Py_ssize_t damage_start = -1
+    cdef Py_ssize_t old_end
+    cdef Py_ssize_t new_end
+    cdef int old_kind
+    cdef int new_kind
+
+    while pos < end:
+        while i < old.count and old.starts[i] + old.lengths[i] + shift <= pos:
+            i += 1
+        if i < old.count and old.starts[i] + shift <= pos:
+            old_kind = old.kinds[i]
+            old_end = old.starts[i] + old.lengths[i] + shift
+        else:
+            old_kind = -1
+            old_end = old.starts[i] + shift if i < old.count else end
+
+        while j < new.count and new.starts[j] + new.lengths[j] <= pos:
+            j += 1
+        if j < new.count and new.starts[j] <= pos:
+            new_kind = new.kinds[j]
+            new_end = new.starts[j] + new.lengths[j]
+        else:
+            new_kind = -1
+            new_end = new.starts[j] if j < new.count else end
+
+        if old_kind != new_kind:
+            if damage_start < 0:
+                damage_start = pos
+        elif damage_start >= 0:
+            add_range(ranges, damage_start, pos)
+            damage_start = -1
+
+        pos = min(old_end, new_end, end)
+
+    if damage_start >= 0:
+        add_range(ranges, damage_start, end)
+    return 0
+
+
+cdef TokenArray list_columns(list tokens, Py_ssize_t start, Py_ssize_t end, dict style_ids):
+    # tokens of a (style, start, lexeme) list overlapping start..end, styles numbered through style_ids
+    cdef TokenArray found = TokenArray("", ())
+    cdef Py_ssize_t n = len(tokens)
+    cdef Py_ssize_t i = bisect_left(tokens, start, key=TOKEN_START)
+    cdef tuple token
+
+    if i > 0:
+        i -= 1
+    while i < n:
+        token = tokens[i]
+        if <Py_ssize_t>token[1] >= end:
+            break
+        found.push(style_ids.setdefault(token[0], len(style_ids)), token[1], len(<str>token[2]))
+        i += 1
+    return found
+
+
+def damage(old, new, edits=None, changed=None):
+    # [(start, end)] ranges of new buffer to restyle, minimal and in order
+    #
+    # old, new : TokenArray (same lexer) or (style, start, lexeme) lists, before and after
+    # edits    : (start, removed_len, inserted_text) in old buffer positions, as passed to
+    #            retokenize (None if text is the same, e.g. after DSCL values are re-validated)
+    # changed  : (changed_start, changed_end) from retokenize, tokens outside of it are reused
+    #            so only this range is compared
+    #
+    # inserted text is always in a range, everything else only where the style changed
+    cdef Py_ssize_t limit = PY_SSIZE_T_MAX
+    cdef Py_ssize_t low = 0
+    cdef Py_ssize_t high = limit
+    cdef Py_ssize_t delta = 0
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t edit_start
+    cdef Py_ssize_t inserted
+    cdef Py_ssize_t start
+    cdef Py_ssize_t end
+    cdef Py_ssize_t shift
+    cdef Py_ssize_t old_low = limit
+    cdef Py_ssize_t old_high = 0
+    cdef list pieces = [] # (start, end, shift) in new positions, shift None for inserted text
+    cdef list clipped = []
+    cdef list ranges = []
+    cdef dict style_ids
+
+    if changed is not None:
+        low = changed[0]
+        high = changed[1]
+
+    for edit in sorted(edits or (), key=EDIT_START):
+        edit_start = edit[0]
+        inserted = len(edit[2]) if isinstance(edit[2], str) else edit[2]
+        if edit_start + delta < pos:
+            raise ValueError("damage : overlapping edits")
+
+        pieces.append((pos, edit_start + delta, delta))
+        pieces.append((edit_start + delta, edit_start + delta + inserted, None))
+        pos = edit_start + delta + inserted
+        delta += inserted - <Py_ssize_t>edit[1]
+    pieces.append((pos, limit, delta))
+
+    for start, end, piece_shift in pieces:
+        start = max(start, low)
+        end = min(end, high)
+        if start < end:
+            clipped.append((start, end, piece_shift))
+            if piece_shift is not None:
+                old_low = min(old_low, start - <Py_ssize_t>piece_shift)
+                old_high = limit if end == limit else max(old_high, end - <Py_ssize_t>piece_shift)
+
+    if isinstance(old, list) and isinstance(new, list):
+        style_ids = {}
+        old = list_columns(old, old_low, old_high, style_ids)
+        new = list_columns(new, low, high, style_ids)
+    elif not (isinstance(old, TokenArray) and isinstance(new, TokenArray)):
+        raise TypeError("damage : old and new must both be TokenArray or both be lists")
+    elif (<TokenArray>old).styles != (<TokenArray>new).styles:
+        raise ValueError("damage : tokens are from different lexers (styles differ)")
+
+    for start, end, piece_shift in clipped:
+        if piece_shift is None:
+            add_range(ranges, start, end)
+        else:
+            compare_styles(old, new, start, end, piece_shift, ranges)
+
+    return ranges
+
+
+cdef uint32_t MAX_SEED = 1 << 20 # same as gen_words.py
+
+
+cdef inline uint32_t hash_word(str word, uint32_t seed):
+    return lc_hash(PyUnicode_DATA(word), PyUnicode_KIND(word), 0, len(word), seed)
+
+
+cdef class WordTable:
+    # { word: kind } as minimal perfect hash, either generated (wrap_words) or
+    # built here from a dict, e.g. for keywords added at Lexer construction
+
+    def __cinit__(self, dict words=None):
+        memset(&self.table, 0, sizeof(lc_word_table))
+        self.owned = False
+
+        if words:
+            self.build(words)
+
+    def __dealloc__(self):
+        if self.owned:
+            PyMem_Free(<void*>self.table.displace)
+            PyMem_Free(<void*>self.table.offsets)
+            PyMem_Free(<void*>self.table.lengths)
+            PyMem_Free(<void*>self.table.kinds)
+            PyMem_Free(<void*>self.table.chars)
+
+    cdef int build(self, dict words) except -1:
+        # same construction as perfect_hash in gen_words.py
+        cdef list keys = sorted(words)
+        cdef uint32_t size = len(keys)
+        cdef list buckets = [[] for _ in range(size)]
+        cdef list slots = [None] * size
+        cdef list placed
+        cdef list free
+        cdef uint32_t seed
+        cdef Py_ssize_t index
+        cdef Py_ssize_t offset = 0
+        cdef bytes chars
+        cdef str word
+
+        for word in keys:
+            if not 0 < len(word) <= 255 or max(map(ord, word)) > 255:
+                raise ValueError("WordTable : %r must be latin-1 and at most 255 chars" % word)
+            if not 0 <= words[word] < 256:
+                raise ValueError("WordTable : kind of %r out of range" % word)
+
+            buckets[hash_word(word, 0) % size].append(word)
+
+        cdef int32_t* displace = <int32_t*>PyMem_Malloc(size * sizeof(int32_t))
+        cdef uint32_t* offsets = <uint32_t*>PyMem_Malloc(size * sizeof(uint32_t))
+        cdef uint8_t* lengths = <uint8_t*>PyMem_Malloc(size * sizeof(uint8_t))
+        cdef uint8_t* kinds = <uint8_t*>PyMem_Malloc(size * sizeof(uint8_t))
+
+        self.table.displace = displace
+        self.table.offsets = offsets
+        self.table.lengths = lengths
+        self.table.kinds = kinds
+        self.owned = True
+
+        if displace == NULL or offsets == NULL or lengths == NULL or kinds == NULL:
+            raise MemoryError()
+
+        memset(displace, 0, size * sizeof(int32_t))
+
+        for index in sorted(range(size), key=lambda i: -len(buckets[i])):
+            if len(buckets[index]) < 2:
+                break
+
+            seed = 1
+            while True:
+                placed = [hash_word(word, seed) % size for word in buckets[index]]
+                if len(set(placed)) == len(placed) and all(slots[slot] is None for slot in placed):
+                    break
+                seed += 1
+                if seed == MAX_SEED:
+                    raise ValueError("WordTable : no seed for %r" % buckets[index])
+
+            displace[index] = seed
+            for word, slot in zip(buckets[index], placed):
+                slots[slot] = word
+
+        free = [slot for slot in range(size) if slots[slot] is None]
+        for index in range(size):
+            if len(buckets[index]) == 1:
+                slot = free.pop()
+                displace[index] = -(slot + 1)
+                slots[slot] = buckets[index][0]
+
+        chars = "".join(slots).encode("latin-1")
+        self.table.chars = <unsigned char*>PyMem_Malloc(len(chars) + 1)
+        if self.table.chars == NULL:
+            raise MemoryError()
+        memcpy(<void*>self.table.chars, <char*>chars, len(chars) + 1)
+
+        for index in range(size):
+            word = slots[index]
+            offsets[index] = offset
+            lengths[index] = len(word)
+            kinds[index] = words[word]
+            offset += len(word)
+
+        self.table.size = size
+        self.table.max_len = max(map(len, keys))
+        return 0
+
+    def __len__(self):
+        return self.table.size
+
+    def __contains__(self, str word):
+        return word_kind(self, word, 0, len(word)) != -1
+
+    def kind_of(self, str word):
+        # TokenKind of word, or -1
+        return word_kind(self, word, 0, len(word))
+
+    def items(self):
+        # { word: kind }
+        cdef uint32_t i
+        cdef dict items = {}
+
+        for i in range(self.table.size):
+            word = (<char*>self.table.chars)[self.table.offsets[i]:self.table.offsets[i] + self.table.lengths[i]].decode("latin-1")
+            items[word] = self.table.kinds[i]
+
+        return items
+
+    def words(self, int kind):
+        # frozenset of words with given kind
+        return frozenset(word for word, kind_ in self.items().items() if kind_ == kind)
+
+    def extended(self, dict words):
+        # new table with words ({ word: kind }) added or overriding
+        cdef dict merged = self.items()
+        merged.update(words)
+        return WordTable(merged)
+
+
+def word_kinds(dict extra_words, dict kinds):
+    # { word: kind } from { style: words } (e.g. Lexer extra_words), kinds maps style to TokenKind
+    cdef dict words = {}
+
+    for style, style_words in extra_words.items():
+        if style not in kinds:
+            raise ValueError("word_kinds : no word table style %r (expected one of %s)" % (style, ", ".join(sorted(kinds))))
+
+        for word in style_words:
+            words[word] = kinds[style]
+
+    return words
+
+
+
+# streaming (line-local lexers)
+
+CHUNK_SIZE = 1 << 20
+
+
+def read_chunks(file, Py_ssize_t chunk_size=CHUNK_SIZE):
+    # chunks from file object until eof
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_lines(source, Py_ssize_t chunk_size=CHUNK_SIZE):
+    # str chunks of about chunk_size that end at a line break (except the last one)
+    #
+    # source is a str, a file object (text or binary) or an iterable of str or
+    # bytes chunks. bytes are decoded as utf-8 (also across chunks) and lines
+    # longer than chunk_size are kept whole
+    cdef list pending = []
+    cdef Py_ssize_t cut
+    cdef str text
+    decoder = None
+
+    chunks = source
+    if isinstance(source, str):
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif hasattr(source, "read"):
+        chunks = read_chunks(source, chunk_size)
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            text = chunk
+        else:
+            if decoder is None:
+                decoder = getincrementaldecoder("utf-8")()
+            text = decoder.decode(chunk)
+
+        cut = text.rfind('\n') + 1
+        if cut == 0:
+            if text:
+                pending.append(text)
+            continue
+
+        pending.append(text[:cut])
+        yield "".join(pending)
+        pending = [text[cut:]] if cut < len(text) else []
+
+    if decoder is not None:
+        pending.append(decoder.decode(b"", True))
+
+    text = "".join(pending)
+    if text:
+        yield text
+
+
+cdef Py_ssize_t last_boundary(TokenArray tokens):
+    # last line start in tokens.text not inside a token, if the last token may go
+    # on in the text that follows (it reaches the end), else len(text)
+    cdef str text = tokens.text
+    cdef Py_ssize_t i = tokens.count - 1
+    cdef Py_ssize_t cut
+
+    if i < 0 or tokens.starts[i] + tokens.lengths[i] < len(text):
+        return len(text)
+
+    # tokens do not overlap, so ends are sorted like starts
+    cut = text.rfind('\n', 0, tokens.starts[i]) + 1
+    while i >= 0 and tokens.starts[i] + tokens.lengths[i] > cut:
+        if tokens.starts[i] < cut:
+            cut = text.rfind('\n', 0, tokens.starts[i]) + 1
+        i -= 1
+
+    return cut
+
+
+def iter_tokens(tokenize_compact, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+    # tokens for lexers whose state resets at newlines, one chunk of lines at a time
+    #
+    # yields (style, start, lexeme) with offsets from start of source, or if
+    # compact (offset, TokenArray) batches where offset is added to starts
+    #
+    # a token that reaches the end of a chunk (an unclosed string, ...) may go on
+    # in the next one, so the lines from the last line start outside a token are
+    # carried over and lexed again with the next chunk (once as much new text
+    # has come in, so a huge token is not lexed over and over)
+    cdef Py_ssize_t offset = 0
+    cdef Py_ssize_t waiting = 0
+    cdef Py_ssize_t cut
+    cdef Py_ssize_t count
+    cdef Py_ssize_t i
+    cdef str carry = ""
+    cdef str text
+    cdef list pending = []
+    cdef TokenArray tokens
+    cdef TokenArray head
+
+    chunks = iter_lines(source, chunk_size)
+    while True:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(chunk)
+            waiting += len(chunk)
+            if waiting < len(carry):
+                continue
+
+        if not pending and not carry:
+            return
+
+        text = carry + "".join(pending)
+        pending = []
+        waiting = 0
+
+        tokens = tokenize_compact(text)
+        cut = len(text) if chunk is None else last_boundary(tokens)
+
+        count = tokens.count
+        if cut < len(text):
+            count = 0
+            while count < tokens.count and tokens.starts[count] < cut:
+                count += 1
+
+        if compact:
+            if count > 0 or cut > 0:
+                if count < tokens.count:
+                    head = TokenArray(text[:cut], tokens.styles)
+                    copy_tokens(head, tokens, 0, count, 0)
+                    tokens = head
+                yield offset, tokens
+        else:
+            for i in range(count):
+                yield (tokens.styles[tokens.kinds[i]], offset + tokens.starts[i], text[tokens.starts[i]:tokens.starts[i] + tokens.lengths[i]])
+
+        offset += cut
+        carry = text[cut:]
+
+        if chunk is None:
+            return
+
+
+# per-line token cache (line-local lexers)
+
+LINE_CACHE_BYTES = 32 << 20
+
+cdef enum:
+    LINE_OVERHEAD = 160 # bytes per cached line besides its text and tokens (dict entry, bytes header, ...)
+    RECENT_TEXTS = 4 # last tokenized texts kept to copy unchanged runs of lines from
+
+
+cdef Py_ssize_t same_prefix(const char* a, const char* b, Py_ssize_t n) noexcept nogil:
+    # length of the common prefix of a and b, at most n bytes
+    cdef Py_ssize_t i = 0
+    while i + 256 <= n and memcmp(a + i, b + i, 256) == 0:
+        i += 256
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+cdef Py_ssize_t same_suffix(const char* a_end, const char* b_end, Py_ssize_t n) noexcept nogil:
+    # length of the common suffix of a and b (ending at a_end and b_end), at most n bytes
+    cdef Py_ssize_t i = 0
+    while i + 256 <= n and memcmp(a_end - i - 256, b_end - i - 256, 256) == 0:
+        i += 256
+    while i < n and a_end[-i - 1] == b_end[-i - 1]:
+        i += 1
+    return i
+
+
+cdef int copy_tokens(TokenArray tokens, TokenArray source, Py_ssize_t first, Py_ssize_t last, Py_ssize_t shift) except -1:
+    # append tokens first..last of source (and their symbols) with starts moved by shift
+    cdef Py_ssize_t count = last - first
+    cdef Py_ssize_t base = tokens.count
+    cdef Py_ssize_t index
+    cdef Py_ssize_t i
+
+    if count <= 0:
+        return 0
+    if source.starts[last - 1] + source.lengths[last - 1] + shift > INT32_MAX:
+        raise OverflowError("TokenArray : offset does not fit in int32")
+    if base + count > tokens.capacity:
+        tokens.reserve(max(base + count, tokens.capacity * 2, 1024))
+
+    memcpy(tokens.starts + base, source.starts + first, 4 * count)
+    if shift != 0:
+        for i in range(base, base + count):
+            tokens.starts[i] += <int32_t>shift
+    memcpy(tokens.lengths + base, source.lengths + first, 4 * count)
+    memcpy(tokens.kinds + base, source.kinds + first, count)
+    tokens.count += count
+
+    for i in range(source.symbol_count):
+        index = source.symbol_tokens[i]
+        if first <= index < last:
+            tokens.mark_symbol(base + index - first, source.symbol_kinds[i])
+
+    return 0
+
+
+cdef inline Py_ssize_t line_cost(str line, bytes entry):
+    return len(line) * PyUnicode_KIND(line) + len(entry) + LINE_OVERHEAD
+
+
+cdef bytes pack_line(TokenArray tokens, Py_ssize_t first, Py_ssize_t first_symbol, Py_ssize_t offset):
+    # tokens (and symbols) from first, starts relative to offset, as
+    # count, symbol count, starts, lengths, kinds, symbol tokens, symbol kinds
+    cdef int32_t count = <int32_t>(tokens.count - first)
+    cdef int32_t symbols = <int32_t>(tokens.symbol_count - first_symbol)
+    cdef bytes entry = PyBytes_FromStringAndSize(NULL, 8 + 9 * count + 5 * symbols)
+    cdef char* data = PyBytes_AS_STRING(entry)
+    cdef int32_t value
+    cdef Py_ssize_t i
+
+    memcpy(data, &count, 4)
+    memcpy(data + 4, &symbols, 4)
+    data += 8
+
+    for i in range(count):
+        value = <int32_t>(tokens.starts[first + i] - offset)
+        memcpy(data + 4 * i, &value, 4)
+    memcpy(data + 4 * count, tokens.lengths + first, 4 * count)
+    memcpy(data + 8 * count, tokens.kinds + first, count)
+    data += 9 * count
+
+    for i in range(symbols):
+        value = <int32_t>(tokens.symbol_tokens[first_symbol + i] - first)
+        memcpy(data + 4 * i, &value, 4)
+    memcpy(data + 4 * symbols, tokens.symbol_kinds + first_symbol, symbols)
+
+    return entry
+
+
+cdef int unpack_line(TokenArray tokens, bytes entry, Py_ssize_t offset, Py_ssize_t length) except -1:
+    # push tokens of pack_line at offset (line of length chars)
+    cdef const char* data = PyBytes_AS_STRING(entry)
+    cdef Py_ssize_t first = tokens.count
+    cdef int32_t count
+    cdef int32_t symbols
+    cdef int32_t value
+    cdef Py_ssize_t i
+
+    if offset + length > INT32_MAX:
+        raise OverflowError("TokenArray : offset does not fit in int32")
+
+    memcpy(&count, data, 4)
+    memcpy(&symbols, data + 4, 4)
+    data += 8
+
+    if first + count > tokens.capacity:
+        tokens.reserve(max(first + count, tokens.capacity * 2, 1024))
+
+    memcpy(tokens.starts + first, data, 4 * count)
+    for i in range(first, first + count):
+        tokens.starts[i] += <int32_t>offset
+    memcpy(tokens.lengths + first, data + 4 * count, 4 * count)
+    memcpy(tokens.kinds + first, data + 8 * count, count)
+    tokens.count += count
+    data += 9 * count
+
+    for i in range(symbols):
+        memcpy(&value, data + 4 * i, 4)
+        tokens.mark_symbol(first + value, (<const uint8_t*>data)[4 * symbols + i])
+
+    return 0
+
+
+cdef class LineCache:
+    # tokens of lines by line content, starts relative to the line, bounded
+    # to about max_bytes
+    #
+    # Scanning a line-local lexer from a line start to the next one depends on
+    # that line only, so its tokens are reused wherever the same line shows up
+    # again, rebased to its offset. Lines whose tokens run into the next line
+    # (e.g. an unclosed string) and the last line are always scanned. A cache
+    # can be shared by lexers of the same language and settings.
+    #
+    # Looking up every line costs about as much as lexing it with the fast
+    # lexers, so the last RECENT_TEXTS texts and their tokens are kept too. The
+    # unchanged start and end of a text (memcmp against the closest one) are
+    # copied from its tokens, and only the lines in between go through the line
+    # table. Re-tokenizing a buffer after an edit lexes the edited lines and
+    # copies the rest.
+    #
+    # Lines are evicted by generation rather than strict LRU (no list to update
+    # on every hit): new lines go to lines, which becomes older once it holds
+    # half of max_bytes, dropping the previous older. Hits in older move back.
+
+    def __cinit__(self, Py_ssize_t max_bytes=LINE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def __len__(self):
+        return len(self.lines) + len(self.older)
+
+    def __repr__(self):
+        return "LineCache(%d lines, %d of %d bytes, %d hits, %d misses)" % (len(self), self.nbytes, self.max_bytes, self.hits, self.misses)
+
+    def clear(self):
+        self.lines = {}
+        self.older = {}
+        self.recent = []
+        self.lines_bytes = 0
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    cdef int store(self, str line, bytes entry, Py_ssize_t cost) except -1:
+        if 2 * cost > self.max_bytes:
+            return 0
+
+        if 2 * (self.lines_bytes + cost) > self.max_bytes:
+            self.older = self.lines
+            self.lines = {}
+            self.nbytes = self.lines_bytes
+            self.lines_bytes = 0
+
+        self.lines[line] = entry
+        self.lines_bytes += cost
+        self.nbytes += cost
+        return 0
+
+    cdef TokenArray tokenize(self, str text, tuple styles, line_scan scan, object context):
+        # tokens of text (as scan gives them from 0), with cached lines copied
+        cdef TokenArray tokens = TokenArray(text, styles)
+        cdef TokenArray old = None
+        cdef TokenArray candidate
+        cdef Py_ssize_t n = len(text)
+        cdef int kind = PyUnicode_KIND(text)
+        cdef const char* data = <const char*>PyUnicode_DATA(text)
+        cdef Py_ssize_t prefix = 0
+        cdef Py_ssize_t suffix = 0
+        cdef Py_ssize_t limit
+        cdef Py_ssize_t same
+        cdef Py_ssize_t shift = 0
+        cdef Py_ssize_t sync = PY_SSIZE_T_MAX
+        cdef Py_ssize_t i = 0
+        cdef Py_ssize_t j
+        cdef Py_ssize_t next_line
+        cdef Py_ssize_t end
+        cdef Py_ssize_t first
+        cdef Py_ssize_t first_symbol
+        cdef Py_ssize_t cost
+        cdef object entry
+        cdef str line
+
+        # closest recent text (longest common start and end)
+        for candidate in self.recent:
+            if PyUnicode_KIND(candidate.text) != kind:
+                continue
+
+            limit = min(n, len(candidate.text))
+            same = same_prefix(data, <const char*>PyUnicode_DATA(candidate.text), limit * kind) // kind
+            end = same_suffix(data + n * kind, <const char*>PyUnicode_DATA(candidate.text) + len(candidate.text) * kind, (limit - same) * kind) // kind
+
+            if old is None or same + end > prefix + suffix:
+                old = candidate
+                prefix = same
+                suffix = end
+
+        if old is not None:
+            # lines before the first change, from a line start no old token runs over
+            i = PyUnicode_FindChar(text, '\n', 0, prefix, -1) + 1
+            # (the last old line too, its tokens may have stopped at the end of text)
+            if i > 0 and i == len(old.text):
+                i = PyUnicode_FindChar(text, '\n', 0, i - 1, -1) + 1
+            j = token_from(old, i)
+            while j < old.count and old.starts[j] < i:
+                i = PyUnicode_FindChar(text, '\n', 0, old.starts[j], -1) + 1
+                j = token_from(old, i)
+
+            copy_tokens(tokens, old, 0, j, 0)
+            shift = n - len(old.text)
+            sync = n - suffix
+
+        while i < n:
+            # line start after the last change, old tokens from here on only move
+            if i > sync:
+                j = token_from(old, i - shift)
+                if j == old.count or old.starts[j] >= i - shift:
+                    copy_tokens(tokens, old, j, old.count, shift)
+                    break
+
+            next_line = scan_to_eol(text, i, n) + 1
+
+            # last line, its tokens may depend on the end of text
+            if next_line >= n:
+                scan(context, text, i, n, tokens)
+                break
+
+            line = text[i:next_line]
+            entry = self.lines.get(line)
+
+            if entry is None and self.older:
+                entry = self.older.pop(line, None)
+                if entry is not None:
+                    cost = line_cost(line, <bytes>entry)
+                    self.nbytes -= cost
+                    self.store(line, <bytes>entry, cost)
+
+            if entry is not None:
+                self.hits += 1
+                unpack_line(tokens, <bytes>entry, i, next_line - i)
+                i = next_line
+                continue
+
+            self.misses += 1
+            first = tokens.count
+            first_symbol = tokens.symbol_count
+            end = scan(context, text, i, next_line, tokens)
+
+            if end == next_line:
+                entry = pack_line(tokens, first, first_symbol, i)
+                self.store(line, <bytes>entry, line_cost(line, <bytes>entry))
+
+            i = end
+
+        # keep a copy (callers may restyle tokens), replacing the text it was edited from
+        if old is not None and 2 * (prefix + suffix) >= len(old.text):
+            self.recent.remove(old)
+
+        candidate = TokenArray(text, styles, tokens.count)
+        copy_tokens(candidate, tokens, 0, tokens.count, 0)
+        self.recent.insert(0, candidate)
+        del self.recent[RECENT_TEXTS:]
+
+        return tokens
+
+
+# thread pool (lexers that scan without the gil)
+
+def tokenize_many(tokenize, texts, max_workers=None):
+    # [tokenize(text) for text in texts], spread over a thread pool
+    #
+    # scanning runs in parallel for lexers that release the gil while scanning
+    # (pc.pyx, hackerman.pyx, odin_tokenizer), building tuples does not
+    cdef list items = list(texts)
+
+    if len(items) < 2 or max_workers == 1:
+        return [tokenize(text) for text in items]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(tokenize, items))
+
+
+# line-sharded tokenization of one text (line-local lexers)
+
+PARALLEL_THRESHOLD = 1 << 20 # chars, shorter texts are scanned serially
+
+
+cdef class Shards:
+    # one text split at line starts, scanned a shard at a time on the pool
+    cdef line_scan scan
+    cdef object context
+    cdef str text
+    cdef tuple styles
+
+    def scan_shard(self, tuple bounds):
+        # (end, tokens) of scan from a line start to the first line start at or after stop
+        cdef TokenArray tokens = TokenArray(self.text, self.styles)
+        cdef Py_ssize_t end = self.scan(self.context, self.text, bounds[0], bounds[1], tokens)
+        return end, tokens
+
+
+cdef TokenArray scan_parallel(str text, tuple styles, line_scan scan, object context, object workers, Py_ssize_t threshold):
+    # tokens of text as scan gives them from 0, with one shard of lines per worker
+    # scanned on a thread pool (in parallel if scan releases the gil)
+    #
+    # Shards are scanned in place, so their starts are already offsets in text.
+    # A shard whose first line was taken by a token of the shard before (e.g.
+    # an unclosed string) is scanned again from where that one ended.
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t count = workers or os.cpu_count() or 1
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t stop
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t k
+    cdef list bounds = []
+    cdef list results
+    cdef TokenArray tokens
+    cdef TokenArray part
+    cdef Shards shards
+
+    if n >= threshold:
+        for k in range(1, count + 1):
+            stop = n if k == count else min(scan_to_eol(text, max(n * k // count - 1, start), n) + 1, n)
+            if stop > start:
+                bounds.append((start, stop))
+                start = stop
+
+    if len(bounds) < 2:
+        tokens = TokenArray(text, styles)
+        scan(context, text, 0, n, tokens)
+        return tokens
+
+    shards = Shards()
+    shards.scan = scan
+    shards.context = context
+    shards.text = text
+    shards.styles = styles
+
+    with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+        results = list(pool.map(shards.scan_shard, bounds))
+
+    tokens = TokenArray(text, styles, sum([len(<TokenArray>result[1]) for result in results]))
+
+    for k in range(len(bounds)):
+        start, stop = bounds[k]
+        if pos == start:
+            pos, part = results[k]
+            copy_tokens(tokens, part, 0, part.count, 0)
+        elif pos < stop:
+            pos = scan(context, text, pos, stop, tokens)
+
+    return tokens
@@ -0,0 +1,78 @@
+// MIT License
+
+// Copyright 2025 @asyncze (Michael Sjöberg)
+
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+
+// Dispatch tables for spec tokenizers (see gen_lexers.py, lexer_spec.pyx)
+
+// A spec is an ordered list of rules. first[c]..first[c + 1] indexes the rules
+// (into order) that can start with Latin-1 char c, in spec order, and bucket
+// 0x100 holds the rules whose start class also matches code points above 0xff.
+// So the scanner tries only the few rules for the current char, first match
+// wins.
+
+#ifndef LEXER_SPEC_H
+#define LEXER_SPEC_H
+
+#include <stdint.h>
+
+#include "lexer_core.h"
+
+#define LS_MAX_START 8 /* chars in a literal start */
+#define LS_WIDE 0x100  /* bucket of code points above 0xff */
+
+// what follows the start of a rule
+#define LS_BODY_NONE  0 /* token is the start */
+#define LS_BODY_EOL   1 /* to end of line */
+#define LS_BODY_UNTIL 2 /* through the next end delimiter (or end of text), escape skips a char */
+#define LS_BODY_RUN   3 /* run of chars in run class (or the also char) */
+#define LS_BODY_WORD  4 /* run, kind from word table if listed there */
+#define LS_BODY_SPANS 5 /* to end of line, open..close spans in span_kind */
+
+#define LS_NO_SYMBOL 0xff
+
+typedef struct {
+    uint32_t start[LS_MAX_START]; /* literal start (start[0] is checked by dispatch) */
+    uint8_t length;               /* chars matched by the start */
+    uint8_t start_class;          /* class of first char (LC_*), 0 for literal starts */
+    uint8_t line_start;           /* only as first char of a line */
+    uint8_t kind;
+    uint8_t body;
+    uint8_t run;
+    uint32_t also;
+    uint32_t open;
+    uint32_t close;
+    uint32_t end[LS_MAX_START];   /* end delimiter of until */
+    uint8_t end_length;
+    uint32_t escape;              /* in until, the char after it is skipped, 0 for none */
+    uint32_t skip;                /* dropped once after a span, 0 for none */
+    uint8_t span_kind;
+    uint8_t symbol;               /* SymbolKind if the token starts its line */
+} ls_rule;
+
+typedef struct {
+    const ls_rule* rules;
+    uint32_t rule_count;
+    const uint16_t* first;        /* LS_WIDE + 2 offsets into order */
+    const uint16_t* order;
+} ls_spec;
+
+#endif
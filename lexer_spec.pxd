@@ -0,0 +1,58 @@
+# Declarations for spec tokenizers (see lexer_spec.pyx, gen_lexers.py)
+
+# cython: language_level=3
+cimport cython
+from libc.stdint cimport uint8_t, uint16_t, uint32_t
+
+from lexer_core cimport Text, TokenArray, WordTable, LineCache
+
+cdef extern from "lexer_spec.h":
+    enum:
+        LS_MAX_START
+        LS_WIDE
+        LS_BODY_NONE
+        LS_BODY_EOL
+        LS_BODY_UNTIL
+        LS_BODY_RUN
+        LS_BODY_WORD
+        LS_BODY_SPANS
+        LS_NO_SYMBOL
+
+    ctypedef struct ls_rule:
+        uint32_t start[LS_MAX_START]
+        uint8_t length
+        uint8_t start_class
+        uint8_t line_start
+        uint8_t kind
+        uint8_t body
+        uint8_t run
+        uint32_t also
+        uint32_t open
+        uint32_t close
+        uint32_t end[LS_MAX_START]
+        uint8_t end_length
+        uint32_t escape
+        uint32_t skip
+        uint8_t span_kind
+        uint8_t symbol
+
+    ctypedef struct ls_spec:
+        const ls_rule* rules
+        uint32_t rule_count
+        const uint16_t* first
+        const uint16_t* order
+
+
+cdef Py_ssize_t scan_spec(const ls_spec* spec, Text text, Py_ssize_t current_char_index, Py_ssize_t stop, WordTable words, TokenArray tokens) except -1 nogil
+
+
+# base of generated Lexer classes
+
+cdef class SpecLexer:
+    cdef const ls_spec* spec
+    cdef readonly WordTable words
+    cdef readonly tuple styles
+    cdef public LineCache line_cache
+
+    cdef int setup(self, const ls_spec* spec, WordTable words, tuple styles, dict kinds, extra_words, LineCache line_cache) except -1
+    cdef list outline(self, int symbol, str line_text)
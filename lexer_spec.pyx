@@ -0,0 +1,381 @@
+
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Table-driven scanner for spec tokenizers
+
+# gen_lexers.py compiles a spec (specs/*.py) into rule and dispatch tables
+# (ls_spec, see lexer_spec.h) and a module whose Lexer subclasses SpecLexer.
+# scan_spec runs any spec without the gil: blanks and newlines are skipped, the
+# rules for the current char are tried in spec order and the first match makes
+# the token, anything else is a 1-char default token. Scans start at line
+# starts, so the incremental and viewport functions work as for pc.pyx.
+
+# cython: language_level=3
+cimport cython
+from libc.stdint cimport uint8_t, uint16_t, uint32_t
+from lexer_core cimport (
+    Text, text_view, char_at, char_is, is_alpha, is_alnum, is_digit, at_line_start,
+    raw_to_char, raw_to_eol, raw_class, raw_word_kind, lc_char_class, LC_BLANK,
+    LC_ALPHA, LC_ALNUM, LC_DIGIT, WordTable, TokenArray, SymbolIndex, TK_DEFAULT,
+    SYM_CLASS, SYM_FUNCTION, SYM_TYPE, LineCache,
+)
+
+from incremental import retokenize as _retokenize, tokenize_range as _tokenize_range
+from lexer_core import CHUNK_SIZE, iter_tokens as _iter_tokens, line_range, tokenize_many as _tokenize_many, word_kinds
+
+
+cdef inline bint in_class(Py_UCS4 ch, uint8_t mask) noexcept nogil:
+    # char_is, with unicode classes (LC_ALPHA, LC_ALNUM, LC_DIGIT) above 0xff
+    if ch < 0x100:
+        return (lc_char_class[ch] & mask) != 0
+
+    return ((mask & LC_ALPHA) and is_alpha(ch)) or ((mask & LC_ALNUM) and is_alnum(ch)) or ((mask & LC_DIGIT) and is_digit(ch))
+
+
+cdef inline Py_ssize_t run_end(const ls_rule* rule, Text text, Py_ssize_t current_char_index, Py_ssize_t n) noexcept nogil:
+    cdef Py_UCS4 ch
+
+    while current_char_index < n:
+        ch = char_at(text, current_char_index)
+        if not (in_class(ch, rule.run) or (rule.also != 0 and ch == rule.also)):
+            break
+        current_char_index += 1
+
+    return current_char_index
+
+
+cdef inline Py_ssize_t until_end(const ls_rule* rule, Text text, Py_ssize_t current_char_index, Py_ssize_t n) noexcept nogil:
+    # end of until body from current_char_index : after the end delimiter, or end of text
+    cdef Py_UCS4 ch
+    cdef Py_ssize_t j
+
+    while current_char_index < n:
+        if rule.escape == 0:
+            current_char_index = raw_to_char(text, current_char_index, n, rule.end[0])
+            if current_char_index >= n:
+                break
+
+        ch = char_at(text, current_char_index)
+
+        if rule.escape != 0 and ch == rule.escape:
+            current_char_index += 2
+            continue
+
+        if ch == rule.end[0] and current_char_index + rule.end_length <= n:
+            for j in range(1, rule.end_length):
+                if char_at(text, current_char_index + j) != rule.end[j]:
+                    break
+            else:
+                return current_char_index + rule.end_length
+
+        current_char_index += 1
+
+    return n
+
+
+cdef const ls_rule* match_rule(const ls_spec* spec, Text text, Py_ssize_t current_char_index, Py_UCS4 ch, bint line_start) noexcept nogil:
+    # first rule that matches at current_char_index, or NULL
+    cdef Py_ssize_t bucket = ch if ch < 0x100 else LS_WIDE
+    cdef const ls_rule* rule
+    cdef Py_ssize_t k
+    cdef Py_ssize_t j
+
+    for k in range(spec.first[bucket], spec.first[bucket + 1]):
+        rule = &spec.rules[spec.order[k]]
+
+        if rule.line_start and not line_start:
+            continue
+
+        # wide chars share one bucket, so the class is checked here
+        if bucket == LS_WIDE and not in_class(ch, rule.start_class):
+            continue
+
+        if current_char_index + rule.length > text.length:
+            continue
+
+        for j in range(1, rule.length):
+            if char_at(text, current_char_index + j) != rule.start[j]:
+                break
+        else:
+            return rule
+
+    return NULL
+
+
+cdef Py_ssize_t handle_spans(const ls_rule* rule, Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    # token to end of line, split around open..close spans (e.g. "- task [tag] more")
+    cdef Py_ssize_t start = current_char_index
+    cdef Py_ssize_t line_end = raw_to_eol(text, current_char_index + 1, text.length)
+    current_char_index += rule.length
+
+    while current_char_index < line_end:
+        current_char_index = raw_to_char(text, current_char_index, line_end, rule.open)
+
+        if current_char_index < line_end:
+            tokens.push(rule.kind, start, current_char_index - start)
+
+            start = current_char_index
+            current_char_index = raw_to_char(text, current_char_index + 1, line_end, rule.close)
+
+            if current_char_index < line_end:
+                current_char_index += 1
+
+            tokens.push(rule.span_kind, start, current_char_index - start)
+
+            if rule.skip != 0 and current_char_index < line_end and char_at(text, current_char_index) == rule.skip:
+                current_char_index += 1
+
+            start = current_char_index
+
+    tokens.push(rule.kind, start, current_char_index - start)
+    return current_char_index
+
+
+cdef Py_ssize_t handle_rule(const ls_rule* rule, Py_ssize_t current_char_index, Text text, WordTable words, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t n = text.length
+    cdef Py_ssize_t start = current_char_index
+    cdef int kind = rule.kind
+    cdef int found
+
+    if rule.body == LS_BODY_SPANS:
+        return handle_spans(rule, current_char_index, text, tokens)
+
+    current_char_index += rule.length
+
+    if rule.body == LS_BODY_EOL:
+        current_char_index = raw_to_eol(text, current_char_index, n)
+
+    elif rule.body == LS_BODY_UNTIL:
+        current_char_index = until_end(rule, text, current_char_index, n)
+
+    elif rule.body == LS_BODY_RUN or rule.body == LS_BODY_WORD:
+        current_char_index = run_end(rule, text, current_char_index, n)
+
+        if rule.body == LS_BODY_WORD:
+            found = raw_word_kind(words, text, start, current_char_index)
+            if found >= 0:
+                kind = found
+
+    tokens.push(kind, start, current_char_index - start)
+
+    if rule.symbol != LS_NO_SYMBOL and at_line_start(text, start):
+        tokens.mark_symbol(tokens.count - 1, rule.symbol)
+
+    return current_char_index
+
+
+cdef Py_ssize_t scan_spec(const ls_spec* spec, Text text, Py_ssize_t current_char_index, Py_ssize_t stop, WordTable words, TokenArray tokens) except -1 nogil:
+    # tokenize from line start (or start of token, see restart_spec), return at first line start at or after stop
+    cdef Py_ssize_t n = text.length
+    cdef const ls_rule* rule
+    cdef bint line_start = current_char_index == 0 or char_at(text, current_char_index - 1) == '\n'
+    cdef Py_UCS4 ch
+
+    while current_char_index < n:
+        if current_char_index >= stop and (current_char_index == 0 or char_at(text, current_char_index - 1) == '\n'):
+            break
+
+        ch = char_at(text, current_char_index)
+
+        # whitespace
+        if char_is(ch, LC_BLANK):
+            current_char_index = raw_class(text, current_char_index + 1, n, LC_BLANK)
+
+        # newline
+        elif ch == '\n':
+            current_char_index += 1
+            line_start = True
+            continue
+
+        else:
+            rule = match_rule(spec, text, current_char_index, ch, line_start)
+
+            if rule != NULL:
+                current_char_index = handle_rule(rule, current_char_index, text, words, tokens)
+
+            # fallback
+            else:
+                tokens.push(TK_DEFAULT, current_char_index, 1)
+                current_char_index += 1
+
+        line_start = False
+
+    return current_char_index
+
+
+cdef Py_ssize_t restart_spec(const ls_spec* spec, Text text, Py_ssize_t offset) noexcept nogil:
+    # offset, or start of token spanning it (as scan_spec, without pushing tokens)
+    cdef Py_ssize_t n = text.length
+    cdef Py_ssize_t current_char_index = 0
+    cdef Py_ssize_t end
+    cdef const ls_rule* rule
+    cdef bint line_start = True
+    cdef Py_UCS4 ch
+
+    while current_char_index < offset:
+        ch = char_at(text, current_char_index)
+
+        if char_is(ch, LC_BLANK):
+            current_char_index = raw_class(text, current_char_index + 1, n, LC_BLANK)
+            line_start = False
+            continue
+
+        elif ch == '\n':
+            current_char_index += 1
+            line_start = True
+            continue
+
+        rule = match_rule(spec, text, current_char_index, ch, line_start)
+        line_start = False
+
+        if rule == NULL:
+            end = current_char_index + 1
+        elif rule.body == LS_BODY_SPANS:
+            end = raw_to_eol(text, current_char_index + 1, n)
+        elif rule.body == LS_BODY_EOL:
+            end = raw_to_eol(text, current_char_index + rule.length, n)
+        elif rule.body == LS_BODY_UNTIL:
+            end = until_end(rule, text, current_char_index + rule.length, n)
+        elif rule.body == LS_BODY_RUN or rule.body == LS_BODY_WORD:
+            end = run_end(rule, text, current_char_index + rule.length, n)
+        else:
+            end = current_char_index + rule.length
+
+        if end > offset:
+            return current_char_index
+        current_char_index = end
+
+    return offset
+
+
+cdef Py_ssize_t scan_line(object lexer, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    return scan_spec((<SpecLexer>lexer).spec, text_view(text), start, stop, (<SpecLexer>lexer).words, tokens)
+
+
+cdef class SpecLexer:
+    # tokenize, incremental and viewport methods for generated Lexer classes,
+    # which call setup from __init__ and add lexer_name, comment_char, ...
+
+    cdef int setup(self, const ls_spec* spec, WordTable words, tuple styles, dict kinds, extra_words, LineCache line_cache) except -1:
+        # extra_words : { style: words } added to word table, e.g. { "keyword": ["for"] }
+        # line_cache : shared by lexers of the module, lexers with extra_words get their own
+        self.spec = spec
+        self.words = words.extended(word_kinds(extra_words, kinds)) if extra_words else words
+        self.styles = styles
+        self.line_cache = LineCache() if extra_words else line_cache
+        return 0
+
+    cdef list outline(self, int symbol, str line_text):
+        # [(style, line_text)] if line_text starts with the literal start of a rule
+        # that marks symbol (for _is_class, _is_function_name, _is_type_def)
+        cdef const ls_rule* rule
+        cdef uint32_t r
+        cdef str start
+
+        for r in range(self.spec.rule_count):
+            rule = &self.spec.rules[r]
+            if rule.symbol != symbol or rule.start_class != 0:
+                continue
+
+            start = "".join([chr(rule.start[j]) for j in range(rule.length)])
+            if line_text.startswith(start):
+                return [(self.styles[rule.kind], line_text)]
+
+        return None
+
+    def _is_class(self, line_text):
+        return self.outline(SYM_CLASS, line_text) or False
+
+    def _is_function_name(self, line_text):
+        return self.outline(SYM_FUNCTION, line_text) or False
+
+    def _is_type_def(self, line_text):
+        return self.outline(SYM_TYPE, line_text) or False
+
+    def tokenize(self, str text):
+        return self.tokenize_compact(text).to_list()
+
+    def tokenize_compact(self, str text):
+        # same tokens as tokenize, stored as kind/start/length arrays
+        # (scans without the gil, see tokenize_many)
+        cdef TokenArray tokens = TokenArray(text, self.styles)
+        cdef Text view = text_view(text)
+        cdef const ls_spec* spec = self.spec
+        cdef WordTable words = self.words
+
+        with nogil:
+            scan_spec(spec, view, 0, view.length, words, tokens)
+
+        return tokens
+
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in line_cache are copied instead of lexed
+        return self.line_cache.tokenize(text, self.styles, scan_line, self)
+
+    def tokenize_many(self, texts, max_workers=None, bint compact=False):
+        # tokenize (or tokenize_compact) of each text, scanned in parallel on a thread pool
+        return _tokenize_many(self.tokenize_compact if compact else self.tokenize, texts, max_workers)
+
+    def iter_tokens(self, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+        # tokens of str, file object or iterable of chunks, one chunk of lines at a time
+        # (compact yields (offset, TokenArray) batches)
+        return _iter_tokens(self.tokenize_compact, source, chunk_size, compact)
+
+    def scan(self, str text, Py_ssize_t start, Py_ssize_t stop, list tokens):
+        # scan for incremental retokenize / tokenize_range
+        cdef TokenArray found = TokenArray(text, self.styles)
+        cdef Py_ssize_t end = scan_spec(self.spec, text_view(text), start, stop, self.words, found)
+        tokens.extend(found)
+        return end
+
+    def retokenize(self, str text, list old_tokens, edits, SymbolIndex symbols=None):
+        # text is buffer after edits, edits is list of (start, removed_len, inserted_text) in old positions
+        # (symbols from symbol_index is updated in place from the re-lexed lines)
+        cdef TokenArray found
+        result = _retokenize(self.scan, text, old_tokens, edits)
+
+        if symbols is not None:
+            changed_start, changed_end = result[1]
+            found = TokenArray(text, self.styles)
+            if changed_end > changed_start:
+                scan_spec(self.spec, text_view(text), changed_start, changed_end, self.words, found)
+            symbols.update(found, changed_start, changed_end)
+
+        return result
+
+    def symbol_index(self, str text, TokenArray tokens=None):
+        # outline (tokens of rules with a symbol) from tokens of text (tokenized if not given), see SymbolIndex
+        return SymbolIndex(tokens if tokens is not None else self.tokenize_compact(text))
+
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing only those lines
+        # (and a token spanning into them)
+        return _tokenize_range(self.scan, text, start_offset, end_offset, self.restart_point)
+
+    def restart_point(self, str text, Py_ssize_t offset):
+        # offset, or start of token spanning it (used by tokenize_range)
+        return restart_spec(self.spec, text_view(text), offset)
+
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        return self.tokenize_range(text, *line_range(text, first_line, last_line))
@@ -25,6 +25,22 @@
 
 # cython: language_level=3
 cimport cython
+from lexer_core cimport (
+    Text, text_view, char_at, char_is, at_line_start, raw_to_char, raw_to_eol,
+    raw_class, raw_digits, raw_word_kind, LC_BLANK, LC_ASCII_LETTER,
+    LC_ASCII_DIGIT, LC_UNDERSCORE, WordTable, lc_word_table, wrap_words,
+    TokenArray, TK_DEFAULT, TK_KEYWORD, TK_LAMBDA, TK_STRING, TK_NUMBER,
+    TK_OPERATOR, TK_COMMENT, TK_SPECIAL, TK_CONDITIONAL,
+    SymbolIndex, SYM_FUNCTION, LC_STATS, lc_stat, lc_clock_ns, count_stat,
+    stats_dict, clear_stats, LineCache, scan_parallel,
+)
+from libc.stdint cimport uint64_t
+
+from incremental import retokenize as _retokenize, tokenize_range as _tokenize_range
+from lexer_core import CHUNK_SIZE, PARALLEL_THRESHOLD, iter_tokens as _iter_tokens, line_range, make_styles, tokenize_many as _tokenize_many, word_kinds
+
+cdef extern from "pc_words.h":
+    const lc_word_table pc_words
 
 
 cdef str WHITESPACE = "whitespace"
@@ -48,124 +64,258 @@ cdef str WARNING = "_warning"
 cdef str SUCCESS = "_success"
 
 
-KEYWORDS = { "if", "else", "while", "swap", "print" }
-CONDITIONALS = { "True", "False" }
+# generated from gen_words.py
+cdef WordTable WORDS = wrap_words(&pc_words)
 
+KEYWORDS = WORDS.words(TK_KEYWORD)
+CONDITIONALS = WORDS.words(TK_CONDITIONAL)
 
-cdef inline bint _is_letter(str ch):
-    return ('a' <= ch <= 'z') or ('A' <= ch <= 'Z') or (ch == '_')
+# styles that can be extended with Lexer(extra_words={ style: [...] })
+WORD_KINDS = { KEYWORD: TK_KEYWORD, CONDITIONAL: TK_CONDITIONAL }
 
-cdef inline bint _is_digit(str ch):
-    return '0' <= ch <= '9'
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: DEFAULT,
+    TK_KEYWORD: KEYWORD,
+    TK_LAMBDA: LAMBDA,
+    TK_STRING: STRING,
+    TK_NUMBER: NUMBER,
+    TK_OPERATOR: OPERATOR,
+    TK_COMMENT: COMMENT,
+    TK_SPECIAL: SPECIAL,
+    TK_CONDITIONAL: CONDITIONAL,
+})
 
-cdef inline bint _is_alnum_or_underscore(str ch):
-    return _is_letter(ch) or _is_digit(ch)
 
+# scan handlers for Lexer.stats() (counted only in LC_STATS builds, see lexer_core.h)
+cdef enum:
+    H_WHITESPACE
+    H_NEWLINE
+    H_DASH
+    H_OPERATOR
+    H_TAG
+    H_STRING
+    H_NUMBER
+    H_IDENTIFIER
+    H_DEFAULT
+    H_COUNT
 
-cdef inline int handle_whitespace(int current_char_index):
-    current_char_index += 1
-    return current_char_index
+cdef tuple HANDLERS = (
+    "whitespace", "newline", "handle_dash", "handle_operator", "handle_tag",
+    "handle_string", "handle_number", "handle_identifier", "default",
+)
 
+cdef lc_stat STATS[H_COUNT]
 
-cdef int handle_dash(int current_char_index, str text, list tokens):
-    cdef int n = len(text)
-    cdef int start = current_char_index
-    cdef str lexeme
 
-    if current_char_index + 1 < n and text[current_char_index + 1] == '-':
-        lexeme = "--"
-        current_char_index += 2
-        
-        while current_char_index < n and text[current_char_index] != '\n':
-            lexeme += text[current_char_index]
-            current_char_index += 1
+cdef Py_ssize_t handle_dash(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t n = text.length
+    cdef Py_ssize_t start = current_char_index
+
+    if current_char_index + 1 < n and char_at(text, current_char_index + 1) == '-':
+        current_char_index = raw_to_eol(text, current_char_index + 2, n)
         
-        tokens.append((COMMENT, start, lexeme))
+        tokens.push(TK_COMMENT, start, current_char_index - start)
         return current_char_index
     
-    elif current_char_index + 1 < n and text[current_char_index + 1] == '>':
-        tokens.append((SPECIAL, start, "->"))
+    elif current_char_index + 1 < n and char_at(text, current_char_index + 1) == '>':
+        tokens.push(TK_SPECIAL, start, 2)
         return current_char_index + 2
     
     else:
-        tokens.append((OPERATOR, current_char_index, "-"))
+        tokens.push(TK_OPERATOR, current_char_index, 1)
         return current_char_index + 1
 
 
-cdef int handle_operator(int current_char_index, str text, list tokens):
-    tokens.append((OPERATOR, current_char_index, text[current_char_index]))
+cdef Py_ssize_t handle_operator(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    tokens.push(TK_OPERATOR, current_char_index, 1)
     return current_char_index + 1
 
 
-cdef int handle_tag(int current_char_index, str text, list tokens):
-    cdef int n = len(text)
-    cdef int start = current_char_index
-    cdef str lexeme = "@"
-    current_char_index += 1
-    
-    while current_char_index < n and _is_letter(text[current_char_index]):
-        lexeme += text[current_char_index]
-        current_char_index += 1
+cdef Py_ssize_t handle_tag(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t start = current_char_index
+    current_char_index = raw_class(text, current_char_index + 1, text.length, LC_ASCII_LETTER | LC_UNDERSCORE)
     
-    tokens.append((LAMBDA, start, lexeme))
+    tokens.push(TK_LAMBDA, start, current_char_index - start)
+
+    # tag at line start is a function in outline
+    if at_line_start(text, start):
+        tokens.mark_symbol(tokens.count - 1, SYM_FUNCTION)
+
     return current_char_index
 
 
-cdef int handle_string(int current_char_index, str text, list tokens):
-    cdef int n = len(text)
-    cdef int start = current_char_index
-    cdef str lexeme = "\""
-    current_char_index += 1
-    
-    while current_char_index < n and text[current_char_index] != '"':
-        lexeme += text[current_char_index]
-        current_char_index += 1
+cdef Py_ssize_t handle_string(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t n = text.length
+    cdef Py_ssize_t start = current_char_index
+    current_char_index = raw_to_char(text, current_char_index + 1, n, '"')
     
     if current_char_index < n:
-        lexeme += '"'
         current_char_index += 1
     
-    tokens.append((STRING, start, lexeme))
+    tokens.push(TK_STRING, start, current_char_index - start)
     return current_char_index
 
 
-cdef int handle_number(int current_char_index, str text, list tokens):
-    cdef int n = len(text)
-    cdef int start = current_char_index
-    cdef str lexeme = text[current_char_index]
-    current_char_index += 1
+cdef Py_ssize_t handle_number(Py_ssize_t current_char_index, Text text, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t start = current_char_index
+    current_char_index = raw_digits(text, current_char_index + 1, text.length, True)
     
-    while current_char_index < n and (_is_digit(text[current_char_index]) or text[current_char_index] == '.'):
-        lexeme += text[current_char_index]
-        current_char_index += 1
-    
-    tokens.append((NUMBER, start, lexeme))
+    tokens.push(TK_NUMBER, start, current_char_index - start)
     return current_char_index
 
 
-cdef int handle_identifier(int current_char_index, str text, list tokens):
-    cdef int n = len(text)
-    cdef int start = current_char_index
-    cdef str lexeme = text[current_char_index]
-    current_char_index += 1
-    while current_char_index < n and _is_alnum_or_underscore(text[current_char_index]):
-        lexeme += text[current_char_index]
-        current_char_index += 1
+cdef Py_ssize_t handle_identifier(Py_ssize_t current_char_index, Text text, WordTable words, TokenArray tokens) except -1 nogil:
+    cdef Py_ssize_t start = current_char_index
+    cdef int kind
+    current_char_index = raw_class(text, current_char_index + 1, text.length, LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE)
+
+    kind = raw_word_kind(words, text, start, current_char_index)
+    if kind < 0:
+        kind = TK_DEFAULT
+
+    tokens.push(kind, start, current_char_index - start)
+    return current_char_index
+
+
+cdef Py_ssize_t scan_into(Text text, Py_ssize_t current_char_index, Py_ssize_t stop, WordTable words, TokenArray tokens) except -1 nogil:
+    # tokenize from line start, return at first line start at or after stop
+    cdef Py_ssize_t n = text.length
+    cdef Py_UCS4 ch
+    cdef uint64_t started = 0
+    cdef Py_ssize_t first = 0
+    cdef int handler = H_DEFAULT
+
+    while current_char_index < n:
+        if current_char_index >= stop and (current_char_index == 0 or char_at(text, current_char_index - 1) == '\n'):
+            break
+
+        if LC_STATS:
+            started = lc_clock_ns()
+            first = current_char_index
+
+        ch = char_at(text, current_char_index)
+
+        # whitespace
+        if char_is(ch, LC_BLANK):
+            handler = H_WHITESPACE
+            current_char_index = raw_class(text, current_char_index + 1, n, LC_BLANK)
+        
+        # newline
+        elif ch == '\n':
+            handler = H_NEWLINE
+            current_char_index += 1
+        
+        # '-' : comment / '->' / minus
+        elif ch == '-':
+            handler = H_DASH
+            current_char_index = handle_dash(current_char_index, text, tokens)
+        
+        # single-char operators
+        elif ch in u"=!+*/<>":
+            handler = H_OPERATOR
+            current_char_index = handle_operator(current_char_index, text, tokens)
+        
+        # '@' tag
+        elif ch == '@':
+            handler = H_TAG
+            current_char_index = handle_tag(current_char_index, text, tokens)
+        
+        # string literal
+        elif ch == '"':
+            handler = H_STRING
+            current_char_index = handle_string(current_char_index, text, tokens)
+        
+        # number
+        elif char_is(ch, LC_ASCII_DIGIT):
+            handler = H_NUMBER
+            current_char_index = handle_number(current_char_index, text, tokens)
+        
+        # identifier
+        elif char_is(ch, LC_ASCII_LETTER | LC_UNDERSCORE):
+            handler = H_IDENTIFIER
+            current_char_index = handle_identifier(current_char_index, text, words, tokens)
+        
+        # fallback
+        else:
+            handler = H_DEFAULT
+            tokens.push(TK_DEFAULT, current_char_index, 1)
+            current_char_index += 1
+
+        if LC_STATS:
+            count_stat(&STATS[handler], started, current_char_index - first)
 
-    if lexeme in CONDITIONALS:
-        tokens.append((CONDITIONAL, start, lexeme))
-    
-    elif lexeme in KEYWORDS:
-        tokens.append((KEYWORD, start, lexeme))
-    
-    else:
-        tokens.append((DEFAULT, start, lexeme))
-    
     return current_char_index
 
 
+cpdef Py_ssize_t scan(str text, Py_ssize_t start, Py_ssize_t stop, list tokens):
+    # list version of scan_into (used by incremental retokenize)
+    cdef TokenArray found = TokenArray(text, STYLES)
+    cdef Py_ssize_t end = scan_into(text_view(text), start, stop, WORDS, found)
+    tokens.extend(found)
+    return end
+
+
+cpdef Py_ssize_t restart_point(str text, Py_ssize_t offset):
+    # offset, or start of string spanning it (used by tokenize_range)
+    #
+    # only strings span lines, and '"' and "--" are not part of any other token
+    # (comments run to end of line), so skimming for them finds every token
+    # boundary tokenize would see before offset
+    cdef Text view = text_view(text)
+    cdef Py_ssize_t n = view.length
+    cdef Py_ssize_t current_char_index = 0
+    cdef Py_ssize_t end
+    cdef Py_UCS4 ch
+
+    while current_char_index < offset:
+        ch = char_at(view, current_char_index)
+
+        if ch == '-' and current_char_index + 1 < n and char_at(view, current_char_index + 1) == '-':
+            end = raw_to_eol(view, current_char_index + 2, n)
+        elif ch == '"':
+            end = raw_to_char(view, current_char_index + 1, n, '"')
+            if end < n:
+                end += 1
+        else:
+            current_char_index += 1
+            continue
+
+        if end > offset:
+            return current_char_index
+        current_char_index = end
+
+    return offset
+
+
+# lines seen by tokenize_cached, shared by lexers without extra_words
+cdef LineCache LINE_CACHE = LineCache()
+
+
+cdef Py_ssize_t scan_line(object words, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    return scan_into(text_view(text), start, stop, <WordTable>words, tokens)
+
+
+cdef Py_ssize_t scan_shard(object words, str text, Py_ssize_t start, Py_ssize_t stop, TokenArray tokens) except -1:
+    # scan_line without the gil, for tokenize_parallel
+    cdef Text view = text_view(text)
+    cdef WordTable table = <WordTable>words
+    cdef Py_ssize_t end
+
+    with nogil:
+        end = scan_into(view, start, stop, table, tokens)
+
+    return end
+
+
 @cython.cclass
 class Lexer:
+    words = cython.declare(WordTable, visibility="readonly")
+    line_cache = cython.declare(LineCache, visibility="public")
+
+    def __init__(self, extra_words=None):
+        # extra_words : { style: words } added to word table, e.g. { "keyword": ["for"] }
+        self.words = WORDS.extended(word_kinds(extra_words, WORD_KINDS)) if extra_words else WORDS
+        self.line_cache = LineCache() if extra_words else LINE_CACHE
 
     @property
     def lexer_name(self):
@@ -191,57 +341,79 @@ class Lexer:
     def _is_type_def(self, line_text):
         return False
 
+    def stats(self):
+        # { handler: { "calls", "chars", "seconds" } } of all PlayCode scans since the last
+        # reset_stats, empty unless built with LEXER_STATS=1 (see lexer_core.STATS)
+        return stats_dict(HANDLERS, STATS)
+
+    def reset_stats(self):
+        clear_stats(STATS, H_COUNT)
+
     def tokenize(self, str text):
-        cdef int current_char_index = 0
-        cdef int n = len(text)
-        cdef str ch
-        cdef str next_ch
-        cdef list tokens = []
-        cdef bint new_line = True
-
-        while current_char_index < n:
-            ch = text[current_char_index]
-            next_ch = text[current_char_index + 1] if current_char_index + 1 < n else ""
-
-            # whitespace
-            if ch in (' ', '\t', '\r'):
-                current_char_index = handle_whitespace(current_char_index)
-            
-            # newline
-            elif ch == '\n':
-                current_char_index = handle_whitespace(current_char_index)
-                new_line = True
-                continue
-            
-            # '-' : comment / '->' / minus
-            elif ch == '-':
-                current_char_index = handle_dash(current_char_index, text, tokens)
-            
-            # single-char operators
-            elif ch in ('=', '!', '+', '*', '/', '<', '>'):
-                current_char_index = handle_operator(current_char_index, text, tokens)
-            
-            # '@' tag
-            elif ch == '@':
-                current_char_index = handle_tag(current_char_index, text, tokens)
-            
-            # string literal
-            elif ch == '"':
-                current_char_index = handle_string(current_char_index, text, tokens)
-            
-            # number
-            elif _is_digit(ch):
-                current_char_index = handle_number(current_char_index, text, tokens)
-            
-            # identifier
-            elif _is_letter(ch):
-                current_char_index = handle_identifier(current_char_index, text, tokens)
-            
-            # fallback
-            else:
-                tokens.append((DEFAULT, current_char_index, ch))
-                current_char_index += 1
-
-            new_line = False
+        return self.tokenize_compact(text).to_list()
+
+    def tokenize_compact(self, str text):
+        # same tokens as tokenize, stored as kind/start/length arrays
+        # (scans without the gil, see tokenize_many)
+        cdef TokenArray tokens = TokenArray(text, STYLES)
+        cdef Text view = text_view(text)
+        cdef WordTable words = self.words
+
+        with nogil:
+            scan_into(view, 0, view.length, words, tokens)
 
         return tokens
+
+    def tokenize_cached(self, str text):
+        # same tokens as tokenize_compact, lines already in line_cache are copied instead of lexed
+        return self.line_cache.tokenize(text, STYLES, scan_line, self.words)
+
+    def tokenize_many(self, texts, max_workers=None, bint compact=False):
+        # tokenize (or tokenize_compact) of each text, scanned in parallel on a thread pool
+        return _tokenize_many(self.tokenize_compact if compact else self.tokenize, texts, max_workers)
+
+    def tokenize_parallel(self, str text, workers=None, Py_ssize_t threshold=PARALLEL_THRESHOLD, bint compact=False):
+        # tokenize (or tokenize_compact) with text split at line starts into a shard per worker
+        # (default os.cpu_count()) scanned on a thread pool, serially if text is under threshold chars
+        cdef TokenArray tokens = scan_parallel(text, STYLES, scan_shard, self.words, workers, threshold)
+        return tokens if compact else tokens.to_list()
+
+    def iter_tokens(self, source, Py_ssize_t chunk_size=CHUNK_SIZE, bint compact=False):
+        # tokens of str, file object or iterable of chunks, one chunk of lines at a time
+        # (compact yields (offset, TokenArray) batches)
+        return _iter_tokens(self.tokenize_compact, source, chunk_size, compact)
+
+    def scan(self, str text, Py_ssize_t start, Py_ssize_t stop, list tokens):
+        # scan with this lexer's word table
+        cdef TokenArray found = TokenArray(text, STYLES)
+        cdef Py_ssize_t end = scan_into(text_view(text), start, stop, self.words, found)
+        tokens.extend(found)
+        return end
+
+    def retokenize(self, str text, list old_tokens, edits, SymbolIndex symbols=None):
+        # text is buffer after edits, edits is list of (start, removed_len, inserted_text) in old positions
+        # (symbols from symbol_index is updated in place from the re-lexed lines)
+        cdef TokenArray found
+        result = _retokenize(self.scan, text, old_tokens, edits)
+
+        if symbols is not None:
+            changed_start, changed_end = result[1]
+            found = TokenArray(text, STYLES)
+            if changed_end > changed_start:
+                scan_into(text_view(text), changed_start, changed_end, self.words, found)
+            symbols.update(found, changed_start, changed_end)
+
+        return result
+
+    def symbol_index(self, str text, TokenArray tokens=None):
+        # outline (@tags at line start) from tokens of text (tokenized if not given), see SymbolIndex
+        return SymbolIndex(tokens if tokens is not None else self.tokenize_compact(text))
+
+    def tokenize_range(self, str text, Py_ssize_t start_offset, Py_ssize_t end_offset):
+        # tokens for lines overlapping text[start_offset:end_offset], lexing only those lines
+        # (and a string spanning into them)
+        return _tokenize_range(self.scan, text, start_offset, end_offset, restart_point)
+
+    def tokenize_visible(self, str text, Py_ssize_t first_line, Py_ssize_t last_line):
+        # tokens for lines first_line..last_line (0-based, inclusive)
+        return self.tokenize_range(text, *line_range(text, first_line, last_line))
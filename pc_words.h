@@ -0,0 +1,24 @@
+// Generated by gen_words.py, do not edit
+
+#include "lexer_core.h"
+
+#define PC_WORDS_TK_KEYWORD 2
+#define PC_WORDS_TK_CONDITIONAL 12
+
+static const int32_t pc_words_displace[] = {
+    1, 1, 0, 9, 0, 0, -2
+};
+static const uint32_t pc_words_offsets[] = {
+    0, 5, 9, 13, 18, 22, 27
+};
+static const uint8_t pc_words_lengths[] = {
+    5, 4, 4, 5, 4, 5, 2
+};
+static const uint8_t pc_words_kinds[] = {
+    12, 12, 2, 2, 2, 2, 2
+};
+static const unsigned char pc_words_chars[] = "FalseTrueelsewhileswapprintif";
+
+static const lc_word_table pc_words = {
+    7, 5, pc_words_displace, pc_words_offsets, pc_words_lengths, pc_words_kinds, pc_words_chars
+};
@@ -0,0 +1,49 @@
+# Odin as a lexer spec (comments, strings and words as in experiments/_odin.pyx, see
+# gen_lexers.py). Unlike _odin.pyx, unclosed strings and block comments are not errors,
+# raw strings have no escapes, numbers stop at "." (1.5 is three tokens, 0..<10 keeps
+# its range), attributes stop at "(" and `name :: proc` is not marked for the outline.
+
+from gen_words import TABLES
+
+NAME = "Odin"
+COMMENT_CHAR = "//"
+LINE_COMMENT = "//"
+
+STYLES = {
+    "TK_DEFAULT": "default",
+    "TK_KEYWORD": "keyword",
+    "TK_STRING": "string",
+    "TK_NUMBER": "number",
+    "TK_OPERATOR": "operator",
+    "TK_COMMENT": "comment",
+    "TK_TYPE": "type",
+    "TK_CONDITIONAL": "conditional",
+    "TK_BUILT_IN": "built_in",
+}
+
+WORDS = TABLES["odin_words"][1]
+
+RULES = [
+    # line and block comments
+    { "start": "//", "kind": "TK_COMMENT", "until": "eol" },
+    { "start": "/*", "kind": "TK_COMMENT", "until": "*/" },
+
+    # strings, raw strings have no escapes
+    { "start": "\"", "kind": "TK_STRING", "until": "\"", "escape": "\\" },
+    { "start": "'", "kind": "TK_STRING", "until": "'", "escape": "\\" },
+    { "start": "`", "kind": "TK_STRING", "until": "`" },
+
+    # attribute and directive
+    { "start": "@", "kind": "TK_OPERATOR", "run": "LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE" },
+    { "start": "#", "kind": "TK_KEYWORD", "run": "LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE" },
+
+    # scope, range and operators
+    { "start": "::", "kind": "TK_KEYWORD" },
+    { "start": "..", "kind": "TK_OPERATOR" },
+    { "chars": "=!^?+-*%&|~<>/:", "kind": "TK_OPERATOR" },
+
+    { "class": "LC_ASCII_DIGIT", "kind": "TK_NUMBER", "run": "LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE" },
+
+    # identifier, keyword, type, built-in or conditional if in WORDS
+    { "class": "LC_ALPHA | LC_UNDERSCORE", "kind": "TK_DEFAULT", "run": "LC_ALNUM | LC_UNDERSCORE", "words": True },
+]
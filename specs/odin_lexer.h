@@ -0,0 +1,87 @@
+// Generated by gen_lexers.py from specs/odin.py, do not edit
+
+#include "lexer_spec.h"
+
+#define ODIN_WORDS_TK_KEYWORD 2
+#define ODIN_WORDS_TK_CONDITIONAL 12
+#define ODIN_WORDS_TK_BUILT_IN 13
+#define ODIN_WORDS_TK_TYPE 17
+
+static const int32_t odin_words_displace[] = {
+    0, -61, 0, -59, 0, -55, 3, -54, 0, -53, 2, 0, 4, -52, 0, 1,
+    0, 0, -41, 0, -36, 0, 1, 0, 0, 0, 0, 0, 1, 0, 2, -32,
+    6, 6, 1, 5, -27, 11, -21, -20, -19, 1, 1, 0, 1, -15, 1, -12,
+    -10, 0, 0, -7, -3, 0, 0, 0, 4, 12, 3, 0, 0
+};
+static const uint32_t odin_words_offsets[] = {
+    0, 7, 16, 19, 24, 27, 34, 41, 50, 53, 57, 70, 72, 75, 82, 86,
+    89, 91, 94, 98, 101, 105, 108, 112, 121, 124, 131, 134, 138, 143, 148, 151,
+    159, 165, 173, 179, 190, 196, 199, 203, 207, 212, 214, 216, 221, 223, 229, 233,
+    242, 248, 254, 258, 271, 281, 285, 292, 296, 303, 308, 311, 314
+};
+static const uint8_t odin_words_lengths[] = {
+    7, 9, 3, 5, 3, 7, 7, 9, 3, 4, 13, 2, 3, 7, 4, 3,
+    2, 3, 4, 3, 4, 3, 4, 9, 3, 7, 3, 4, 5, 5, 3, 8,
+    6, 8, 6, 11, 6, 3, 4, 4, 5, 2, 2, 5, 2, 6, 4, 9,
+    6, 6, 4, 13, 10, 4, 7, 4, 7, 5, 3, 3, 6
+};
+static const uint8_t odin_words_kinds[] = {
+    2, 2, 17, 12, 2, 2, 2, 17, 17, 17, 17, 2, 17, 13, 17, 17,
+    17, 13, 12, 17, 17, 13, 2, 2, 17, 2, 17, 17, 2, 2, 17, 2,
+    2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 17, 2, 17, 2,
+    17, 2, 2, 17, 17, 2, 2, 2, 2, 2, 17, 2, 2
+};
+static const unsigned char odin_words_chars[] = "bit_setor_returni16falseasmforeignpackagecomplex64inti128quaternion128dof64printlnuintf32i8lentrueu16u128fmtcasetransmutei32dynamici64boolusingbreaku64continuestructdistinctimportfallthroughnot_inforelseenumwhereifindeferu8switchruneauto_caststringtypeidcastquaternion256complex128procor_elsewhencontextunionu32mapreturn";
+
+static const lc_word_table odin_words = {
+    61, 13, odin_words_displace, odin_words_offsets, odin_words_lengths, odin_words_kinds, odin_words_chars
+};
+
+static const ls_rule odin_rules[] = {
+    { .start = { 47, 47 }, .length = 2, .kind = 10, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_COMMENT */
+    { .start = { 47, 42 }, .length = 2, .kind = 10, .body = LS_BODY_UNTIL, .end = { 42, 47 }, .end_length = 2, .symbol = LS_NO_SYMBOL }, /* TK_COMMENT */
+    { .start = { 34 }, .length = 1, .kind = 7, .body = LS_BODY_UNTIL, .end = { 34 }, .end_length = 1, .escape = 92, .symbol = LS_NO_SYMBOL }, /* TK_STRING */
+    { .start = { 39 }, .length = 1, .kind = 7, .body = LS_BODY_UNTIL, .end = { 39 }, .end_length = 1, .escape = 92, .symbol = LS_NO_SYMBOL }, /* TK_STRING */
+    { .start = { 96 }, .length = 1, .kind = 7, .body = LS_BODY_UNTIL, .end = { 96 }, .end_length = 1, .symbol = LS_NO_SYMBOL }, /* TK_STRING */
+    { .start = { 64 }, .length = 1, .kind = 9, .body = LS_BODY_RUN, .run = 28, .symbol = LS_NO_SYMBOL }, /* TK_OPERATOR */
+    { .start = { 35 }, .length = 1, .kind = 2, .body = LS_BODY_RUN, .run = 28, .symbol = LS_NO_SYMBOL }, /* TK_KEYWORD */
+    { .start = { 58, 58 }, .length = 2, .kind = 2, .symbol = LS_NO_SYMBOL }, /* TK_KEYWORD */
+    { .start = { 46, 46 }, .length = 2, .kind = 9, .symbol = LS_NO_SYMBOL }, /* TK_OPERATOR */
+    { .length = 1, .kind = 9, .symbol = LS_NO_SYMBOL }, /* TK_OPERATOR */
+    { .length = 1, .start_class = 8, .kind = 8, .body = LS_BODY_RUN, .run = 28, .symbol = LS_NO_SYMBOL }, /* TK_NUMBER */
+    { .length = 1, .start_class = 48, .kind = 1, .body = LS_BODY_WORD, .run = 80, .symbol = LS_NO_SYMBOL }, /* TK_DEFAULT */
+};
+
+static const uint16_t odin_first[] = {
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 1, 2, 3, 3, 4, 5, 6, 6, 6, 7, 8, 8, 9, 10,
+    13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 25, 25, 26, 27, 28,
+    29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44,
+    45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 56, 56, 56, 57,
+    58, 59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 71, 72, 73,
+    74, 75, 76, 77, 78, 79, 80, 81, 82, 83, 84, 85, 85, 86, 86, 87,
+    87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87,
+    87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87,
+    87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 87, 88, 88, 88, 88, 88,
+    88, 88, 88, 88, 88, 88, 89, 89, 89, 89, 89, 90, 90, 90, 90, 90,
+    90, 91, 92, 93, 94, 95, 96, 97, 98, 99, 100, 101, 102, 103, 104, 105,
+    106, 107, 108, 109, 110, 111, 112, 113, 113, 114, 115, 116, 117, 118, 119, 120,
+    121, 122, 123, 124, 125, 126, 127, 128, 129, 130, 131, 132, 133, 134, 135, 136,
+    137, 138, 139, 140, 141, 142, 143, 144, 144, 145, 146, 147, 148, 149, 150, 151,
+    152, 153
+};
+static const uint16_t odin_order[] = {
+    9, 2, 6, 9, 9, 3, 9, 9, 9, 8, 0, 1, 9, 10, 10, 10,
+    10, 10, 10, 10, 10, 10, 10, 7, 9, 9, 9, 9, 9, 5, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 9, 11, 4, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 9, 9, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11,
+    11, 11, 11, 11, 11, 11, 11, 11, 11
+};
+
+static const ls_spec odin_spec = { odin_rules, 12, odin_first, odin_order };
@@ -0,0 +1,54 @@
+# Generated by gen_lexers.py from specs/odin.py, do not edit
+
+# Tokenizer for Odin (.pyx, scanned by lexer_spec.pyx)
+
+# cython: language_level=3
+cimport cython
+from lexer_core cimport WordTable, LineCache, lc_word_table, wrap_words, TK_DEFAULT, TK_KEYWORD, TK_STRING, TK_NUMBER, TK_OPERATOR, TK_COMMENT, TK_CONDITIONAL, TK_BUILT_IN, TK_TYPE
+from lexer_spec cimport ls_spec, SpecLexer
+
+from lexer_core import make_styles
+
+cdef extern from "odin_lexer.h":
+    const ls_spec odin_spec
+    const lc_word_table odin_words
+
+
+cdef WordTable WORDS = wrap_words(&odin_words)
+
+# styles that can be extended with Lexer(extra_words={ style: [...] })
+WORD_KINDS = { 'keyword': TK_KEYWORD, 'conditional': TK_CONDITIONAL, 'built_in': TK_BUILT_IN, 'type': TK_TYPE }
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: 'default',
+    TK_KEYWORD: 'keyword',
+    TK_STRING: 'string',
+    TK_NUMBER: 'number',
+    TK_OPERATOR: 'operator',
+    TK_COMMENT: 'comment',
+    TK_CONDITIONAL: 'conditional',
+    TK_BUILT_IN: 'built_in',
+    TK_TYPE: 'type',
+})
+
+# lines seen by tokenize_cached, shared by lexers without extra_words
+cdef LineCache LINE_CACHE = LineCache()
+
+
+@cython.cclass
+class Lexer(SpecLexer):
+
+    def __init__(self, extra_words=None):
+        self.setup(&odin_spec, WORDS, STYLES, WORD_KINDS, extra_words, LINE_CACHE)
+
+    @property
+    def lexer_name(self):
+        return 'Odin'
+
+    @property
+    def comment_char(self):
+        return '//'
+
+    @property
+    def line_comment(self):
+        return '//'
@@ -0,0 +1,38 @@
+# PlayCode as a lexer spec (same tokens as pc.pyx, see gen_lexers.py)
+
+NAME = "PlayCode"
+COMMENT_CHAR = ["--", None]
+LINE_COMMENT = "--"
+
+STYLES = {
+    "TK_DEFAULT": "default",
+    "TK_KEYWORD": "keyword",
+    "TK_LAMBDA": "lambda",
+    "TK_STRING": "string",
+    "TK_NUMBER": "number",
+    "TK_OPERATOR": "operator",
+    "TK_COMMENT": "comment",
+    "TK_SPECIAL": "special",
+    "TK_CONDITIONAL": "conditional",
+}
+
+WORDS = {
+    "TK_KEYWORD": ("if", "else", "while", "swap", "print"),
+    "TK_CONDITIONAL": ("True", "False"),
+}
+
+RULES = [
+    # comment, arrow and minus
+    { "start": "--", "kind": "TK_COMMENT", "until": "eol" },
+    { "start": "->", "kind": "TK_SPECIAL" },
+    { "chars": "-=!+*/<>", "kind": "TK_OPERATOR" },
+
+    # '@' tag, a function in outline at line start
+    { "start": "@", "kind": "TK_LAMBDA", "run": "LC_ASCII_LETTER | LC_UNDERSCORE", "symbol": "SYM_FUNCTION" },
+
+    { "start": "\"", "kind": "TK_STRING", "until": "\"" },
+    { "class": "LC_ASCII_DIGIT", "kind": "TK_NUMBER", "run": "LC_ASCII_DIGIT", "also": "." },
+
+    # identifier, keyword or conditional if in WORDS
+    { "class": "LC_ASCII_LETTER | LC_UNDERSCORE", "kind": "TK_DEFAULT", "run": "LC_ASCII_LETTER | LC_ASCII_DIGIT | LC_UNDERSCORE", "words": True },
+]
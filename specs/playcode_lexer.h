@@ -0,0 +1,63 @@
+// Generated by gen_lexers.py from specs/playcode.py, do not edit
+
+#include "lexer_spec.h"
+
+#define PLAYCODE_WORDS_TK_KEYWORD 2
+#define PLAYCODE_WORDS_TK_CONDITIONAL 12
+
+static const int32_t playcode_words_displace[] = {
+    1, 1, 0, 9, 0, 0, -2
+};
+static const uint32_t playcode_words_offsets[] = {
+    0, 5, 9, 13, 18, 22, 27
+};
+static const uint8_t playcode_words_lengths[] = {
+    5, 4, 4, 5, 4, 5, 2
+};
+static const uint8_t playcode_words_kinds[] = {
+    12, 12, 2, 2, 2, 2, 2
+};
+static const unsigned char playcode_words_chars[] = "FalseTrueelsewhileswapprintif";
+
+static const lc_word_table playcode_words = {
+    7, 5, playcode_words_displace, playcode_words_offsets, playcode_words_lengths, playcode_words_kinds, playcode_words_chars
+};
+
+static const ls_rule playcode_rules[] = {
+    { .start = { 45, 45 }, .length = 2, .kind = 10, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_COMMENT */
+    { .start = { 45, 62 }, .length = 2, .kind = 11, .symbol = LS_NO_SYMBOL }, /* TK_SPECIAL */
+    { .length = 1, .kind = 9, .symbol = LS_NO_SYMBOL }, /* TK_OPERATOR */
+    { .start = { 64 }, .length = 1, .kind = 6, .body = LS_BODY_RUN, .run = 20, .symbol = 1 }, /* TK_LAMBDA */
+    { .start = { 34 }, .length = 1, .kind = 7, .body = LS_BODY_UNTIL, .end = { 34 }, .end_length = 1, .symbol = LS_NO_SYMBOL }, /* TK_STRING */
+    { .length = 1, .start_class = 8, .kind = 8, .body = LS_BODY_RUN, .run = 8, .also = 46, .symbol = LS_NO_SYMBOL }, /* TK_NUMBER */
+    { .length = 1, .start_class = 20, .kind = 1, .body = LS_BODY_WORD, .run = 28, .symbol = LS_NO_SYMBOL }, /* TK_DEFAULT */
+};
+
+static const uint16_t playcode_first[] = {
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 1, 2, 2, 2, 2, 2, 2, 2, 2, 3, 4, 4, 7, 7,
+    8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 18, 18, 19, 20, 21,
+    21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36,
+    37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 48, 48, 48, 48,
+    49, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63,
+    64, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75, 75,
+    75, 75
+};
+static const uint16_t playcode_order[] = {
+    2, 4, 2, 2, 0, 1, 2, 2, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 2, 2, 2, 3, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6
+};
+
+static const ls_spec playcode_spec = { playcode_rules, 7, playcode_first, playcode_order };
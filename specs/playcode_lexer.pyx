@@ -0,0 +1,54 @@
+# Generated by gen_lexers.py from specs/playcode.py, do not edit
+
+# Tokenizer for PlayCode (.pyx, scanned by lexer_spec.pyx)
+
+# cython: language_level=3
+cimport cython
+from lexer_core cimport WordTable, LineCache, lc_word_table, wrap_words, TK_DEFAULT, TK_KEYWORD, TK_LAMBDA, TK_STRING, TK_NUMBER, TK_OPERATOR, TK_COMMENT, TK_SPECIAL, TK_CONDITIONAL
+from lexer_spec cimport ls_spec, SpecLexer
+
+from lexer_core import make_styles
+
+cdef extern from "playcode_lexer.h":
+    const ls_spec playcode_spec
+    const lc_word_table playcode_words
+
+
+cdef WordTable WORDS = wrap_words(&playcode_words)
+
+# styles that can be extended with Lexer(extra_words={ style: [...] })
+WORD_KINDS = { 'keyword': TK_KEYWORD, 'conditional': TK_CONDITIONAL }
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: 'default',
+    TK_KEYWORD: 'keyword',
+    TK_LAMBDA: 'lambda',
+    TK_STRING: 'string',
+    TK_NUMBER: 'number',
+    TK_OPERATOR: 'operator',
+    TK_COMMENT: 'comment',
+    TK_SPECIAL: 'special',
+    TK_CONDITIONAL: 'conditional',
+})
+
+# lines seen by tokenize_cached, shared by lexers without extra_words
+cdef LineCache LINE_CACHE = LineCache()
+
+
+@cython.cclass
+class Lexer(SpecLexer):
+
+    def __init__(self, extra_words=None):
+        self.setup(&playcode_spec, WORDS, STYLES, WORD_KINDS, extra_words, LINE_CACHE)
+
+    @property
+    def lexer_name(self):
+        return 'PlayCode'
+
+    @property
+    def comment_char(self):
+        return ['--', None]
+
+    @property
+    def line_comment(self):
+        return '--'
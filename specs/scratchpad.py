@@ -0,0 +1,27 @@
+# Scratch Pad as a lexer spec (same tokens as experiments/scrpd.pyx, see gen_lexers.py)
+
+NAME = "Scratch Pad"
+COMMENT_CHAR = ""
+LINE_COMMENT = ""
+
+STYLES = {
+    "TK_DEFAULT": "default",
+    "TK_KEYWORD": "keyword",
+    "TK_NAME": "name",
+    "TK_COMMENT": "comment",
+    "TK_SPECIAL": "special",
+    "TK_ERROR": "error",
+    "TK_SUCCESS": "success",
+}
+
+# everything else is default, one token per char
+RULES = [
+    { "start": ">>", "line_start": True, "kind": "TK_NAME", "until": "eol" },    # command
+    { "start": "%%", "line_start": True, "kind": "TK_SPECIAL", "until": "eol" }, # chat
+    { "start": "#", "line_start": True, "kind": "TK_KEYWORD", "until": "eol" },  # header
+    { "start": "+", "line_start": True, "kind": "TK_SUCCESS", "until": "eol" },  # done task
+    { "start": "*", "line_start": True, "kind": "TK_ERROR", "until": "eol" },    # priority task
+
+    # not done task, [tags] inside are special
+    { "start": "-", "line_start": True, "kind": "TK_NAME", "until": "eol", "spans": ("[", "]", "TK_SPECIAL", " ") },
+]
@@ -0,0 +1,37 @@
+// Generated by gen_lexers.py from specs/scratchpad.py, do not edit
+
+#include "lexer_spec.h"
+
+static const ls_rule scratchpad_rules[] = {
+    { .start = { 62, 62 }, .length = 2, .line_start = 1, .kind = 4, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_NAME */
+    { .start = { 37, 37 }, .length = 2, .line_start = 1, .kind = 11, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_SPECIAL */
+    { .start = { 35 }, .length = 1, .line_start = 1, .kind = 2, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_KEYWORD */
+    { .start = { 43 }, .length = 1, .line_start = 1, .kind = 16, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_SUCCESS */
+    { .start = { 42 }, .length = 1, .line_start = 1, .kind = 14, .body = LS_BODY_EOL, .symbol = LS_NO_SYMBOL }, /* TK_ERROR */
+    { .start = { 45 }, .length = 1, .line_start = 1, .kind = 4, .body = LS_BODY_SPANS, .open = 91, .close = 93, .skip = 32, .span_kind = 11, .symbol = LS_NO_SYMBOL }, /* TK_NAME */
+};
+
+static const uint16_t scratchpad_first[] = {
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 3, 4, 4, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6,
+    6, 6
+};
+static const uint16_t scratchpad_order[] = {
+    2, 1, 4, 3, 5, 0
+};
+
+static const ls_spec scratchpad_spec = { scratchpad_rules, 6, scratchpad_first, scratchpad_order };
@@ -0,0 +1,51 @@
+# Generated by gen_lexers.py from specs/scratchpad.py, do not edit
+
+# Tokenizer for Scratch Pad (.pyx, scanned by lexer_spec.pyx)
+
+# cython: language_level=3
+cimport cython
+from lexer_core cimport WordTable, LineCache, lc_word_table, wrap_words, TK_DEFAULT, TK_KEYWORD, TK_NAME, TK_COMMENT, TK_SPECIAL, TK_ERROR, TK_SUCCESS
+from lexer_spec cimport ls_spec, SpecLexer
+
+from lexer_core import make_styles
+
+cdef extern from "scratchpad_lexer.h":
+    const ls_spec scratchpad_spec
+
+
+cdef WordTable WORDS = WordTable()
+
+# styles that can be extended with Lexer(extra_words={ style: [...] })
+WORD_KINDS = {}
+
+cdef tuple STYLES = make_styles({
+    TK_DEFAULT: 'default',
+    TK_KEYWORD: 'keyword',
+    TK_NAME: 'name',
+    TK_COMMENT: 'comment',
+    TK_SPECIAL: 'special',
+    TK_ERROR: 'error',
+    TK_SUCCESS: 'success',
+})
+
+# lines seen by tokenize_cached, shared by lexers without extra_words
+cdef LineCache LINE_CACHE = LineCache()
+
+
+@cython.cclass
+class Lexer(SpecLexer):
+
+    def __init__(self, extra_words=None):
+        self.setup(&scratchpad_spec, WORDS, STYLES, WORD_KINDS, extra_words, LINE_CACHE)
+
+    @property
+    def lexer_name(self):
+        return 'Scratch Pad'
+
+    @property
+    def comment_char(self):
+        return ''
+
+    @property
+    def line_comment(self):
+        return ''
@@ -0,0 +1,59 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Tests run against built modules
+#
+#   python build.py build_ext --inplace
+#   python -m pytest                              # modules in repo root and experiments
+#   LEXER_BUILD_DIR=build/ python -m pytest       # or somewhere else (os.pathsep separated)
+#
+# Tests of modules that are not built are skipped.
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.run import TARGETS, load_target
+
+BUILD_DIRS = [os.path.abspath(d) for d in os.environ.get("LEXER_BUILD_DIR", "").split(os.pathsep) if d] + [ROOT, os.path.join(ROOT, "experiments")]
+
+# module name : lexer, each module is loaded once per session
+_lexers = {}
+
+
+@pytest.fixture(scope="session")
+def load():
+    # load("pc.pyx") -> Lexer of bench target, skips test if module is not built
+    def load_lexer(name):
+        key = TARGETS[name][2] or TARGETS[name][3]
+        if key not in _lexers:
+            try:
+                _lexers[key] = load_target(name, BUILD_DIRS).__self__
+            except ImportError as e:
+                pytest.skip(str(e))
+        return _lexers[key]
+    return load_lexer
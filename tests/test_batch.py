@@ -0,0 +1,79 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Project-wide batch tokenization
+
+import os
+
+from batch import find_files, tokenize_project
+
+
+def test_tokens(load, tmp_path):
+    lexer = load("pc.pyx")
+    texts = { "a.pc": '@main\n  print "x\ny"\n', "b.pc": "-- comment\n1 + 2\n", "c.txt": "skipped\n" }
+    for name, text in texts.items():
+        (tmp_path / name).write_text(text)
+
+    results = { result.path: result for result in tokenize_project(str(tmp_path), lexers={ "pc": "pc" }, max_workers=1) }
+
+    assert sorted(results) == [str(tmp_path / "a.pc"), str(tmp_path / "b.pc")]
+    for path, result in results.items():
+        text = texts[os.path.basename(path)]
+        assert result.error is None
+        assert result.to_list(text) == lexer.tokenize(text)
+
+
+def test_errors_are_per_file(load, tmp_path):
+    load("pc.pyx")
+    (tmp_path / "a.pc").write_text("1 + 2\n")
+    (tmp_path / "b.missing").write_text("x\n")
+    (tmp_path / "c.pc").write_bytes(b"\xff\xfe\n")
+
+    results = { result.path: result for result in tokenize_project(str(tmp_path), lexers={ "pc": "pc", "missing": "no_such_lexer" }, max_workers=1) }
+
+    assert results[str(tmp_path / "a.pc")].error is None
+    assert len(results[str(tmp_path / "a.pc")]) == 3
+    assert results[str(tmp_path / "b.missing")].error.startswith("ModuleNotFoundError")
+    assert results[str(tmp_path / "c.pc")].error.startswith("UnicodeDecodeError")
+
+
+def test_dotfiles(tmp_path):
+    # .hackerman is the DSCL config, matched by name like dotfiles in exclude
+    for name in (".hackerman", "a.hackerman", ".git", "b.pc.hackerman", ".pc"):
+        (tmp_path / name).write_text("x\n")
+
+    found = [(os.path.basename(path), module) for path, module in find_files(str(tmp_path), lexers={ "hackerman": "hackerman", "pc": "pc" })]
+
+    assert found == [(".hackerman", "hackerman"), (".pc", "pc"), ("a.hackerman", "hackerman"), ("b.pc.hackerman", "hackerman")]
+    assert find_files(str(tmp_path), exclude="hackerman", lexers={ "hackerman": "hackerman" }) == []
+
+
+def test_dscl_config(load, tmp_path):
+    lexer = load("hackerman.pyx")
+    text = "font_size 12\n-- comment\n"
+    (tmp_path / ".hackerman").write_text(text)
+
+    results = list(tokenize_project(str(tmp_path), max_workers=1))
+
+    assert [os.path.basename(result.path) for result in results] == [".hackerman"]
+    assert results[0].error is None
+    assert results[0].to_list(text) == lexer.tokenize(text)
@@ -0,0 +1,66 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# DSCL value validation in hackerman.pyx (see bench/dscl_validation.py)
+
+import pytest
+
+from bench.dscl_validation import CASES, block
+
+# value : styles after the setting name
+EXPECTED = {
+    "12": ["number"], "x12": ["_error"], "1_000": ["number"], "-4": ["number"],
+    "0.85": ["number"], "1e-3": ["number"], ".5": ["number"], "0.8x": ["_error"],
+    "true": ["number"], "False": ["number"], "yes": ["_error"],
+    "bold": ["string"], "light": ["string"], "heavy": ["_error"],
+    "Fira Code": ["string"], "JetBrains Mono": ["string"], "Menlo?": ["_error"],
+    "pyc,so,o": ["string"], "pyc": ["_error"],
+    "*": ["string"], "**": ["_error"],
+    "value": ["comment"],
+    "14 -- default size": ["number", "comment"],
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_values(load, case):
+    lexer = load("hackerman.pyx")
+    name, values = CASES[case]
+
+    for value in values:
+        text = "%s %s\n" % (name, value)
+        tokens = lexer.tokenize(text)
+        assert tokens[0] == ("default", 0, name)
+        assert [style for style, _, _ in tokens[1:]] == EXPECTED[value], text
+        assert tokens[1][1] == len(name) + 1
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_block(load, case):
+    lexer = load("hackerman.pyx")
+    name, values = CASES[case]
+    text = block(name, values, 100)
+    expected = []
+
+    for line in text.splitlines(True):
+        expected += [style for style, _, _ in lexer.tokenize(line)]
+
+    assert [style for style, _, _ in lexer.tokenize(text)] == expected
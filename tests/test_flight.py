@@ -0,0 +1,57 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Flight recorder for slow tokenize calls
+
+import json
+
+import pytest
+
+from flight import FlightRecorder
+
+
+@pytest.mark.parametrize("name", ["pc.pyx", "hackerman.pyx", "toml.py"])
+def test_dump(load, tmp_path, name):
+    lexer = load(name)
+    recorder = FlightRecorder(threshold=0)
+    text = "a = 1\n"
+
+    assert recorder.wrap(lexer).tokenize(text) == lexer.tokenize(text)
+    assert recorder.dump(str(tmp_path / "flight.json")) == 1
+
+    with open(tmp_path / "flight.json", encoding="utf-8") as f:
+        entry = json.load(f)["entries"][0]
+
+    lexer_name = lexer.lexer_name
+    assert entry["lexer"] == (lexer_name() if callable(lexer_name) else lexer_name)
+    assert entry["method"] == "tokenize"
+    assert entry["text"] == text
+    assert entry["tokens"] == len(lexer.tokenize(text))
+
+
+def test_failed_dump(tmp_path):
+    recorder = FlightRecorder(threshold=0)
+    recorder.entries.append({ "value": object() })
+
+    with pytest.raises(TypeError):
+        recorder.dump(str(tmp_path / "flight.json"))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,79 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Pygments fallback (experiments/_generic.py needs pygments, and TOKEN_MAP from the
+# editor's main module, which is stubbed here if it is not importable)
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("pygments")
+from pygments.util import ClassNotFound
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import main
+except ImportError:
+    main = types.ModuleType("main")
+    main.TOKEN_MAP = dict(enumerate(("whitespace", "default", "keyword", "class", "name", "parameter", "lambda", "string",
+        "number", "operator", "comment", "special", "conditional", "built_in", "error", "warning", "success")))
+    sys.modules["main"] = main
+
+spec = importlib.util.spec_from_file_location("test_generic_module", os.path.join(ROOT, "experiments", "_generic.py"))
+generic = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generic)
+
+
+def test_extension_case():
+    # .C is C++ and .c is C in Pygments, so they must not share a cache entry
+    assert generic.lexer_key("a.C") != generic.lexer_key("a.c")
+    assert generic.Lexer("x.c").lexer.name != generic.Lexer("y.C").lexer.name
+    assert generic.Lexer("y.C").lexer.name == generic.get_lexer_for_filename("y.C").name
+
+
+def test_long_extensions():
+    # the lexer for a.js.j2 is not the one for every .j2 file
+    assert generic.lexer_key("a.js.j2") == ".js.j2"
+    assert generic.lexer_key("b.c.css.j2") == ".css.j2"
+
+    for first, second in (("a.js.j2", "a.css.j2"), ("a.rs.in", "a.css.in")):
+        assert generic.Lexer(first).lexer.name == generic.get_lexer_for_filename(first).name
+        assert generic.Lexer(second).lexer.name == generic.get_lexer_for_filename(second).name
+        assert generic.Lexer(first).lexer.name != generic.Lexer(second).lexer.name
+
+    with pytest.raises(ClassNotFound):
+        generic.Lexer("x.j2")
+
+
+def test_tokenize():
+    lexer = generic.Lexer("a.c")
+    text = "int main() { return 0; } // c\n"
+    tokens = lexer.tokenize(text)
+
+    assert "".join(value for _, _, value in tokens) == text
+    assert tokens[0] == ("special", 0, "int") # Token.Keyword.Type
+    assert list(lexer.iter_tokens(text)) == tokens
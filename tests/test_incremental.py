@@ -0,0 +1,165 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Incremental re-tokenization (incremental.pyx) and damage regions (lexer_core.damage)
+# against a full tokenize, on random texts and random sequences of edit batches
+
+import random
+
+import pytest
+
+# target : chars for random texts and inserted text
+SCAN_CHARS = {
+    "pc.pyx":                   "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "hackerman.pyx":            "[]-- ab=\"1.\r\n\t",
+    "playcode_lexer.pyx":       "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "scratchpad_lexer.pyx":     ">>%%#+-*[] ab\n\t",
+    "odin_lexer.pyx":           "/*\"'`\\ab1.\n\t",
+}
+
+# lexers with line states (tokenize_lines)
+LINE_CHARS = {
+    "_odin.pyx":                "/*\"'`\\ab1.:@#\n\t",
+    "_py.pyx":                  "()'\"#:=.,\\ abXf1\n\t",
+    "_py.py":                   "()'\"#:=.,\\ abXf1\n\t",
+}
+
+# words so texts also open and close declarations, strings and comments
+WORDS = ["class ", "def ", "import ", "'''", "\"\"\"", "/*", "*/", "[x]", "--", ">>", "%%", "True", "proc"]
+
+
+def random_text(rng, chars, high):
+    return "".join(rng.choice(chars) if rng.random() < 0.9 else rng.choice(WORDS) for _ in range(rng.randint(0, high)))
+
+
+def random_edits(rng, text, chars):
+    # 1 to 3 non-overlapping (start, removed_len, inserted_text) edits in text, and text after them
+    cuts = sorted(rng.sample(range(len(text) + 1), min(2 * rng.randint(1, 3), (len(text) + 1) // 2 * 2 or 1)))
+    cuts += cuts[-1:] * (len(cuts) % 2)
+    edits = [(cuts[k], cuts[k + 1] - cuts[k] if rng.random() < 0.5 else 0, random_text(rng, chars, 6)) for k in range(0, len(cuts), 2)]
+    rng.shuffle(edits) # retokenize and damage take edits in any order
+
+    new_text = text
+    for start, removed, inserted in sorted(edits, reverse=True):
+        new_text = new_text[:start] + inserted + new_text[start + removed:]
+    return edits, new_text
+
+
+def new_positions(edits):
+    # [(start, end)] of inserted text in new positions, and shift after all edits
+    inserted = []
+    delta = 0
+    for start, removed, text in sorted(edits):
+        inserted.append((start + delta, start + delta + len(text)))
+        delta += len(text) - removed
+    return inserted, delta
+
+
+def check_changed(text, old_tokens, tokens, edits, changed):
+    # tokens outside changed are the old ones (shifted after it), inserted text is inside it
+    # (a changed range to the end of text also holds zero-length tokens there)
+    inserted, delta = new_positions(edits)
+    changed_start, changed_end = changed
+
+    assert changed_start <= inserted[0][0] and inserted[-1][1] <= changed_end
+    assert [token for token in tokens if token[1] + len(token[2]) <= changed_start] == [token for token in old_tokens if token[1] + len(token[2]) <= changed_start]
+    if changed_end < len(text):
+        assert [token for token in tokens if token[1] >= changed_end] == [(style, start + delta, lexeme) for style, start, lexeme in old_tokens if start + delta >= changed_end]
+
+
+def styles_at(tokens, length):
+    # style at every position (None between tokens)
+    styles = [None] * length
+    for style, start, lexeme in tokens:
+        styles[start:start + len(lexeme)] = [style] * len(lexeme)
+    return styles
+
+
+def check_damage(old_text, text, old_tokens, tokens, old_compact, compact, edits, changed):
+    # ranges cover exactly the inserted text and the positions whose style changed
+    from lexer_core import damage # built, after load
+
+    old_styles = styles_at(old_tokens, len(old_text))
+    new_styles = styles_at(tokens, len(text))
+
+    # old position of every new position (None in inserted text)
+    mapping = []
+    old_pos = 0
+    for start, removed, inserted in sorted(edits):
+        mapping.extend(range(old_pos, start))
+        mapping.extend([None] * len(inserted))
+        old_pos = start + removed
+    mapping.extend(range(old_pos, len(old_text)))
+
+    damaged = { pos for pos in range(len(text)) if mapping[pos] is None or new_styles[pos] != old_styles[mapping[pos]] }
+
+    for ranges in (damage(old_compact, compact, edits, changed), damage(old_compact, compact, edits), damage(old_tokens, tokens, edits, changed)):
+        covered = set()
+        for start, end in ranges:
+            covered.update(range(start, end))
+        assert covered == damaged, (old_text, edits, ranges)
+        assert all(start < end for start, end in ranges)
+        assert all(ranges[k][1] < ranges[k + 1][0] for k in range(len(ranges) - 1))
+
+
+@pytest.mark.parametrize("name", SCAN_CHARS)
+def test_retokenize(load, name):
+    lexer = load(name)
+    chars = SCAN_CHARS[name]
+    rng = random.Random(0)
+
+    for _ in range(300):
+        text = random_text(rng, chars, 200)
+        tokens = lexer.tokenize(text)
+        symbols = lexer.symbol_index(text)
+
+        for _ in range(5):
+            edits, new_text = random_edits(rng, text, chars)
+            new_tokens, changed = lexer.retokenize(new_text, tokens, edits, symbols=symbols)
+
+            assert new_tokens == lexer.tokenize(new_text), (text, edits)
+            assert symbols.outline() == lexer.symbol_index(new_text).outline(), (text, edits)
+            check_changed(new_text, tokens, new_tokens, edits, changed)
+            check_damage(text, new_text, tokens, new_tokens, lexer.tokenize_compact(text), lexer.tokenize_compact(new_text), edits, changed)
+
+            text, tokens = new_text, new_tokens
+
+
+@pytest.mark.parametrize("name", LINE_CHARS)
+def test_retokenize_lines(load, name):
+    lexer = load(name)
+    chars = LINE_CHARS[name]
+    rng = random.Random(0)
+
+    for _ in range(300):
+        text = random_text(rng, chars, 200)
+        tokens, lines = lexer.tokenize_lines(text)
+
+        for _ in range(5):
+            edits, new_text = random_edits(rng, text, chars)
+            new_tokens, new_lines, changed = lexer.retokenize(new_text, tokens, lines, edits)
+
+            assert (new_tokens, new_lines) == lexer.tokenize_lines(new_text), (text, edits)
+            assert new_tokens == lexer.tokenize(new_text), (text, edits)
+            check_changed(new_text, tokens, new_tokens, edits, changed)
+
+            text, tokens, lines = new_text, new_tokens, new_lines
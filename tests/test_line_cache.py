@@ -0,0 +1,100 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Per-line token cache against full scans (see bench/line_cache.py)
+
+import random
+
+import pytest
+
+from bench.line_cache import TARGETS, corpus, edit, random_text, same, splice, FUZZ_CACHE_BYTES
+
+# lexers with tokenize_cached but no line_cache attribute (cache per settings)
+SETTINGS_TARGETS = {
+    "stxt.pyx": "> sh:ab\n",
+    "txt.pyx": "> sh:ab\n",
+}
+
+
+@pytest.mark.parametrize("name", TARGETS)
+def test_edits(load, name):
+    lexer = load(name)
+    rng = random.Random(0)
+    text = corpus(TARGETS[name][0], 2000, 0)
+
+    lexer.line_cache = type(lexer.line_cache)()
+    lexer.tokenize_cached(text)
+    for _ in range(20):
+        text = edit(rng, text)
+        assert same(lexer.tokenize_cached(text), lexer.tokenize_compact(text))
+
+
+@pytest.mark.parametrize("name", TARGETS)
+def test_random_texts(load, name):
+    lexer = load(name)
+    chars = TARGETS[name][1]
+    rng = random.Random(0)
+
+    lexer.line_cache = type(lexer.line_cache)(FUZZ_CACHE_BYTES)
+    for _ in range(2000):
+        sample = random_text(rng, chars)
+        for sample in (sample, splice(rng, sample, chars)):
+            assert same(lexer.tokenize_cached(sample), lexer.tokenize_compact(sample)), sample
+
+
+@pytest.mark.parametrize("name", SETTINGS_TARGETS)
+def test_settings(load, name):
+    lexer = load(name)
+    chars = SETTINGS_TARGETS[name]
+    rng = random.Random(0)
+
+    for _ in range(1000):
+        sample = random_text(rng, chars)
+        for shell_start, chat_response in (("sh:", ">"), ("a", "b")):
+            lexer.shell_start = shell_start
+            lexer.chat_response = chat_response
+            assert same(lexer.tokenize_cached(sample), lexer.tokenize_compact(sample)), (sample, shell_start)
+
+    lexer.shell_start, lexer.chat_response = "sh:", ">"
+
+
+def test_path_values_rechecked(load, tmp_path):
+    # a cached line with a path value is looked up again on every call
+    lexer = load("hackerman.pyx")
+    directory = tmp_path / "root"
+    directory.mkdir()
+    text = "[file_explorer]\nfile_explorer_root %s\n" % directory
+    styles = lambda tokens: [style for style, _, lexeme in tokens if lexeme == str(directory)]
+
+    lexer.line_cache = type(lexer.line_cache)()
+    lexer.path_cache.clear()
+    assert styles(lexer.tokenize(text)) == ["string"]
+    assert styles(lexer.tokenize_cached(text)) == ["string"]
+
+    directory.rmdir()
+    lexer.path_cache.clear()
+    assert styles(lexer.tokenize_cached(text)) == ["_error"]
+    assert styles(lexer.tokenize_cached("-- edit\n" + text)) == ["_error"]
+
+    directory.mkdir()
+    lexer.path_cache.clear()
+    assert styles(lexer.tokenize_cached(text)) == ["string"]
@@ -0,0 +1,66 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Bulk-scan kernels keep tokenize linear on pathological inputs
+#
+# Each input is one huge token (unterminated string or header, comment line,
+# identifier, ...). Tokenizing 4x the input must take about 4x the time, a
+# lexer building lexemes char by char takes about 16x.
+
+import time
+
+import pytest
+
+SIZE = 1 << 16
+
+# target : inputs as (prefix, repeated chunk)
+INPUTS = {
+    "pc.pyx":           [('"', "a"), ("-- ", "a"), ("", "a"), ("", "1"), ("@", "a")],
+    "hackerman.pyx":    [("-- ", "a"), ("[", "a"), ("name = ", "a")],
+    "scrpd.pyx":        [("# ", "a"), (">> ", "a"), ("%% ", "a"), ("- ", "a"), ("", "a")],
+    "todo.pyx":         [("# ", "a"), ("- ", "a"), ("+ ", "a"), ("* ", "a")],
+    "stxt.pyx":         [("", "a"), ("> ", "a")],
+    "txt.pyx":          [("", "a"), ("> ", "a")],
+    "_odin.pyx":        [('"', "a"), ("/*", "a"), ("// ", "a"), ("", "a"), ("", "1")],
+    "_py.pyx":          [('"""', "a"), ("# ", "a"), ("", "a"), ("", "1")],
+    "toml.pyx":         [('"""', "a"), ("# ", "a"), ("[", "a")],
+}
+
+
+def best_time(tokenize, text, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tokenize(text)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+@pytest.mark.parametrize("name, prefix, chunk", [(name, prefix, chunk) for name, inputs in INPUTS.items() for prefix, chunk in inputs])
+def test_linear_time(load, name, prefix, chunk):
+    lexer = load(name)
+    small = best_time(lexer.tokenize, prefix + chunk * SIZE)
+    large = best_time(lexer.tokenize, prefix + chunk * (4 * SIZE))
+
+    # 4x when linear, 16x when quadratic, floor for timer noise
+    assert large < 10 * max(small, 1_000_000), "%r: %.2f ms for %d chars, %.2f ms for %d chars" % (prefix, small / 1e6, SIZE, large / 1e6, 4 * SIZE)
@@ -0,0 +1,93 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# NativeLexer.tokenize_raw (experiments/native_bridge.py) without a native library :
+# process_input is a Python function that returns an Odin-layout token array
+
+import ctypes
+import importlib.util
+import os
+import re
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location("test_native_bridge_module", os.path.join(ROOT, "experiments", "native_bridge.py"))
+bridge = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bridge)
+
+
+def fake_lexer(offsets):
+    # NativeLexer whose process_input makes one token per word, start_pos in offsets
+    calls = []
+    keep = []
+
+    def process_input(arg):
+        data = ctypes.string_at(arg.text, arg.len)
+        text = data.decode("utf-8")
+        words = [(match.start(), match.group()) for match in re.finditer(r"\S+", text)]
+        tokens = (bridge.Token * max(len(words), 1))()
+
+        for n, (start, word) in enumerate(words):
+            byte_start = len(text[:start].encode("utf-8"))
+            tokens[n].type = n % 3
+            tokens[n].start_pos = byte_start if offsets == "bytes" else start
+            tokens[n].value = bridge.String(arg.text + byte_start, len(word.encode("utf-8")))
+
+        keep.append(tokens)
+        result = bridge.DynamicToken()
+        result.data = ctypes.cast(tokens, ctypes.POINTER(bridge.Token))
+        result.len = len(words)
+        result.cap = len(words)
+        return result
+
+    lexer = bridge.NativeLexer.__new__(bridge.NativeLexer)
+    lexer.offsets = offsets
+    lexer.process_input = process_input
+    lexer.free_tokens = calls.append
+    return lexer, calls
+
+
+@pytest.mark.parametrize("offsets", ["bytes", "chars"])
+@pytest.mark.parametrize("text", ["", "a bc  d", "é a€b 😀 x\nyé", "ä" * 5000 + " z 😀😀 " + "b" * 300])
+def test_tokenize_raw(offsets, text):
+    lexer, calls = fake_lexer(offsets)
+    words = [(match.start(), match.group()) for match in re.finditer(r"\S+", text)]
+
+    types, starts, values = lexer.tokenize_raw(text)
+
+    assert starts == [start for start, _ in words]
+    assert values == [word for _, word in words]
+    assert types == [n % 3 for n in range(len(words))]
+    assert len(calls) == 1
+
+
+def test_offsets():
+    text = "aé€😀b"
+    data = text.encode("utf-8")
+    chars = list(range(len(text) + 1))
+    byte_offsets = [len(text[:n].encode("utf-8")) for n in chars]
+
+    assert bridge.char_to_byte_offsets(text, chars) == byte_offsets
+    assert bridge.byte_to_char_offsets(data, byte_offsets) == chars
+    assert bridge.char_to_byte_offsets(text, [4, 1]) == [byte_offsets[4], byte_offsets[1]]
@@ -0,0 +1,72 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# odin_tokenizer (experiments/_odin_tokenizer.c) scans utf-8 bytes and converts
+# token offsets to code points for str and tokenize_file
+
+import random
+
+import pytest
+
+CHARS = "/*\"'`\\ab1.:@#\n\t é€😀"
+
+
+def byte_tokens(tokens, text):
+    # code point offsets of tokens as byte offsets in text.encode()
+    return [(kind, len(text[:start].encode()), len(text[start:start + length].encode())) for kind, start, length in tokens]
+
+
+def check(odin, text, tmp_path):
+    data = text.encode()
+    tokens = odin.tokenize(text)
+
+    assert all(length > 0 for _, _, length in tokens), text
+    assert byte_tokens(tokens, text) == odin.tokenize(data), text
+
+    path = tmp_path / "a.odin"
+    path.write_bytes(data)
+    assert odin.tokenize_file(str(path)) == tokens
+    assert odin.tokenize_file(str(path), byte_offsets=True) == odin.tokenize(data)
+
+
+@pytest.mark.parametrize("text", ["/*é", "/* x", "/*é*/a", "a/*", "/*", "\"é", "é/*€*/😀", "x := \"€\" // é\n/* 😀"])
+def test_non_ascii(load, tmp_path, text):
+    check(load("_odin_tokenizer.c"), text, tmp_path)
+
+
+def test_unterminated_comment(load):
+    odin = load("_odin_tokenizer.c")
+    comment = odin.tokenize("/**/")[0][0]
+
+    assert odin.tokenize("/*é") == [(comment, 0, 3)]
+    assert odin.tokenize("a /* x")[1:] == [(comment, 2, 4)]
+
+
+def test_random_texts(load, tmp_path):
+    odin = load("_odin_tokenizer.c")
+    rng = random.Random(0)
+
+    for _ in range(500):
+        check(odin, "".join(rng.choice(CHARS) for _ in range(rng.randint(0, 60))), tmp_path)
+
+    # offsets past the first blocks of the utf-8 index (every 4 KB)
+    check(odin, "".join(rng.choice(CHARS) for _ in range(20000)), tmp_path)
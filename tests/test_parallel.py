@@ -0,0 +1,73 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# tokenize_parallel against tokenize (see bench/parallel.py)
+
+import random
+
+import pytest
+
+from bench.corpus import generate
+from bench.parallel import TARGETS, WORKERS, random_text, same
+
+# a shard starting inside a token of the shard before it
+CASES = {
+    "hackerman.pyx": ["a \"x\n" * 50, "-- c\n" * 50 + "[h\n" * 50, "\n" * 100, "x" * 100],
+    "pc.pyx": ["\"abc\n" * 50 + "x = 1\n" * 50, "--" + "\n" * 100, "\n" * 100, "x" * 100],
+}
+
+
+@pytest.mark.parametrize("name", TARGETS)
+@pytest.mark.parametrize("workers", WORKERS)
+def test_corpus(load, name, workers):
+    language, _ = TARGETS[name]
+    assert same(load(name), generate(language, "200KB", 0), workers, 0)
+
+
+@pytest.mark.parametrize("name", TARGETS)
+def test_random_texts(load, name):
+    _, chars = TARGETS[name]
+    lexer = load(name)
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        text = random_text(rng, chars)
+        assert same(lexer, text, rng.choice(WORKERS), 0), text
+
+
+@pytest.mark.parametrize("name", TARGETS)
+def test_shard_boundaries(load, name):
+    lexer = load(name)
+
+    for text in CASES[name]:
+        for workers in WORKERS:
+            assert same(lexer, text, workers, 0), (text, workers)
+
+
+@pytest.mark.parametrize("name", TARGETS)
+def test_threshold(load, name):
+    language, _ = TARGETS[name]
+    lexer = load(name)
+    text = generate(language, "10KB", 0)
+
+    assert lexer.tokenize_parallel(text, 4) == lexer.tokenize(text)
+    assert lexer.tokenize_parallel(text, 4, len(text) + 1) == lexer.tokenize(text)
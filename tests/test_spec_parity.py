@@ -0,0 +1,50 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Spec tokenizers against the hand-written ones (see bench/spec_parity.py)
+
+import random
+
+import pytest
+
+from bench.corpus import generate
+from bench.spec_parity import PAIRS, differences, random_text
+
+
+@pytest.mark.parametrize("spec_name", PAIRS)
+def test_corpus(load, spec_name):
+    name, language, _ = PAIRS[spec_name]
+    spec_lexer, lexer = load(spec_name), load(name)
+    rng = random.Random(0)
+
+    assert differences(spec_lexer, lexer, generate(language, "100KB", 0), rng) == []
+
+
+@pytest.mark.parametrize("spec_name", PAIRS)
+def test_random_texts(load, spec_name):
+    name, _, chars = PAIRS[spec_name]
+    spec_lexer, lexer = load(spec_name), load(name)
+    rng = random.Random(0)
+
+    for _ in range(5000):
+        text = random_text(rng, chars)
+        assert differences(spec_lexer, lexer, text, rng) == [], text
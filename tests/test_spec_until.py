@@ -0,0 +1,83 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# until rules of spec tokenizers : end delimiters of several chars and escapes
+# (gen_lexers.py, lexer_spec.pyx), checked on specs/odin.py
+
+import random
+
+import pytest
+
+import gen_lexers
+
+# closed comments and strings, the tokens odin_lexer shares with _odin.pyx
+ODIN_PIECES = ["/* a\n*/", "/**/", "/* * / */", "// c\n", "\"a\\\"b\"", "\"\\\\\"", "'\\''", "`a\\b`", "\"é\n\"", "x", "::", "..", " ", "\n"]
+
+
+def compile_rule(rule):
+    kinds = gen_lexers.gen_words.token_kinds()
+    classes, table = gen_lexers.char_classes()
+    return gen_lexers.compile_rule("rule", rule, kinds, gen_lexers.symbol_kinds(), classes, table)[0]
+
+
+def test_compile_until():
+    fields = compile_rule({ "start": "/*", "kind": "TK_COMMENT", "until": "*/" })
+    assert (fields["body"], fields["end"], fields["end_length"]) == ("until", [ord("*"), ord("/")], 2)
+    assert "escape" not in fields
+
+    fields = compile_rule({ "start": "\"", "kind": "TK_STRING", "until": "\"", "escape": "\\" })
+    assert (fields["end"], fields["escape"]) == ([ord("\"")], ord("\\"))
+
+
+@pytest.mark.parametrize("rule", [
+    { "start": "\"", "kind": "TK_STRING", "until": "" },
+    { "start": "\"", "kind": "TK_STRING", "until": "123456789" },
+    { "start": "\"", "kind": "TK_STRING", "until": "eol", "escape": "\\" },
+    { "start": "\"", "kind": "TK_STRING", "escape": "\\" },
+    { "start": "\"", "kind": "TK_STRING", "until": "\"", "escape": "\\\\" },
+])
+def test_compile_errors(rule):
+    with pytest.raises(ValueError):
+        compile_rule(rule)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("/* a\n*/ x", [("comment", 0, "/* a\n*/"), ("default", 8, "x")]),
+    ("/* a * / */", [("comment", 0, "/* a * / */")]),
+    ("/* a", [("comment", 0, "/* a")]),
+    ("/*/ x", [("comment", 0, "/*/ x")]),
+    ("\"a\\\"b\" c", [("string", 0, "\"a\\\"b\""), ("default", 7, "c")]),
+    ("\"a\\\\\" c", [("string", 0, "\"a\\\\\""), ("default", 6, "c")]),
+    ("\"a\\", [("string", 0, "\"a\\")]),
+    ("`a\\` c", [("string", 0, "`a\\`"), ("default", 5, "c")]),
+])
+def test_until(load, text, expected):
+    assert load("odin_lexer.pyx").tokenize(text) == expected
+
+
+def test_odin_parity(load):
+    spec_lexer, lexer = load("odin_lexer.pyx"), load("_odin.pyx")
+    rng = random.Random(0)
+
+    for _ in range(3000):
+        text = "".join(rng.choice(ODIN_PIECES) for _ in range(rng.randint(0, 30)))
+        assert spec_lexer.tokenize(text) == lexer.tokenize(text), text
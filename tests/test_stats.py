@@ -0,0 +1,53 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Handler statistics (counted only in builds with LEXER_STATS=1)
+
+import pytest
+
+# target : (text, handler that must have run, chars it consumed)
+CASES = {
+    "pc.pyx":           ('-- note\n"text"\n', "handle_dash", 7),
+    "hackerman.pyx":    ("[header]\nfont_size = 12\n", "handle_header", 8),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_stats(load, name):
+    lexer = load(name)
+    import lexer_core
+
+    text, handler, chars = CASES[name]
+    lexer.reset_stats()
+    lexer.tokenize(text)
+    stats = lexer.stats()
+
+    if not lexer_core.STATS:
+        assert stats == {}
+        return
+
+    assert stats[handler]["calls"] == 1
+    assert stats[handler]["chars"] == chars
+    assert sum(entry["chars"] for name, entry in stats.items() if name not in ("validate_values", "resolve_paths")) == len(text)
+
+    lexer.reset_stats()
+    assert all(entry["calls"] == 0 for entry in lexer.stats().values())
@@ -0,0 +1,80 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Streaming gives the tokens of tokenize, also when a token spans chunks
+
+import io
+import random
+
+import pytest
+
+# target : chars for random texts
+CHARS = {
+    "pc.pyx":                   "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "playcode_lexer.pyx":       "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "hackerman.pyx":            "[]-- ab=\"1.\r\n\t",
+    "scrpd.pyx":                ">>%%#+-*[] ab\n\t",
+    "scratchpad_lexer.pyx":     ">>%%#+-*[] ab\n\t",
+    "stxt.pyx":                 "> ab$%\n",
+    "txt.pyx":                  "> ab$%\n",
+}
+
+
+def from_batches(batches):
+    return [(style, offset + start, lexeme) for offset, tokens in batches for style, start, lexeme in tokens]
+
+
+@pytest.mark.parametrize("name, text", [
+    ("pc.pyx", 'a\n"x\ny"\nb\n'),
+    ("pc.pyx", '"x\n\n\n\ny\n'),
+    ("hackerman.pyx", "[a\nb\nc]\nd = 1\n"),
+    ("hackerman.pyx", "a = 1\n[b\nc\n"),
+])
+def test_spanning_token(load, name, text):
+    lexer = load(name)
+    for chunk_size in range(1, 8):
+        assert list(lexer.iter_tokens(text, chunk_size)) == lexer.tokenize(text)
+
+
+@pytest.mark.parametrize("name", CHARS)
+def test_random_texts(load, name):
+    lexer = load(name)
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        text = "".join(rng.choice(CHARS[name]) for _ in range(rng.randint(0, 80)))
+        chunk_size = rng.randint(1, 16)
+        expected = lexer.tokenize(text)
+
+        assert list(lexer.iter_tokens(text, chunk_size)) == expected, (text, chunk_size)
+        assert from_batches(lexer.iter_tokens(text, chunk_size, True)) == expected, (text, chunk_size)
+
+
+@pytest.mark.parametrize("name", ["pc.pyx", "hackerman.pyx"])
+def test_files(load, name):
+    lexer = load(name)
+    rng = random.Random(1)
+    text = "".join(rng.choice(CHARS[name] + "é中") for _ in range(5000))
+
+    expected = lexer.tokenize(text)
+    assert list(lexer.iter_tokens(io.StringIO(text), 64)) == expected
+    assert list(lexer.iter_tokens(io.BytesIO(text.encode("utf-8")), 64)) == expected
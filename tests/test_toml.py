@@ -0,0 +1,54 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compiled TOML tokenizer (toml.pyx) against toml.py, on the lines toml.py
+# handles (see bench/toml_native.py)
+
+import pytest
+
+from bench.corpus import generate
+from bench.toml_native import HANDLED, handled
+
+
+@pytest.fixture(scope="module")
+def lexers(load):
+    return load("toml.py"), load("toml.pyx")
+
+
+@pytest.mark.parametrize("line", HANDLED)
+def test_handled(lexers, line):
+    reference, compiled = lexers
+    assert compiled.tokenize(line) == reference.tokenize(line)
+
+
+def test_corpus(lexers):
+    reference, compiled = lexers
+    lines = [line for line in sorted(set(generate("toml", "100KB", 0).split("\n"))) if handled(line)]
+
+    assert len(lines) > 100
+    assert [line for line in lines if compiled.tokenize(line) != reference.tokenize(line)] == []
+
+
+def test_compact(lexers):
+    _, compiled = lexers
+    text = generate("toml", "100KB", 1)
+    assert list(compiled.tokenize_compact(text)) == compiled.tokenize(text)
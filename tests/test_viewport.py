@@ -0,0 +1,96 @@
+# MIT License
+
+# Copyright 2025 @asyncze (Michael Sjöberg)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Viewport-first tokenization gives the tokens of tokenize overlapping the
+# lines in view, also when a string or header starts above them (and the
+# tokens of the lines after the view a token spanning out of it reaches)
+
+import random
+
+import pytest
+
+PY_LINES = [
+    "class X:\n", "class X(B):\n", "class B :\n", "def f(a, b=1):\n", "def X():\n", "    X = f(B)\n",
+    "    return X\n", "x = 'a\n", "y = \"b\n", "'''\n", "\"\"\"\n", "# class C\n", "X = f(\n    B,\n)\n", "\n",
+]
+
+# target : chars (or lines) for random texts
+CHARS = {
+    "pc.pyx":                   "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "playcode_lexer.pyx":       "-->=!+*/<@\"0123456789._aZ if True\n\t",
+    "hackerman.pyx":            "[]-- ab=\"1.\r\n\t",
+    "scrpd.pyx":                ">>%%#+-*[] ab\n\t",
+    "scratchpad_lexer.pyx":     ">>%%#+-*[] ab\n\t",
+    "_odin.pyx":                "/*\"'`\\ab1.\n\t",
+    "odin_lexer.pyx":           "/*\"'`\\ab1.\n\t",
+    # lines rather than chars, random chars leave declarations open in ways the skim before
+    # the view doesn't follow
+    "_py.py":                   PY_LINES,
+    "_py.pyx":                  PY_LINES,
+}
+
+
+def visible(tokens, text, first_line, last_line):
+    # tokens of tokenize overlapping lines first_line..last_line
+    starts = [0] + [i + 1 for i, ch in enumerate(text) if ch == "\n"]
+    start = starts[min(first_line, len(starts) - 1)]
+    end = starts[last_line + 1] if last_line + 1 < len(starts) else len(text)
+    return [token for token in tokens if token[1] < max(end, start + 1) and (token[1] >= start or token[1] + len(token[2]) > start)]
+
+
+def check(lexer, text, first_line, last_line):
+    tokens = lexer.tokenize(text)
+    found = lexer.tokenize_visible(text, first_line, last_line)
+    expected = visible(tokens, text, first_line, last_line)
+
+    assert found[:len(expected)] == expected
+    if found:
+        first = tokens.index(found[0])
+        assert found == tokens[first:first + len(found)]
+
+
+@pytest.mark.parametrize("name, text, first_line, last_line", [
+    ("pc.pyx", 'a\n"x\ny"\nb\n', 2, 2),
+    ("pc.pyx", '-- "\n"x\ny"\nb\n', 2, 3),
+    ("playcode_lexer.pyx", 'a\n"x\ny"\nb\n', 2, 2),
+    ("hackerman.pyx", "[a\nb]\nc = 1\n", 1, 2),
+    ("hackerman.pyx", "a = [b\n[c\nd]\n", 2, 2),
+    ("_py.py", "class X(B):\n    pass\n\nX = 1\n", 3, 3),
+    ("_py.pyx", "class X(B):\n    pass\n\nX = 1\n", 3, 3),
+    ("_py.pyx", "class X :\n    pass\n\nX = 1\n", 3, 3),
+])
+def test_spanning_token(load, name, text, first_line, last_line):
+    check(load(name), text, first_line, last_line)
+
+
+@pytest.mark.parametrize("name", CHARS)
+def test_random_texts(load, name):
+    lexer = load(name)
+    rng = random.Random(0)
+
+    for _ in range(3000):
+        text = "".join(rng.choice(CHARS[name]) for _ in range(rng.randint(0, 60)))
+        lines = text.count("\n") + 1
+        first_line = rng.randrange(lines)
+        last_line = rng.randrange(first_line, lines)
+
+        check(lexer, text, first_line, last_line)